@@ -17,6 +17,66 @@
 using namespace std;
 
 
+// per element emulsification - shared by emulsify() and emulsify_le()
+static inline OSErr emulsify_element(unsigned long step_len,
+                                     double *frac_water,
+                                     double *interfacial_area,
+                                     double frac_evap,
+                                     int32_t age,
+                                     double *bulltime,
+                                     double k_emul,
+                                     double emul_time,
+                                     double emul_C,
+                                     double S_max,
+                                     double Y_max,
+                                     double drop_max)
+{
+	double Y, S;
+	double start, le_age;	// convert to double for calculations
+
+	S = *interfacial_area;
+	le_age = age;
+	if ((le_age >= emul_time && emul_time >= 0.) || frac_evap >= emul_C && emul_C > 0.)
+	{
+		if (emul_time > 0.)	// user has set value
+			start = emul_time;
+		else
+		{
+			if (*bulltime < 0.)
+			{
+				start = le_age;
+				*bulltime = le_age;
+			}
+			else
+				start = *bulltime;
+		}
+		S = S + k_emul * step_len * exp( (-k_emul / S_max) * (le_age - start));
+		if (S > S_max)
+			S = S_max;
+	}
+	else
+	{
+		S = 0.;
+	}
+
+	if (S < ((6.0 / drop_max) * (Y_max / (1.0 - Y_max))))
+	{
+		Y = S * drop_max / (6.0 + (S * drop_max));
+	}
+	else
+	{
+		Y = Y_max;
+	}
+
+	if (Y < 0) { return -1;}
+
+	*frac_water = Y;
+	*interfacial_area = S;
+
+	return 0;
+}
+
+
 OSErr emulsify(int n, unsigned long step_len,
 			   double *frac_water,
 			   double *interfacial_area,
@@ -31,69 +91,151 @@ OSErr emulsify(int n, unsigned long step_len,
 			   double drop_max)
 {
 	OSErr err = 0;
-	double Y, S;
-	//Seconds start;
-	double start, le_age;	// convert to double for calculations
-	//char errmsg[256];
-	
+
 	for (int i=0; i < n; i++)
 	{
-		S = interfacial_area[i];
-		le_age = age[i];
-		//sprintf(errmsg,"for i = %ld, S = %lf, age = %lf, emul_time =%lf, frac_evap[i] = %lf\n",i,S,le_age,emul_time,frac_evap[i]);
-		//printNote(errmsg);
-		//sprintf(errmsg,"k_emul = %lf, emul_C = %lf, Y_max = %lf, S_max = %lf, drop_max = %lf\n",k_emul,emul_C,Y_max,S_max,drop_max);
-		//printNote(errmsg);
-		//if ((age[i] >= emul_time && emul_time >= 0.) || frac_evap[i] >= emul_C && emul_C > 0.)
-		if ((le_age >= emul_time && emul_time >= 0.) || frac_evap[i] >= emul_C && emul_C > 0.)
-		{
-			if (emul_time > 0.)	// user has set value
-				start = emul_time;
-			else
-			{
-				if (bulltime[i] < 0.)
-				{
-					//start = age[i];
-					//bulltime[i] = age[i];
-					start = le_age;
-					bulltime[i] = le_age;
-				}
-				else
-					start = bulltime[i];
-			}
-			//S = S + k_emul * step_len * exp( (-k_emul / S_max) * (age[i] - start));
-			S = S + k_emul * step_len * exp( (-k_emul / S_max) * (le_age - start));
-			if (S > S_max)
-				S = S_max;
-		}
-		else
-		{
-			S = 0.;
-		}
-		
-		if (S < ((6.0 / drop_max) * (Y_max / (1.0 - Y_max))))
-		{
-			Y = S * drop_max / (6.0 + (S * drop_max));
-		//sprintf(errmsg,"Y = %lf, S = %lf\n",Y,S);
-		//printNote(errmsg);
-		}
-		else
-		{
-			Y = Y_max;
-		//sprintf(errmsg,"Y = %lf, S = %lf\n",Y,S);
-		//printNote(errmsg);
-		}
-		
-		if (Y < 0) { err = -1; return err;}
-		
-		frac_water[i] = Y;
-		interfacial_area[i] = S;
+		err = emulsify_element(step_len,
+							   &frac_water[i], &interfacial_area[i],
+							   frac_evap[i], age[i], &bulltime[i],
+							   k_emul, emul_time, emul_C,
+							   S_max, Y_max, drop_max);
+		if (err) return err;
 	}
-	
+
 	return err;
 }
 
 
+// same as emulsify() but with the water uptake coefficient given per element
+OSErr emulsify_le(int n, unsigned long step_len,
+				  double *frac_water,
+				  double *interfacial_area,
+				  double *frac_evap,
+				  int32_t *age,
+				  double *bulltime,
+				  double *k_emul,
+				  double emul_time,
+				  double emul_C,
+				  double S_max,
+				  double Y_max,
+				  double drop_max)
+{
+	OSErr err = 0;
+
+	for (int i=0; i < n; i++)
+	{
+		err = emulsify_element(step_len,
+							   &frac_water[i], &interfacial_area[i],
+							   frac_evap[i], age[i], &bulltime[i],
+							   k_emul[i], emul_time, emul_C,
+							   S_max, Y_max, drop_max);
+		if (err) return err;
+	}
+
+	return err;
+}
+
+
+// per element dispersion - shared by adios2_disperse() and
+// adios2_disperse_le()
+static inline void disperse_element(unsigned long step_len,
+                                    double Y,
+                                    double mass,
+                                    double visc,
+                                    double rho,
+                                    double A,
+                                    double *d_disp,  // output
+                                    double *d_sed,  // output
+                                    double *droplet_avg_size,  // output
+                                    double fbw,
+                                    double De,
+                                    double Hrms,
+                                    double visc_w,
+                                    double rho_w,
+                                    double C_sed,
+                                    double V_entrain,
+                                    double ka)
+{
+	double g = 9.80665;
+
+	double C_disp = pow(De, 0.57) * fbw; // dispersion term at current time
+
+	double d_disp_out = 0.0;
+	double d_sed_out = 0.0;
+
+	if (Y >= 1) {
+	    *d_disp = 0.0;
+	    *d_sed = 0.0;
+	    *droplet_avg_size = 0.0;
+	    return;
+	}  // shouldn't happen
+
+	double C_Roy = 2400.0 * exp(-73.682 * sqrt(visc)); // Roy's constant
+
+	// surface oil slick thickness
+	double thickness = 0.0;
+	if (A > 0) {
+		// emulsion volume (m3)
+		double Vemul = (mass / rho)  / (1.0 - Y);
+
+		thickness = Vemul / A;
+	}
+
+	// mass rate of oil driven into the first 1.5 wave height (m3/sec)
+	double Q_disp = C_Roy * C_disp * V_entrain * (1.0 - Y) * A / rho;
+
+	// Net mass loss rate due to sedimentation (kg/s)
+	// (Note: why not in m^3/s???)
+	double Q_sed = 0.0;
+	if (C_sed > 0.0 && thickness >= 1.0e-4) {
+		// average droplet size based on surface oil slick thickness
+		double droplet = 0.613 * thickness;
+		*droplet_avg_size = droplet;
+
+		// droplet average rise velocity
+		double speed = (droplet * droplet * g *
+		                (1.0 - rho / rho_w) /
+		                (18.0 * visc_w));
+
+		// vol of refloat oil/wave p
+		double V_refloat = 0.588 * (pow(thickness, 1.7) - 5.0e-8);
+		if (V_refloat < 0.0)
+			V_refloat = 0.0;
+
+		// (kg/m2-sec) mass rate of emulsion
+		double q_refloat = C_Roy * C_disp * V_refloat * A;
+
+		double C_oil = (q_refloat * step_len /
+		                (speed * step_len + 1.5 * Hrms));
+
+		//vol rate
+		Q_sed = (1.6 * ka *
+		         sqrt(Hrms * De * fbw / (rho_w * visc_w)) *
+		         C_oil * C_sed / rho);
+	}
+
+	//total vol oil loss due to dispersion
+	d_disp_out = Q_disp * step_len;
+
+	//total vol oil loss due to sedimentation
+	d_sed_out = (1.0 - Y) * Q_sed * step_len;
+
+	d_disp_out *= rho;
+	d_sed_out *= rho;
+
+	if (d_disp_out + d_sed_out > mass) {
+		double ratio = d_disp_out / (d_disp_out + d_sed_out);
+
+		d_disp_out = ratio * mass;
+		d_sed_out = mass - d_disp_out;
+	}
+
+	// assign our final values to our output arrays
+	*d_disp = d_disp_out;
+	*d_sed = d_sed_out;
+}
+
+
 OSErr adios2_disperse(int n, unsigned long step_len,
                       double *frac_water,
                       double *le_mass,
@@ -112,98 +254,49 @@ OSErr adios2_disperse(int n, unsigned long step_len,
                       double V_entrain,
                       double ka)
 {
-	OSErr err = 0;
-
-	double g = 9.80665;
-	double De = disp_wave_energy;
-	double fbw = frac_breaking_waves;
-	double Hrms = wave_height;
-
-	double C_disp = pow(De, 0.57) * fbw; // dispersion term at current time
-
 	for (int i=0; i < n; i++)
 	{
-		double rho = le_density[i];	// pure oil density
-		double mass = le_mass[i];
-		double visc = le_viscosity[i]; // oil (or emulsion) viscosity
-		double Y = frac_water[i]; // water fraction
-		double A = fay_area[i];
-
-		double d_disp_out = 0.0;
-		double d_sed_out = 0.0;
-
-		if (Y >= 1) {
-		    d_disp[i] = 0.0;
-		    d_sed[i] = 0.0;
-		    droplet_avg_size[i] = 0.0;
-		    continue;
-		}  // shouldn't happen
-
-		double C_Roy = 2400.0 * exp(-73.682 * sqrt(visc)); // Roy's constant
-
-        // surface oil slick thickness
-		double thickness = 0.0;
-		if (A > 0) {
-            // emulsion volume (m3)
-            double Vemul = (mass / rho)  / (1.0 - Y);
-
-            thickness = Vemul / A;
-		}
-
-		// mass rate of oil driven into the first 1.5 wave height (m3/sec)
-		double Q_disp = C_Roy * C_disp * V_entrain * (1.0 - Y) * A / rho;
-
-		// Net mass loss rate due to sedimentation (kg/s)
-		// (Note: why not in m^3/s???)
-		double Q_sed = 0.0;
-		if (C_sed > 0.0 && thickness >= 1.0e-4) {
-			// average droplet size based on surface oil slick thickness
-			double droplet = 0.613 * thickness;
-            droplet_avg_size[i] = droplet;
-
-			// droplet average rise velocity
-			double speed = (droplet * droplet * g *
-			                (1.0 - rho / rho_w) /
-			                (18.0 * visc_w));
-
-			// vol of refloat oil/wave p
-			double V_refloat = 0.588 * (pow(thickness, 1.7) - 5.0e-8);
-			if (V_refloat < 0.0)
-				V_refloat = 0.0;
-
-			// (kg/m2-sec) mass rate of emulsion
-			double q_refloat = C_Roy * C_disp * V_refloat * A;
-
-			double C_oil = (q_refloat * step_len /
-			                (speed * step_len + 1.5 * Hrms));
-
-			//vol rate
-			Q_sed = (1.6 * ka *
-			         sqrt(Hrms * De * fbw / (rho_w * visc_w)) *
-			         C_oil * C_sed / rho);
-		}
-
-		//total vol oil loss due to dispersion
-		d_disp_out = Q_disp * step_len;
-
-		//total vol oil loss due to sedimentation
-		d_sed_out = (1.0 - Y) * Q_sed * step_len;
-
-		d_disp_out *= rho;
-		d_sed_out *= rho;
-
-		if (d_disp_out + d_sed_out > mass) {
-			double ratio = d_disp_out / (d_disp_out + d_sed_out);
+		disperse_element(step_len,
+		                 frac_water[i], le_mass[i], le_viscosity[i],
+		                 le_density[i], fay_area[i],
+		                 &d_disp[i], &d_sed[i], &droplet_avg_size[i],
+		                 frac_breaking_waves, disp_wave_energy, wave_height,
+		                 visc_w, rho_w, C_sed, V_entrain, ka);
+	}
 
-			d_disp_out = ratio * mass;
-			d_sed_out = mass - d_disp_out;
-		}
+	return 0;
+}
 
-        // assign our final values to our output arrays
-		d_disp[i] = d_disp_out;
-        d_sed[i] = d_sed_out;
 
+// same as adios2_disperse() but with the wave parameters given per element
+OSErr adios2_disperse_le(int n, unsigned long step_len,
+                         double *frac_water,
+                         double *le_mass,
+                         double *le_viscosity,
+                         double *le_density,
+                         double *fay_area,
+                         double *d_disp,  // output
+                         double *d_sed,  // output
+                         double *droplet_avg_size,  // output
+                         double *frac_breaking_waves,
+                         double *disp_wave_energy,
+                         double *wave_height,
+                         double visc_w,
+                         double rho_w,
+                         double C_sed,
+                         double V_entrain,
+                         double ka)
+{
+	for (int i=0; i < n; i++)
+	{
+		disperse_element(step_len,
+		                 frac_water[i], le_mass[i], le_viscosity[i],
+		                 le_density[i], fay_area[i],
+		                 &d_disp[i], &d_sed[i], &droplet_avg_size[i],
+		                 frac_breaking_waves[i], disp_wave_energy[i],
+		                 wave_height[i],
+		                 visc_w, rho_w, C_sed, V_entrain, ka);
 	}
 
-	return err;
+	return 0;
 }
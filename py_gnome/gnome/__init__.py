@@ -81,6 +81,7 @@ from . import (map,
                environment,
                model,
                multi_model_broadcast,
+               multi_model_scheduler,
                spill_container,
                spill,
                movers,
@@ -250,6 +250,9 @@ _default_values = {'positions': ((3,), world_point_type, 'positions',
                    # It is evenly divided to number of LEs
                    'bulk_init_volume': ((), np.float64, 'bulk_init_volume', 0,
                                         ArrayTypeDivideOnSplit),
+                   # index of the blob the LE was released with - used by
+                   # FayGravityViscous to look up the blob's area
+                   'blob_id': ((), np.int64, 'blob_id', 0),
                    'density': ((), np.float64, 'density', 0),
                    'oil_density': ((), np.float64, 'oil_density', 0),
                    'evap_decay_constant': (None, np.float64,
@@ -295,6 +298,12 @@ _default_values = {'positions': ((3,), world_point_type, 'positions',
                                  ArrayTypeDivideOnSplit),
                    'partition_coeff': ((), np.float64, 'partition_coeff', 0),
                    'droplet_avg_size': ((), np.float64, 'droplet_avg_size', 0),
+
+                   # environment at each element sampled once per time step
+                   # by the EnvironmentSampler - see Model(sample_environment)
+                   'wind_speed': ((), np.float64, 'wind_speed', 0),
+                   'water_temp': ((), np.float64, 'water_temp', 0),
+                   'wave_height': ((), np.float64, 'wave_height', 0),
                    }
 
 
@@ -11,6 +11,7 @@ drop_max = 1.0e-5
 volume_entrained = 3.9e-8
 ka = 1.0e-4
 gravity = 9.80665
+earth_radius = 6366706.989  # same value as FlatEarthProjection
 
 
 units = {'gas_constant': 'J/(K mol)',
@@ -19,4 +20,5 @@ units = {'gas_constant': 'J/(K mol)',
          'max emul drop diameter': 'm',
          'volume of oil entrained': 'm^3',
          'oil sticking term': 'm^3/kg',
-         'acceleration': 'm/s^2'}
+         'acceleration': 'm/s^2',
+         'earth radius': 'm'}
@@ -4,4 +4,5 @@ Functions with implementation given in cy_helpers.pyx
 These can be cimported in other cython modules
 """
 
-cdef bytes to_bytes(unicode ucode)
\ No newline at end of file
+cdef bytes to_bytes(unicode ucode)
+cdef int c_num_threads() nogil
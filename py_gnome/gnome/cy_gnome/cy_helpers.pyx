@@ -51,6 +51,34 @@ def rand():
     return stdlib.rand()
 
 
+# number of threads used by the prange (OpenMP) loops in the cython kernels.
+# Set by the Model; if extensions are built without OpenMP, loops are serial.
+cdef int _num_threads = 1
+
+
+def set_num_threads(int num_threads):
+    """
+    Set the number of threads used by the parallel element loops in the
+    cython movers and land check
+    """
+    global _num_threads
+    if num_threads < 1:
+        raise ValueError('num_threads must be at least 1')
+
+    _num_threads = num_threads
+
+
+def get_num_threads():
+    """
+    Number of threads used by the parallel element loops
+    """
+    return _num_threads
+
+
+cdef int c_num_threads() nogil:
+    return _num_threads
+
+
 cdef bytes to_bytes(unicode ucode):
     """
     Encode a string to its unicode type to default file system encoding for
@@ -6,6 +6,7 @@ have crossed land on the raster map
 """
 
 import cython
+from cython.parallel cimport prange
 
 import numpy as np
 from gnome.utilities.geometry.cy_point_in_polygon import points_in_poly
@@ -16,6 +17,7 @@ from libc.stdlib cimport abs, div, div_t
 from libcpp cimport bool
 
 cimport type_defs
+from cy_helpers cimport c_num_threads
 
 def overlap_grid(int32_t m, int32_t n, pt1, pt2):
     """
@@ -41,7 +43,7 @@ cdef int32_t c_overlap_grid(int32_t m,
                             int32_t y1,
                             int32_t x2,
                             int32_t y2,
-                            ):
+                            ) nogil:
     """
     check if the line segment from pt1 to pt could overlap the grid of
     size (m,n).
@@ -74,7 +76,7 @@ cdef bool c_find_first_pixel( uint8_t* grid,
                              int32_t *prev_y,
                              int32_t *hit_x,
                              int32_t *hit_y,
-                             ):
+                             ) nogil:
     """
     Marches along the grid to see if the LE movement crosses land
     
@@ -157,7 +159,9 @@ cdef bool c_find_first_pixel( uint8_t* grid,
                     pt1_y = y0-sy
                     pt2_x = x0-sx
                     pt2_y = y0
-                    try: # replace with real check???
+                    # adjacent points off the grid are not land
+                    if (pt1_y >= 0 and pt1_y < n and
+                        pt2_x >= 0 and pt2_x < m):
                         if ( (grid[pt1_x * n + pt1_y] == 1) and #is the y-adjacent point on land?
                              (grid[pt2_x * n + pt2_y] == 1)     #is the x-adjacent point on land?
                             ):
@@ -165,8 +169,6 @@ cdef bool c_find_first_pixel( uint8_t* grid,
                             hit_y[0] = pt1_y # we have to pick one -- this is arbitrary
                             #return (*prev_x, *prev_y), (*hit_x, *hit_y)
                             return True
-                    except IndexError:
-                        pass
 
     # if we get here, no hit
     return False
@@ -304,15 +306,21 @@ def check_land_layers(grid_layers,
         
         This version will look through multiple layers of raster map
 
+        The GIL is released while walking the LEs so the forecast and
+        uncertain spill containers can be land checked concurrently. LEs are
+        independent so the walk is split across cy_helpers.get_num_threads()
+        threads; results do not depend on the number of threads.
         """
-        cdef int32_t  prev_x, prev_y, hit_x, hit_y, cur_ratio, layer, coarse_pos_x, num_ratios
         cdef uint32_t i, num_le
-        cdef int32_t m, n
-        cdef bool did_hit
-        cdef int32_t* coarse_pos = <int32_t*> PyMem_Malloc (2*sizeof(int32_t))
-        cdef int32_t* coarse_end = <int32_t*> PyMem_Malloc (2*sizeof(int32_t))
+        cdef int32_t num_ratios
+        cdef Py_ssize_t le
+        cdef int num_threads = c_num_threads()
 
+        num_le = positions.shape[0]
         num_ratios = grid_ratios.shape[0]
+        if num_le == 0:
+            return
+
         cdef uint8_t** dataptrs = <uint8_t**> PyMem_Malloc(num_ratios*sizeof(uint8_t *))
         cdef int32_t* widths = <int32_t*> PyMem_Malloc(num_ratios*sizeof(int32_t))
         cdef int32_t* heights = <int32_t*> PyMem_Malloc(num_ratios*sizeof(int32_t))
@@ -324,63 +332,87 @@ def check_land_layers(grid_layers,
             heights[i] = grid_layers[i].shape[1]
             dataptrs[i] = &grid_arr[0,0]
 
-        num_le = positions.shape[0]
+        # raw pointers and row strides so the loop does not need the GIL
+        cdef int32_t* ratios_ptr = &grid_ratios[0]
+        cdef int32_t* pos_ptr = &positions[0, 0]
+        cdef int32_t* end_ptr = &end_positions[0, 0]
+        cdef int16_t* status_ptr = &status_codes[0]
+        cdef int32_t* lwp_ptr = &last_water_positions[0, 0]
+        cdef uint32_t pos_stride = positions.shape[1]
+        cdef uint32_t end_stride = end_positions.shape[1]
+        cdef uint32_t lwp_stride = last_water_positions.shape[1]
+
+        for le in prange(<Py_ssize_t>num_le, nogil=True, schedule='static',
+                         num_threads=num_threads):
+            c_check_land_layer_le(dataptrs, widths, heights,
+                                  ratios_ptr, num_ratios,
+                                  pos_ptr + le * pos_stride,
+                                  end_ptr + le * end_stride,
+                                  status_ptr + le,
+                                  lwp_ptr + le * lwp_stride)
+
+        PyMem_Free(dataptrs)
+        PyMem_Free(widths)
+        PyMem_Free(heights)
 
-        for i in range(num_le):
-            #if the LE is on land, or if it starts and ends in the same water-only square on the coarsest grid, skip this LE
-            if status_codes[i] == type_defs.OILSTAT_ONLAND:
-                continue
 
-            layer = 0
-            #begin the walk. If a hit is registered on the current grid, drop down one level and continue the walk.
-            #If a hit is registered on the lowest level, then LE has landed.
-            while True:
-                coarse_pos[0] = div(positions[i,0], grid_ratios[layer]).quot
-                coarse_pos[1] = div(positions[i,1], grid_ratios[layer]).quot
-                coarse_end[0] = div(end_positions[i,0], grid_ratios[layer]).quot
-                coarse_end[1] = div(end_positions[i,1], grid_ratios[layer]).quot
-                cur_ratio = grid_ratios[layer]
-                did_hit = c_find_first_pixel(dataptrs[layer],
+cdef void c_check_land_layer_le(uint8_t** dataptrs,
+                                int32_t* widths,
+                                int32_t* heights,
+                                int32_t* grid_ratios,
+                                int32_t num_ratios,
+                                int32_t* position,
+                                int32_t* end_position,
+                                int16_t* status_code,
+                                int32_t* last_water_position) nogil:
+        """
+        land check a single LE through the layers of the raster map.
+        The arguments for the LE point to its row in the positions,
+        end_positions, status_codes and last_water_positions arrays, which
+        are altered in place.
+        """
+        cdef int32_t prev_x, prev_y, hit_x, hit_y, layer
+        cdef bool did_hit
+
+        #if the LE is on land, skip this LE
+        if status_code[0] == type_defs.OILSTAT_ONLAND:
+            return
+
+        layer = 0
+        #begin the walk. If a hit is registered on the current grid, drop down one level and continue the walk.
+        #If a hit is registered on the lowest level, then LE has landed.
+        while True:
+            did_hit = c_find_first_pixel(dataptrs[layer],
                                          widths[layer],
                                          heights[layer],
-                                         coarse_pos[0],
-                                         coarse_pos[1],
-                                         coarse_end[0],
-                                         coarse_end[1],
+                                         div(position[0], grid_ratios[layer]).quot,
+                                         div(position[1], grid_ratios[layer]).quot,
+                                         div(end_position[0], grid_ratios[layer]).quot,
+                                         div(end_position[1], grid_ratios[layer]).quot,
                                          &prev_x,
                                          &prev_y,
                                          &hit_x,
                                          &hit_y,
                                          )
-                if did_hit:
-                    if layer == num_ratios - 1:
-                        # hit on the lowest layer (confirmed land hit)
-                        last_water_positions[i, 0] = prev_x
-                        last_water_positions[i, 1] = prev_y
-                        end_positions[i,0] = hit_x
-                        end_positions[i,1] = hit_y
-                        status_codes[i] = type_defs.OILSTAT_ONLAND
-                        break
-                    else:
-                        # possible hit, go down a layer and try again
-                        layer += 1
-                        coarse_pos[0] = div(positions[i,0], grid_ratios[layer]).quot
-                        coarse_pos[1] = div(positions[i,1], grid_ratios[layer]).quot
-                        coarse_end[0] = div(end_positions[i,0], grid_ratios[layer]).quot
-                        coarse_end[1] = div(end_positions[i,1], grid_ratios[layer]).quot
+            if did_hit:
+                if layer == num_ratios - 1:
+                    # hit on the lowest layer (confirmed land hit)
+                    last_water_position[0] = prev_x
+                    last_water_position[1] = prev_y
+                    end_position[0] = hit_x
+                    end_position[1] = hit_y
+                    status_code[0] = type_defs.OILSTAT_ONLAND
+                    return
                 else:
-                    # didn't hit land -- can move the LE
-                    positions[i, 0] = end_positions[i, 0]
-                    positions[i, 1] = end_positions[i, 1]
-                    break
+                    # possible hit, go down a layer and try again
+                    layer += 1
+            else:
+                # didn't hit land -- can move the LE
+                position[0] = end_position[0]
+                position[1] = end_position[1]
+                return
+
 
-        PyMem_Free(coarse_pos)
-        PyMem_Free(coarse_end)
-        PyMem_Free(dataptrs)
-        PyMem_Free(widths)
-        PyMem_Free(heights)
-        
-        
 def move_particles(cnp.ndarray[cnp.float64_t, ndim=2, mode='c'] positions not None,
                  cnp.ndarray[cnp.float64_t, ndim=2, mode='c'] end_positions not None,
                  cnp.ndarray[int16_t, ndim=1, mode='c'] status_codes not None,
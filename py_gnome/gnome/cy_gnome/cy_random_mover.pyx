@@ -99,9 +99,21 @@ cdef class CyRandomMover(cy_mover.CyMover):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        err = self.rand.get_move(N, model_time, step_len, &ref_points[0], &delta[0], &LE_status[0], spill_type, 0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D* c_ref_points = &ref_points[0]
+        cdef WorldPoint3D* c_delta = &delta[0]
+        cdef short* c_LE_status = <short *>&LE_status[0]
+
+        # modifies delta in place - C++ code does not need the GIL.
+        # Not split across threads like CyWindMover: Random_c draws from the
+        # global C rand() stream, so a parallel loop would not be
+        # deterministic.
+        with nogil:
+            err = self.rand.get_move(N, c_model_time, c_step_len,
+                                     c_ref_points, c_delta,
+                                     c_LE_status, spill_type, 0)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points and delta '
                              'are defined')
@@ -3,8 +3,8 @@ import numpy as np
 
 # following exist in gnome.cy_gnome
 from type_defs cimport *
-from utils cimport emulsify
-from utils cimport adios2_disperse
+from utils cimport emulsify, emulsify_le
+from utils cimport adios2_disperse, adios2_disperse_le
 from libc.stdint cimport *
 
 
@@ -13,31 +13,53 @@ def emulsify_oil(step_len, cnp.ndarray[cnp.npy_double] frac_water,
                  cnp.ndarray[cnp.npy_double] le_frac_evap,
                  cnp.ndarray[int32_t] le_age,
                  cnp.ndarray[cnp.npy_double] le_bulltime,
-                 double k_emul,
+                 k_emul,
                  double emul_time,
                  double emul_C,
                  double S_max,
                  double Y_max,
                  double drop_max):
     """
+    k_emul is either a scalar or an array with a value for each element
     """
     cdef OSErr emul_err
+    cdef cnp.ndarray[cnp.npy_double] k_emul_le
     # N = len(frac_water)
     N = len(le_age)
 
-    emul_err = emulsify(N,
-                        step_len,
-                        & frac_water[0],
-                        & le_interfacial_area[0],
-                        & le_frac_evap[0],
-                        & le_age[0],
-                        & le_bulltime[0],
-                        k_emul,
-                        emul_time,
-                        emul_C,
-                        S_max,
-                        Y_max,
-                        drop_max)
+    if np.ndim(k_emul) == 0:
+        emul_err = emulsify(N,
+                            step_len,
+                            & frac_water[0],
+                            & le_interfacial_area[0],
+                            & le_frac_evap[0],
+                            & le_age[0],
+                            & le_bulltime[0],
+                            k_emul,
+                            emul_time,
+                            emul_C,
+                            S_max,
+                            Y_max,
+                            drop_max)
+    else:
+        k_emul_le = np.ascontiguousarray(k_emul, dtype=np.float64)
+        if len(k_emul_le) != N:
+            raise ValueError("k_emul must be a scalar or have a value "
+                             "for each element")
+
+        emul_err = emulsify_le(N,
+                               step_len,
+                               & frac_water[0],
+                               & le_interfacial_area[0],
+                               & le_frac_evap[0],
+                               & le_age[0],
+                               & le_bulltime[0],
+                               & k_emul_le[0],
+                               emul_time,
+                               emul_C,
+                               S_max,
+                               Y_max,
+                               drop_max)
 
     if emul_err != 0:
         raise ValueError("C++ call to emulsify returned error code: "
@@ -52,38 +74,69 @@ def disperse_oil(step_len, cnp.ndarray[cnp.npy_double] frac_water,
                  cnp.ndarray[cnp.npy_double] d_disp,
                  cnp.ndarray[cnp.npy_double] d_sed,
                  cnp.ndarray[cnp.npy_double] droplet_avg_size,
-                 double frac_breaking_waves,
-                 double disp_wave_energy,
-                 double wave_height,
+                 frac_breaking_waves,
+                 disp_wave_energy,
+                 wave_height,
                  double visc_w,
                  double rho_w,
                  double C_sed,
                  double V_entrain,
                  double ka):
     """
+    frac_breaking_waves, disp_wave_energy and wave_height are either all
+    scalars or all arrays with a value for each element
     """
     cdef OSErr disp_err
+    cdef cnp.ndarray[cnp.npy_double] fbw_le, de_le, hrms_le
     # N = len(frac_water)
     N = len(le_mass)
 
-    disp_err = adios2_disperse(N,
-                               step_len,
-                               & frac_water[0],
-                               & le_mass[0],
-                               & le_viscosity[0],
-                               & le_density[0],
-                               & fay_area[0],
-                               & d_disp[0],
-                               & d_sed[0],
-                               & droplet_avg_size[0],
-                               frac_breaking_waves,
-                               disp_wave_energy,
-                               wave_height,
-                               visc_w,
-                               rho_w,
-                               C_sed,
-                               V_entrain,
-                               ka)
+    if np.ndim(wave_height) == 0:
+        disp_err = adios2_disperse(N,
+                                   step_len,
+                                   & frac_water[0],
+                                   & le_mass[0],
+                                   & le_viscosity[0],
+                                   & le_density[0],
+                                   & fay_area[0],
+                                   & d_disp[0],
+                                   & d_sed[0],
+                                   & droplet_avg_size[0],
+                                   frac_breaking_waves,
+                                   disp_wave_energy,
+                                   wave_height,
+                                   visc_w,
+                                   rho_w,
+                                   C_sed,
+                                   V_entrain,
+                                   ka)
+    else:
+        fbw_le = np.ascontiguousarray(np.broadcast_to(frac_breaking_waves,
+                                                      (N,)),
+                                      dtype=np.float64)
+        de_le = np.ascontiguousarray(np.broadcast_to(disp_wave_energy, (N,)),
+                                     dtype=np.float64)
+        hrms_le = np.ascontiguousarray(np.broadcast_to(wave_height, (N,)),
+                                       dtype=np.float64)
+
+        disp_err = adios2_disperse_le(N,
+                                      step_len,
+                                      & frac_water[0],
+                                      & le_mass[0],
+                                      & le_viscosity[0],
+                                      & le_density[0],
+                                      & fay_area[0],
+                                      & d_disp[0],
+                                      & d_sed[0],
+                                      & droplet_avg_size[0],
+                                      & fbw_le[0],
+                                      & de_le[0],
+                                      & hrms_le[0],
+                                      visc_w,
+                                      rho_w,
+                                      C_sed,
+                                      V_entrain,
+                                      ka)
 
     if disp_err != 0:
         raise ValueError("C++ call to disperse returned error code: "
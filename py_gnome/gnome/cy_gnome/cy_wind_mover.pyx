@@ -1,12 +1,15 @@
+cimport cython
 cimport numpy as cnp
 import numpy as np
+from cython.parallel cimport prange
 
 from gnome import basic_types
 
 # following exist in gnome.cy_gnome
 from movers cimport WindMover_c, Mover_c
 from type_defs cimport WorldPoint3D, LEWindUncertainRec, LEStatus, LEType, \
-                       OSErr, Seconds, VelocityRec
+                       OSErr, Seconds, VelocityRec, FORECAST_LE
+from cy_helpers cimport c_num_threads
 cimport cy_mover, cy_ossm_time
 from cy_mover cimport CyWindMoverBase
 
@@ -152,16 +155,29 @@ cdef class CyWindMover(CyWindMoverBase):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        # modifies delta in place
-        err = self.wind.get_move(N, model_time, step_len,
-                                  &ref_points[0],
-                                  &delta[0],
-                                  &windages[0],
-                                  &LE_status[0],
-                                  spill_type,
-                                  0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D* c_ref_points = &ref_points[0]
+        cdef WorldPoint3D* c_delta = &delta[0]
+        cdef double* c_windages = &windages[0]
+        cdef short* c_LE_status = <short *>&LE_status[0]
+        cdef int num_threads = c_num_threads()
+
+        # modifies delta in place - C++ code does not need the GIL
+        if num_threads > 1 and spill_type == FORECAST_LE:
+            # forecast LEs are independent and the wind value for the step
+            # is fixed in prepare_for_model_step, so chunks of LEs can be
+            # moved in parallel. Uncertain LEs index per-LE uncertainty
+            # arrays by their position in the call so they stay serial.
+            err = self._get_move_chunked(N, c_model_time, c_step_len,
+                                         c_ref_points, c_delta, c_windages,
+                                         c_LE_status, num_threads)
+        else:
+            with nogil:
+                err = self.wind.get_move(N, c_model_time, c_step_len,
+                                         c_ref_points, c_delta, c_windages,
+                                         c_LE_status, spill_type, 0)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'and windages are defined')
@@ -175,6 +191,36 @@ cdef class CyWindMover(CyWindMoverBase):
                              "or 'uncertainty' - you've chosen: "
                              "{0}".format(spill_type))
 
+    @cython.cdivision(True)
+    cdef OSErr _get_move_chunked(self, int N,
+                                 unsigned long model_time,
+                                 unsigned long step_len,
+                                 WorldPoint3D* ref_points,
+                                 WorldPoint3D* delta,
+                                 double* windages,
+                                 short* LE_status,
+                                 int num_threads):
+        """
+        split forecast LEs into one contiguous chunk per thread and call
+        WindMover_c.get_move on each chunk with the GIL released
+        """
+        cdef WindMover_c* wind = self.wind
+        cdef int chunk = (N + num_threads - 1) / num_threads
+        cdef int c, start, count
+        cdef int err = 0
+
+        for c in prange(num_threads, nogil=True, schedule='static',
+                        num_threads=num_threads):
+            start = c * chunk
+            count = min(chunk, N - start)
+            if count > 0:
+                err |= wind.get_move(count, model_time, step_len,
+                                     ref_points + start, delta + start,
+                                     windages + start, LE_status + start,
+                                     FORECAST_LE, 0)
+
+        return <OSErr>err
+
     def set_constant_wind(self, windU, windV):
         """
         Constant wind can be set using set_ossm as well; though this is
@@ -118,3 +118,34 @@ cdef extern from "Weatherers_c.h":
                           double C_sed,
                           double V_entrain,
                           double ka)
+
+    OSErr emulsify_le(int n, unsigned long step_len,
+                      double *frac_water,
+                      double *interfacial_area,
+                      double *frac_evap,
+                      int32_t *age,
+                      double *bulltime,
+                      double *k_emul,
+                      double emul_time,
+                      double emul_C,
+                      double S_max,
+                      double Y_max,
+                      double drop_max)
+
+    OSErr adios2_disperse_le(int n, unsigned long step_len,
+                             double *frac_water,
+                             double *le_mass,
+                             double *le_viscosity,
+                             double *le_density,
+                             double *fay_area,
+                             double *d_disp,
+                             double *d_sed,
+                             double *droplet_avg_size,
+                             double *frac_breaking_waves,
+                             double *disp_wave_energy,
+                             double *wave_height,
+                             double visc_w,
+                             double rho_w,
+                             double C_sed,
+                             double V_entrain,
+                             double ka)
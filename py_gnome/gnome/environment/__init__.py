@@ -20,6 +20,7 @@ from tide import Tide, TideSchema
 from wind import Wind, WindSchema, constant_wind, wind_from_values
 from running_average import RunningAverage, RunningAverageSchema
 from grid import Grid, GridSchema, PyGrid, PyGrid_S, PyGrid_U
+from sampler import EnvironmentSampler
 # from gnome.environment.environment_objects import IceAwareCurrentSchema
 
 
@@ -53,5 +54,6 @@ __all__ = [Environment,
            IceAwareWind,
            TemperatureTS,
            env_from_netCDF,
-           ice_env_from_netCDF
+           ice_env_from_netCDF,
+           EnvironmentSampler
            ]
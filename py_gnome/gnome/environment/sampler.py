@@ -0,0 +1,207 @@
+'''
+Per element sampling of the environment.
+
+Weatherers normally use one wind speed and one water temperature for all
+elements at a given time. If Model(sample_environment=True), the model
+samples the wind, water temperature and waves at the position of each
+element in the water once per time step, before weathering, and stores the
+results in the SpillContainer arrays:
+
+    'wind_speed': m/s
+    'water_temp': K
+    'wave_height': m (RMS height)
+
+Evaporation, NaturalDispersion and Emulsification use these arrays in place
+of the value at model_time if they exist - see Weatherer._env_array_types.
+
+The wind, water and waves are the ones the weatherers reference - see
+EnvironmentSampler.from_weatherers(). With a gridded wind (GridWind) or a
+gridded water temperature (GridTemperature), elements see the local value.
+Otherwise the single point value is used for all elements, which gives the
+same result as not sampling.
+'''
+import numpy as np
+
+import unit_conversion as uc
+
+from gnome import AddLogger
+from gnome.basic_types import oil_status
+
+from .property import EnvProp, VectorProp
+from .environment_objects import GridTemperature, TemperatureTS
+
+
+class EnvironmentSampler(AddLogger):
+    '''
+    Samples the environment at the elements' positions and stores it in the
+    SpillContainer's data arrays
+    '''
+    def __init__(self, wind=None, water=None, waves=None, temperature=None):
+        '''
+        All arguments are optional. An array is only filled if there is an
+        object to sample it from.
+
+        :param wind=None: Wind object or a wind property with an
+            at(points, time) method like GridWind
+        :param water=None: Water object. Used for the water temperature if
+            temperature is None
+        :param waves=None: Waves object used to compute the wave height from
+            the sampled wind speed
+        :param temperature=None: water temperature property with an
+            at(points, time) method like GridTemperature
+        '''
+        self.wind = wind
+        self.water = water
+        self.waves = waves
+        self.temperature = temperature
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(wind={0.wind!r}, '
+                'water={0.water!r}, '
+                'waves={0.waves!r}, '
+                'temperature={0.temperature!r})'.format(self))
+
+    @classmethod
+    def from_environment(cls, environment):
+        '''
+        create a sampler from the objects in the model's environment
+        collection. Uses the same 'wind', 'water' and 'waves' objects that
+        the model attaches to weatherers by default.
+        '''
+        kwargs = {}
+        for obj in environment:
+            # _ref_as can be a list, like IceAwareWind's
+            ref_as = getattr(obj, '_ref_as', None) or []
+            if isinstance(ref_as, basestring):
+                ref_as = [ref_as]
+
+            for name in ('wind', 'water', 'waves'):
+                if name in ref_as and name not in kwargs:
+                    kwargs[name] = obj
+
+            if (isinstance(obj, (GridTemperature, TemperatureTS)) and
+                    'temperature' not in kwargs):
+                kwargs['temperature'] = obj
+
+        return cls(**kwargs)
+
+    @classmethod
+    def from_weatherers(cls, weatherers, environment):
+        '''
+        create a sampler for the 'wind', 'water' and 'waves' objects used by
+        the weatherers that use the sampled arrays (see
+        Weatherer._env_array_types). The wind and water of their waves
+        count too since the wave height is computed from the sampled wind
+        speed. Objects no weatherer references are found in the environment
+        collection like from_environment() does.
+
+        :raises ValueError: if the weatherers reference different wind,
+            water or waves objects - there is only one array of each
+        '''
+        refs = {'wind': [], 'water': [], 'waves': []}
+        for w in weatherers:
+            if not w.on or not w._env_array_types:
+                continue
+
+            objs = [(name, getattr(w, name, None)) for name in refs]
+
+            waves = getattr(w, 'waves', None)
+            if waves is not None:
+                objs.append(('wind', getattr(waves, 'wind', None)))
+                objs.append(('water', getattr(waves, 'water', None)))
+
+            for name, obj in objs:
+                if (obj is not None and
+                        not any(obj is other for other in refs[name])):
+                    refs[name].append(obj)
+
+        sampler = cls.from_environment(environment)
+        for name, objs in refs.iteritems():
+            if len(objs) > 1:
+                msg = ("sample_environment: weatherers use different {0} "
+                       "objects: {1}"
+                       .format(name, ', '.join(o.name for o in objs)))
+                raise ValueError(msg)
+
+            if len(objs) == 1:
+                setattr(sampler, name, objs[0])
+
+        return sampler
+
+    @property
+    def array_types(self):
+        '''
+        names of the arrays this sampler fills - add these to the
+        SpillContainer's array_types
+        '''
+        array_types = set()
+        if self.wind is not None:
+            array_types.add('wind_speed')
+
+            if self.waves is not None:
+                array_types.add('wave_height')
+
+        if self.temperature is not None or self.water is not None:
+            array_types.add('water_temp')
+
+        return array_types
+
+    def sample(self, sc, model_time):
+        '''
+        sample the environment at model_time for the elements in the water
+        and set the 'wind_speed', 'water_temp' and 'wave_height' arrays that
+        are defined in sc. Other elements keep their previous values.
+        '''
+        if sc.num_released == 0:
+            return
+
+        in_water = sc['status_codes'] == oil_status.in_water
+        if not np.any(in_water):
+            return
+
+        points = sc['positions'][in_water]
+
+        if 'wind_speed' in sc and self.wind is not None:
+            wind_speed = self.wind_speed(points, model_time)
+            sc['wind_speed'][in_water] = wind_speed
+
+            if 'wave_height' in sc and self.waves is not None:
+                sc['wave_height'][in_water] = \
+                    self.waves.get_values(wind_speed)[0]
+
+        if 'water_temp' in sc:
+            sc['water_temp'][in_water] = self.water_temp(points, model_time)
+
+    def wind_speed(self, points, model_time):
+        '''
+        :returns: wind speed in m/s at each point
+        '''
+        if isinstance(self.wind, (EnvProp, VectorProp)):
+            vel = self.wind.at(points, model_time)
+            speed = np.hypot(vel[:, 0], vel[:, 1])
+
+            return self._convert('Velocity', self.wind.units, 'm/s', speed)
+
+        speed = self.wind.get_value(model_time)[0]
+        return np.full((len(points),), speed, dtype=np.float64)
+
+    def water_temp(self, points, model_time):
+        '''
+        :returns: water temperature in K at each point
+        '''
+        if self.temperature is not None:
+            temp = np.asarray(self.temperature.at(points, model_time),
+                              dtype=np.float64).reshape(-1)
+
+            return self._convert('Temperature', self.temperature.units, 'K',
+                                 temp)
+
+        temp = self.water.get('temperature', 'K')
+        return np.full((len(points),), temp, dtype=np.float64)
+
+    def _convert(self, unit_type, from_unit, to_unit, values):
+        'convert values if from_unit is given and differs from to_unit'
+        if from_unit is None or from_unit == to_unit:
+            return values
+
+        return uc.convert(unit_type, from_unit, to_unit, values)
@@ -14,6 +14,8 @@ from __future__ import division
 
 import copy
 
+import numpy as np
+
 from gnome import constants
 from gnome.utilities import serializable
 from gnome.utilities.serializable import Field
@@ -125,6 +127,40 @@ class Waves(Environment, serializable.Serializable):
 
         return H, T, Wf, De
 
+    def get_values(self, wind_speed, wave_height=None):
+        """
+        Vectorized version of get_value() for per-element wind speeds, as
+        sampled by the EnvironmentSampler and stored in the 'wind_speed'
+        array of the SpillContainer.
+
+        :param wind_speed: wind speed at each element in m/s
+        :type wind_speed: numpy array
+
+        :param wave_height=None: wave height at each element if it was
+            already computed from wind_speed, as in the 'wave_height' array
+
+        :returns: wave_height, peak_period, whitecap_fraction,
+                  dissipation_energy as numpy arrays the same shape as
+                  wind_speed. Units are the same as get_value()
+        """
+        U = np.asarray(wind_speed, dtype=np.float64)
+
+        if self.water.wave_height is None:
+            if wave_height is None:
+                H = self.compute_H(U)
+            else:
+                H = wave_height
+        else:  # user specified a wave height
+            H = np.full_like(U, self.water.wave_height)
+            U = np.full_like(U, self.pseudo_wind(self.water.wave_height))
+
+        Wf = self.whitecap_fraction(U)
+        T = np.broadcast_to(self.mean_wave_period(U), U.shape)
+
+        De = self.dissipative_wave_energy(H)
+
+        return H, T, Wf, De
+
     def get_emulsification_wind(self, time):
         """
         Return the right wind for the wave climate
@@ -149,6 +185,20 @@ class Waves(Environment, serializable.Serializable):
         else:  # user specified a wave height
             return max(U, self.pseudo_wind(wave_height))
 
+    def get_emulsification_winds(self, wind_speed):
+        """
+        Vectorized version of get_emulsification_wind() for per-element
+        wind speeds
+
+        :param wind_speed: wind speed at each element in m/s
+        :type wind_speed: numpy array
+        """
+        wave_height = self.water.wave_height
+        if wave_height is None:
+            return wind_speed
+        else:  # user specified a wave height
+            return np.maximum(wind_speed, self.pseudo_wind(wave_height))
+
     def compute_H(self, U):
         return Adios2.wave_height(U, self.water.fetch)
 
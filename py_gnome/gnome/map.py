@@ -95,6 +95,10 @@ class GnomeMap(Serializable):
 
     refloat_halflife = None  # note -- no land, so never used
 
+    # refloat_elements() draws from numpy's random generator - see
+    # Process.draws_random
+    draws_random = True
+
     def __init__(self, map_bounds=None, spillable_area=None, land_polys=None,
                  name=None):
         """
@@ -321,6 +325,25 @@ class GnomeMap(Serializable):
         """
         pass
 
+    def _update_mass_balance(self, sc, status_before):
+        """
+        Update 'beached' and 'off_maps' in sc.mass_balance after
+        beach_elements(). Only the elements whose status changed are added
+        to the SpillContainer's mass_ledger.
+
+        :param status_before: copy of 'status_codes' before beaching
+        """
+        changed = np.flatnonzero(sc['status_codes'] != status_before)
+
+        ledger = sc.mass_ledger
+        if len(changed) > 0:
+            fate_status = ledger.state(sc, changed)[0]
+            ledger.update(sc, changed, (fate_status, status_before[changed]))
+
+        sc.mass_balance['beached'] = ledger.beached
+        sc.mass_balance['off_maps'] = ledger.off_maps
+        ledger.check(sc)
+
     def resurface_airborne_elements(self, spill_container):
         """
         Takes any elements that are left above the water surface (z < 0.0)
@@ -550,6 +573,8 @@ class ParamMap(GnomeMap):
         This map class does not use a raster map for collision detection. Since
         the land is so simple the collisions are detected via intersection.
         """
+        status_before = sc['status_codes'].copy()
+
         self.resurface_airborne_elements(sc)
         self._set_off_map_status(sc)
 
@@ -568,10 +593,7 @@ class ParamMap(GnomeMap):
         # todo: need a prepare_for_model_run() so map adds these keys to
         #     mass_balance as opposed to SpillContainer
         # update 'off_maps'/'beached' in mass_balance
-        sc.mass_balance['beached'] = \
-            sc['mass'][sc['status_codes'] == oil_status.on_land].sum()
-        sc.mass_balance['off_maps'] += \
-            sc['mass'][sc['status_codes'] == oil_status.off_maps].sum()
+        self._update_mass_balance(sc, status_before)
 
     def refloat_elements(self, spill_container, time_step):
         """
@@ -606,10 +628,15 @@ class ParamMap(GnomeMap):
         if r_idx.size > 0:
             # check is not required, but why do this operation if no particles
             # need to be refloated
+            ledger = spill_container.mass_ledger
+            before = ledger.state(spill_container, r_idx)
+
             spill_container['positions'][r_idx] = \
                 spill_container['last_water_positions'][r_idx]
             spill_container['status_codes'][r_idx] = oil_status.in_water
 
+            ledger.update(spill_container, r_idx, before)
+
     def update_from_dict(self, data):
         if ('center' in data.keys() or
                 'distance' in data.keys() or
@@ -882,6 +909,8 @@ class RasterMap(GnomeMap):
             It must have the following data arrays:
             ('prev_position', 'positions', 'last_water_pt', 'status_code')
         """
+        status_before = sc['status_codes'].copy()
+
         self.resurface_airborne_elements(sc)
 
         # pull the data from the sc
@@ -920,10 +949,7 @@ class RasterMap(GnomeMap):
         # todo: need a prepare_for_model_run() so map adds these keys to
         #     mass_balance as opposed to SpillContainer
         # update 'off_maps'/'beached' in mass_balance
-        sc.mass_balance['beached'] = \
-            sc['mass'][sc['status_codes'] == oil_status.on_land].sum()
-        sc.mass_balance['off_maps'] += \
-            sc['mass'][sc['status_codes'] == oil_status.off_maps].sum()
+        self._update_mass_balance(sc, status_before)
 
     def refloat_elements(self, spill_container, time_step):
         """
@@ -961,10 +987,15 @@ class RasterMap(GnomeMap):
         if r_idx.size > 0:
             # check is not required, but why do this operation if no particles
             # need to be refloated
+            ledger = spill_container.mass_ledger
+            before = ledger.state(spill_container, r_idx)
+
             spill_container['positions'][r_idx] = \
                 spill_container['last_water_positions'][r_idx]
             spill_container['status_codes'][r_idx] = oil_status.in_water
 
+            ledger.update(spill_container, r_idx, before)
+
     def _check_land_layers(self, raster_map_layers, ratios,
                            positions, end_positions,
                            status_codes, last_water_positions):
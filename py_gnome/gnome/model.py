@@ -2,9 +2,12 @@
 import os
 import shutil
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import copy
 import inspect
 import zipfile
+import threading
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -12,7 +15,7 @@ from colander import (SchemaNode,
                       String, Float, Int, Bool, List,
                       drop, OneOf)
 
-from gnome.environment import Environment
+from gnome.environment import Environment, EnvironmentSampler
 
 import gnome.utilities.cache
 from gnome.utilities.time_utils import round_time
@@ -20,6 +23,7 @@ from gnome.utilities.orderedcollection import OrderedCollection
 from gnome.utilities.serializable import Serializable, Field
 
 from gnome.basic_types import oil_status, fate
+from gnome.cy_gnome import cy_helpers
 from gnome.spill_container import SpillContainerPair
 from gnome.environment import Wind
 from gnome.movers import Mover
@@ -27,6 +31,7 @@ from gnome.weatherers import (weatherer_sort,
                               Weatherer,
                               WeatheringData,
                               FayGravityViscous)
+from gnome.weatherers.fused import fuse_weatherers, FusedWeathering
 from gnome.outputters import Outputter, NetCDFOutput, WeatheringOutput
 from gnome.persist import (extend_colander,
                            validators,
@@ -36,6 +41,76 @@ from gnome.persist.base_schema import (ObjType,
                                        CollectionItemsList)
 from gnome.exceptions import ReferencedObjectNotSet, GnomeRuntimeError
 
+# the _ContainerTurn of the container a pool thread of
+# Model._map_containers() is processing
+_container_turn = threading.local()
+
+
+class _ContainerTurn(object):
+    '''
+    Order of the process calls of one container in a parallel
+    Model._map_containers() call.
+
+    A process that is not thread safe is called for the container once the
+    containers before it are done with that call of the process, so the
+    containers can be in different processes at the same time but each
+    process still gets them in order. A process that draws random numbers
+    waits until the containers before it are done with func, so the numbers
+    are drawn in the same order as in a sequential run.
+    '''
+    def __init__(self, cond, before):
+        '''
+        :param cond: threading.Condition shared by the containers
+        :param before: _ContainerTurn of the containers before this one
+        '''
+        self._cond = cond
+        self._before = before
+
+        # (id of process, number of the call) of the calls that are done
+        self._done = set()
+        self._finished = False
+
+        self._num_calls = {}
+        self._call = None
+
+    def start(self, process):
+        '''
+        the previous call is done - wait until process can be called
+        '''
+        self._end_call()
+
+        if getattr(process, 'thread_safe', False):
+            return
+
+        num = self._num_calls.get(id(process), 0)
+        self._num_calls[id(process)] = num + 1
+        self._call = (id(process), num)
+
+        in_order = getattr(process, 'draws_random', False)
+        with self._cond:
+            for turn in self._before:
+                while not (turn._finished or
+                           (not in_order and self._call in turn._done)):
+                    self._cond.wait()
+
+    def finish(self):
+        '''
+        the container is done with func
+        '''
+        self._end_call()
+
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def _end_call(self):
+        if self._call is not None:
+            with self._cond:
+                self._done.add(self._call)
+                self._cond.notify_all()
+
+            self._call = None
+
 
 class ModelSchema(ObjType):
     'Colander schema for Model object'
@@ -53,6 +128,12 @@ class ModelSchema(ObjType):
                       validator=OneOf(['gnome', 'adios', 'roc']),
                       missing=drop)
     location = SchemaNode(List(), missing=drop)
+    parallel_containers = SchemaNode(Bool(), missing=drop)
+    num_threads = SchemaNode(Int(), missing=drop)
+    fused_weathering = SchemaNode(Bool(), missing=drop)
+    sample_environment = SchemaNode(Bool(), missing=drop)
+    weathering_only = SchemaNode(Bool(), missing=drop)
+    adaptive_substeps = SchemaNode(Bool(), missing=drop)
 
     def __init__(self, json_='webapi', *args, **kwargs):
         '''
@@ -93,7 +174,13 @@ class Model(Serializable):
                'weatherers',
                'environment',
                'outputters',
-               'location']
+               'location',
+               'parallel_containers',
+               'num_threads',
+               'fused_weathering',
+               'sample_environment',
+               'weathering_only',
+               'adaptive_substeps']
 
     _create = []
     _create.extend(_update)
@@ -116,6 +203,13 @@ class Model(Serializable):
 
     modes = {'gnome', 'adios', 'roc'}
 
+    # number of elements used to represent the elements released by a spill
+    # in a time step if weathering_only is True
+    weathering_only_elements = 10
+
+    # most substeps a weatherer is given if adaptive_substeps is True
+    max_adaptive_substeps = 20
+
     @classmethod
     def new_from_dict(cls, dict_):
         'Restore model from previously persisted _state'
@@ -204,7 +298,13 @@ class Model(Serializable):
                  cache_enabled=False,
                  name=None,
                  mode=None,
-                 location=[]):
+                 location=[],
+                 parallel_containers=False,
+                 num_threads=1,
+                 fused_weathering=False,
+                 sample_environment=False,
+                 weathering_only=False,
+                 adaptive_substeps=False):
         '''
         Initializes a model.
         All arguments have a default.
@@ -231,10 +331,56 @@ class Model(Serializable):
         :param mode='Gnome': The runtime 'mode' that the model should use.
                              This is a value that the Web Client uses to
                              decide which UI views it should present.
+
+        :param parallel_containers=False: If True and uncertainty is on, the
+            forecast and uncertain SpillContainers are moved, weathered and
+            cleaned up concurrently on a thread pool. Processes with
+            thread_safe set run for both containers at the same time. The
+            uncertain container calls any other process once the forecast
+            container is done with it, so the uncertain container can be in
+            one weatherer while the forecast is in the next. The movers and
+            the map draw random numbers, so the uncertain container calls
+            them once the forecast container is done moving. Results are the
+            same as in a sequential run, random draws included.
+
+        :param num_threads=1: Number of threads used by the parallel element
+            loops in the cython land check and wind mover. Elements are
+            independent in these loops so results do not depend on
+            num_threads. This is a process wide setting applied at the
+            start of each run.
+
+        :param fused_weathering=False: If True, consecutive Evaporation,
+            NaturalDispersion, Emulsification and WeatheringData weatherers
+            are run together per block of elements for all substeps instead
+            of one process at a time. See gnome.weatherers.fused for how
+            results differ from the per-process loop.
+
+        :param sample_environment=False: If True, the wind speed, water
+            temperature and wave height are sampled at each element's
+            position once per time step and weatherers use these per element
+            values. This only differs from the default with a gridded wind
+            or water temperature. See gnome.environment.sampler
+
+        :param weathering_only=False: If True, the model only computes the
+            oil budget: movers, the map and the element cache are skipped
+            and the elements released by a spill in a time step are
+            represented by weathering_only_elements elements. Since elements
+            do not move, no elements beach or leave the map. WeatheringOutput
+            is the only outputter supported in this mode.
+
+        :param adaptive_substeps=False: If True, the number of weathering
+            substeps is chosen for each weatherer at each time step from its
+            stable_time_step() estimate, up to max_adaptive_substeps. This
+            gives many substeps for fresh oil and one once it changes
+            slowly. Weatherers with no estimate use weathering_substeps.
+            The substeps used are recorded in substeps_used.
         '''
         self.__restore__(time_step, start_time, duration,
                          weathering_substeps,
-                         uncertain, cache_enabled, map, name, mode, location)
+                         uncertain, cache_enabled, map, name, mode, location,
+                         parallel_containers, num_threads, fused_weathering,
+                         sample_environment, weathering_only,
+                         adaptive_substeps)
 
         self._register_callbacks()
 
@@ -257,7 +403,10 @@ class Model(Serializable):
 
     def __restore__(self, time_step, start_time, duration,
                     weathering_substeps, uncertain, cache_enabled, map,
-                    name, mode, location):
+                    name, mode, location, parallel_containers=False,
+                    num_threads=1, fused_weathering=False,
+                    sample_environment=False, weathering_only=False,
+                    adaptive_substeps=False):
         '''
         Take out initialization that does not register the callback here.
         This is because new_from_dict will use this to restore the model _state
@@ -316,6 +465,24 @@ class Model(Serializable):
 
         self.location = location
 
+        # thread pool is created on first use if parallel_containers is True
+        self.parallel_containers = parallel_containers
+        self._container_pool = None
+
+        self.num_threads = num_threads
+        self.fused_weathering = fused_weathering
+
+        # sampler is created in setup_model_run if sample_environment is True
+        self.sample_environment = sample_environment
+        self._env_sampler = None
+
+        self.weathering_only = weathering_only
+
+        self.adaptive_substeps = adaptive_substeps
+
+        # {weatherer name: [substeps of each time step]}, reset by rewind()
+        self.substeps_used = OrderedDict()
+
     def reset(self, **kwargs):
         '''
         Resets model to defaults -- Caution -- clears all movers, spills, etc.
@@ -343,9 +510,13 @@ class Model(Serializable):
         # clear the cache:
         self._cache.rewind()
 
+        self.substeps_used = OrderedDict()
+
         for outputter in self.outputters:
             outputter.rewind()
 
+        self.close_container_pool()
+
         self.logger.info(self._pid + "rewound model - " + self.name)
 
 #    def write_from_cache(self, filetype='netcdf', time_step='all'):
@@ -680,13 +851,23 @@ class Model(Serializable):
 
         # order weatherers collection
         self._order_weatherers()
-        transport = False
-        for mover in self.movers:
+
+        if self.weathering_only:
+            for outputter in self.outputters:
+                if outputter.on and not isinstance(outputter,
+                                                   WeatheringOutput):
+                    raise ValueError('{0} is not supported if '
+                                     'weathering_only is True'
+                                     .format(outputter.__class__.__name__))
+
+        for mover in self._transport_movers():
             if mover.on:
                 mover.prepare_for_model_run()
-                transport = True
                 array_types.update(mover.array_types)
 
+        # default time step is the same with or without weathering_only
+        transport = any(mover.on for mover in self.movers)
+
         weathering = False
         for w in self.weatherers:
             for sc in self.spills.items():
@@ -700,6 +881,13 @@ class Model(Serializable):
         for environment in self.environment:
             environment.prepare_for_model_run(self.start_time)
 
+        self._env_sampler = None
+        if self.sample_environment and weathering:
+            self._env_sampler = \
+                EnvironmentSampler.from_weatherers(self.weatherers,
+                                                   self.environment)
+            array_types.update(self._env_sampler.array_types)
+
         if self.time_step is None:
             # for now hard-code this; however, it should depend on weathering
             # note: do not set time_step attribute because we don't want to
@@ -717,6 +905,13 @@ class Model(Serializable):
         for sc in self.spills.items():
             sc.prepare_for_model_run(array_types)
 
+            if self.weathering_only:
+                sc.elements_per_release = self.weathering_only_elements
+            else:
+                sc.elements_per_release = None
+
+        cy_helpers.set_num_threads(self.num_threads)
+
         # outputters need array_types, so this needs to come after those
         # have been updated.
         for outputter in self.outputters:
@@ -733,7 +928,7 @@ class Model(Serializable):
         sets up everything for the current time_step:
         '''
         # initialize movers differently if model uncertainty is on
-        for m in self.movers:
+        for m in self._transport_movers():
             for sc in self.spills.items():
                 m.prepare_for_model_step(sc, self.time_step, self.model_time)
 
@@ -748,6 +943,66 @@ class Model(Serializable):
         for outputter in self.outputters:
             outputter.prepare_for_model_step(self.time_step, self.model_time)
 
+    def _transport_movers(self):
+        '''
+        the movers run by the model - none if weathering_only is True
+        '''
+        if self.weathering_only:
+            return []
+
+        return self.movers
+
+    def _map_containers(self, func):
+        '''
+        Call func(sc) for each SpillContainer. The forecast and uncertain
+        containers are independent within a step so if parallel_containers
+        is True, they are processed concurrently on a thread pool.
+
+        :returns: list of results in the order of self.spills.items()
+        '''
+        containers = self.spills.items()
+
+        if not self.parallel_containers or len(containers) < 2:
+            return [func(sc) for sc in containers]
+
+        if self._container_pool is None:
+            self._container_pool = ThreadPool(len(containers))
+
+        cond = threading.Condition()
+        turns = []
+        for sc in containers:
+            turns.append(_ContainerTurn(cond, list(turns)))
+
+        def run(i):
+            _container_turn.turn = turns[i]
+            try:
+                return func(containers[i])
+            finally:
+                _container_turn.turn = None
+                turns[i].finish()
+
+        return self._container_pool.map(run, range(len(containers)))
+
+    def _wait_turn(self, process):
+        '''
+        In a parallel _map_containers() call, wait until process can be
+        called for this container - see _ContainerTurn. Call it before each
+        call of a mover, weatherer, the map or the environment sampler.
+        '''
+        turn = getattr(_container_turn, 'turn', None)
+        if turn is not None:
+            turn.start(process)
+
+    def close_container_pool(self):
+        '''
+        shut down the threads used by _map_containers(). A new pool is
+        created if the model is stepped again.
+        '''
+        if self._container_pool is not None:
+            self._container_pool.close()
+            self._container_pool.join()
+            self._container_pool = None
+
     def move_elements(self):
         '''
         Moves elements:
@@ -756,30 +1011,45 @@ class Model(Serializable):
          - calls the beaching code to beach the elements that need beaching.
          - sets the new position
         '''
-        for sc in self.spills.items():
-            if sc.num_released > 0:  # can this check be removed?
+        self._map_containers(self._move_elements)
+
+    def _move_elements(self, sc):
+        '''
+        move elements of one SpillContainer - see move_elements()
+        '''
+        if sc.num_released > 0:  # can this check be removed?
 
-                # possibly refloat elements
-                self.map.refloat_elements(sc, self.time_step)
+            # possibly refloat elements
+            self._wait_turn(self.map)
+            self.map.refloat_elements(sc, self.time_step)
 
-                # reset next_positions
-                (sc['next_positions'])[:] = sc['positions']
+            # reset next_positions
+            (sc['next_positions'])[:] = sc['positions']
 
-                # loop through the movers
-                for m in self.movers:
-                    delta = m.get_move(sc, self.time_step, self.model_time)
-                    sc['next_positions'] += delta
+            # loop through the movers
+            for m in self.movers:
+                self._wait_turn(m)
+                delta = m.get_move(sc, self.time_step, self.model_time)
+                sc['next_positions'] += delta
 
-                self.map.beach_elements(sc)
+            self._wait_turn(self.map)
+            self.map.beach_elements(sc)
 
-                # let model mark these particles to be removed
-                tbr_mask = sc['status_codes'] == oil_status.off_maps
-                sc['status_codes'][tbr_mask] = oil_status.to_be_removed
+            # let model mark these particles to be removed
+            tbr_idx = np.flatnonzero(sc['status_codes'] ==
+                                     oil_status.off_maps)
+            if len(tbr_idx) > 0:
+                before = sc.mass_ledger.state(sc, tbr_idx)
+                sc['status_codes'][tbr_idx] = oil_status.to_be_removed
+                sc.mass_ledger.update(sc, tbr_idx, before)
 
-                self._update_fate_status(sc)
+                # elements to be removed are no longer weathered
+                sc.reset_fate_dataview()
 
-                # the final move to the new positions
-                (sc['positions'])[:] = sc['next_positions']
+            self._update_fate_status(sc)
+
+            # the final move to the new positions
+            (sc['positions'])[:] = sc['next_positions']
 
     def _update_fate_status(self, sc):
         '''
@@ -790,8 +1060,15 @@ class Model(Serializable):
         update fate_status in move_elements
         '''
         if 'fate_status' in sc:
-            non_w_mask = sc['status_codes'] == oil_status.on_land
-            sc['fate_status'][non_w_mask] = fate.non_weather
+            non_w_idx = np.flatnonzero((sc['status_codes'] ==
+                                        oil_status.on_land) &
+                                       (sc['fate_status'] != fate.non_weather))
+            if len(non_w_idx) > 0:
+                before = sc.mass_ledger.state(sc, non_w_idx)
+                sc['fate_status'][non_w_idx] = fate.non_weather
+                sc.mass_ledger.update(sc, non_w_idx, before)
+
+                sc.reset_fate_dataview()
 
     def weather_elements(self):
         '''
@@ -813,18 +1090,79 @@ class Model(Serializable):
             # if no weatherers then mass_components array may not be defined
             return
 
-        for sc in self.spills.items():
-            # elements may have beached to update fate_status
+        self._map_containers(self._weather_elements)
 
-            sc.reset_fate_dataview()
+    def _weather_elements(self, sc):
+        '''
+        weather elements of one SpillContainer - see weather_elements()
+        '''
+        # elements may have beached to update fate_status
+        sc.reset_fate_dataview()
+
+        if self._env_sampler is not None:
+            self._wait_turn(self._env_sampler)
+            self._env_sampler.sample(sc, self.model_time)
+
+        substeps = self._split_into_substeps()
+
+        weatherers = self.weatherers
+        if self.fused_weathering:
+            weatherers = fuse_weatherers(weatherers)
+
+        for w in weatherers:
+            self._wait_turn(w)
+            if self.adaptive_substeps:
+                substeps = self._weatherer_substeps(w, sc)
+
+            if isinstance(w, FusedWeathering):
+                w.weather_elements(sc, substeps)
+                continue
 
-            for w in self.weatherers:
-                for model_time, time_step in self._split_into_substeps():
-                    # change 'mass_components' in weatherer
-                    w.weather_elements(sc, time_step, model_time)
+            for model_time, time_step in substeps:
+                # change 'mass_components' in weatherer
+                w.weather_elements(sc, time_step, model_time)
 
-    def _split_into_substeps(self):
+    def _weatherer_substeps(self, w, sc):
         '''
+        substeps of the current time step for weatherer w (or all weatherers
+        of a FusedWeathering object) if adaptive_substeps is True. The
+        number of substeps is recorded in substeps_used for the forecast
+        SpillContainer.
+
+        :return: sequence of (datetime, timestep)
+        '''
+        if isinstance(w, FusedWeathering):
+            members = w.weatherers
+        else:
+            members = [w]
+
+        num = 1
+        for m in members:
+            dt = m.stable_time_step(sc, self.time_step, self.model_time)
+
+            if dt is None:
+                num = max(num, self.weathering_substeps)
+            elif dt > 0:
+                num = max(num, min(int(np.ceil(self.time_step / dt)),
+                                   self.max_adaptive_substeps))
+            else:
+                num = self.max_adaptive_substeps
+
+        if not sc.uncertain:
+            for m in members:
+                self.substeps_used.setdefault(m.name, []).append(num)
+
+            self.logger.debug('{0._pid} {1} weathering substeps for {2}'
+                              .format(self, num,
+                                      ', '.join(m.name for m in members)))
+
+        return self._split_into_substeps(num)
+
+    def _split_into_substeps(self, num_substeps=None):
+        '''
+        :param num_substeps=None: number of substeps. Default is
+            weathering_substeps
+
         :return: sequence of (datetime, timestep)
          (Note: we divide evenly on second boundaries.
                    Thus, there will likely be a remainder
@@ -832,8 +1170,11 @@ class Model(Serializable):
                    this remainder, which results in
                    1 more sub-step than we requested.)
         '''
+        if num_substeps is None:
+            num_substeps = self.weathering_substeps
+
         time_step = int(self._time_step)
-        sub_step = time_step / self.weathering_substeps
+        sub_step = time_step / num_substeps
 
         indexes = [idx for idx in range(0, time_step + 1, sub_step)]
         res = [(idx, next_idx - idx)
@@ -856,25 +1197,34 @@ class Model(Serializable):
 
         Output data
         '''
-        for mover in self.movers:
-            for sc in self.spills.items():
-                mover.model_step_is_done(sc)
-
-        for w in self.weatherers:
-            for sc in self.spills.items():
-                w.model_step_is_done(sc)
+        self._map_containers(self._processes_step_is_done)
 
         for outputter in self.outputters:
             outputter.model_step_is_done()
 
-        for sc in self.spills.items():
-            '''
-            removes elements with oil_status.to_be_removed
-            '''
-            sc.model_step_is_done()
+        self._map_containers(self._container_step_is_done)
 
-            # age remaining particles
-            sc['age'][:] = sc['age'][:] + self.time_step
+    def _processes_step_is_done(self, sc):
+        '''
+        call model_step_is_done for movers and weatherers for one container
+        '''
+        for mover in self._transport_movers():
+            self._wait_turn(mover)
+            mover.model_step_is_done(sc)
+
+        for w in self.weatherers:
+            self._wait_turn(w)
+            w.model_step_is_done(sc)
+
+    def _container_step_is_done(self, sc):
+        '''
+        removes elements with oil_status.to_be_removed and ages the
+        remaining elements of one container
+        '''
+        sc.model_step_is_done()
+
+        # age remaining particles
+        sc['age'][:] = sc['age'][:] + self.time_step
 
     def write_output(self, valid, messages=None):
         output_info = {'step_num': self.current_time_step}
@@ -930,7 +1280,10 @@ class Model(Serializable):
 
         else:
             self.setup_time_step()
-            self.move_elements()
+
+            if not self.weathering_only:
+                self.move_elements()
+
             self.weather_elements()
             self.step_is_done()
 
@@ -965,7 +1318,8 @@ class Model(Serializable):
         # cache the results - current_time_step is incremented but the
         # current_time_stamp in spill_containers (self.spills) is not updated
         # till we go through the prepare_for_model_step
-        self._cache.save_timestep(self.current_time_step, self.spills)
+        self._cache.save_timestep(self.current_time_step, self.spills,
+                                  mass_balance_only=self.weathering_only)
         output_info = self.write_output(isvalid)
         self.logger.debug("{0._pid} Completed step: {0.current_time_step} "
                           "for {0.name}".format(self))
@@ -1010,6 +1364,8 @@ class Model(Serializable):
                 self.logger.info('Run Complete: Stop Iteration')
                 break
 
+        self.close_container_pool()
+
         return output_data
 
     def _add_to_environ_collec(self, obj_added):
@@ -1263,6 +1619,7 @@ class Model(Serializable):
             sc.current_time_stamp = data.pop('current_time_stamp').item()
             sc._data_arrays = data
             sc.mass_balance = weather_data
+            sc.mass_ledger.restore(sc)
 
         # delete file after data is loaded - since no longer needed
         os.remove(spill_data)
@@ -1,4 +1,5 @@
 import copy
+import threading
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -53,6 +54,17 @@ class Process(AddLogger):
                      'real_data_start', 'real_data_stop'],
                read=['active'])
 
+    # True if the forecast and uncertain SpillContainers can be processed at
+    # the same time (see Model.parallel_containers). Only set it for classes
+    # that have been checked: no random draws and no state shared between
+    # the two calls.
+    thread_safe = False
+
+    # True if the process draws from the global random number generators.
+    # With parallel_containers, it is only called for a container once the
+    # containers before it are done, so the numbers are drawn in order.
+    draws_random = False
+
     def __init__(self, **kwargs):  # default min + max values for timespan
         """
         Initialize default Mover/Weatherer parameters
@@ -184,6 +196,9 @@ class Process(AddLogger):
 
 
 class Mover(Process):
+    # the C++ movers draw from the global rand() for their uncertainty
+    draws_random = True
+
     def get_move(self, sc, time_step, model_time_datetime):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
@@ -236,10 +251,13 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
+        # cos(lat) factor is computed once and reused for each stage
+        lon_scale = FlatEarthProjection.lon_scale(pos)
+        p1 = np.empty_like(pos)
+
         v0 = vel_field.at(pos, t, extrapolate=self.extrapolate)
-        d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s, pos)
-        p1 = pos.copy()
-        p1 += d0
+        FlatEarthProjection.add_meters_to_lonlat(v0 * dt_s, lon_scale,
+                                                 pos, p1)
 
         v1 = vel_field.at(p1, t + dt, extrapolate=self.extrapolate)
 
@@ -250,27 +268,65 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
+        # cos(lat) factor is computed once and reused for each stage; the
+        # stage position buffer is also reused
+        lon_scale = FlatEarthProjection.lon_scale(pos)
+        p_stage = np.empty_like(pos)
+
         v0 = vel_field.at(pos, t, extrapolate=self.extrapolate)
-        d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s / 2, pos)
-        p1 = pos.copy()
-        p1 += d0
+        FlatEarthProjection.add_meters_to_lonlat(v0 * (dt_s / 2.), lon_scale,
+                                                 pos, p_stage)
 
-        v1 = vel_field.at(p1, t + dt / 2, extrapolate=self.extrapolate)
-        d1 = FlatEarthProjection.meters_to_lonlat(v1 * dt_s / 2, pos)
-        p2 = pos.copy()
-        p2 += d1
+        v1 = vel_field.at(p_stage, t + dt / 2, extrapolate=self.extrapolate)
+        FlatEarthProjection.add_meters_to_lonlat(v1 * (dt_s / 2.), lon_scale,
+                                                 pos, p_stage)
 
-        v2 = vel_field.at(p2, t + dt / 2, extrapolate=self.extrapolate)
-        d2 = FlatEarthProjection.meters_to_lonlat(v2 * dt_s, pos)
-        p3 = pos.copy()
-        p3 += d2
+        v2 = vel_field.at(p_stage, t + dt / 2, extrapolate=self.extrapolate)
+        FlatEarthProjection.add_meters_to_lonlat(v2 * dt_s, lon_scale,
+                                                 pos, p_stage)
 
-        v3 = vel_field.at(p3, t + dt, extrapolate=self.extrapolate)
+        v3 = vel_field.at(p_stage, t + dt, extrapolate=self.extrapolate)
 
         return dt_s / 6 * (v0 + 2 * v1 + 2 * v2 + v3)
 
 
+class PerThreadAttr(object):
+    '''
+    Data descriptor for attributes that hold per-call scratch data, like the
+    positions/delta arrays that CyMover sets up in prepare_data_for_get_move.
+
+    Values are stored per thread so the same mover can be used for the
+    forecast and uncertain SpillContainers concurrently (see
+    Model.parallel_containers). A thread that has not yet set the attribute
+    sees the default.
+    '''
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+
+    def _local(self, obj):
+        # setdefault is atomic so only one threading.local is ever created
+        return obj.__dict__.setdefault('_per_thread_attrs', threading.local())
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        return getattr(self._local(obj), self.name, self.default)
+
+    def __set__(self, obj, value):
+        setattr(self._local(obj), self.name, value)
+
+
 class CyMover(Mover):
+    # scratch data for the current get_move call - kept per thread
+    model_time = PerThreadAttr('model_time', 0)
+    positions = PerThreadAttr('positions',
+                              np.zeros((0, 3), dtype=world_point_type))
+    delta = PerThreadAttr('delta', np.zeros((0, 3), dtype=world_point_type))
+    status_codes = PerThreadAttr('status_codes',
+                                 np.zeros((0, 1), dtype=status_code_type))
+    spill_type = PerThreadAttr('spill_type', 0)
 
     def __init__(self, **kwargs):
         """
@@ -132,11 +132,12 @@ class PyWindMover(movers.PyMover, serializable.Serializable):
         if sc.num_released is None  or sc.num_released == 0:
             return
 
-        rand.random_with_persistance(sc['windage_range'][:, 0],
-                                     sc['windage_range'][:, 1],
-                                     sc['windages'],
-                                     sc['windage_persist'],
-                                     time_step)
+        rand.refresh_with_persistance(sc['windage_range'][:, 0],
+                                      sc['windage_range'][:, 1],
+                                      sc['windages'],
+                                      sc['windage_persist'],
+                                      sc['age'],
+                                      time_step)
 
     def get_move(self, sc, time_step, model_time_datetime, num_method=None):
         """
@@ -21,7 +21,7 @@ from gnome.cy_gnome.cy_ice_wind_mover import CyIceWindMover
 
 from gnome.utilities.serializable import Serializable, Field
 from gnome.utilities.time_utils import sec_to_datetime
-from gnome.utilities.rand import random_with_persistance
+from gnome.utilities.rand import refresh_with_persistance
 
 
 from gnome import environment
@@ -145,11 +145,12 @@ class WindMoversBase(CyMover):
         if sc.num_released is None or sc.num_released == 0:
             return
 
-        random_with_persistance(sc['windage_range'][:, 0],
-                                sc['windage_range'][:, 1],
-                                sc['windages'],
-                                sc['windage_persist'],
-                                time_step)
+        refresh_with_persistance(sc['windage_range'][:, 0],
+                                 sc['windage_range'][:, 1],
+                                 sc['windages'],
+                                 sc['windage_persist'],
+                                 sc['age'],
+                                 time_step)
 
     def get_move(self, sc, time_step, model_time_datetime):
         """
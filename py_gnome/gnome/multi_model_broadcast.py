@@ -182,6 +182,11 @@ class ModelConsumer(mp.Process):
     def _get_weatherer_attribute(self, idx, attr):
         return getattr(self.model.weatherers[idx], attr)
 
+    def _set_weathering_only(self, weathering_only):
+        self.model.weathering_only = weathering_only
+
+        return self.model.weathering_only
+
     def _set_weathering_output_only(self):
         del_list = [o for o in self.model.outputters
                     if not isinstance(o, WeatheringOutput)]
@@ -200,7 +205,13 @@ class ModelBroadcaster(GnomeId):
     def __init__(self, model,
                  wind_speed_uncertainties,
                  spill_amount_uncertainties,
-                 ipc_folder='.'):
+                 ipc_folder='.',
+                 weathering_only=False):
+        '''
+            :param weathering_only=False: if True, the models only compute
+                the oil budget - see Model(weathering_only=True). Use this
+                if there is no land or the beached oil can be ignored.
+        '''
         self.model = model
         self.ipc_folder = ipc_folder
         self.context = None
@@ -222,6 +233,9 @@ class ModelBroadcaster(GnomeId):
             self._disable_cache(i)
             self._set_weathering_output_only(i)
 
+            if weathering_only:
+                self._set_weathering_only(i)
+
     def __del__(self):
         self.stop()
 
@@ -311,3 +325,6 @@ class ModelBroadcaster(GnomeId):
 
     def _set_weathering_output_only(self, idx):
         self.cmd('set_weathering_output_only', {}, idx=idx)
+
+    def _set_weathering_only(self, idx):
+        self.cmd('set_weathering_only', dict(weathering_only=True), idx=idx)
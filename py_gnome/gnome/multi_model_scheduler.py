@@ -0,0 +1,316 @@
+'''
+Run several Model instances in one process by interleaving their time steps
+on a thread pool.
+
+A Model step spends much of its time in netCDF reads, cache writes and
+C++/numpy code that releases the GIL, so while one model waits on I/O another
+model's step can run. Steps of the same model are always run in order and
+never concurrently; only steps of different models overlap.
+
+Models scheduled together should not share mover, weatherer or environment
+objects. Note that Model.rewind() reseeds the global random number
+generators, so models with random components are not reproducible bit for
+bit when run together.
+'''
+import heapq
+import threading
+from multiprocessing.pool import ThreadPool
+
+from gnome import AddLogger
+
+
+class ScheduledModel(object):
+    '''
+    Book-keeping for one Model managed by the ModelScheduler
+    '''
+    # values for the 'status' attribute
+    pending = 'pending'
+    running = 'running'
+    complete = 'complete'
+    cancelled = 'cancelled'
+    error = 'error'
+
+    def __init__(self, model, priority=0, callback=None, keep_output=True):
+        self.model = model
+        self.priority = priority
+        self.callback = callback
+        self.keep_output = keep_output
+
+        self.status = self.pending
+        self.cancel_requested = False
+        self.step_num = -1
+        self.output = []
+        self.exception = None
+
+    @property
+    def done(self):
+        return self.status in (self.complete, self.cancelled, self.error)
+
+    def progress(self):
+        '''
+        :returns: dict with 'status', 'step_num', 'num_time_steps' and
+            'fraction' of time steps completed
+        '''
+        num_time_steps = self.model.num_time_steps
+        if num_time_steps:
+            fraction = (self.step_num + 1) / float(num_time_steps)
+        else:
+            fraction = 0.
+
+        return {'status': self.status,
+                'step_num': self.step_num,
+                'num_time_steps': num_time_steps,
+                'fraction': min(fraction, 1.0)}
+
+
+class ModelScheduler(AddLogger):
+    '''
+    Interleaves the time steps of many models on a thread pool.
+
+    Usage::
+
+        scheduler = ModelScheduler(num_workers=4)
+        scheduler.add(model1)
+        scheduler.add(model2, priority=10)
+        results = scheduler.run()   # {model.id: [output_info, ...]}
+
+    or call start(), then poll progress() and cancel() models as needed,
+    then join().
+    '''
+    policies = ('round_robin', 'priority')
+
+    def __init__(self, num_workers=4, policy='round_robin'):
+        '''
+        :param num_workers=4: number of model steps that can run at once
+
+        :param policy='round_robin': order in which waiting models get their
+            next step. 'round_robin' cycles through the models in the order
+            they were added. 'priority' always runs the waiting model with
+            the highest priority first; models with equal priority are run
+            round robin.
+        '''
+        if policy not in self.policies:
+            raise ValueError('policy ({0}) invalid, should be one of {1}'
+                             .format(policy, self.policies))
+
+        self.num_workers = num_workers
+        self.policy = policy
+
+        self._models = {}
+        self._ready = []
+        self._seq = 0
+        self._in_flight = 0
+        self._started = False
+
+        self._lock = threading.Condition(threading.RLock())
+        self._pool = None
+
+    def add(self, model, priority=0, callback=None, keep_output=True,
+            rewind=True):
+        '''
+        Add a model to the scheduler. If the scheduler is started, the model
+        gets its first step as soon as a worker is free.
+
+        :param model: gnome.model.Model object
+        :param priority=0: used by the 'priority' policy, higher runs first
+        :param callback=None: callable invoked as callback(model, output_info)
+            after each step, from a scheduler thread
+        :param keep_output=True: keep the output_info of each step so it is
+            returned by run()/results()
+        :param rewind=True: rewind the model before its first step
+
+        :returns: model.id which is the key for progress(), cancel(), etc
+        '''
+        with self._lock:
+            if model.id in self._models:
+                raise ValueError('model {0} is already scheduled'
+                                 .format(model.id))
+
+            if rewind:
+                model.rewind()
+
+            entry = ScheduledModel(model, priority, callback, keep_output)
+            self._models[model.id] = entry
+            self._push(entry)
+
+            if self._started:
+                self._dispatch()
+
+        return model.id
+
+    def start(self):
+        '''
+        Start running steps in the background; returns immediately
+        '''
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self.num_workers)
+
+            self._started = True
+            self._dispatch()
+
+    def join(self, timeout=None):
+        '''
+        Block until all models are complete, cancelled or have failed
+
+        :param timeout=None: seconds to wait. If None, wait until done.
+        :returns: True if all models are done
+        '''
+        with self._lock:
+            while not self._all_done():
+                self._lock.wait(timeout)
+                if timeout is not None:
+                    break
+
+            return self._all_done()
+
+    def run(self):
+        '''
+        Run all models to completion
+
+        :returns: dict of {model.id: list of output_info from each step}
+        '''
+        self.start()
+        self.join()
+
+        for entry in self._models.values():
+            if entry.status == entry.error:
+                self.logger.error('model {0} failed at step {1}: {2}'
+                                  .format(entry.model.name,
+                                          entry.step_num + 1,
+                                          entry.exception))
+
+        return self.results()
+
+    def results(self):
+        '''
+        :returns: dict of {model.id: list of output_info kept so far}
+        '''
+        with self._lock:
+            return dict((m_id, list(entry.output))
+                        for m_id, entry in self._models.iteritems())
+
+    def progress(self, model_id=None):
+        '''
+        :param model_id=None: id returned by add(). If None, return
+            progress of all models as a dict keyed by id
+
+        :returns: see ScheduledModel.progress()
+        '''
+        with self._lock:
+            if model_id is not None:
+                return self._models[model_id].progress()
+
+            return dict((m_id, entry.progress())
+                        for m_id, entry in self._models.iteritems())
+
+    def cancel(self, model_id):
+        '''
+        Cancel a model. A step that is already running finishes, but no
+        further steps are run.
+        '''
+        with self._lock:
+            entry = self._models[model_id]
+            if entry.done:
+                return
+
+            entry.cancel_requested = True
+            if entry.status == entry.pending:
+                entry.status = entry.cancelled
+                self._lock.notify_all()
+
+    def exception(self, model_id):
+        '''
+        :returns: the exception raised by a model whose status is 'error'
+        '''
+        return self._models[model_id].exception
+
+    def close(self):
+        '''
+        Stop the worker threads. Steps that are running finish first.
+        '''
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._started = False
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def _all_done(self):
+        return all(entry.done for entry in self._models.itervalues())
+
+    def _push(self, entry):
+        if self.policy == 'priority':
+            key = (-entry.priority, self._seq)
+        else:
+            key = (0, self._seq)
+
+        self._seq += 1
+        heapq.heappush(self._ready, (key, entry))
+
+    def _dispatch(self):
+        '''
+        Hand the next waiting models to the pool. Must hold the lock.
+        '''
+        while self._in_flight < self.num_workers and self._ready:
+            entry = heapq.heappop(self._ready)[1]
+            if entry.cancel_requested or entry.done:
+                continue
+
+            entry.status = entry.running
+            self._in_flight += 1
+            self._pool.apply_async(self._step, (entry,),
+                                   callback=self._step_done)
+
+    def _step(self, entry):
+        '''
+        Run one step of one model on a worker thread. Exceptions are caught
+        and returned since ThreadPool in python 2 has no error_callback.
+        '''
+        try:
+            return (entry, entry.model.step(), None)
+        except StopIteration:
+            return (entry, None, StopIteration)
+        except Exception as err:
+            return (entry, None, err)
+
+    def _step_done(self, result):
+        '''
+        Called by the pool after each step. Runs on the pool's result thread
+        so it must not raise.
+        '''
+        entry, output, err = result
+
+        if output is not None and entry.callback is not None:
+            try:
+                entry.callback(entry.model, output)
+            except Exception as cb_err:
+                self.logger.error('callback for model {0} failed: {1}'
+                                  .format(entry.model.name, cb_err))
+
+        with self._lock:
+            self._in_flight -= 1
+
+            if err is StopIteration:
+                entry.status = entry.complete
+            elif err is not None:
+                entry.status = entry.error
+                entry.exception = err
+            else:
+                entry.step_num = output['step_num']
+                if entry.keep_output:
+                    entry.output.append(output)
+
+                if entry.cancel_requested:
+                    entry.status = entry.cancelled
+                elif entry.step_num >= entry.model.num_time_steps - 1:
+                    entry.status = entry.complete
+                else:
+                    entry.status = entry.pending
+                    self._push(entry)
+
+            if self._pool is not None:
+                self._dispatch()
+
+            self._lock.notify_all()
@@ -5,11 +5,14 @@ from renderer import Renderer, RendererSchema
 from weathering import WeatheringOutput
 from geo_json import (TrajectoryGeoJsonOutput,
                       IceGeoJsonOutput)
+from binary import BinaryParticleOutput, decode_frame
 from json import (IceJsonOutput,
                   CurrentJsonOutput)
 
 from kmz import KMZOutput
 from image import IceImageOutput
 from shape import ShapeOutput
+from concentration import ConcentrationGridOutput
+from tiles import TileOutput
 
 # NOTE: no need for __all__ if you want export everything!
@@ -132,7 +132,7 @@ class Animation(Renderer):
             self.copy_back_to_fore()
 
         # draw data for self.draw_ontop second so it draws on top
-        scp = self.cache.load_timestep(step_num).items()
+        scp = self._load_timestep(step_num).items()
         if len(scp) == 1:
             self.draw_elements(scp[0])
         else:
@@ -0,0 +1,323 @@
+'''
+Binary particle outputter
+
+A compact alternative to TrajectoryGeoJsonOutput for web clients
+'''
+import copy
+import os
+import struct
+import zlib
+from glob import glob
+
+import numpy as np
+
+from colander import SchemaNode, String, drop, Int, Bool
+
+from gnome.utilities.time_utils import date_to_sec
+from gnome.utilities.serializable import Serializable, Field
+
+from .outputter import Outputter, BaseSchema
+
+# frame header: magic, version, flags, reserved, step_num, time (seconds
+# since the epoch), number of elements, number of delta encoded elements
+FRAME_MAGIC = 'GNPB'
+FRAME_VERSION = 2
+FRAME_HEADER = struct.Struct('<4sBBHIdII')
+
+FLAG_UNCERTAIN = 1
+FLAG_DELTA = 2
+FLAG_COMPRESSED = 4
+
+# name, dtype in the frame and the unsigned int dtype of the same size used
+# for delta encoding. The columns are ordered by item size so every column
+# is aligned for typed array views on the client. 'id' must be first, it is
+# never delta encoded
+FRAME_COLUMNS = (('id', '<u4', '<u4'),
+                 ('lon', '<f4', '<u4'),
+                 ('lat', '<f4', '<u4'),
+                 ('mass', '<f4', '<u4'),
+                 ('spill_num', '<u2', '<u2'),
+                 ('status_codes', 'u1', 'u1'))
+
+
+def match_ids(ids, previous_ids):
+    '''
+    find the elements of the previous frame with the same ids. Elements are
+    matched by id since elements may have been removed since the previous
+    frame. If an id is in the previous frame more than once, the first one
+    is used.
+
+    :param ids: ids of the elements in the frame
+    :param previous_ids: ids of the elements in the previous frame
+
+    :returns: (matched, previous_ix) - bool array, True for the elements
+        that are in the previous frame, and the index of each matched element
+        in the previous frame
+    '''
+    if len(previous_ids) == 0:
+        return (np.zeros((len(ids),), dtype=bool),
+                np.zeros((len(ids),), dtype=np.intp))
+
+    order = np.argsort(previous_ids, kind='mergesort')
+    ix = np.searchsorted(previous_ids, ids, sorter=order)
+    previous_ix = order[np.minimum(ix, len(order) - 1)]
+
+    return (previous_ids[previous_ix] == ids, previous_ix)
+
+
+def decode_frame(frame, previous=None):
+    '''
+    decode a frame written by BinaryParticleOutput
+
+    :param frame: the encoded frame
+    :type frame: str
+
+    :param previous=None: the decoded previous frame of the same spill
+        container. Required if the frame is delta encoded
+    :type previous: dict
+
+    :returns: dict containing the header values and one array per column
+    '''
+    (magic, version, flags, _reserved, step_num, time, num_elements,
+     num_delta) = FRAME_HEADER.unpack_from(frame)
+
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError('not a version {0} particle frame'
+                         .format(FRAME_VERSION))
+
+    if num_delta > 0 and previous is None:
+        raise ValueError('frame for step {0} is delta encoded, previous '
+                         'frame is required'.format(step_num))
+
+    decoded = {'step_num': step_num,
+               'time': time,
+               'uncertain': bool(flags & FLAG_UNCERTAIN),
+               'num_elements': num_elements,
+               'num_delta': num_delta}
+
+    payload = frame[FRAME_HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    offset = 0
+    for name, dtype, delta_dtype in FRAME_COLUMNS:
+        data = np.frombuffer(payload, dtype=delta_dtype, count=num_elements,
+                             offset=offset).copy()
+        offset += data.nbytes
+
+        if name == 'id':
+            if num_delta > 0:
+                matched, previous_ix = match_ids(data, previous['id'])
+                previous_ix = previous_ix[matched]
+        elif num_delta > 0:
+            data[matched] += \
+                previous[name].view(delta_dtype)[previous_ix]
+
+        decoded[name] = data.view(dtype)
+
+    return decoded
+
+
+class BinaryParticleSchema(BaseSchema):
+    '''
+    Nothing is required for initialization
+    '''
+    delta = SchemaNode(Bool(), missing=drop)
+    keyframe_interval = SchemaNode(Int(), missing=drop)
+    output_dir = SchemaNode(String(), missing=drop)
+
+
+class BinaryParticleOutput(Outputter, Serializable):
+    '''
+    class that outputs the particles of each step as a compact binary frame.
+    There is one frame for the forecast and one for the uncertain spill
+    container. All values are little endian. A frame is a header followed by
+    one column per array:
+    ::
+
+        header (28 bytes):
+            magic           4s      'GNPB'
+            version         uint8
+            flags           uint8   1: uncertain, 2: delta encoded,
+                                    4: columns are zlib compressed
+            reserved        uint16
+            step_num        uint32
+            time            float64 seconds since the epoch
+            num_elements    uint32
+            num_delta       uint32  number of delta encoded elements
+
+        columns:
+            id              uint32[num_elements]
+            lon             float32[num_elements]
+            lat             float32[num_elements]
+            mass            float32[num_elements]
+            spill_num       uint16[num_elements]
+            status_codes    uint8[num_elements]
+
+    If delta is True, the values of the elements that are in the previous
+    frame of the same spill container are stored as the difference from the
+    value of the element with the same id in that frame - see match_ids().
+    The difference is taken between the bit patterns of the values as
+    unsigned integers of the column size (uint32 for float32) and wraps
+    around, so decoding is exact. Elements that moved a little have small
+    differences, so the columns of delta frames are zlib compressed. The
+    'id' column is not delta encoded. A full, uncompressed frame is written
+    every keyframe_interval frames so clients can join mid stream.
+    See decode_frame()
+    '''
+    _state = copy.deepcopy(Outputter._state)
+
+    _state += [Field('delta', update=True, save=True),
+               Field('keyframe_interval', update=True, save=True),
+               Field('output_dir', update=True, save=True)]
+    _schema = BinaryParticleSchema
+
+    cache_arrays = ('id', 'positions', 'status_codes', 'mass', 'spill_num')
+
+    def __init__(self,
+                 delta=False,
+                 keyframe_interval=10,
+                 output_dir=None,
+                 **kwargs):
+        '''
+        :param bool delta=False: if True, delta encode the frames against
+            the previous frame
+        :param int keyframe_interval=10: write a full frame every
+            keyframe_interval frames when delta encoding
+        :param str output_dir=None: output directory for the frames. Default
+            is None since data is returned in dict for webapi
+
+        use super to pass optional \*\*kwargs to base class __init__ method
+        '''
+        self.delta = delta
+        self.keyframe_interval = keyframe_interval
+        self.output_dir = output_dir
+
+        super(BinaryParticleOutput, self).__init__(output_dir=output_dir,
+                                                   **kwargs)
+
+    def prepare_for_model_run(self, *args, **kwargs):
+        """
+        prepares the outputter for a model run.
+
+        Parameters passed to base class (use super): model_start_time, cache
+
+        Cleans out previous written frames and forgets the previous frames
+        used for delta encoding
+        """
+        super(BinaryParticleOutput, self).prepare_for_model_run(*args,
+                                                                **kwargs)
+        self._previous = {}
+        self._frames_since_key = {}
+        self.clean_output_files()
+
+    def write_output(self, step_num, islast_step=False):
+        'encode the particles of step_num as binary frames'
+        super(BinaryParticleOutput, self).write_output(step_num, islast_step)
+
+        if not self._write_step:
+            return None
+
+        output_info = {'step_num': step_num,
+                       'certain': None,
+                       'uncertain': None}
+
+        for sc in self._load_timestep(step_num).items():
+            frame = self.encode_frame(sc, step_num)
+
+            if sc.uncertain:
+                output_info['uncertain'] = frame
+            else:
+                output_info['certain'] = frame
+
+        output_info['time_stamp'] = sc.current_time_stamp.isoformat()
+
+        if self.output_dir:
+            output_info['output_filename'] = \
+                self.output_to_file(output_info['certain'], step_num)
+            if output_info['uncertain'] is not None:
+                self.output_to_file(output_info['uncertain'], step_num,
+                                    uncertain=True)
+
+        return output_info
+
+    def encode_frame(self, sc, step_num):
+        '''
+        encode the particles of a spill container as a binary frame
+        '''
+        positions = sc['positions']
+        columns = [sc['id'].astype('<u4'),
+                   positions[:, 0].astype('<f4'),
+                   positions[:, 1].astype('<f4'),
+                   sc['mass'].astype('<f4'),
+                   sc['spill_num'].astype('<u2'),
+                   sc['status_codes'].astype('u1')]
+
+        num_elements = len(positions)
+        num_delta = 0
+        flags = FLAG_UNCERTAIN if sc.uncertain else 0
+
+        previous = self._previous.get(sc.uncertain)
+        since_key = self._frames_since_key.get(sc.uncertain, 0)
+
+        if (self.delta and previous is not None and
+                since_key < self.keyframe_interval - 1):
+            matched, previous_ix = match_ids(columns[0], previous[0])
+            previous_ix = previous_ix[matched]
+            num_delta = np.count_nonzero(matched)
+            self._frames_since_key[sc.uncertain] = since_key + 1
+        else:
+            self._frames_since_key[sc.uncertain] = 0
+
+        if num_delta > 0:
+            flags |= FLAG_DELTA | FLAG_COMPRESSED
+
+        header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, flags, 0,
+                                   step_num,
+                                   date_to_sec(sc.current_time_stamp),
+                                   num_elements, num_delta)
+
+        payload = []
+        for ix, (name, _dtype, delta_dtype) in enumerate(FRAME_COLUMNS):
+            data = columns[ix].view(delta_dtype)
+
+            if num_delta > 0 and name != 'id':
+                data = data.copy()
+                data[matched] -= \
+                    previous[ix].view(delta_dtype)[previous_ix]
+
+            payload.append(data.tostring())
+
+        payload = ''.join(payload)
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.compress(payload)
+
+        self._previous[sc.uncertain] = columns
+
+        return header + payload
+
+    def output_to_file(self, frame, step_num, uncertain=False):
+        if uncertain:
+            file_format = 'particles_uncertain_{0:06d}.bin'
+        else:
+            file_format = 'particles_{0:06d}.bin'
+
+        filename = os.path.join(self.output_dir,
+                                file_format.format(step_num))
+
+        with open(filename, 'wb') as outfile:
+            outfile.write(frame)
+
+        return filename
+
+    def rewind(self):
+        'forget the previous frames used for delta encoding'
+        super(BinaryParticleOutput, self).rewind()
+        self._previous = {}
+        self._frames_since_key = {}
+
+    def clean_output_files(self):
+        if self.output_dir:
+            files = glob(os.path.join(self.output_dir, 'particles_*.bin'))
+            for f in files:
+                os.remove(f)
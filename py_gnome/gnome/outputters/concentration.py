@@ -0,0 +1,402 @@
+'''
+Concentration grid outputter - bins the mass of the floating elements onto
+a regular longitude/latitude grid and writes the grids to a netcdf file
+'''
+
+import copy
+import os
+from datetime import datetime
+
+import netCDF4 as nc
+
+import numpy as np
+
+from colander import (SchemaNode, TupleSchema, String, Float, Int,
+                      OneOf, drop)
+
+from gnome import __version__
+from gnome.basic_types import oil_status
+from gnome.constants import earth_radius
+from gnome.persist import base_schema
+
+from gnome.utilities.serializable import Serializable, Field
+
+from .outputter import Outputter, BaseSchema
+
+
+def bin_mass(positions, mass, bounds, num_cells):
+    '''
+    sum the mass of the elements in each cell of a regular grid
+
+    :param positions: Nx2 or Nx3 array of (lon, lat, ...) positions
+    :param mass: N array of element masses
+    :param bounds: ((min_lon, min_lat), (max_lon, max_lat)) of the grid
+    :param num_cells: (number of longitude cells, number of latitude cells)
+
+    :returns: (num_lat, num_lon) array of mass per cell. Elements outside the
+        bounds are dropped.
+    '''
+    (min_lon, min_lat), (max_lon, max_lat) = bounds
+    num_lon, num_lat = num_cells
+
+    i_lon = np.floor((positions[:, 0] - min_lon) *
+                     (num_lon / (max_lon - min_lon))).astype(np.int64)
+    i_lat = np.floor((positions[:, 1] - min_lat) *
+                     (num_lat / (max_lat - min_lat))).astype(np.int64)
+
+    inside = ((i_lon >= 0) & (i_lon < num_lon) &
+              (i_lat >= 0) & (i_lat < num_lat))
+
+    grid = np.bincount(i_lat[inside] * num_lon + i_lon[inside],
+                       weights=mass[inside],
+                       minlength=num_lon * num_lat)
+
+    return grid.reshape(num_lat, num_lon)
+
+
+def kernel_matrix(num, width):
+    '''
+    (num, num) matrix that spreads the values of num cells with a gaussian
+    kernel of standard deviation width cells. Each column sums to 1 so the
+    total is conserved; the kernel is cut off at 4 widths.
+    '''
+    offsets = np.arange(num)
+    dist = (offsets[:, np.newaxis] - offsets[np.newaxis, :]) / float(width)
+
+    kernel = np.exp(-0.5 * dist ** 2)
+    kernel[np.abs(dist) > 4] = 0.0
+
+    return kernel / kernel.sum(axis=0)
+
+
+class GridShape(TupleSchema):
+    num_lon = SchemaNode(Int())
+    num_lat = SchemaNode(Int())
+
+
+class ConcentrationGridOutputSchema(BaseSchema):
+    'colander schema for serialize/deserialize object'
+    netcdf_filename = SchemaNode(String(), missing=drop)
+    bounds = base_schema.LongLatBounds()
+    num_cells = GridShape()
+    aggregation = SchemaNode(String(), missing=drop,
+                             validator=OneOf(['instantaneous', 'max',
+                                              'cumulative']))
+    method = SchemaNode(String(), missing=drop,
+                        validator=OneOf(['bincount', 'kde']))
+    kernel_width = SchemaNode(Float(), missing=drop)
+
+
+class ConcentrationGridOutput(Outputter, Serializable):
+    '''
+    Bins the mass of the floating elements (status in_water) onto a regular
+    longitude/latitude grid every output step and writes the stack of grids
+    to a netcdf file. The uncertain elements go to a second file, like
+    NetCDFOutput.
+
+    The netcdf file has 'time', 'latitude' and 'longitude' dimensions and the
+    variables:
+
+    'mass' (time, latitude, longitude): mass of oil in each cell (kg)
+
+    'surface_concentration' (time, latitude, longitude): mass per area of
+    each cell (kg/m^2)
+
+    aggregation sets what is written for each step:
+
+    'instantaneous': the grid of the step
+
+    'max': the maximum of each cell over the steps so far
+
+    'cumulative': the sum of each cell over the steps so far
+    '''
+    aggregation_lu = ('instantaneous', 'max', 'cumulative')
+    method_lu = ('bincount', 'kde')
+
+    cf_attributes = {'comment': 'Gridded particle output from the NOAA '
+                                'PyGnome model',
+                     'source': 'PyGnome version {0}'.format(__version__),
+                     'institution': 'NOAA Emergency Response Division',
+                     'conventions': 'CF-1.6',
+                     }
+
+    _state = copy.deepcopy(Outputter._state)
+
+    _state.add_field([Field('netcdf_filename', save=True, update=True,
+                            test_for_eq=False),
+                      Field('bounds', save=True, update=True),
+                      Field('num_cells', save=True, update=True),
+                      Field('aggregation', save=True, update=True),
+                      Field('method', save=True, update=True),
+                      Field('kernel_width', save=True, update=True),
+                      ])
+    _schema = ConcentrationGridOutputSchema
+
+    cache_arrays = ('positions', 'mass', 'status_codes')
+
+    def __init__(self,
+                 netcdf_filename,
+                 bounds,
+                 num_cells,
+                 aggregation='instantaneous',
+                 method='bincount',
+                 kernel_width=1.0,
+                 **kwargs):
+        '''
+        :param netcdf_filename: file to write the grids to
+        :param bounds: ((min_lon, min_lat), (max_lon, max_lat)) of the grid
+        :param num_cells: (number of longitude cells,
+                           number of latitude cells)
+        :param aggregation='instantaneous': one of 'instantaneous', 'max' or
+            'cumulative'
+        :param method='bincount': 'bincount' adds the mass of each element
+            to the cell it is in. 'kde' then spreads the mass of each cell
+            with a gaussian kernel (a binned kernel density estimate)
+        :param kernel_width=1.0: standard deviation of the 'kde' kernel in
+            number of cells
+
+        use super to pass optional kwargs to base class __init__ method
+        '''
+        self.netcdf_filename = netcdf_filename
+
+        if aggregation not in self.aggregation_lu:
+            raise ValueError('aggregation must be one of: {0}'
+                             .format(self.aggregation_lu))
+
+        if method not in self.method_lu:
+            raise ValueError('method must be one of: {0}'
+                             .format(self.method_lu))
+
+        self.bounds = tuple(map(tuple, bounds))
+        self.num_cells = tuple(num_cells)
+        self.aggregation = aggregation
+        self.method = method
+        self.kernel_width = kernel_width
+
+        super(ConcentrationGridOutput, self).__init__(**kwargs)
+
+    @property
+    def netcdf_filename(self):
+        return self._netcdf_filename
+
+    @netcdf_filename.setter
+    def netcdf_filename(self, new_name):
+        self._check_filename(new_name)
+        self._netcdf_filename = new_name
+
+    @property
+    def uncertain_filename(self):
+        '''
+        the grids of the uncertain SpillContainer are written to this file
+        '''
+        name, ext = os.path.splitext(self._netcdf_filename)
+        return '{0}_uncertain{1}'.format(name, ext)
+
+    def cell_centers(self):
+        '''
+        (longitudes, latitudes) of the cell centers
+        '''
+        (min_lon, min_lat), (max_lon, max_lat) = self.bounds
+        num_lon, num_lat = self.num_cells
+
+        d_lon = (max_lon - min_lon) / float(num_lon)
+        d_lat = (max_lat - min_lat) / float(num_lat)
+
+        return (min_lon + d_lon * (np.arange(num_lon) + 0.5),
+                min_lat + d_lat * (np.arange(num_lat) + 0.5))
+
+    def cell_areas(self):
+        '''
+        (num_lat, 1) array of the area of the cells in each row (m^2)
+        '''
+        (min_lon, min_lat), (max_lon, max_lat) = self.bounds
+        num_lon, num_lat = self.num_cells
+
+        lat_edges = np.radians(np.linspace(min_lat, max_lat, num_lat + 1))
+        d_lon = np.radians(max_lon - min_lon) / num_lon
+
+        areas = (earth_radius ** 2 * d_lon *
+                 (np.sin(lat_edges[1:]) - np.sin(lat_edges[:-1])))
+
+        return areas[:, np.newaxis]
+
+    def grid_mass(self, sc):
+        '''
+        mass per cell of the floating elements of a spill container
+        '''
+        in_water = sc['status_codes'] == oil_status.in_water
+
+        grid = bin_mass(sc['positions'][in_water], sc['mass'][in_water],
+                        self.bounds, self.num_cells)
+
+        if self.method == 'kde':
+            grid = np.dot(np.dot(self._kernels[1], grid), self._kernels[0].T)
+
+        return grid
+
+    def prepare_for_model_run(self,
+                              model_start_time,
+                              spills,
+                              **kwargs):
+        '''
+        create the netcdf files and define the grid variables. Existing
+        files are deleted.
+        '''
+        super(ConcentrationGridOutput,
+              self).prepare_for_model_run(model_start_time, spills, **kwargs)
+
+        if not self.on:
+            return
+
+        self.clean_output_files()
+
+        if self.method == 'kde':
+            self._kernels = [kernel_matrix(num, self.kernel_width)
+                             for num in self.num_cells]
+
+        self._aggregate = {}
+        self._areas = self.cell_areas()
+
+        lon, lat = self.cell_centers()
+        time_units = ('seconds since {0}'
+                      .format(self._model_start_time.isoformat()))
+
+        for sc in self.sc_pair.items():
+            file_ = (self.uncertain_filename if sc.uncertain
+                     else self.netcdf_filename)
+
+            with nc.Dataset(file_, 'w', format='NETCDF4') as rootgrp:
+                rootgrp.setncatts(self.cf_attributes)
+                rootgrp.setncattr('creation_date',
+                                  datetime.now().replace(microsecond=0)
+                                  .isoformat())
+                rootgrp.setncattr('aggregation', self.aggregation)
+                rootgrp.setncattr('method', self.method)
+
+                rootgrp.createDimension('time', None)
+                rootgrp.createDimension('latitude', len(lat))
+                rootgrp.createDimension('longitude', len(lon))
+
+                var = rootgrp.createVariable('time', np.float64, ('time',))
+                var.setncatts({'long_name': 'time since the beginning of '
+                                            'the simulation',
+                               'standard_name': 'time',
+                               'calendar': 'gregorian',
+                               'units': time_units})
+
+                var = rootgrp.createVariable('latitude', np.float64,
+                                             ('latitude',))
+                var.setncatts({'long_name': 'latitude of the cell center',
+                               'standard_name': 'latitude',
+                               'units': 'degrees_north'})
+                var[:] = lat
+
+                var = rootgrp.createVariable('longitude', np.float64,
+                                             ('longitude',))
+                var.setncatts({'long_name': 'longitude of the cell center',
+                               'standard_name': 'longitude',
+                               'units': 'degrees_east'})
+                var[:] = lon
+
+                dims = ('time', 'latitude', 'longitude')
+                chunks = (1, len(lat), len(lon))
+
+                var = rootgrp.createVariable('mass', np.float64, dims,
+                                             zlib=True, chunksizes=chunks)
+                var.setncatts({'long_name': 'mass of floating oil in the '
+                                            'cell',
+                               'units': 'kilograms'})
+
+                var = rootgrp.createVariable('surface_concentration',
+                                             np.float64, dims,
+                                             zlib=True, chunksizes=chunks)
+                var.setncatts({'long_name': 'mass of floating oil per area '
+                                            'of the cell',
+                               'units': 'kg m-2'})
+
+    def write_output(self, step_num, islast_step=False):
+        '''
+        bin the elements of step_num and append the grids to the netcdf
+        files
+        '''
+        super(ConcentrationGridOutput, self).write_output(step_num,
+                                                          islast_step)
+
+        if self.on is False or not self._write_step:
+            return None
+
+        for sc in self._load_timestep(step_num).items():
+            file_ = (self.uncertain_filename if sc.uncertain
+                     else self.netcdf_filename)
+            time_stamp = sc.current_time_stamp
+
+            grid = self.grid_mass(sc)
+
+            previous = self._aggregate.get(sc.uncertain)
+            if previous is not None:
+                if self.aggregation == 'max':
+                    grid = np.maximum(grid, previous)
+                elif self.aggregation == 'cumulative':
+                    grid = grid + previous
+
+            self._aggregate[sc.uncertain] = grid
+
+            with nc.Dataset(file_, 'a') as rootgrp:
+                rg_vars = rootgrp.variables
+                idx = len(rg_vars['time'])
+
+                rg_vars['time'][idx] = nc.date2num(time_stamp,
+                                                   rg_vars['time'].units,
+                                                   rg_vars['time'].calendar)
+                rg_vars['mass'][idx] = grid
+                rg_vars['surface_concentration'][idx] = grid / self._areas
+
+        return {'netcdf_filename': (self.netcdf_filename,
+                                    self.uncertain_filename),
+                'time_stamp': time_stamp}
+
+    def clean_output_files(self):
+        '''
+        deletes output files that may be around
+
+        called by prepare_for_model_run
+        '''
+        for file_ in (self.netcdf_filename, self.uncertain_filename):
+            try:
+                os.remove(file_)
+            except OSError:
+                pass  # it must not be there
+
+    def rewind(self):
+        '''
+        forget the aggregated grids
+        '''
+        super(ConcentrationGridOutput, self).rewind()
+
+        self._aggregate = {}
+
+    def save(self, saveloc, references=None, name=None):
+        '''
+        See baseclass :meth:`~gnome.persist.Savable.save`
+
+        update netcdf_filename to point to saveloc, then call base class save
+        using super
+        '''
+        json_ = self.serialize('save')
+        fname = os.path.split(json_['netcdf_filename'])[1]
+        json_['netcdf_filename'] = os.path.join('./', fname)
+        return self._json_to_saveloc(json_, saveloc, references, name)
+
+    @classmethod
+    def loads(cls, json_data, saveloc, references=None):
+        '''
+        loads object from json_data
+
+        update path to 'netcdf_filename' in json_data, then finish loading
+        by calling super class' load method
+        '''
+        json_data['netcdf_filename'] = \
+            os.path.join(saveloc, json_data['netcdf_filename'])
+
+        return super(ConcentrationGridOutput, cls).loads(json_data, saveloc,
+                                                         references)
@@ -29,6 +29,7 @@ class TrajectoryGeoJsonSchema(BaseSchema):
     round_data = SchemaNode(Bool(), missing=drop)
     round_to = SchemaNode(Int(), missing=drop)
     output_dir = SchemaNode(String(), missing=drop)
+    multipoint = SchemaNode(Bool(), missing=drop)
 
 
 class TrajectoryGeoJsonOutput(Outputter, Serializable):
@@ -64,6 +65,35 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
             ...
         }
 
+    The uncertain features are written to geojson_uncertain_<STEP>.geojson,
+    next to the forecast file geojson_<STEP>.geojson.
+
+    If multipoint is True, the elements are instead grouped into one
+    MultiPoint Feature per spill and status code, and the 'certain' and
+    'uncertain' feature collections are returned as geojson text. The
+    masses are given in the same order as the coordinates:
+    ::
+
+        {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": <FEATURE_NUMBER>,
+                "properties": {
+                    "status_code": <>,
+                    "spill_num": <>,
+                    "sc_type": <FORECAST OR UNCERTAIN>,
+                    "mass": [<MASS>, ...]
+                },
+                "geometry": {
+                    "type": "MultiPoint",
+                    "coordinates": [[<LONGITUDE>, <LATITUDE>], ...]
+                }
+            },
+            ...
+        }
+
     '''
     _state = copy.deepcopy(Outputter._state)
 
@@ -71,13 +101,20 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
     # is saved correctly - maybe point it to saveloc
     _state += [Field('round_data', update=True, save=True),
                Field('round_to', update=True, save=True),
-               Field('output_dir', update=True, save=True)]
+               Field('output_dir', update=True, save=True),
+               Field('multipoint', update=True, save=True)]
     _schema = TrajectoryGeoJsonSchema
 
+    cache_arrays = ('positions', 'status_codes', 'mass', 'spill_num')
+
+    # number of elements formatted per write when streaming multipoint files
+    _chunk_size = 10000
+
     def __init__(self,
                  round_data=True,
                  round_to=4,
                  output_dir=None,
+                 multipoint=False,
                  **kwargs):
         '''
         :param bool round_data=True: if True, then round the numpy arrays
@@ -88,12 +125,17 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
         :param str output_dir=None: output directory for geojson files. Default
             is None since data is returned in dict for webapi. For using
             write_output_post_run(), this must be set
+        :param bool multipoint=False: if True, output one MultiPoint feature
+            per spill and status code instead of one Point feature per
+            element. The features are built and written straight from the
+            numpy arrays, which is much faster for large numbers of elements.
 
         use super to pass optional \*\*kwargs to base class __init__ method
         '''
         self.round_data = round_data
         self.round_to = round_to
         self.output_dir = output_dir
+        self.multipoint = multipoint
 
         super(TrajectoryGeoJsonOutput, self).__init__(output_dir=output_dir,
                                                       **kwargs)
@@ -124,12 +166,16 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
         if not self._write_step:
             return None
 
+        if self.multipoint:
+            return self._write_multipoint_output(step_num)
+
         # one feature per element client; replaced with multipoint
         # because client performance is much more stable with one
         # feature per step rather than (n) features per step.features = []
         c_features = []
         uc_features = []
-        for sc in self.cache.load_timestep(step_num).items():
+        uncertain = False
+        for sc in self._load_timestep(step_num).items():
             position = self._dataarray_p_types(sc['positions'])
             status = self._dataarray_p_types(sc['status_codes'])
             mass = self._dataarray_p_types(sc['mass'])
@@ -156,6 +202,8 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
                 else:
                     c_features.append(feature)
 
+            uncertain = uncertain or sc.uncertain
+
         c_geojson = FeatureCollection(c_features)
         uc_geojson = FeatureCollection(uc_features)
         # default geojson should not output data to file
@@ -166,21 +214,143 @@ class TrajectoryGeoJsonOutput(Outputter, Serializable):
                        }
 
         if self.output_dir:
-            output_info['output_filename'] = self.output_to_file(c_geojson, step_num)
-            self.output_to_file(uc_geojson, step_num)
+            output_info['output_filename'] = self.output_to_file(c_geojson,
+                                                                 step_num)
+            if uncertain:
+                self.output_to_file(uc_geojson, step_num, True)
 
         return output_info
 
-    def output_to_file(self, json_content, step_num):
-        file_format = 'geojson_{0:06d}.geojson'
-        filename = os.path.join(self.output_dir,
-                                file_format.format(step_num))
+    def _filename(self, step_num, uncertain=False):
+        'geojson file for step_num - the uncertain features go in their own'
+        if uncertain:
+            file_format = 'geojson_uncertain_{0:06d}.geojson'
+        else:
+            file_format = 'geojson_{0:06d}.geojson'
+
+        return os.path.join(self.output_dir, file_format.format(step_num))
+
+    def output_to_file(self, json_content, step_num, uncertain=False):
+        filename = self._filename(step_num, uncertain)
 
         with open(filename, 'w+') as outfile:
             dump(json_content, outfile, indent=True)
 
         return filename
 
+    def _write_multipoint_output(self, step_num):
+        '''
+        multipoint version of write_output. Returns the same output_info
+        dict, except that the feature collections are geojson text, which
+        is also what is written to the files
+        '''
+        c_features = []
+        uc_features = []
+        uncertain = False
+        for sc in self._load_timestep(step_num).items():
+            if sc.uncertain:
+                uc_features = self._multipoint_features(sc)
+                uncertain = True
+            else:
+                c_features = self._multipoint_features(sc)
+
+        output_info = {'time_stamp': sc.current_time_stamp.isoformat(),
+                       'certain': self._encode_features(c_features),
+                       'uncertain': self._encode_features(uc_features)
+                       }
+
+        if self.output_dir:
+            output_info['output_filename'] = \
+                self.stream_to_file(output_info['certain'], step_num)
+            if uncertain:
+                self.stream_to_file(output_info['uncertain'], step_num, True)
+
+        return output_info
+
+    def _multipoint_features(self, sc):
+        '''
+        group the elements of the spill container by spill_num and
+        status_code. Each group is returned as a dict that keeps its
+        coordinates and masses as numpy arrays
+        '''
+        spill_num = sc['spill_num']
+        status = sc['status_codes']
+        if len(status) == 0:
+            return []
+
+        sc_type = 'uncertain' if sc.uncertain else 'forecast'
+
+        # lexsort is stable so elements keep their order within a group
+        order = np.lexsort((status, spill_num))
+        breaks = np.flatnonzero((np.diff(spill_num[order]) != 0) |
+                                (np.diff(status[order]) != 0)) + 1
+
+        features = []
+        for ix, group in enumerate(np.split(order, breaks)):
+            features.append({'id': ix,
+                             'status_code': int(status[group[0]]),
+                             'spill_num': int(spill_num[group[0]]),
+                             'sc_type': sc_type,
+                             'coordinates': sc['positions'][group, :2],
+                             'mass': sc['mass'][group]})
+
+        return features
+
+    def _encode_features(self, features):
+        '''
+        geojson text of a FeatureCollection of multipoint features. The
+        arrays are formatted in chunks with a fixed number of decimals
+        (round_to) rather than going through the json encoder
+        '''
+        chunks = ['{"type": "FeatureCollection", "features": [']
+        for ix, f in enumerate(features):
+            if ix > 0:
+                chunks.append(', ')
+
+            chunks.append('{{"type": "Feature", "id": {0}, '
+                          '"properties": {{"status_code": {1}, '
+                          '"spill_num": {2}, "sc_type": "{3}", '
+                          '"mass": ['
+                          .format(f['id'], f['status_code'],
+                                  f['spill_num'], f['sc_type']))
+            self._encode_array(chunks, f['mass'], '{0}')
+            chunks.append(']}, "geometry": {"type": "MultiPoint", '
+                          '"coordinates": [')
+            self._encode_array(chunks, f['coordinates'], '[{0}, {0}]')
+            chunks.append(']}}')
+
+        chunks.append(']}\n')
+
+        return ''.join(chunks)
+
+    def stream_to_file(self, geojson_text, step_num, uncertain=False):
+        'write the text from _encode_features() to the file for step_num'
+        filename = self._filename(step_num, uncertain)
+
+        with open(filename, 'w+') as outfile:
+            outfile.write(geojson_text)
+
+        return filename
+
+    def _encode_array(self, chunks, data_array, item):
+        '''
+        append the rows of data_array as comma separated json values to
+        chunks. item is the template for one row; each {0} is replaced by a
+        float format
+        '''
+        if self.round_data:
+            item = item.format('%.{0}f'.format(self.round_to))
+        else:
+            item = item.format('%r')
+
+        for start in xrange(0, len(data_array), self._chunk_size):
+            chunk = data_array[start:start + self._chunk_size]
+            if start > 0:
+                chunks.append(', ')
+
+            chunks.append(', '.join([item] * len(chunk)) %
+                          tuple(chunk.ravel().tolist()))
+
     def _dataarray_p_types(self, data_array):
         '''
         return array as list with appropriate python dtype
@@ -7,14 +7,15 @@ These will output images for use in the Web client / OpenLayers
 import os
 import copy
 import collections
-from tempfile import NamedTemporaryFile
 
 import numpy as np
 
 from gnome.utilities.serializable import Field
 from gnome.utilities.time_utils import date_to_sec
 
-from gnome.utilities.map_canvas import MapCanvas
+from gnome.utilities.map_canvas import (MapCanvas,
+                                        rasterize_polygons,
+                                        encode_png)
 
 from gnome.persist import class_from_objtype
 
@@ -58,6 +59,14 @@ class IceImageOutput(Outputter):
         # this is a place where we store our gradient color infomration
         self.gradient_lu = {}
 
+        # png palettes of the gradients, the last color is transparent
+        self.gradient_palettes = {}
+
+        # the pixels covered by the cells of each grid, keyed by mover id.
+        # Only valid for the viewport they were computed for
+        self._grid_pixels = {}
+        self._grid_pixels_viewport = None
+
         self.map_canvas = MapCanvas(image_size,
                                     projection=projection,
                                     viewport=viewport,
@@ -116,22 +125,28 @@ class IceImageOutput(Outputter):
 
         self.gradient_lu[gradient_name] = (scale, np.array(color_names))
 
-    def add_gradient_to_canvas(self, color_range, color_prefix, num_colors):
-        '''
-            Add a color gradient to our palette
+        # libgd alpha goes from 0 (opaque) to 127 (transparent),
+        # png alpha from 255 (opaque) to 0 (transparent)
+        colors = self.gradient_colors(color_range, num_colors)
+        colors[:, 3] = (127 - colors[:, 3]) * 255.0 / 127
 
-            NOTE: Probably not the most efficient way to do this.
+        palette = np.zeros((num_colors + 1, 4), dtype=np.uint8)
+        palette[:-1] = colors.round().clip(0, 255)
+        self.gradient_palettes[gradient_name] = palette
+
+    def gradient_colors(self, color_range, num_colors):
+        '''
+            Interpolate a color gradient
 
             :param color_range: The colors that we would like to use to
                                 generate our gradient
-            :type color_range: A sequence of 2 or more 3-tuples
-
-            :param color_prefix: The prefix that will be used in the naming
-                                 of the colors in the gradient
-            :type color_prefix: str
+            :type color_range: A sequence of 2 or more 3-tuples or 4-tuples
 
             :param num_colors: The number of gradient colors to generate
             :type num_colors: Number
+
+            :returns: (num_colors, 4) array of (r, g, b, alpha) values,
+                      with libgd alpha values
         '''
         color_range_idx = range(len(color_range))
         color_space = np.linspace(color_range_idx[0], color_range_idx[-1],
@@ -150,8 +165,28 @@ class IceImageOutput(Outputter):
         else:
             a_grad = np.array([0.] * num_colors)
 
+        return np.column_stack((r_grad, g_grad, b_grad, a_grad))
+
+    def add_gradient_to_canvas(self, color_range, color_prefix, num_colors):
+        '''
+            Add a color gradient to our palette
+
+            NOTE: Probably not the most efficient way to do this.
+
+            :param color_range: The colors that we would like to use to
+                                generate our gradient
+            :type color_range: A sequence of 2 or more 3-tuples
+
+            :param color_prefix: The prefix that will be used in the naming
+                                 of the colors in the gradient
+            :type color_prefix: str
+
+            :param num_colors: The number of gradient colors to generate
+            :type num_colors: Number
+        '''
         new_colors = []
-        for i, (r, g, b, a) in enumerate(zip(r_grad, g_grad, b_grad, a_grad)):
+        for i, (r, g, b, a) in enumerate(self.gradient_colors(color_range,
+                                                              num_colors)):
             new_colors.append(('{}{}'.format(color_prefix, i), (r, g, b, a)))
 
         self.map_canvas.add_colors(new_colors)
@@ -160,18 +195,25 @@ class IceImageOutput(Outputter):
 
     def lookup_gradient_color(self, gradient_name, values):
         try:
-            (low_val, high_val), color_names = self.gradient_lu[gradient_name]
+            color_names = self.gradient_lu[gradient_name][1]
         except IndexError:
             return None
 
+        return color_names[self.lookup_gradient_index(gradient_name, values)]
+
+    def lookup_gradient_index(self, gradient_name, values):
+        '''
+            The index of the gradient color of each value -- also the index
+            into the gradient's png palette
+        '''
+        (low_val, high_val), color_names = self.gradient_lu[gradient_name]
+
         scale_range = high_val - low_val
         q_step_range = scale_range / len(color_names)
 
-        idx = (np.floor(values / q_step_range)
-               .astype(int)
-               .clip(0, len(color_names) - 1))
-
-        return color_names[idx]
+        return (np.floor(values / q_step_range)
+                .astype(int)
+                .clip(0, len(color_names) - 1))
 
     def write_output(self, step_num, islast_step=False):
         """
@@ -220,10 +262,46 @@ class IceImageOutput(Outputter):
 
         return open(image_file_file_path).read()
 
+    def grid_pixels(self, mover, mover_grid):
+        '''
+            The pixels covered by the cells of a mover's grid in the current
+            viewport, as (pixel_indices, cell_indices) into the flattened
+            image and the cells of the grid.
+
+            The cells are only rasterized once per viewport.
+        '''
+        canvas = self.map_canvas
+        viewport = tuple(map(tuple, canvas.viewport))
+
+        if self._grid_pixels_viewport != viewport:
+            self._grid_pixels = {}
+            self._grid_pixels_viewport = viewport
+
+        if mover.id not in self._grid_pixels:
+            dtype = mover_grid.dtype.descr
+            unstructured_type = dtype[0][1]
+            new_shape = mover_grid.shape + (len(dtype),)
+            points = (mover_grid
+                      .view(dtype=unstructured_type)
+                      .reshape(-1, len(dtype)))
+
+            polygons = (canvas.projection.to_pixel(points)
+                        .reshape(new_shape[:-1] + (2,)))
+
+            raster = rasterize_polygons(polygons, canvas.image_size).ravel()
+            pixels = np.flatnonzero(raster >= 0)
+
+            self._grid_pixels[mover.id] = (pixels, raster[pixels])
+
+        return self._grid_pixels[mover.id]
+
     def render_images(self, model_time):
         """
             render the actual images
-            This uses the MapCanvas code to do the actual rendering
+
+            The cells of the ice grids are rasterized once for the viewport
+            (see grid_pixels()), so each step is a lookup of the gradient
+            color of every cell, encoded to png in memory.
 
             returns: thickness_image, concentration_image
         """
@@ -240,52 +318,36 @@ class IceImageOutput(Outputter):
                                                         mover_grid_bb)
 
         canvas.viewport = mover_grid_bb
-        canvas.clear_background()
+
+        width, height = canvas.image_size[:2]
+        thickness_palette = self.gradient_palettes['thickness']
+        concentration_palette = self.gradient_palettes['concentration']
+
+        # start with the transparent color -- the last one in the palettes
+        thickness_pixels = np.empty((height * width,), dtype=np.uint8)
+        thickness_pixels.fill(len(thickness_palette) - 1)
+        concentration_pixels = np.empty((height * width,), dtype=np.uint8)
+        concentration_pixels.fill(len(concentration_palette) - 1)
 
         # Here is where we draw our grid data....
         for mover, mover_grid in zip(self.ice_movers, mover_grids):
-            mover_grid_bb = mover.get_grid_bounding_box(mover_grid,
-                                                        mover_grid_bb)
+            pixels, cells = self.grid_pixels(mover, mover_grid)
 
             concentration, thickness = mover.get_ice_fields(model_time)
 
-            thickness_colors = self.lookup_gradient_color('thickness',
+            thickness_colors = self.lookup_gradient_index('thickness',
                                                           thickness)
-            concentration_colors = self.lookup_gradient_color('concentration',
-                                                              concentration)
+            concentration_colors = \
+                self.lookup_gradient_index('concentration', concentration)
 
-            dtype = mover_grid.dtype.descr
-            unstructured_type = dtype[0][1]
-            new_shape = mover_grid.shape + (len(dtype),)
-            mover_grid = (mover_grid
-                          .view(dtype=unstructured_type)
-                          .reshape(*new_shape))
-
-            for poly, tc, cc in zip(mover_grid,
-                                    thickness_colors, concentration_colors):
-                canvas.draw_polygon(poly, fill_color=tc)
-                canvas.draw_polygon(poly, fill_color=cc, background=True)
-
-        # diagnostic so we can see what we have rendered.
-        # print '\ndrawing reference objects...'
-        # canvas.draw_graticule(False)
-        # canvas.draw_tags(False)
-        # canvas.save_background('background.png')
-        # canvas.save_foreground('foreground.png')
-
-        # py_gd does not currently have the capability to generate a .png
-        # formatted buffer in memory. (libgd can be made to do this, but
-        # the wrapper is yet to be written)
-        # So we will just write to a tempfile and then read it back.
-        with NamedTemporaryFile() as fp:
-            canvas.save_foreground(fp.name)
-            fp.seek(0)
-            thickness_image = fp.read().encode('base64')
-
-        with NamedTemporaryFile() as fp:
-            canvas.save_background(fp.name)
-            fp.seek(0)
-            coverage_image = fp.read().encode('base64')
+            thickness_pixels[pixels] = thickness_colors[cells]
+            concentration_pixels[pixels] = concentration_colors[cells]
+
+        thickness_image = encode_png(thickness_pixels.reshape(height, width),
+                                     thickness_palette).encode('base64')
+        coverage_image = encode_png(concentration_pixels.reshape(height,
+                                                                 width),
+                                    concentration_palette).encode('base64')
 
         return ("data:image/png;base64,{}".format(thickness_image),
                 "data:image/png;base64,{}".format(coverage_image),
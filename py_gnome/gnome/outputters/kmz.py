@@ -46,6 +46,8 @@ class KMZOutput(Outputter, Serializable):
     _state += [Field('filename', update=True, save=True),]
     _schema = KMZSchema
 
+    cache_arrays = ('positions', 'status_codes')
+
     time_formatter = '%m/%d/%Y %H:%M'
     def __init__(self, filename, **kwargs):
         '''
@@ -60,6 +62,7 @@ class KMZOutput(Outputter, Serializable):
 
         self.filename = filename + ".kmz"
         self.kml_name = os.path.split(filename)[-1] + ".kml"
+        self._kml_filename = filename + ".kml"
 
 
         super(KMZOutput, self).__init__(**kwargs)
@@ -110,12 +113,14 @@ class KMZOutput(Outputter, Serializable):
         # shouldn't be required if the above worked!
         self._file_exists_error(self.filename)
 
-        # create a list to hold what will be the contents of the kml
-        self.kml = [kmz_templates.header_template.format(caveat=kmz_templates.caveat,
-                                                         kml_name = self.kml_name,
-                                                         valid_timestring = model_start_time.strftime(self.time_formatter),
-                                                         issued_timestring = datetime.now().strftime(self.time_formatter),
-                                                         )]
+        # the kml is streamed to a file next to the kmz, one timestep at a
+        # time, then zipped up on the last step
+        with open(self._kml_filename, 'w') as kmlfile:
+            kmlfile.write(kmz_templates.header_template.format(caveat=kmz_templates.caveat,
+                                                               kml_name = self.kml_name,
+                                                               valid_timestring = model_start_time.strftime(self.time_formatter),
+                                                               issued_timestring = datetime.now().strftime(self.time_formatter),
+                                                               ))
 
         # # netcdf outputter has this --  not sure why
         # self._middle_of_run = True
@@ -129,39 +134,40 @@ class KMZOutput(Outputter, Serializable):
             return None
 
 
-        # add to the kml list:
-        for sc in self.cache.load_timestep(step_num).items(): # loop through uncertain and certain LEs
-            ## extract the data
-            start_time = sc.current_time_stamp
-            if self.output_timestep is None:
-                end_time = start_time + timedelta(seconds = self.model_timestep)
-            else:
-                end_time = start_time + self.output_timestep
-            start_time = start_time.isoformat()
-            end_time = end_time.isoformat()
-
-            positions = sc['positions']
-            water_positions = positions[sc['status_codes']   == oil_status.in_water]
-            beached_positions = positions[sc['status_codes'] == oil_status.on_land]
-
-            data_dict = {'certain' : "Uncertainty"if sc.uncertain else "Best Guess",
-                        }
-            self.kml.append(kmz_templates.build_one_timestep(water_positions,
-                                                             beached_positions,
-                                                             start_time,
-                                                             end_time,
-                                                             sc.uncertain
-                                                             ))
+        # append to the kml file:
+        with open(self._kml_filename, 'a') as kmlfile:
+            for sc in self._load_timestep(step_num).items(): # loop through uncertain and certain LEs
+                ## extract the data
+                start_time = sc.current_time_stamp
+                if self.output_timestep is None:
+                    end_time = start_time + timedelta(seconds = self.model_timestep)
+                else:
+                    end_time = start_time + self.output_timestep
+                start_time = start_time.isoformat()
+                end_time = end_time.isoformat()
+
+                positions = sc['positions']
+                water_positions = positions[sc['status_codes']   == oil_status.in_water]
+                beached_positions = positions[sc['status_codes'] == oil_status.on_land]
+
+                kmlfile.write(kmz_templates.build_one_timestep(water_positions,
+                                                               beached_positions,
+                                                               start_time,
+                                                               end_time,
+                                                               sc.uncertain
+                                                               ))
+
+            if islast_step:
+                kmlfile.write(kmz_templates.footer)
 
         if islast_step: # now we really write the file:
-           self.kml.append(kmz_templates.footer)
-           with zipfile.ZipFile(self.filename, 'w', compression=zipfile.ZIP_DEFLATED) as kmzfile:
+            with zipfile.ZipFile(self.filename, 'w', compression=zipfile.ZIP_DEFLATED) as kmzfile:
                 kmzfile.writestr('dot.png', base64.b64decode(DOT))
                 kmzfile.writestr('x.png', base64.b64decode(X))
-                # write the kml file
-                kmzfile.writestr(self.kml_name, "".join(self.kml).encode('utf8'))
-
+                # copy the kml file in - read from disk in chunks
+                kmzfile.write(self._kml_filename, self.kml_name)
 
+            os.remove(self._kml_filename)
 
         # output_filename = self.output_to_file(geojson, step_num)
         output_info = {'time_stamp': sc.current_time_stamp.isoformat(),
@@ -188,10 +194,11 @@ class KMZOutput(Outputter, Serializable):
 
         here in case it needs to be called from elsewhere
         '''
-        try:
-            os.remove(self.filename)
-        except OSError:
-            pass # it must not be there
+        for filename in (self.filename, self._kml_filename):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass # it must not be there
 
 # These icons (these are base64 encoded 3-pixel sized dots in a 32x32 transparent PNG)
 #   these were encoded by the "build_icons" script
@@ -2,6 +2,8 @@
 templates for the kmz  outputter
 """
 
+import numpy as np
+
 caveat = "This trajectory was produced by GNOME (General NOAA Operational Modeling Environment), and should be used for educational and planning purposes only--not for a real response. In the event of an oil or chemical spill in U.S. waters, contact the U.S. Coast Guard National Response Center at 1-800-424-8802."
 
 
@@ -108,6 +110,21 @@ point_template="""             <Point>
              </Point>
 """
 
+# same as point_template, but for % formatting of many points at once
+point_template_pct = point_template.replace('{:.6f}', '%.6f')
+
+
+def format_points(positions):
+    """
+    format the lon, lat of all positions with point_template in one go
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 0:
+        return ""
+
+    return ((point_template_pct * len(positions)) %
+            tuple(positions[:, :2].ravel().tolist()))
+
 
 timestep_header_template = """<Folder>
   <name>{date_string}:{certain}</name>
@@ -150,9 +167,7 @@ def build_one_timestep(floating_positions,
 
         data['status'] = status
         kml.append(one_run_header.format(**data))
-
-        for point in positions:
-            kml.append(point_template.format(*point[:2]))
+        kml.append(format_points(positions))
         kml.append(one_run_footer)
     kml.append(timestep_footer)
 
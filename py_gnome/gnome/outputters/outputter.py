@@ -44,6 +44,11 @@ class Outputter(Serializable):
                Field('output_start_time', save=True, update=True))
     _schema = BaseSchema
 
+    # names of the data arrays write_output() reads from the cache. None
+    # loads all arrays, () only loads the mass_balance and time stamp.
+    # See _load_timestep()
+    cache_arrays = None
+
     def __init__(self,
                  cache=None,
                  on=True,
@@ -339,8 +344,9 @@ class Outputter(Serializable):
 
         for step_num in range(num_time_steps):
             if (step_num > 0 and step_num < num_time_steps - 1):
-                next_ts = (self.cache.load_timestep(step_num).items()[0].
-                           current_time_stamp)
+                next_ts = (self.cache.load_timestep(step_num,
+                                                    metadata_only=True)
+                           .items()[0].current_time_stamp)
                 ts = next_ts - model_time
                 self.prepare_for_model_step(ts.seconds, model_time)
 
@@ -348,8 +354,16 @@ class Outputter(Serializable):
                 last_step = True
 
             self.write_output(step_num, last_step)
-            model_time = (self.cache.load_timestep(step_num).items()[0].
-                          current_time_stamp)
+            model_time = (self.cache.load_timestep(step_num,
+                                                   metadata_only=True)
+                          .items()[0].current_time_stamp)
+
+    def _load_timestep(self, step_num):
+        '''
+        load the data of step_num from the cache with only the arrays in
+        cache_arrays
+        '''
+        return self.cache.load_timestep(step_num, arrays=self.cache_arrays)
 
     # Some utilities for checking valid filenames, etc...
     def _check_filename(self, filename):
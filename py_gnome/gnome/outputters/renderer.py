@@ -12,6 +12,9 @@ from os.path import basename
 import glob
 import copy
 import zipfile
+from collections import deque
+from multiprocessing import Pool
+
 import numpy as np
 import py_gd
 
@@ -86,6 +89,9 @@ class Renderer(Outputter, MapCanvas):
                            test_for_eq=False))
     _schema = RendererSchema
 
+    # used by draw_elements()
+    cache_arrays = ('positions', 'status_codes', 'id')
+
     @classmethod
     def new_from_dict(cls, dict_):
         """
@@ -126,6 +132,7 @@ class Renderer(Outputter, MapCanvas):
                  on=True,
                  formats=['png', 'gif'],
                  timestamp_attrib={},
+                 save_workers=0,
                  **kwargs
                  ):
         """
@@ -181,6 +188,13 @@ class Renderer(Outputter, MapCanvas):
                         Default is .png and animated .gif
         :type formats: list of strings
 
+        :param save_workers=0: number of worker processes that encode and
+            write the frame images. If 0, frames are written in write_output.
+            Otherwise write_output sends a copy of the frame to a worker and
+            draws the next one while it is encoded; wait_for_saves() blocks
+            until all frames are written. It is called after the last step.
+        :type save_workers: int
+
 
         Remaining kwargs are passed onto baseclass's __init__ with a direct
         call: Outputter.__init__(..)
@@ -204,6 +218,15 @@ class Renderer(Outputter, MapCanvas):
         self.draw_ontop = draw_ontop
         self.draw_back_to_fore = draw_back_to_fore
 
+        # frames being written by the save workers - see save_frame()
+        self.save_workers = save_workers
+        self._save_pool = None
+        self._pending_saves = deque()
+
+        # projected pixels of the beached elements of the last frame, for
+        # the forecast (False) and uncertain (True) spill container
+        self._beached_pixels = {}
+
         Outputter.__init__(self,
                            cache,
                            on,
@@ -314,6 +337,7 @@ class Renderer(Outputter, MapCanvas):
         """
         super(Renderer, self).prepare_for_model_run(*args, **kwargs)
 
+        self.wait_for_saves()
         self.clean_output_files()
 
         self.draw_background()
@@ -414,6 +438,9 @@ class Renderer(Outputter, MapCanvas):
 
         This should be called whenever the scale changes
         """
+        # pixels of beached elements are no longer valid
+        self._beached_pixels = {}
+
         # create a new background image
         self.clear_background()
         self.draw_land()
@@ -517,7 +544,7 @@ class Renderer(Outputter, MapCanvas):
 
             # which ones are on land?
             on_land = sc['status_codes'] == oil_status.on_land
-            self.draw_points(positions[on_land],
+            self.draw_pixels(self._beached_to_pixel(sc, on_land),
                              diameter=2,
                              color='black',
                              # color=color,
@@ -529,6 +556,40 @@ class Renderer(Outputter, MapCanvas):
                              color=color,
                              shape="round")
 
+    def _beached_to_pixel(self, sc, on_land):
+        """
+        pixel coordinates of the beached elements of sc
+
+        Beached elements do not move, so the pixels projected for the last
+        frame are reused for elements with the same id and position. Only
+        newly beached elements are projected. The cache is sorted by id so
+        the ids are looked up with searchsorted - the ids are not
+        necessarily in order along the data arrays.
+        """
+        ids = sc['id'][on_land]
+        lonlat = sc['positions'][on_land, :2]
+
+        pixels = np.empty((len(ids), 2), dtype=np.int32)
+        found = np.zeros(len(ids), dtype=bool)
+
+        cached = self._beached_pixels.get(sc.uncertain)
+        if cached is not None and len(cached[0]) > 0 and len(ids) > 0:
+            c_ids, c_lonlat, c_pixels = cached
+            idx = np.searchsorted(c_ids, ids).clip(max=len(c_ids) - 1)
+            found = ((c_ids[idx] == ids) &
+                     (c_lonlat[idx] == lonlat).all(axis=1))
+            pixels[found] = c_pixels[idx[found]]
+
+        if not found.all():
+            pixels[~found] = self.projection.to_pixel(lonlat[~found],
+                                                      asint=True)
+
+        order = np.argsort(ids, kind='mergesort')
+        self._beached_pixels[sc.uncertain] = (ids[order], lonlat[order],
+                                              pixels[order])
+
+        return pixels
+
     def draw_raster_map(self):
         """
         draws the raster map used for beaching to the image.
@@ -609,32 +670,81 @@ class Renderer(Outputter, MapCanvas):
         if self.draw_back_to_fore:
             self.copy_back_to_fore()
 
-        # draw prop for self.draw_ontop second so it draws on top
-        scp = self.cache.load_timestep(step_num).items()
-        if len(scp) == 1:
-            self.draw_elements(scp[0])
-        else:
-            if self.draw_ontop == 'forecast':
-                self.draw_elements(scp[1])
-                self.draw_elements(scp[0])
-            else:
-                self.draw_elements(scp[0])
-                self.draw_elements(scp[1])
+        scp = self._load_timestep(step_num).items()
+        self.draw_containers(scp)
 
         time_stamp = scp[0].current_time_stamp
         self.draw_timestamp(time_stamp)
         self.draw_props(time_stamp)
 
+        file_types = []
         for ftype in self.formats:
             if ftype == 'gif':
                 self.animation.add_frame(self.fore_image, self.delay)
             else:
-                self.save_foreground(image_filename, file_type=ftype)
+                file_types.append(ftype)
+
+        self.save_frame(image_filename, file_types)
         self.last_filename = image_filename
 
+        if islast_step:
+            self.wait_for_saves()
+
         return {'image_filename': image_filename,
                 'time_stamp': time_stamp}
 
+    def save_frame(self, filename, file_types):
+        """
+        save the foreground image to filename in each of file_types
+
+        If save_workers is 0, the files are written right away. Otherwise the
+        foreground image is copied to an array of color indices and sent to a
+        save worker process, so the next frame can be drawn while this one is
+        encoded -- libgd holds the GIL while it encodes, so a thread would
+        not overlap with drawing. At most 2 * save_workers frames are waiting
+        to be written.
+        """
+        if not self.save_workers or not file_types:
+            for ftype in file_types:
+                self.save_foreground(filename, file_type=ftype)
+            return
+
+        if self._save_pool is None:
+            self._save_pool = Pool(self.save_workers,
+                                   initializer=_init_save_worker,
+                                   initargs=(self._preset_colors,
+                                             self._added_colors))
+
+        # wait for the oldest frame to be written if too many are waiting
+        while (self._pending_saves and
+               (self._pending_saves[0].ready() or
+                len(self._pending_saves) >= 2 * self.save_workers)):
+            self._pending_saves.popleft().get()
+
+        self._pending_saves.append(self._save_pool.apply_async(
+            _save_frame_array,
+            (np.array(self.fore_image), filename, file_types)))
+
+    def wait_for_saves(self):
+        """
+        block until all frames handed to the save workers are written, then
+        shut down the workers
+        """
+        while self._pending_saves:
+            self._pending_saves.popleft().get()
+
+        if self._save_pool is not None:
+            self._save_pool.close()
+            self._save_pool.join()
+            self._save_pool = None
+
+    def rewind(self):
+        """
+        wait for frames that are still being written
+        """
+        super(Renderer, self).rewind()
+        self.wait_for_saves()
+
     def write_output_post_run(self, **kwargs):
         super(Renderer, **kwargs)
         if '.gif' in self.formats:
@@ -646,8 +756,19 @@ class Renderer(Outputter, MapCanvas):
         memory after this function exits - it returns current_time_stamp
         """
 
+        scp = self._load_timestep(step_num).items()
+        self.draw_containers(scp)
+
+        return scp[0].current_time_stamp
+
+    def draw_containers(self, scp):
+        """
+        draw the elements of the forecast and uncertain spill containers
+
+        :param scp: list of spill containers, as returned by
+            SpillContainerPairData.items()
+        """
         # draw prop for self.draw_ontop second so it draws on top
-        scp = self.cache.load_timestep(step_num).items()
         if len(scp) == 1:
             self.draw_elements(scp[0])
         else:
@@ -658,7 +779,94 @@ class Renderer(Outputter, MapCanvas):
                 self.draw_elements(scp[0])
                 self.draw_elements(scp[1])
 
-        return scp[0].current_time_stamp
+    def render_from_cache(self, cache, num_time_steps, processes=None):
+        """
+        Render the frames of a finished model run from its cache in a pool
+        of processes. Each worker draws on its own copy of the canvas; the
+        background is drawn once here and sent to the workers. The image
+        files are written by the workers and the animated gif, if 'gif' is
+        in formats, is assembled here in step order.
+
+        Every step is rendered -- output_timestep is not used.
+
+        :param cache: the ElementCache of the model run (model._cache)
+        :param num_time_steps: number of steps in the cache
+        :param processes=None: number of worker processes. Default is the
+            number of cores.
+
+        :returns: list of the image filenames, one per step
+
+        .. note:: property layers added with add_vec_prop() depend on the
+            model time and can only be drawn by write_output()
+        """
+        if self.props:
+            raise ValueError('property layers are not supported when '
+                             'rendering from the cache')
+
+        self.wait_for_saves()
+        self.clean_output_files()
+        self.draw_background()
+
+        file_types = [ftype for ftype in self.formats if ftype != 'gif']
+        make_gif = 'gif' in self.formats
+        if make_gif:
+            self.start_animation(self.anim_filename)
+
+        for ftype in file_types:
+            self.save_background(os.path.join(self.output_dir,
+                                              self.background_map_name),
+                                 file_type=ftype)
+
+        filenames = [os.path.join(self.output_dir,
+                                  self.foreground_filename_format
+                                  .format(step_num))
+                     for step_num in range(num_time_steps)]
+
+        # load the steps lazily so only the frames in flight are in memory
+        tasks = ((cache.load_timestep(step_num,
+                                      arrays=self.cache_arrays).items(),
+                  filenames[step_num], file_types, make_gif)
+                 for step_num in range(num_time_steps))
+
+        # colors added after the renderer was created
+        colors = self._added_colors[len(self.map_colors):]
+
+        pool = Pool(processes,
+                    initializer=_init_frame_worker,
+                    initargs=(self._frame_worker_kwargs(),
+                              colors,
+                              np.array(self.back_image)))
+        try:
+            # imap returns the frames in step order
+            for frame in pool.imap(_render_frame, tasks):
+                if make_gif:
+                    self.animation.add_frame(self.image_from_array(frame),
+                                             self.delay)
+        finally:
+            pool.close()
+            pool.join()
+
+        if make_gif:
+            self.animation.close_anim()
+
+        if filenames:
+            self.last_filename = filenames[-1]
+
+        return filenames
+
+    def _frame_worker_kwargs(self):
+        """
+        arguments for the Renderer used by each render_from_cache() worker.
+        The workers get the background as an image, so no map is needed.
+        """
+        return {'output_dir': self.output_dir,
+                'image_size': self.image_size,
+                'projection': self.projection,
+                'map_BB': self.viewport,
+                'draw_back_to_fore': self.draw_back_to_fore,
+                'draw_ontop': self.draw_ontop,
+                'formats': [],
+                'timestamp_attrib': self.timestamp_attribs}
 
     def projection_to_dict(self):
         """
@@ -713,6 +921,72 @@ class Renderer(Outputter, MapCanvas):
         return super(Renderer, cls).loads(json_data, saveloc, references)
 
 
+# Renderer of a render_from_cache() worker process
+_frame_renderer = None
+
+
+def _init_frame_worker(renderer_kwargs, colors, background):
+    """
+    set up the Renderer of a render_from_cache() worker process
+    """
+    global _frame_renderer
+
+    _frame_renderer = Renderer(**renderer_kwargs)
+    if colors:
+        _frame_renderer.add_colors(colors)
+
+    _frame_renderer.back_image = _frame_renderer.image_from_array(background)
+
+
+def _render_frame(args):
+    """
+    draw one frame in a render_from_cache() worker and save it. Returns the
+    frame as an array of color indices if it is needed for the animation.
+    """
+    scp, filename, file_types, return_frame = args
+    renderer = _frame_renderer
+
+    renderer.clear_foreground()
+    if renderer.draw_back_to_fore:
+        renderer.copy_back_to_fore()
+
+    renderer.draw_containers(scp)
+    renderer.draw_timestamp(scp[0].current_time_stamp)
+
+    for ftype in file_types:
+        renderer.save_foreground(filename, file_type=ftype)
+
+    return np.array(renderer.fore_image) if return_frame else None
+
+
+# palette of the images of a save_frame() worker process
+_save_palette = None
+
+
+def _init_save_worker(preset_colors, colors):
+    """
+    set up a save_frame() worker process with the palette of the Renderer
+    """
+    global _save_palette
+
+    _save_palette = (preset_colors, colors)
+
+
+def _save_frame_array(arr, filename, file_types):
+    """
+    save a frame given as an array of color indices to filename in each of
+    file_types - run by the save_frame() workers
+    """
+    preset_colors, colors = _save_palette
+
+    image = py_gd.from_array(arr, preset_colors=preset_colors)
+    if colors:
+        image.add_colors(colors)
+
+    for ftype in file_types:
+        image.save(filename, file_type=ftype)
+
+
 class GridVisLayer:
 
     def __init__(self,
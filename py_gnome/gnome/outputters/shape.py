@@ -4,15 +4,100 @@ shapefile  outputter
 
 import copy
 import os
+import struct
 import zipfile
+from datetime import date
+
+import numpy as np
 
 from colander import SchemaNode, String, drop
-import shapefile as shp
 
 from gnome.utilities.serializable import Serializable, Field
 
 from .outputter import Outputter, BaseSchema
 
+# The .shp, .shx and .dbf files are written directly rather than through
+# pyshp so the records of each step can be built from the data arrays in one
+# go and appended to the files. See the ESRI Shapefile Technical Description
+# for the layouts
+SHP_FILE_CODE = 9994
+SHP_VERSION = 1000
+SHP_POINT = 1
+SHP_HEADER_SIZE = 100
+
+# a point record: record header (big endian) followed by the content
+SHP_POINT_RECORD = np.dtype([('number', '>i4'),
+                             ('length', '>i4'),
+                             ('shape_type', '<i4'),
+                             ('x', '<f8'),
+                             ('y', '<f8')])
+SHX_RECORD = np.dtype([('offset', '>i4'),
+                       ('length', '>i4')])
+
+# content length of a point record in 16-bit words
+SHP_POINT_LENGTH = (SHP_POINT_RECORD.itemsize - 8) // 2
+
+# name, type, width and decimals of the dbf fields
+DBF_FIELDS = (('Year', 'C', 4, 0),
+              ('Month', 'C', 2, 0),
+              ('Day', 'C', 2, 0),
+              ('Hour', 'C', 2, 0),
+              ('LE id', 'N', 10, 0),
+              ('Depth', 'N', 18, 6),
+              ('Mass', 'N', 18, 6),
+              ('Age', 'N', 18, 0),
+              ('Status_Code', 'N', 3, 0))
+
+DBF_RECORD = np.dtype([('deleted', 'S1')] +
+                      [(name, 'S{0}'.format(width))
+                       for name, _type, width, _decimals in DBF_FIELDS])
+
+
+def shp_header(file_length, bbox):
+    '''
+    header of a .shp or .shx file of points
+
+    :param int file_length: total file length in bytes
+    :param bbox: (xmin, ymin, xmax, ymax) of all the points
+    '''
+    return (struct.pack('>7i', SHP_FILE_CODE, 0, 0, 0, 0, 0,
+                        file_length // 2) +
+            struct.pack('<2i8d', SHP_VERSION, SHP_POINT,
+                        *(tuple(bbox) + (0., 0., 0., 0.))))
+
+
+def dbf_header(num_records):
+    '''
+    header and field descriptors of the .dbf file
+    '''
+    today = date.today()
+    header_length = 32 + 32 * len(DBF_FIELDS) + 1
+    header = [struct.pack('<4BIHH20x', 3, today.year - 1900, today.month,
+                          today.day, num_records, header_length,
+                          DBF_RECORD.itemsize)]
+
+    for name, f_type, width, decimals in DBF_FIELDS:
+        header.append(struct.pack('<11sc4xBB14x', name.replace(' ', '_'),
+                                  f_type, width, decimals))
+    header.append('\r')
+
+    return ''.join(header)
+
+
+def format_dbf_column(values, width, decimals):
+    '''
+    format a numeric array as a column of fixed width dbf 'N' values
+    '''
+    text = (('%{0}.{1}f'.format(width, decimals) * len(values)) %
+            tuple(values.tolist()))
+
+    if len(text) != width * len(values):
+        raise ValueError('values do not fit in a dbf field of width {0}'
+                         .format(width))
+
+    return np.frombuffer(text, dtype='S{0}'.format(width))
+
+
 class ShapeSchema(BaseSchema):
     '''
     Nothing is required for initialization
@@ -33,6 +118,8 @@ class ShapeOutput(Outputter, Serializable):
     _state += [Field('filename', update=True, save=True), ]
     _schema = ShapeSchema
 
+    cache_arrays = ('positions', 'id', 'mass', 'age', 'status_codes')
+
     time_formatter = '%m/%d/%Y %H:%M'
     
     def __init__(self, filename, **kwargs):
@@ -103,97 +190,142 @@ class ShapeOutput(Outputter, Serializable):
         epsg += ',PRIMEM["Greenwich",0],'
         epsg += 'UNIT["degree",0.0174532925199433]]'
         self.epsg = epsg
-        
+
+        # number of records and bounding box written so far for the
+        # forecast (False) and uncertain (True) shapefile. The headers are
+        # written with these on the last step
+        self._num_records = {}
+        self._bbox = {}
+
         for sc in self.sc_pair.items():
-            w = shp.Writer(shp.POINT)
-            w.autobalance = 1
-
-            w.field('Year', 'C')
-            w.field('Month', 'C')
-            w.field('Day', 'C')
-            w.field('Hour', 'C')
-            w.field('LE id', 'N')
-            w.field('Depth', 'N')
-            w.field('Mass', 'N')
-            w.field('Age', 'N')
-            w.field('Status_Code', 'N')
-            
-            if sc.uncertain:
-                self.w_u = w
-            else:
-                self.w = w
-        
+            fn = self._shapefilename(sc.uncertain)
+            self._num_records[sc.uncertain] = 0
+            self._bbox[sc.uncertain] = None
+
+            # placeholder headers - records are appended after them
+            for suf in ('shp', 'shx'):
+                with open(fn + '.' + suf, 'wb') as outfile:
+                    outfile.write(shp_header(SHP_HEADER_SIZE,
+                                             (0., 0., 0., 0.)))
+
+            with open(fn + '.dbf', 'wb') as outfile:
+                outfile.write(dbf_header(0))
+
     def write_output(self, step_num, islast_step=False):
-        """dump a timestep's data into the kmz file"""
+        """dump a timestep's data into the shape files"""
 
         super(ShapeOutput, self).write_output(step_num, islast_step)
 
         if not self.on or not self._write_step:
             return None
 
-        uncertain = False
-        
-        for sc in self.cache.load_timestep(step_num).items():
-            
-            curr_time = sc.current_time_stamp
-            
-            if sc.uncertain: 
-                uncertain = True
-                for k, p in enumerate(sc['positions']):
-                    self.w_u.point(p[0], p[1])
-                    self.w_u.record(curr_time.year,
-                        curr_time.month,
-                        curr_time.day,
-                        curr_time.hour,
-                        sc['id'][k],
-                        p[2],
-                        sc['mass'][k],
-                        sc['age'][k],
-                        sc['status_codes'][k])
-            else:
-                for k, p in enumerate(sc['positions']):
-                    self.w.point(p[0], p[1])
-                    self.w.record(curr_time.year,
-                        curr_time.month,
-                        curr_time.day,
-                        curr_time.hour,
-                        sc['id'][k],
-                        p[2],
-                        sc['mass'][k],
-                        sc['age'][k],
-                        sc['status_codes'][k])
-       
+        for sc in self._load_timestep(step_num).items():
+            self._append_records(sc)
+
         if islast_step:  # now we really write the files:
-            
-            if uncertain:
-                shapefilenames = [self.filename, self.filename + '_uncert']
-            else:
-                shapefilenames = [self.filename]
-            
-            for fn in shapefilenames:
-
-                if uncertain:
-                    self.w_u.save(fn)
-                else:
-                    self.w.save(fn)
-                zfilename = fn + '.zip'
-
-                prj_file = open("%s.prj" % fn, "w")
-                prj_file.write(self.epsg)
-                prj_file.close()
-                
-                zipf = zipfile.ZipFile(zfilename, 'w')
-                for suf in ['shp', 'prj', 'dbf', 'shx']:
-                    f = os.path.split(fn)[-1] + '.' + suf
-                    zipf.write(os.path.join(self.filedir, f), arcname=f)
-                    os.remove(fn + '.' + suf)
-                zipf.close()
-                
+            for uncertain in self._num_records:
+                self._finish_shapefile(uncertain)
+
         output_info = {'time_stamp': sc.current_time_stamp.isoformat(),
                        'output_filename': self.filename + '.zip'}
 
         return output_info
 
+    def _shapefilename(self, uncertain):
+        'name of the forecast or uncertain shapefile without extension'
+        return self.filename + '_uncert' if uncertain else self.filename
+
+    def _append_records(self, sc):
+        '''
+        build the .shp, .shx and .dbf records of all elements in the spill
+        container and append them to the files
+        '''
+        positions = sc['positions']
+        num = len(positions)
+        if num == 0:
+            return
+
+        start = self._num_records[sc.uncertain]
+        numbers = np.arange(start, start + num)
+
+        shp_rec = np.empty(num, dtype=SHP_POINT_RECORD)
+        shp_rec['number'] = numbers + 1
+        shp_rec['length'] = SHP_POINT_LENGTH
+        shp_rec['shape_type'] = SHP_POINT
+        shp_rec['x'] = positions[:, 0]
+        shp_rec['y'] = positions[:, 1]
+
+        shx_rec = np.empty(num, dtype=SHX_RECORD)
+        shx_rec['offset'] = ((SHP_HEADER_SIZE +
+                              SHP_POINT_RECORD.itemsize * numbers) // 2)
+        shx_rec['length'] = SHP_POINT_LENGTH
+
+        curr_time = sc.current_time_stamp
+        columns = {'LE id': sc['id'],
+                   'Depth': positions[:, 2],
+                   'Mass': sc['mass'],
+                   'Age': sc['age'],
+                   'Status_Code': sc['status_codes']}
+
+        dbf_rec = np.empty(num, dtype=DBF_RECORD)
+        dbf_rec['deleted'] = ' '
+        for name, f_type, width, decimals in DBF_FIELDS:
+            if f_type == 'C':
+                value = getattr(curr_time, name.lower())
+                dbf_rec[name] = str(value).ljust(width)
+            else:
+                dbf_rec[name] = format_dbf_column(columns[name], width,
+                                                  decimals)
+
+        fn = self._shapefilename(sc.uncertain)
+        for suf, records in (('shp', shp_rec),
+                             ('shx', shx_rec),
+                             ('dbf', dbf_rec)):
+            with open(fn + '.' + suf, 'ab') as outfile:
+                outfile.write(records.tostring())
+
+        bbox = (positions[:, 0].min(), positions[:, 1].min(),
+                positions[:, 0].max(), positions[:, 1].max())
+        if self._bbox[sc.uncertain] is not None:
+            old = self._bbox[sc.uncertain]
+            bbox = (min(bbox[0], old[0]), min(bbox[1], old[1]),
+                    max(bbox[2], old[2]), max(bbox[3], old[3]))
+
+        self._bbox[sc.uncertain] = bbox
+        self._num_records[sc.uncertain] = start + num
+
+    def _finish_shapefile(self, uncertain):
+        '''
+        write the final headers and the prj file, then zip up the shapefile
+        '''
+        fn = self._shapefilename(uncertain)
+        num = self._num_records[uncertain]
+        bbox = self._bbox[uncertain] or (0., 0., 0., 0.)
+
+        with open(fn + '.shp', 'r+b') as outfile:
+            outfile.write(shp_header(SHP_HEADER_SIZE +
+                                     SHP_POINT_RECORD.itemsize * num, bbox))
+
+        with open(fn + '.shx', 'r+b') as outfile:
+            outfile.write(shp_header(SHP_HEADER_SIZE +
+                                     SHX_RECORD.itemsize * num, bbox))
+
+        with open(fn + '.dbf', 'r+b') as outfile:
+            outfile.write(dbf_header(num))
+            outfile.seek(0, os.SEEK_END)
+            outfile.write('\x1a')
+
+        prj_file = open("%s.prj" % fn, "w")
+        prj_file.write(self.epsg)
+        prj_file.close()
+
+        zfilename = fn + '.zip'
+        zipf = zipfile.ZipFile(zfilename, 'w')
+        for suf in ['shp', 'prj', 'dbf', 'shx']:
+            f = os.path.split(fn)[-1] + '.' + suf
+            zipf.write(os.path.join(self.filedir, f), arcname=f)
+            os.remove(fn + '.' + suf)
+        zipf.close()
 
     def rewind(self):
         '''
@@ -213,11 +345,12 @@ class ShapeOutput(Outputter, Serializable):
 
         here in case it needs to be called from elsewhere
         '''
-        try:
-            os.remove(self.filename + '.zip')
-            os.remove(self.filename + '_uncert.zip')
-        except OSError:
-            pass  # it must not be there
+        for fn in (self.filename, self.filename + '_uncert'):
+            for suf in ['zip', 'shp', 'prj', 'dbf', 'shx']:
+                try:
+                    os.remove(fn + '.' + suf)
+                except OSError:
+                    pass  # it must not be there
 
 
 
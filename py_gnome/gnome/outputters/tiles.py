@@ -0,0 +1,481 @@
+"""
+Tile outputter
+
+Renders the elements as XYZ ("slippy map") tiles, for web maps that zoom.
+"""
+import os
+import copy
+import shutil
+from glob import glob
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+
+from colander import SchemaNode, SequenceSchema, String, Int, drop
+
+from gnome.basic_types import oil_status
+from gnome.utilities.map_canvas import MapCanvas
+from gnome.utilities.projections import GeoProjection
+from gnome.utilities.serializable import Serializable, Field
+from gnome.utilities.file_tools import haz_files
+
+from .outputter import Outputter, BaseSchema
+
+# the latitude at which the web mercator map is square
+MAX_LATITUDE = 85.0511287798
+
+
+def to_mercator(coords):
+    """
+    project (lon, lat[, depth]) coordinates to web mercator, in "degrees":
+    the longitude is unchanged and the mercator y is scaled so the world is
+    360 x 360 units. The tiles are squares in these units, so the tiles can
+    be drawn with a GeoProjection.
+
+    :param coords: Nx2 or Nx3 array of (lon, lat[, depth]) coordinates
+
+    :returns: Nx2 array of (lon, mercator y)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+
+    lat = np.radians(np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE))
+
+    projected = np.empty((len(coords), 2), dtype=np.float64)
+    projected[:, 0] = coords[:, 0]
+    projected[:, 1] = np.degrees(np.log(np.tan(np.pi / 4 + lat / 2)))
+
+    return projected
+
+
+def tile_bounds(zoom, x, y):
+    """
+    bounding box of tile (x, y) at zoom in web mercator "degrees"
+    (see to_mercator())
+    """
+    size = 360.0 / 2 ** zoom
+
+    return ((x * size - 180.0, 180.0 - (y + 1) * size),
+            ((x + 1) * size - 180.0, 180.0 - y * size))
+
+
+def tiles_for_points(points, zoom, pad=0.0):
+    """
+    the tiles the points are drawn on at zoom
+
+    :param points: Nx2 array of web mercator points (see to_mercator())
+    :param zoom: the zoom level
+    :param pad=0.0: a point is also on the neighboring tiles that are
+        closer than pad, in web mercator "degrees" -- the size of the dots
+
+    :returns: a dict of {(x, y): indices of the points on the tile}
+    """
+    num_tiles = 2 ** zoom
+    size = 360.0 / num_tiles
+
+    x = (points[:, 0] + 180.0) / size
+    y = (180.0 - points[:, 1]) / size
+    pad /= size
+
+    x_min = np.floor(x - pad).astype(np.int64)
+    x_max = np.floor(x + pad).astype(np.int64)
+    y_min = np.floor(y - pad).astype(np.int64)
+    y_max = np.floor(y + pad).astype(np.int64)
+
+    idx = np.arange(len(points))
+    x_edge = x_max != x_min
+    y_edge = y_max != y_min
+    both = x_edge & y_edge
+
+    # every point is on its tile, and on up to 3 neighbors if near an edge
+    tile_x = np.concatenate((x_min, x_max[x_edge], x_min[y_edge],
+                             x_max[both]))
+    tile_y = np.concatenate((y_min, y_min[x_edge], y_max[y_edge],
+                             y_max[both]))
+    idx = np.concatenate((idx, idx[x_edge], idx[y_edge], idx[both]))
+
+    on_map = ((tile_x >= 0) & (tile_x < num_tiles) &
+              (tile_y >= 0) & (tile_y < num_tiles))
+    keys = tile_x[on_map] * num_tiles + tile_y[on_map]
+    idx = idx[on_map]
+
+    if len(keys) == 0:
+        return {}
+
+    order = np.argsort(keys, kind='mergesort')
+    keys = keys[order]
+    idx = idx[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    return dict(((int(key // num_tiles), int(key % num_tiles)), tile_idx)
+                for key, tile_idx in zip(keys[starts],
+                                         np.split(idx, starts[1:])))
+
+
+class TileCanvas(MapCanvas):
+    """
+    MapCanvas that draws one tile at a time: land on the background image,
+    elements on the foreground image.
+    """
+    map_colors = [('land', (255, 204, 153)),  # brown
+                  ('lake', (255, 255, 255)),  # white
+                  ('LE', (0, 0, 0)),  # black
+                  ('uncert_LE', (255, 0, 0)),  # red
+                  ]
+
+    def __init__(self, tile_size=256, land_polygons=()):
+        """
+        :param tile_size=256: width and height of the tiles in pixels
+        :param land_polygons=(): sequence of (polygon, is_lake) with the
+            polygons in web mercator (see to_mercator())
+        """
+        MapCanvas.__init__(self,
+                           (tile_size, tile_size),
+                           projection=GeoProjection(),
+                           preset_colors='BW')
+        self.add_colors(self.map_colors)
+
+        self.land_polygons = land_polygons
+        self.land_bounds = [(poly.min(axis=0), poly.max(axis=0))
+                            for poly, _is_lake in land_polygons]
+
+    def set_tile(self, zoom, x, y):
+        """
+        draw tile (x, y) at zoom next
+
+        only the projection is set -- setting the viewport would draw the
+        graticule
+        """
+        self.tile_bounds = tile_bounds(zoom, x, y)
+        self.projection.set_scale(self.tile_bounds, self.image_size)
+
+    def draw_land(self):
+        """
+        draw the land polygons that are on the tile to the background image
+        """
+        (min_x, min_y), (max_x, max_y) = self.tile_bounds
+
+        self.clear_background()
+        for (poly, is_lake), (low, high) in zip(self.land_polygons,
+                                                self.land_bounds):
+            if (high[0] < min_x or low[0] > max_x or
+                    high[1] < min_y or low[1] > max_y):
+                continue
+
+            self.draw_polygon(poly,
+                              fill_color='lake' if is_lake else 'land',
+                              background=True)
+
+    def draw_elements(self, points, on_land, uncertain):
+        """
+        draw elements to the foreground image, like Renderer.draw_elements()
+
+        :param points: Nx2 array of web mercator positions
+        :param on_land: N bool array -- True for beached elements
+        :param uncertain: True for uncertain elements
+        """
+        self.draw_points(points[on_land],
+                         diameter=2,
+                         color='black',
+                         shape="x")
+        self.draw_points(points[~on_land],
+                         diameter=2,
+                         color='uncert_LE' if uncertain else 'LE',
+                         shape="round")
+
+
+class ZoomLevels(SequenceSchema):
+    zoom = SchemaNode(Int())
+
+
+class TileOutputSchema(BaseSchema):
+    map_filename = SchemaNode(String(), missing=drop)
+    output_dir = SchemaNode(String(), missing=drop)
+    zoom_levels = ZoomLevels(missing=drop)
+    tile_size = SchemaNode(Int(), missing=drop)
+    processes = SchemaNode(Int(), missing=drop)
+
+
+class TileOutput(Outputter, Serializable):
+    """
+    Writes the elements of each output step as XYZ ("slippy map") tiles in
+    web mercator, at several zoom levels, for web maps::
+
+        output_dir/step_00000/{z}/{x}/{y}.png   the elements of step 0
+        output_dir/land/{z}/{x}/{y}.png         the land of the map
+
+    Only the tiles that elements are drawn on are written; a web map should
+    show missing element tiles as empty. The element tiles are transparent
+    so they can be put over the land tiles or any other base map.
+
+    The land does not change, so a land tile is only drawn the first time
+    elements are drawn on that tile. The land tiles are kept across runs
+    until the map, the tile size or the output_dir changes, or the land
+    directory is removed.
+
+    The tiles are drawn by a pool of worker processes while the model runs
+    the next steps. write_output() returns before the tiles of the step are
+    written -- the tiles of the run are all written when the last step is
+    output, or after wait_for_tiles().
+    """
+    land_dir = 'land'
+    step_dir_format = 'step_{0:05d}'
+    step_dir_glob = 'step_?????'
+    tile_format = os.path.join('{0}', '{1}', '{2}.png')
+
+    _state = copy.deepcopy(Outputter._state)
+    _state += [Field('map_filename', save=True, update=True,
+                     test_for_eq=False),
+               Field('output_dir', save=True, update=True,
+                     test_for_eq=False),
+               Field('zoom_levels', save=True, update=True),
+               Field('tile_size', save=True, update=True),
+               Field('processes', save=True, update=True)]
+    _schema = TileOutputSchema
+
+    cache_arrays = ('positions', 'status_codes')
+
+    def __init__(self,
+                 map_filename=None,
+                 output_dir='./',
+                 zoom_levels=(6, 7, 8, 9, 10),
+                 tile_size=256,
+                 processes=None,
+                 **kwargs):
+        """
+        :param map_filename=None: BNA file of the land. If None, no land
+            tiles are drawn
+        :param output_dir='./': directory the tiles are written to
+        :param zoom_levels=(6, 7, 8, 9, 10): the zoom levels to draw the
+            tiles for. At zoom z, the world is 2**z by 2**z tiles
+        :param tile_size=256: width and height of the tiles in pixels
+        :param processes=None: number of worker processes drawing the tiles.
+            Default is the number of cores. If 0, the tiles are drawn in
+            this process when each step is output.
+
+        use super to pass optional \*\*kwargs to base class __init__ method
+        """
+        self.map_filename = map_filename
+        self.zoom_levels = zoom_levels
+        self.tile_size = tile_size
+        self.processes = processes
+
+        self._pool = None
+        self._pending = deque()
+
+        # the land tiles that have been drawn, and the (map_filename,
+        # tile_size, output_dir) they were drawn for
+        self._land_tiles = set()
+        self._land_key = None
+
+        super(TileOutput, self).__init__(output_dir=output_dir, **kwargs)
+
+    def land_polygons(self):
+        """
+        the land polygons of the map in web mercator, as (polygon, is_lake)
+        """
+        if self.map_filename is None:
+            return []
+
+        polygons = []
+        for poly in haz_files.ReadBNA(self.map_filename, 'PolygonSet'):
+            kind = poly.metadata[1].strip().lower().replace(' ', '')
+            if kind in ('mapbounds', 'spillablearea'):
+                continue
+
+            polygons.append((to_mercator(poly), poly.metadata[2] == '2'))
+
+        return polygons
+
+    def prepare_for_model_run(self, *args, **kwargs):
+        """
+        prepares the outputter for a model run.
+
+        Parameters passed to base class (use super): model_start_time, cache
+
+        Cleans out the tiles of the previous run and reads the land polygons
+        for the workers that draw the tiles
+        """
+        super(TileOutput, self).prepare_for_model_run(*args, **kwargs)
+
+        if not self.on:
+            return
+
+        self.wait_for_tiles()
+        self.clean_output_files()
+
+        land_key = (self.map_filename, self.tile_size, self.output_dir)
+        land_dir = os.path.join(self.output_dir, self.land_dir)
+        if land_key != self._land_key or not os.path.isdir(land_dir):
+            if os.path.isdir(land_dir):
+                shutil.rmtree(land_dir)
+
+            self._land_tiles = set()
+            self._land_key = land_key
+
+        self._worker_args = (self.tile_size, self.land_polygons())
+
+        if self.processes == 0:
+            _init_tile_worker(*self._worker_args)
+
+    def write_output(self, step_num, islast_step=False):
+        """
+        hand the tiles of step_num to the workers
+
+        :returns: A dict of info about this step number if this step
+            is to be output, None otherwise.
+            'step_num': step_num
+            'tile_url': path of the tiles of the step, with {z}, {x} and
+                {y} for the tile
+            'tiles': {zoom: list of (x, y) of the tiles written}
+            'time_stamp': time_stamp # as ISO string
+        """
+        super(TileOutput, self).write_output(step_num, islast_step)
+
+        if not self._write_step:
+            return None
+
+        scp = self._load_timestep(step_num).items()
+
+        step_dir = os.path.join(self.output_dir,
+                                self.step_dir_format.format(step_num))
+
+        # web mercator positions of the elements and which ones are on land
+        elements = [(to_mercator(sc['positions']),
+                     sc['status_codes'] == oil_status.on_land,
+                     sc.uncertain) for sc in scp]
+        # the forecast is drawn last, so it is on top
+        elements.sort(key=lambda e: not e[2])
+
+        tasks = []
+        tiles = {}
+        for zoom in self.zoom_levels:
+            # the dots are 2 pixels across
+            pad = 2 * 360.0 / 2 ** zoom / self.tile_size
+
+            tile_elements = {}
+            for points, on_land, uncertain in elements:
+                for tile, idx in tiles_for_points(points, zoom,
+                                                  pad).iteritems():
+                    tile_elements.setdefault(tile, []).append(
+                        (points[idx], on_land[idx], uncertain))
+
+            for (x, y), tile_data in sorted(tile_elements.iteritems()):
+                land_file = None
+                if self.map_filename is not None and \
+                        (zoom, x, y) not in self._land_tiles:
+                    land_file = os.path.join(self.output_dir, self.land_dir,
+                                             self.tile_format.format(zoom,
+                                                                     x, y))
+                    self._land_tiles.add((zoom, x, y))
+
+                tasks.append((zoom, x, y,
+                              os.path.join(step_dir,
+                                           self.tile_format.format(zoom,
+                                                                   x, y)),
+                              tile_data,
+                              land_file))
+
+            tiles[zoom] = sorted(tile_elements)
+
+        if self.processes == 0:
+            for task in tasks:
+                _render_tile(task)
+        else:
+            if self._pool is None:
+                self._pool = Pool(self.processes,
+                                  initializer=_init_tile_worker,
+                                  initargs=self._worker_args)
+
+            self._pending.append(self._pool.map_async(_render_tile, tasks))
+
+            # don't let the model get too far ahead of the workers
+            while len(self._pending) > 2:
+                self._pending.popleft().get()
+
+        if islast_step:
+            self.wait_for_tiles()
+
+        return {'step_num': step_num,
+                'tile_url': os.path.join(step_dir,
+                                         self.tile_format.format('{z}',
+                                                                 '{x}',
+                                                                 '{y}')),
+                'tiles': tiles,
+                'time_stamp': scp[0].current_time_stamp.isoformat()}
+
+    def wait_for_tiles(self):
+        """
+        block until all the tiles handed to the workers are written, then
+        shut down the workers
+        """
+        while self._pending:
+            self._pending.popleft().get()
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def rewind(self):
+        """
+        wait for tiles that are still being written
+        """
+        super(TileOutput, self).rewind()
+        self.wait_for_tiles()
+
+    def clean_output_files(self):
+        """
+        remove the element tiles -- the land tiles are kept
+        """
+        for step_dir in glob(os.path.join(self.output_dir,
+                                          self.step_dir_glob)):
+            shutil.rmtree(step_dir)
+
+
+# TileCanvas of a TileOutput worker process
+_tile_canvas = None
+
+
+def _init_tile_worker(tile_size, land_polygons):
+    """
+    set up the TileCanvas of a worker process
+    """
+    global _tile_canvas
+
+    _tile_canvas = TileCanvas(tile_size, land_polygons)
+
+
+def _makedirs(filename):
+    dirname = os.path.dirname(filename)
+    if not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            # another worker made it
+            if not os.path.isdir(dirname):
+                raise
+
+
+def _render_tile(args):
+    """
+    draw the elements on one tile and save it, and the land tile if
+    land_file is not None
+    """
+    zoom, x, y, filename, tile_data, land_file = args
+    canvas = _tile_canvas
+
+    canvas.set_tile(zoom, x, y)
+
+    if land_file is not None:
+        canvas.draw_land()
+        _makedirs(land_file)
+        canvas.save_background(land_file)
+
+    canvas.clear_foreground()
+    for points, on_land, uncertain in tile_data:
+        canvas.draw_elements(points, on_land, uncertain)
+
+    _makedirs(filename)
+    canvas.save_foreground(filename)
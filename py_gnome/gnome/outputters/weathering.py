@@ -52,6 +52,9 @@ class WeatheringOutput(Outputter, Serializable):
     _state += [Field('output_dir', update=True, save=True)]
     _schema = WeatheringOutputSchema
 
+    # only the mass_balance is written
+    cache_arrays = ()
+
     def __init__(self,
                  output_dir=None,   # default is to not output to file
                  **kwargs):
@@ -81,7 +84,7 @@ class WeatheringOutput(Outputter, Serializable):
 
         # return a dict - json of the mass_balance data
         # weathering outputter should only apply to forecast spill_container
-        sc = self.cache.load_timestep(step_num).items()[0]
+        sc = self._load_timestep(step_num).items()[0]
 
         dict_ = {}
         dict_.update(sc.mass_balance)
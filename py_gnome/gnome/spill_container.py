@@ -50,6 +50,21 @@ substances_spills = namedtuple('substances_spills',
 
 
 class FateDataView(AddLogger):
+    '''
+    Gives weatherers the data arrays for the elements of one substance that
+    are in a given fate.
+
+    The elements selected for each fate are cached until the
+    SpillContainer's fate groups change - see
+    SpillContainer._fate_groups(). If the selected elements are a contiguous
+    range, which is the usual case since most elements are on the surface,
+    the data returned are views into the SpillContainer's arrays and no copy
+    back is needed. Otherwise the arrays are copied and update_sc() scatters
+    them back.
+
+    Elements are never reordered: the C++ movers keep per-element records,
+    like the wind and current uncertainty, by position in the arrays.
+    '''
     _dicts_ = ('surface_weather', 'subsurf_weather', 'skim', 'burn',
                'disperse', 'non_weather', 'all')
 
@@ -69,9 +84,21 @@ class FateDataView(AddLogger):
         # properties of old LEs and properties of newly released LEs
         self.all = {}
 
+        # per fate: selector into SC arrays (slice or index array), copy of
+        # 'fate_status' at the time the selector was made, and for each entry
+        # of the fate's dict, the (SC array, array given out) it came from
+        self._selectors = {}
+        self._fate_status = {}
+        self._sources = {}
+
+        # SpillContainer fate groups generation the selectors are valid for
+        self._group_gen = None
+
     def _get_fate_mask(self, sc, fate):
         '''
         get fate_status mask over SC - only include LEs with 'mass' > 0.0
+        that are not to be removed. LEs that moved off the map this step are
+        not weathered.
         '''
         if fate == 'all':
             # look at all fate data
@@ -81,26 +108,66 @@ class FateDataView(AddLogger):
                       getattr(bt_fate, fate))
 
         w_mask = np.logical_and(w_mask, sc['mass'] > 0.0)
+        w_mask &= sc['status_codes'] != oil_status.to_be_removed
         return w_mask
 
-    def _set_data(self, sc, array_types, fate_mask, fate):
+    def _get_selector(self, sc, fate):
         '''
-        fate_mask is the data already masked for the desired 'fate' option
+        return the selector for 'fate' - a slice if selected elements are
+        contiguous, else an index array. Selectors are cached until the
+        SpillContainer's fate groups change.
         '''
-        # return all data associated with substance
-        if 'substance' in sc:
-            fate_mask = np.logical_and(sc['substance'] == self.substance_id,
-                                       fate_mask)
+        group_gen = sc._fate_groups()
+        if group_gen != self._group_gen:
+            # elements may have changed fate - cached data is invalid
+            self.reset()
+            self._group_gen = group_gen
+
+        if fate not in self._selectors:
+            fate_mask = self._get_fate_mask(sc, fate)
+
+            # return all data associated with substance
+            if 'substance' in sc:
+                fate_mask = np.logical_and(sc['substance'] ==
+                                           self.substance_id,
+                                           fate_mask)
+
+            idx = np.flatnonzero(fate_mask)
+            if len(idx) == 0:
+                selector = slice(0, 0)
+            elif idx[-1] - idx[0] + 1 == len(idx):
+                selector = slice(idx[0], idx[-1] + 1)
+            else:
+                selector = idx
+
+            self._selectors[fate] = selector
+            if 'fate_status' in sc:
+                self._fate_status[fate] = sc['fate_status'][selector].copy()
 
-        if np.all(fate_mask):
+        return self._selectors[fate]
+
+    def _set_data(self, sc, array_types, selector, fate):
+        '''
+        selector is a slice or index array of the elements for 'fate'
+        '''
+        if (isinstance(selector, slice) and
+                selector.stop - selector.start == len(sc)):
             # no need to make a copy of array
             setattr(self, fate, sc._data_arrays)
         else:
             dict_to_update = getattr(self, fate)
+            if dict_to_update is sc._data_arrays:
+                dict_to_update = {}
+
+            sources = self._sources.setdefault(fate, {})
             for at in array_types:
                 array = sc._array_name(at)
-                if array not in dict_to_update:
-                    dict_to_update[array] = sc[array][fate_mask]
+                # SC array may have been replaced by a weatherer assigning to
+                # the 'all' dict, so check we are looking at the current one
+                if (array not in dict_to_update or
+                        sources.get(array, (None,))[0] is not sc[array]):
+                    dict_to_update[array] = sc[array][selector]
+                    sources[array] = (sc[array], dict_to_update[array])
 
             setattr(self, fate, dict_to_update)
 
@@ -115,45 +182,38 @@ class FateDataView(AddLogger):
         # always add 'id' to array_types
         array_types.update({'id'})
         self._set_data(sc, array_types,
-                       self._get_fate_mask(sc, fate),
+                       self._get_selector(sc, fate),
                        fate)
         return getattr(self, fate)
 
     def update_sc(self, sc, fate='surface_weather'):
         '''
-        update SC arrays with data viewer arrays for specified fate
-        - update all arrays just to make sure everything is in sync
+        update SC arrays with data viewer arrays for specified fate. Arrays
+        that are views into the SC arrays are already up to date; only copies
+        and arrays the weatherer replaced in the dict are written back.
 
-        After update, remove LEs with mass = 0. Since weatherers call this at
-        the end of a weathering step, this ensures zero mass LEs are removed
-        from the arrays.
+        If the 'fate_status' of LEs changed or some LEs now have zero mass,
+        the selectors are recomputed the next time a weatherer asks for data.
 
         .. note:: the 'id' of each LE corresponds with the index into SC array
             however, if LEs are removed, then this will not be the case. Do not
-            rely on this indexing. Instead, get the mask again - the assumption
-            is that the fate_mask should be the same between getting the data
-            and resync'ing the original arrays in the SC
+            rely on this indexing. The assumption is that the fate groups do
+            not change between getting the data and resync'ing the original
+            arrays in the SC
         '''
         d_to_sync = getattr(self, fate)
-
-        if d_to_sync is sc._data_arrays:
+        if len(d_to_sync) == 0 or fate not in self._selectors:
             return
 
-        w_mask = self._get_fate_mask(sc, fate)
-
-        if 'substance' in sc:
-            w_mask = np.logical_and(sc['substance'] == self.substance_id,
-                                    w_mask)
+        selector = self._selectors[fate]
 
-        # if fate_status of LEs was updated, then reset data attribute. This is
-        # because the data in the attribute is no longer valid. For instance,
-        # if the 'burn' started with 'surface_weather' data_arrays, then
-        # marked some of these LEs to be burned, they should no longer be
-        # contained in the 'surface_weather' dict - easisest to reset the dict
-        # and let it be recreated when the next weatherer asks for data.
+        # if fate_status of LEs was updated, the grouping is no longer valid.
+        # For instance, if the 'burn' started with 'surface_weather'
+        # data_arrays, then marked some of these LEs to be burned, they
+        # should no longer be part of the 'surface_weather' group
         reset_view = False
-        if ('fate_status' in d_to_sync and
-                np.any(sc['fate_status'][w_mask] != d_to_sync['fate_status'])):
+        if ('fate_status' in d_to_sync and fate in self._fate_status and
+                np.any(d_to_sync['fate_status'] != self._fate_status[fate])):
             reset_view = True
         elif ('mass' in d_to_sync and
               np.any(np.isclose(d_to_sync['mass'], 0))):
@@ -162,24 +222,289 @@ class FateDataView(AddLogger):
             self.logger.debug(self._pid + "found LEs with 'mass' equal to 0. "
                               "reset_view")
 
-        for key, val in d_to_sync.iteritems():
-            sc[key][w_mask] = val
+        if d_to_sync is not sc._data_arrays:
+            is_view = isinstance(selector, slice)
+            sources = self._sources.get(fate, {})
+
+            for key, val in d_to_sync.iteritems():
+                source, given = sources.get(key, (None, None))
+                if is_view and source is sc[key] and given is val:
+                    continue
+
+                sc[key][selector] = val
 
         if reset_view:
-            setattr(self, fate, {})
+            sc._fate_groups_valid = False
+
+
+class SubstanceProperties(object):
+    '''
+    Per-run cache of substance properties used in the weathering inner loop.
+
+    Wraps a substance (OilProps object). The temperature dependent curves
+    vapor_pressure(), kvis_at_temp() and density_at_temp() are memoized by
+    exact temperature; water temperature is constant or changes slowly so
+    these are usually computed once per run. Properties that do not change
+    during a run, like component_density, are read from the substance once.
+    All other attributes are passed through to the substance.
+
+    The SpillContainer creates one per substance in prepare_for_model_run()
+    - see SpillContainer.substance_properties()
+    '''
+    _constant_attrs = ('molecular_weight', 'component_density',
+                       'mass_fraction', 'num_components')
 
-    def _reset_fatedata(self, sc, ix):
+    def __init__(self, substance):
+        self.substance = substance
+        self._curves = {'vapor_pressure': {},
+                        'kvis_at_temp': {},
+                        'density_at_temp': {}}
+
+    def __getattr__(self, name):
+        # only called if name is not found on self
+        if name.startswith('__') or name in ('substance', '_curves'):
+            raise AttributeError(name)
+
+        val = getattr(self.substance, name)
+        if name in self._constant_attrs:
+            setattr(self, name, val)
+
+        return val
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}({0.substance!r})'.format(self))
+
+    def _curve(self, name, temp=None):
         '''
-        reset all arrays that contain LE with 'id' = ix
+        return the value of substance.<name>(temp) from the cache. Only
+        scalar temperatures are cached.
         '''
-        for fate in self._dicts_:
-            data = getattr(self, fate)
-            if len(data) > 0:
-                idx = np.where(data['id'] == ix)[0]
-                if len(idx) > 0:
-                    self._set_data(sc, data.keys(),
-                                   self._get_fate_mask(sc, fate),
-                                   fate)
+        if temp is not None and np.ndim(temp) != 0:
+            return getattr(self.substance, name)(temp)
+
+        key = None if temp is None else float(temp)
+        cache = self._curves[name]
+        try:
+            return cache[key]
+        except KeyError:
+            if temp is None:
+                val = getattr(self.substance, name)()
+            else:
+                val = getattr(self.substance, name)(temp)
+
+            if isinstance(val, np.ndarray):
+                # same array is returned to every caller so protect it
+                val = val.copy()
+                val.setflags(write=False)
+
+            cache[key] = val
+            return val
+
+    def vapor_pressure(self, temp):
+        return self._curve('vapor_pressure', temp)
+
+    def kvis_at_temp(self, temp=None):
+        return self._curve('kvis_at_temp', temp)
+
+    def density_at_temp(self, temp=None):
+        return self._curve('density_at_temp', temp)
+
+
+class MassBalanceLedger(object):
+    '''
+    Running totals of the mass_balance entries that are sums of 'mass' over
+    the elements in a given state: 'amount_released', 'floating',
+    'non_weathering', 'beached' and 'off_maps'.
+
+    Rather than summing the mass arrays every step, the totals are updated
+    where the state of elements changes - release, fate or status changes
+    and removal - using only the elements that changed. Mass removed from
+    floating elements by a weatherer is taken from the weatherer's own
+    mass_balance entry, see floating_losses.
+
+    If debug is True, check() recomputes the totals from the data arrays and
+    raises a GnomeRuntimeError if they do not agree.
+
+    The SpillContainer creates one in rewind() - see
+    SpillContainer.mass_ledger
+    '''
+    # mass_balance entries for mass removed from floating elements
+    floating_losses = ('evaporated', 'natural_dispersion', 'sedimentation',
+                       'dissolution', 'skimmed', 'burned', 'chem_dispersed',
+                       'boomed', 'observed_beached')
+
+    # cross-check the totals against the data arrays in check()
+    debug = False
+
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(amount_released={0.amount_released}, '
+                'beached={0.beached}, off_maps={0.off_maps})'.format(self))
+
+    def reset(self):
+        self.amount_released = 0.0
+        self.non_weathering = 0.0
+        self.beached = 0.0
+        self.off_maps = 0.0
+
+        # floating mass before weatherer losses are subtracted
+        self._floating = 0.0
+        # mass removed from floating elements that is not in mass_balance
+        self._lost = 0.0
+
+    @staticmethod
+    def floating_weight(fate_status, status_codes):
+        '''
+        weight of each element's mass in the 'floating' total. Floating
+        includes elements marked to be skimmed, burned or dispersed, but not
+        elements that are on land or to be removed.
+        '''
+        weight = np.zeros((len(status_codes),), dtype=np.int8)
+
+        if fate_status is not None:
+            weight += fate_status == bt_fate.surface_weather
+            weight += fate_status == bt_fate.non_weather
+            for f in (bt_fate.skim, bt_fate.burn, bt_fate.disperse):
+                weight += fate_status & f == f
+
+        weight -= status_codes == oil_status.on_land
+        weight -= status_codes == oil_status.to_be_removed
+
+        return weight
+
+    def _add(self, mass, fate_status, status_codes, sign):
+        'add (sign=1) or subtract (sign=-1) the elements to the totals'
+        if len(mass) == 0:
+            return
+
+        self._floating += sign * np.dot(mass,
+                                        self.floating_weight(fate_status,
+                                                             status_codes))
+        self.beached += sign * mass[status_codes == oil_status.on_land].sum()
+
+        if fate_status is not None:
+            self.non_weathering += \
+                sign * mass[fate_status == bt_fate.non_weather].sum()
+
+    def state(self, sc, selector):
+        '''
+        :returns: copy of (fate_status, status_codes) of the selected
+            elements. Pass it to update() after changing them. fate_status is
+            None if sc has no 'fate_status' array.
+
+        :param sc: SpillContainer or a dict of its data arrays, like the
+            data a FateDataView gives a weatherer
+        :param selector: slice, index array or mask of the elements
+        '''
+        fate_status = None
+        if 'fate_status' in sc:
+            fate_status = sc['fate_status'][selector].copy()
+
+        return (fate_status, sc['status_codes'][selector].copy())
+
+    def release(self, sc, selector):
+        '''
+        add newly released elements
+        '''
+        mass = sc['mass'][selector]
+
+        self.amount_released += mass.sum()
+        self._add(mass, *self.state(sc, selector), sign=1)
+
+    def remove(self, sc, selector):
+        '''
+        take out elements that are about to be deleted from sc
+        '''
+        self._add(sc['mass'][selector], *self.state(sc, selector), sign=-1)
+
+    def update(self, sc, selector, before):
+        '''
+        the fate_status and/or status_codes of the selected elements changed.
+        Only the selected elements are looked at.
+
+        :param before: state(sc, selector) before the change
+        '''
+        mass = sc['mass'][selector]
+        fate_before, status_before = before
+        fate_after, status_after = self.state(sc, selector)
+
+        self._add(mass, fate_before, status_before, sign=-1)
+        self._add(mass, fate_after, status_after, sign=1)
+
+        self.off_maps += mass[(status_after == oil_status.off_maps) &
+                              (status_before != oil_status.off_maps)].sum()
+
+    def lose(self, amount):
+        '''
+        mass removed from floating elements that is not recorded in one of
+        the floating_losses entries of mass_balance
+        '''
+        self._lost += amount
+
+    def floating(self, mass_balance):
+        '''
+        :returns: floating mass
+        '''
+        lost = self._lost
+        for key in self.floating_losses:
+            lost += mass_balance.get(key, 0.0)
+
+        return self._floating - lost
+
+    def full_totals(self, sc):
+        '''
+        recompute 'floating', 'non_weathering' and 'beached' from the data
+        arrays of sc
+        '''
+        mass = sc['mass']
+        status_codes = sc['status_codes']
+        fate_status = sc['fate_status'] if 'fate_status' in sc else None
+
+        totals = {'beached': mass[status_codes == oil_status.on_land].sum()}
+        if fate_status is not None:
+            totals['floating'] = \
+                np.dot(mass, self.floating_weight(fate_status, status_codes))
+            totals['non_weathering'] = \
+                mass[fate_status == bt_fate.non_weather].sum()
+
+        return totals
+
+    def restore(self, sc):
+        '''
+        set the totals from the data arrays and mass_balance of sc, for
+        instance when a run is restarted from saved data
+        '''
+        self.reset()
+
+        totals = self.full_totals(sc)
+        self.beached = totals['beached']
+        self.non_weathering = totals.get('non_weathering', 0.0)
+        self.amount_released = sc.mass_balance.get('amount_released', 0.0)
+        self.off_maps = sc.mass_balance.get('off_maps', 0.0)
+
+        self._floating = (totals.get('floating', 0.0) -
+                          self.floating(sc.mass_balance))
+
+    def check(self, sc):
+        '''
+        if debug is True, compare the totals with full_totals(sc). Does
+        nothing otherwise.
+        '''
+        if not self.debug:
+            return
+
+        ledger = {'floating': self.floating(sc.mass_balance),
+                  'non_weathering': self.non_weathering,
+                  'beached': self.beached}
+        atol = 1e-8 * max(self.amount_released, 1.0)
+
+        for key, val in self.full_totals(sc).iteritems():
+            if abs(ledger[key] - val) > atol:
+                raise GnomeRuntimeError("mass balance '{0}' is {1} but the "
+                                        "data arrays give {2}"
+                                        .format(key, ledger[key], val))
 
 
 class SpillContainerData(object):
@@ -380,6 +705,11 @@ class SpillContainer(AddLogger, SpillContainerData):
     """
     def __init__(self, uncertain=False):
         super(SpillContainer, self).__init__(uncertain=uncertain)
+
+        # if set, the elements released by a spill in a time step are
+        # represented by at most this many elements - see _collapse_release()
+        self.elements_per_release = None
+
         self.spills = OrderedCollection(dtype=gnome.spill.spill.BaseSpill)
         self.spills.register_callback(self._spills_changed,
                                       ('add', 'replace', 'remove'))
@@ -425,19 +755,73 @@ class SpillContainer(AddLogger, SpillContainerData):
         self._substances_spills = None
         self._oil_comp_array_len = None
 
+    def _reset__substance_properties(self):
+        # per-run cache of substance property curves, keyed by id(substance)
+        self._substance_props = {}
+
+    def substance_properties(self, substance):
+        '''
+        return the SubstanceProperties object that caches property curves of
+        substance for this run. Weatherers pass this in place of the
+        substance to their per element computations.
+        '''
+        try:
+            subs, props = self._substance_props[id(substance)]
+            if subs is substance:
+                return props
+        except KeyError:
+            pass
+
+        props = SubstanceProperties(substance)
+        self._substance_props[id(substance)] = (substance, props)
+
+        return props
+
     def _reset__fate_data_list(self):
         # define the fate view of the data if 'fate_status' is in data arrays
         # 'fate_status' is included if weathering is on
         self._fate_data_list = []
 
+        # FateDataView selectors are recomputed when this is False - see
+        # _fate_groups()
+        self._fate_groups_valid = False
+        self._fate_groups_gen = 0
+
     def reset_fate_dataview(self):
         '''
         reset data arrays for each fate_dataviewer. Each substance that is not
         None has a fate_dataviewer object.
+
+        The elements in each fate are selected again the next time a
+        weatherer asks for data.
         '''
+        self._fate_groups_valid = False
         for viewer in self._fate_data_list:
             viewer.reset()
 
+    def _fate_groups(self):
+        '''
+        Generation of the grouping of elements by
+        (substance, active, fate_status), where active elements have
+        mass > 0 and are not to be removed. The grouping changes when
+        elements are released, split, marked to be removed or their
+        fate_status changes; FateDataView then discards its cached
+        selectors.
+
+        Elements are not moved in the data arrays to make the groups
+        contiguous. The C++ movers keep per-element records by array
+        position, e.g. the uncertainty of WindMover, so reordering the
+        arrays would give the records to the wrong elements.
+
+        :returns: generation of the grouping. It is incremented each time the
+            grouping is invalidated.
+        '''
+        if not self._fate_groups_valid:
+            self._fate_groups_valid = True
+            self._fate_groups_gen += 1
+
+        return self._fate_groups_gen
+
     def _set_substancespills(self):
         '''
         _substances could change when spills are added/deleted
@@ -771,9 +1155,13 @@ class SpillContainer(AddLogger, SpillContainerData):
         self._reset_arrays()
         self._reset__substances_spills()
         self._reset__fate_data_list()
+        self._reset__substance_properties()
         self.initialize_data_arrays()
         self.mass_balance = {}  # reset to empty array
 
+        # running totals for mass_balance - see MassBalanceLedger
+        self.mass_ledger = MassBalanceLedger()
+
     def get_spill_mask(self, spill):
         return self['spill_num'] == self.spills.index(spill)
 
@@ -837,9 +1225,13 @@ class SpillContainer(AddLogger, SpillContainerData):
         if 'fate_status' in self.array_types:
             self._set_fate_data_list()
 
+        # substance or its properties may have changed since last run
+        self._reset__substance_properties()
+
         # 'substance' data_array may have been added so initialize after
         # _set_substancespills() is invoked
         self.initialize_data_arrays()
+        self.mass_ledger.reset()
 
         # todo: maybe better to let map do this, but it does not have a
         # prepare_for_model_run() yet so can't do it there
@@ -918,6 +1310,8 @@ class SpillContainer(AddLogger, SpillContainerData):
                                                  model_time,
                                                  time_step,
                                                  self._data_arrays)
+                    num_rel = self._collapse_release(num_rel)
+                    self.mass_ledger.release(self, slice(-num_rel, None))
                     num_rel_by_substance += num_rel
 
             # always reset data arrays else the changing arrays are stale
@@ -931,6 +1325,33 @@ class SpillContainer(AddLogger, SpillContainerData):
 
         return total_released
 
+    def _collapse_release(self, num_rel):
+        '''
+        If elements_per_release is set, keep that many of the num_rel
+        elements just released by a spill and give them the mass of all
+        num_rel elements. Elements released together by a spill in a time
+        step form a blob that weathers as a unit (see FayGravityViscous), so
+        without transport a few elements give the same mass balance as the
+        full set. The kept elements are spread evenly over the released
+        ones, so a line release keeps its extent.
+
+        :returns: number of elements kept
+        '''
+        num_keep = self.elements_per_release
+        if num_keep is None or num_rel <= num_keep:
+            return num_rel
+
+        keep = np.linspace(0, num_rel - 1, num_keep).round().astype(int)
+        drop = (np.setdiff1d(np.arange(num_rel), keep) +
+                len(self['id']) - num_rel)
+
+        for key in self._array_types.keys():
+            self._data_arrays[key] = np.delete(self[key], drop, axis=0)
+
+        self['mass'][-num_keep:] *= float(num_rel) / num_keep
+
+        return num_keep
+
     def split_element(self, ix, num, l_frac=None):
         '''
         split an element into specified number.
@@ -963,13 +1384,8 @@ class SpillContainer(AddLogger, SpillContainerData):
             data[idx + len(split_elems) - 1] = split_elems[-1]
             self._data_arrays[name] = data
 
-        # update fate_dataview which contains this LE
-        # for now we only have one type of substance
-        if len(self._fate_data_list) > 1:
-            msg = "split_elements assumes only one substance is being modeled"
-            self.logger.error(msg)
-
-        self._fate_data_list[0]._reset_fatedata(self, ix)
+        # data arrays were replaced - fate_dataviews must get new data
+        self.reset_fate_dataview()
 
     def model_step_is_done(self):
         '''
@@ -985,10 +1401,14 @@ class SpillContainer(AddLogger, SpillContainerData):
                                  oil_status.to_be_removed)[0]
 
         if len(to_be_removed) > 0:
+            self.mass_ledger.remove(self, to_be_removed)
+
             for key in self._array_types.keys():
                 self._data_arrays[key] = np.delete(self[key], to_be_removed,
                                                    axis=0)
 
+            self.reset_fate_dataview()
+
     def __str__(self):
         return ('gnome.spill_container.SpillContainer\n'
                 'spill LE attributes: {0}'
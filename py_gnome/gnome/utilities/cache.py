@@ -10,6 +10,7 @@ import warnings
 import tempfile
 import shutil
 import copy
+from contextlib import closing
 from multiprocessing import Lock
 
 import numpy
@@ -121,15 +122,22 @@ class ElementCache(object):
             self._cache_dir = cache_dir
         return True
 
-    def save_timestep(self, step_num, spill_container_pair):
+    def save_timestep(self, step_num, spill_container_pair,
+                      mass_balance_only=False):
         """
         add a time step of data to the cache
 
         :param step_num: the step number of the data
         :param spill_container: the spill container at this step
+        :param mass_balance_only=False: only save the mass_balance and
+            current_time_stamp, not the data arrays. This is all
+            WeatheringOutput reads, so weathering only model runs use it.
         """
         for sc in spill_container_pair.items():
-            data = copy.deepcopy(sc.data_arrays)
+            if mass_balance_only:
+                data = {}
+            else:
+                data = copy.deepcopy(sc.data_arrays)
 
             self._set_weathering_data(sc, data)
 
@@ -151,18 +159,31 @@ class ElementCache(object):
                 filename = self._make_filename(step_num, sc.uncertain)
                 np.savez(filename, **data)
 
-    def load_timestep(self, step_num):
+    def load_timestep(self, step_num, arrays=None, metadata_only=False):
         """
         Returns a SpillContainer with the data arrays cached on disk
 
         :param step_num: the step number you want to load.
+        :param arrays=None: names of the data arrays to load. Default is all
+            arrays. Names that were not cached are ignored.
+        :param metadata_only=False: if True, only load the mass_balance and
+            current_time_stamp - same as arrays=()
+
+        Only the requested arrays are copied from memory or read from disk,
+        so outputters that use a few arrays, or only the mass_balance, should
+        ask for just those.
         """
+        if metadata_only:
+            arrays = ()
+
         # look first in in-memory cache.
         try:
             # make a copy because we pop out the current_time_stamp
             # make these changes to the copy so the self.recent does not change
-
-            (data_arrays, u_data_arrays) = copy.deepcopy(self.recent[step_num])
+            (data_arrays, u_data_arrays) = \
+                [None if data is None else
+                 copy.deepcopy(self._select(data, data, arrays))
+                 for data in self.recent[step_num]]
 
             # copy.deepcopy(self.recent[step_num]) converts
             # 'current_time_stamp' to datetime object
@@ -177,15 +198,16 @@ class ElementCache(object):
         except KeyError:
             # not in the recent dict: try to load from disk
             try:
-                data_arrays = \
-                    dict(np.load(self._make_filename(step_num)))
+                data_arrays = self._load_file(self._make_filename(step_num),
+                                              arrays)
             except IOError:
                 raise CacheError('step: {0} is not in the cache'
                                  .format(step_num))
 
             try:
                 u_data_arrays = \
-                    dict(np.load(self._make_filename(step_num, True)))
+                    self._load_file(self._make_filename(step_num, True),
+                                    arrays)
             except IOError:
                 u_data_arrays = None
 
@@ -239,6 +261,34 @@ class ElementCache(object):
                 data[key] = np.asarray(sc.mass_balance[key])
                 data['mass_balance'][ix] = key
 
+    def _select(self, data, names, arrays):
+        """
+        dict of the items of data that load_timestep() returns: the
+        mass_balance data, the current_time_stamp and the requested arrays.
+
+        :param names: the keys of data - data itself or the list of files in
+            a .npz file
+        """
+        if arrays is None:
+            keys = names
+        else:
+            keys = set(arrays)
+            keys.add('current_time_stamp')
+
+            if 'mass_balance' in names:
+                keys.add('mass_balance')
+                keys.update(data['mass_balance'])
+
+        return dict((k, data[k]) for k in keys if k in names)
+
+    def _load_file(self, filename, arrays):
+        """
+        load the requested arrays from a cache file. Members of a .npz file
+        are read only when accessed, so other arrays are not read.
+        """
+        with closing(np.load(filename)) as npz:
+            return self._select(npz, npz.files, arrays)
+
     def _get_weathering_data(self, data_arrays):
         mb_data = {}
         if 'mass_balance' in data_arrays:
@@ -15,6 +15,8 @@ This version used libgd and py_gd instead of PIL for the rendering
 """
 
 import bisect
+import struct
+import zlib
 
 import numpy as np
 
@@ -199,6 +201,7 @@ class MapCanvas(object):
         """
         self.fore_image.add_colors(color_list)
         self.back_image.add_colors(color_list)
+        self._added_colors.extend(color_list)
 
     def get_color_names(self):
         """
@@ -208,6 +211,10 @@ class MapCanvas(object):
 
     def create_images(self, preset_colors):
         width, height = self.image_size[:2]
+        # kept so image_from_array() can make images with the same palette
+        self._preset_colors = preset_colors
+        self._added_colors = []
+
         self.fore_image = py_gd.Image(width=width, height=height,
                                       preset_colors=preset_colors)
 
@@ -218,6 +225,17 @@ class MapCanvas(object):
             self.clear_background()
             self.clear_foreground()
 
+    def image_from_array(self, arr):
+        """
+        create an image with the same palette as the foreground image from
+        an array of color indices, as returned by fore_asarray()
+        """
+        image = py_gd.from_array(arr, preset_colors=self._preset_colors)
+        if self._added_colors:
+            image.add_colors(self._added_colors)
+
+        return image
+
     def back_asarray(self):
         """
         return the background image as a numpy array
@@ -270,16 +288,30 @@ class MapCanvas(object):
         :param background=False: whether to draw to the background image.
         :type background: bool
         """
+        points = self.projection.to_pixel(points, asint=True)
+        self.draw_pixels(points, diameter, color, shape, background)
+
+    def draw_pixels(self,
+                    pixels,
+                    diameter=1,
+                    color='black',
+                    shape="round",
+                    background=False):
+        """
+        Same as draw_points, but for points that are already projected to
+        pixel coordinates
+
+        :param pixels: a Nx2 numpy array of int32 pixel coordinates
+        """
         if shape not in ('round', 'x'):
             raise ValueError('only "round" and "x" are supported shapes')
 
-        points = self.projection.to_pixel(points, asint=True)
         img = self.back_image if background else self.fore_image
 
         if shape == 'round':
-            img.draw_dots(points, diameter=diameter, color=color)
+            img.draw_dots(pixels, diameter=diameter, color=color)
         elif shape == 'x':
-            img.draw_xes(points, diameter=diameter, color=color)
+            img.draw_xes(pixels, diameter=diameter, color=color)
 
     def draw_polygon(self,
                      points,
@@ -439,6 +471,142 @@ class MapCanvas(object):
                              self.back_image.size)
 
 
+def rasterize_polygons(polygons, image_size, chunk_size=2 ** 20):
+    """
+    Find the polygon that covers each pixel of an image
+
+    This is a vectorized polygon fill for many small convex polygons, like
+    the cells of a model grid: the pixels whose centers are inside each
+    polygon are found with numpy, rather than drawing the polygons one by
+    one. The result can be reused to color the polygons over and over again
+    with a single array lookup.
+
+    :param polygons: (N, k, 2) array of the vertices of N convex polygons in
+                     pixel coordinates (as returned by to_pixel(), but not
+                     rounded to ints). The vertices can be in either order.
+
+    :param image_size: (width, height) of the image
+
+    :param chunk_size=2**20: maximum number of candidate pixels processed at
+                             once -- limits the memory used
+
+    :returns: (height, width) int32 array of the index of the polygon that
+              covers each pixel, -1 for pixels not covered. Where polygons
+              overlap, the later one wins, as if they were drawn in order.
+    """
+    # shift so the pixel centers are at integer coordinates
+    polygons = np.asarray(polygons, dtype=np.float64) - 0.5
+    width, height = image_size[:2]
+
+    raster = np.empty((height, width), dtype=np.int32)
+    raster.fill(-1)
+
+    num_polys, num_verts = polygons.shape[:2]
+    if num_polys == 0:
+        return raster
+
+    # the range of pixels in the bounding box of each polygon
+    x_min = np.ceil(polygons[..., 0].min(axis=1)).clip(0, width)
+    x_max = np.floor(polygons[..., 0].max(axis=1)).clip(-1, width - 1)
+    y_min = np.ceil(polygons[..., 1].min(axis=1)).clip(0, height)
+    y_max = np.floor(polygons[..., 1].max(axis=1)).clip(-1, height - 1)
+
+    x_min = x_min.astype(np.int64)
+    y_min = y_min.astype(np.int64)
+    box_widths = (x_max.astype(np.int64) - x_min + 1).clip(0)
+    box_heights = (y_max.astype(np.int64) - y_min + 1).clip(0)
+
+    counts = box_widths * box_heights
+    ends = np.cumsum(counts)
+
+    start = 0
+    while start < num_polys:
+        base = ends[start] - counts[start]
+        stop = max(np.searchsorted(ends, base + chunk_size, side='right'),
+                   start + 1)
+
+        # one entry for every pixel in the bounding box of every polygon
+        idx = np.repeat(np.arange(start, stop), counts[start:stop])
+        offsets = (np.arange(len(idx)) -
+                   np.repeat(ends[start:stop] - counts[start:stop] - base,
+                             counts[start:stop]))
+
+        px = x_min[idx] + offsets % box_widths[idx]
+        py = y_min[idx] + offsets // box_widths[idx]
+
+        # inside a convex polygon if on the same side of all the edges
+        left = np.ones(len(idx), dtype=np.bool)
+        right = np.ones(len(idx), dtype=np.bool)
+        for i in range(num_verts):
+            p1 = polygons[idx, i]
+            p2 = polygons[idx, (i + 1) % num_verts]
+
+            cross = ((p2[:, 0] - p1[:, 0]) * (py - p1[:, 1]) -
+                     (p2[:, 1] - p1[:, 1]) * (px - p1[:, 0]))
+            left &= cross >= 0
+            right &= cross <= 0
+
+        inside = left | right
+        raster[py[inside], px[inside]] = idx[inside]
+
+        start = stop
+
+    return raster
+
+
+PNG_SIGNATURE = '\x89PNG\r\n\x1a\n'
+
+
+def _png_chunk(chunk_type, data):
+    return ''.join((struct.pack('>I', len(data)),
+                    chunk_type,
+                    data,
+                    struct.pack('>I',
+                                zlib.crc32(chunk_type + data) & 0xffffffff)))
+
+
+def encode_png(indices, palette, compression=6):
+    """
+    Encode an image of color indices as a paletted png, in memory
+
+    py_gd can only save images to files, this is for images that go straight
+    into a web response.
+
+    :param indices: (height, width) array of indices into the palette
+
+    :param palette: (N, 3) or (N, 4) array of (r, g, b[, alpha]) 8 bit
+                    values, N <= 256. alpha is the png alpha:
+                    0 is transparent, 255 is opaque.
+
+    :param compression=6: zlib compression level
+
+    :returns: the png file contents as a string
+    """
+    palette = np.asarray(palette, dtype=np.uint8)
+    if len(palette) > 256:
+        raise ValueError('a png palette can have at most 256 colors')
+
+    height, width = indices.shape
+
+    # each row starts with the filter type -- 0 is no filter
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = indices
+
+    png = [PNG_SIGNATURE,
+           _png_chunk('IHDR', struct.pack('>IIBBBBB', width, height,
+                                          8, 3, 0, 0, 0)),
+           _png_chunk('PLTE', palette[:, :3].tostring())]
+
+    if palette.shape[1] == 4:
+        png.append(_png_chunk('tRNS', palette[:, 3].tostring()))
+
+    png.append(_png_chunk('IDAT', zlib.compress(raw.tostring(),
+                                                compression)))
+    png.append(_png_chunk('IEND', ''))
+
+    return ''.join(png)
+
+
 class GridLines(object):
     """
     class to hold logic for determining where the gridlines should be
@@ -383,6 +383,69 @@ class FlatEarthProjection(GeoProjection):
 
         return delta_lon_lat
 
+    @staticmethod
+    def lon_scale(ref_positions):
+        """
+        Per-element factor that converts an east-west distance in meters
+        to delta longitude: 8.9992801e-06 / cos(ref_lat)
+
+        Latitude changes negligibly over the stages of a time step, so
+        integrators compute this once per step and pass it to
+        add_meters_to_lonlat()
+
+        :param ref_positions: Reference positions in degrees
+        :type ref_positions: NX3, numpy array (Only lat is used here)
+
+        :returns lon_scale: (N,) numpy array
+        """
+        ref_positions = np.asarray(ref_positions,
+                                   dtype=np.float64).reshape(-1, 3)
+
+        lon_scale = np.deg2rad(ref_positions[:, 1])
+        np.cos(lon_scale, out=lon_scale)
+        np.divide(8.9992801e-06, lon_scale, out=lon_scale)
+
+        return lon_scale
+
+    @staticmethod
+    def add_meters_to_lonlat(meters, lon_scale, ref_positions, out):
+        """
+        Fused version of:
+
+            out[:] = ref_positions + meters_to_lonlat(meters, ref_positions)
+
+        that writes directly into the 'out' buffer without making
+        intermediate copies. Used at each stage of the PyMover integrators.
+
+        :param meters: Distances in meters
+        :type meters: NX2 or NX3 numpy array of (dx, dy[, dz])
+                      (dz is passed through untouched)
+
+        :param lon_scale: per-element longitude scale from lon_scale()
+        :type lon_scale: (N,) numpy array
+
+        :param ref_positions: Reference positions in degrees
+        :type ref_positions: NX3, numpy array of (lon, lat, z)
+
+        :param out: stage position buffer that is updated in place
+        :type out: NX3, numpy array. Must not be the same array as
+                   ref_positions or meters
+
+        :returns out:
+        """
+        np.multiply(meters[:, 0], lon_scale, out=out[:, 0])
+        out[:, 0] += ref_positions[:, 0]
+
+        np.multiply(meters[:, 1], 8.9992801e-06, out=out[:, 1])
+        out[:, 1] += ref_positions[:, 1]
+
+        if meters.shape[1] > 2:
+            np.add(ref_positions[:, 2], meters[:, 2], out=out[:, 2])
+        else:
+            out[:, 2] = ref_positions[:, 2]
+
+        return out
+
     @staticmethod
     def lonlat_to_meters(lon_lat, ref_positions):
         """
@@ -112,6 +112,71 @@ def random_with_persistance(
     return array
 
 
+def refresh_with_persistance(low,
+                             high,
+                             array,
+                             persistence,
+                             age,
+                             time_step=1.):
+    """
+    Incremental version of random_with_persistance() used by the wind movers
+    to update windages each time step. Rather than recomputing every element,
+    only elements whose persistence window expires during this time step get
+    a new random value. The element's age is used as the bookkeeping for
+    when the window expires, so no additional state is required.
+
+    - persistence < 0: never updated after release
+    - 0 < persistence <= time_step: window expires every step; the [low, high]
+      interval is scaled by sqrt(persistence / time_step) exactly as in
+      random_with_persistance()
+    - persistence > time_step: value is held until the element's age crosses
+      the next multiple of persistence, then redrawn from [low, high]
+
+    :param low: lower bound for random number; numpy array
+    :param high: upper bound for random number; numpy array
+    :param array: numpy array to be updated in place
+    :param persistence: persistence of each element in seconds
+    :param age: age of each element in seconds at the start of the time step
+    :param time_step: step size for the simulation in seconds.
+
+    :returns: indices of elements that were updated
+    """
+    persistence = np.asarray(persistence)
+    age = np.asarray(age)
+
+    upd = np.flatnonzero(persistence > 0)
+    if len(upd) == 0:
+        return upd
+
+    persist = persistence[upd]
+    hold = persist > time_step
+
+    if np.any(hold):
+        # window expires if age crosses a multiple of persistence in this step
+        h_age = age[upd][hold]
+        due = np.ones(len(upd), dtype=bool)
+        due[hold] = ((h_age + time_step) // persist[hold] >
+                     h_age // persist[hold])
+
+        upd = upd[due]
+        persist = persist[due]
+        hold = hold[due]
+
+        if len(upd) == 0:
+            return upd
+
+    scale = np.where(hold, 1.0, np.sqrt(persist / float(time_step)))
+    low = np.asarray(low)[upd]
+    high = np.asarray(high)[upd]
+
+    mean = (high + low) / 2.
+    half_range = (high - low) * scale / 2.
+
+    array[upd] = np.random.uniform(mean - half_range, mean + half_range)
+
+    return upd
+
+
 def seed(seed=1):
     """
     Set the C++, the python and the numpy random seed to desired value
@@ -20,28 +20,32 @@ class Adios2(object):
         compute the wave height
 
         :param U: wind speed
-        :type U: floating point number in m/s units
+        :type U: floating point number or numpy array in m/s units
 
         :returns Hrms: RMS wave height in meters
         """
+        U = np.asarray(U, dtype=np.float64)
 
         # wind stress factor
         # Transition at U = 4.433049525859078 for linear scale with wind speed.
         #   4.433049525859078 is where the solutions match
-        ws = 0.71 * U ** 1.23 if U < 4.433049525859078 else U
+        ws = np.where(U < 4.433049525859078, 0.71 * U ** 1.23, U)
+
+        # fetch unlimited
+        H = 0.243 * ws * ws / g
 
         # (2268 * ws ** 2) is limit of fetch limited case.
-        if (fetch is not None) and (fetch < 2268 * ws ** 2):
-            H = 0.0016 * np.sqrt(fetch / g) * ws
-        else:  # fetch unlimited
-            H = 0.243 * ws * ws / g
+        if fetch is not None:
+            H = np.where(fetch < 2268 * ws ** 2,
+                         0.0016 * np.sqrt(fetch / g) * ws,
+                         H)
 
         Hrms = 0.707 * H
 
         # arbitrary limit at 30 m -- about the largest waves recorded
         # fixme -- this really depends on water depth -- should take that
         #          into account?
-        return Hrms if Hrms < 30.0 else 30.0
+        return np.minimum(Hrms, 30.0)[()]
 
     @staticmethod
     def wind_speed_from_height(H):
@@ -51,15 +55,15 @@ class Adios2(object):
         - Used if the wave height is specified.
         - Unlimited fetch is assumed:
 
-        :param H: given wave height.
+        :param H: given wave height - float or numpy array
         """
         # U_h = 2.0286 * g * sqrt(H / g) # Bill's version
-        U_h = np.sqrt(g * H / 0.243)
-
-        if U_h < 4.433049525859078:  # check if low wind case
-            U_h = (U_h / 0.71) ** 0.813008
+        U_h = np.sqrt(g * np.asarray(H, dtype=np.float64) / 0.243)
 
-        return U_h
+        # check if low wind case
+        return np.where(U_h < 4.433049525859078,
+                        (U_h / 0.71) ** 0.813008,
+                        U_h)[()]
 
     @staticmethod
     def mean_wave_period(U, wave_height, fetch):
@@ -70,14 +74,17 @@ class Adios2(object):
                Is this s bit low??? 32 m/s -> T=15.7 s
         """
         if wave_height is None:
+            U = np.asarray(U, dtype=np.float64)
             ws = U * 0.71 * U ** 1.23  # fixme -- linear for large windspeed?
 
-            if (fetch is None) or (fetch >= 2268 * ws ** 2):
-                # fetch unlimited
-                T = 0.83 * ws
-            else:
+            # fetch unlimited
+            T = 0.83 * ws
+
+            if fetch is not None:
                 # eq 3-34 (SPM?)
-                T = 0.06238 * (fetch * ws) ** 0.3333333333
+                T = np.where(fetch >= 2268 * ws ** 2,
+                             T,
+                             0.06238 * (fetch * ws) ** 0.3333333333)[()]
         else:
             # user-specified wave height
             T = 7.508 * np.sqrt(wave_height)
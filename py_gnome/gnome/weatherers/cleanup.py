@@ -176,7 +176,7 @@ class CleanUpBase(RemoveMass, Weatherer):
             oil/water mixture, but the mass of the oil. Use the oilwater_mix
             flag to indicate this is the case.
         '''
-        arrays = {'fate_status', 'mass', 'frac_water'}
+        arrays = {'fate_status', 'status_codes', 'mass', 'frac_water'}
         data = sc.substancefatedata(substance, arrays, 'surface_weather')
         curr_mass = data['mass']
 
@@ -185,6 +185,8 @@ class CleanUpBase(RemoveMass, Weatherer):
             # marking LEs for removal
             curr_mass = curr_mass / (1 - data['frac_water'])
 
+        before = sc.mass_ledger.state(data, slice(None))
+
         # (1 - frac_water) * mass_to_remove
         if mass_to_remove >= curr_mass.sum():
             data['fate_status'][:] = new_status
@@ -205,6 +207,7 @@ class CleanUpBase(RemoveMass, Weatherer):
             self.logger.debug('{0} marked {1} LEs with mass: {2}'
                               .format(self._pid, ix, data['mass'][:ix].sum()))
 
+        sc.mass_ledger.update(data, slice(None), before)
         sc.update_from_fatedataview(substance, 'surface_weather')
 
     def _avg_frac_oil(self, data):
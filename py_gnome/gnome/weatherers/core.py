@@ -33,6 +33,16 @@ class Weatherer(Process):
     _state = copy.deepcopy(Process._state)
     _schema = WeathererSchema  # nothing new added so use this schema
 
+    # per element environment arrays the weatherer uses in place of its
+    # wind/water/waves objects if the model samples them. They are not
+    # added to array_types so they are only used if they exist
+    # - see gnome.environment.sampler
+    _env_array_types = ()
+
+    # largest fraction of an element's mass a weatherer should remove in one
+    # substep if the model picks the substeps - see stable_time_step()
+    max_substep_change = 0.1
+
     def __init__(self, **kwargs):
         '''
         Base weatherer class; defines the API for all weatherers
@@ -78,6 +88,17 @@ class Weatherer(Process):
                            self.__class__.__name__)
                     raise ReferencedObjectNotSet(msg)
 
+    def _data_array_types(self, sc):
+        '''
+        array_types plus the per element environment arrays in sc that this
+        weatherer can use - pass this to sc.itersubstancedata()
+        '''
+        env = [name for name in self._env_array_types if name in sc]
+        if not env:
+            return self.array_types
+
+        return self.array_types.union(env)
+
     def weather_elements(self, sc, time_step, model_time):
         '''
         Run the equivalent of get_move for weathering processes. It modifies
@@ -89,6 +110,19 @@ class Weatherer(Process):
         '''
         pass
 
+    def stable_time_step(self, sc, time_step, model_time):
+        '''
+        Estimate of the longest time step over which this weatherer's rates
+        can be held constant, given the current state of the elements. The
+        model uses it to pick the number of substeps for this weatherer if
+        Model.adaptive_substeps is True.
+
+        :returns: time step in seconds, numpy.inf if any time step will do,
+            or None if the weatherer does not give an estimate. The model
+            uses weathering_substeps for weatherers that return None.
+        '''
+        return None
+
     def _halflife(self, M_0, factors, time):
         'Assumes our factors are half-life values'
         half = np.float64(0.5)
@@ -117,6 +151,9 @@ class HalfLifeWeatherer(Weatherer, Serializable):
     _state = copy.deepcopy(Weatherer._state)
     _state += Field('half_lives', save=True, update=True)
 
+    # only changes the arrays of the SpillContainer it is given
+    thread_safe = True
+
     def __init__(self, half_lives=(15.*60, ), **kwargs):
         '''
         The half_lives are a property of HalfLifeWeatherer. If the
@@ -155,9 +192,14 @@ class HalfLifeWeatherer(Weatherer, Serializable):
             return
 
         for _, data in sc.itersubstancedata(self.array_types):
+            mass = data['mass'].sum()
+
             hl = self._halflife(data['mass_components'],
                                 self.half_lives, time_step)
             data['mass_components'][:] = hl
             data['mass'][:] = data['mass_components'].sum(1)
 
+            # decayed mass is not recorded in mass_balance
+            sc.mass_ledger.lose(mass - data['mass'].sum())
+
         sc.update_from_fatedataview()
@@ -49,6 +49,9 @@ class Dissolution(Weatherer, Serializable):
         '''
         self.waves = waves
 
+        # component tables per substance for dissolve_oil()
+        self._tables = {}
+
         super(Dissolution, self).__init__(**kwargs)
 
         self.array_types.update({'area': area,
@@ -64,11 +67,19 @@ class Dissolution(Weatherer, Serializable):
             Add dissolution key to mass_balance if it doesn't exist.
             - Assumes all spills have the same type of oil
             - let's only define this the first time
+
+            Also compute the component tables of each substance for
+            dissolve_oil()
         '''
+        self._tables = {}
+
         if self.on:
             super(Dissolution, self).prepare_for_model_run(sc)
             sc.mass_balance['dissolution'] = 0.0
 
+            for substance in sc.get_substances(complete=False):
+                self._component_tables(substance)
+
     def prepare_for_model_step(self, sc, time_step, model_time):
         '''
             Set/update arrays used by dispersion module for this timestep
@@ -134,93 +145,105 @@ class Dissolution(Weatherer, Serializable):
         droplet_avg_sizes = data['droplet_avg_size']
         areas = data['area']
 
-        # print 'droplet_avg_sizes = ', droplet_avg_sizes
+        tables = self._component_tables(substance)
 
-        arom_mask = substance._sara['type'] == 'Aromatics'
+        # molar averaged partition coefficient (K_ow) of each LE.
+        # K_ow for non-aromatics are 0.0
+        data['partition_coeff'] = (np.dot(fmasses, tables['K_ow_per_mol']) /
+                                   np.dot(fmasses, tables['inv_mol_wt']))
 
-        mol_wt = substance.molecular_weight
-        rho = substance.component_density
+        total_masses = fmasses.sum(axis=1)
+        mass_rhos = np.dot(fmasses, tables['rho'])
 
-        assert mol_wt.shape == rho.shape
+        avg_rhos = np.zeros_like(total_masses)
+        np.divide(mass_rhos, total_masses, out=avg_rhos,
+                  where=total_masses > 0)
 
-        # calculate the partition coefficient (K_ow) for all aromatics
-        # for each LE.
-        # K_ow for non-aromatics are masked to 0.0
-        K_ow_comp = arom_mask * BanerjeeHuibers.partition_coeff(mol_wt, rho)
-        data['partition_coeff'] = ((fmasses * K_ow_comp / mol_wt).sum(axis=1) / 
-                                   (fmasses / mol_wt).sum(axis=1))
+        # oil concentration of a component is its mass fraction times the
+        # average oil density, so scale the masses by avg_rho / total_mass
+        conc_scale = np.zeros_like(total_masses)
+        np.divide(avg_rhos, total_masses, out=conc_scale,
+                  where=total_masses > 0)
 
-        avg_rhos = self.oil_avg_density(fmasses, rho)
-        # print ('oil density at temp = {}'
-        #        .format(substance.get_density(self.waves.water
-        #                                      .get('temperature'))))
-        # print 'avg_rhos = ', avg_rhos
-        water_rhos = np.zeros(avg_rhos.shape) + self.waves.water.get('density')
+        water_rho = self.waves.water.get('density')
 
-        k_w_i = Stokes.water_phase_xfer_velocity(water_rhos - avg_rhos,
+        k_w_i = Stokes.water_phase_xfer_velocity(water_rho - avg_rhos,
                                                  droplet_avg_sizes)
         k_diffusion = 0.134  # Thorpe turbulent diffusion coefficient
 
-        total_volumes = self.oil_total_volume(fmasses, rho)
-
         f_wc_i = self.water_column_time_fraction(model_time, k_w_i)
         T_wc_i = f_wc_i * time_step
-        # print 'T_wc_i = ', T_wc_i
 
         T_calm_i = self.calm_between_wave_breaks(model_time, time_step, T_wc_i)
-        # print 'T_calm_i = ', T_calm_i
 
         assert np.alltrue(T_calm_i <= float(time_step))
         assert np.alltrue(T_wc_i <= float(time_step))
         assert np.alltrue(T_wc_i + T_calm_i <= float(time_step))
 
-        oil_concentrations = self.oil_concentration(fmasses, rho)
+        # total droplet surface area is the oil volume times the area to
+        # volume ratio of a droplet, 6 / d. No droplets if d is 0
+        total_volumes = np.dot(fmasses, tables['inv_rho'])
+        area_per_volume = np.zeros_like(total_volumes)
+        np.divide(6.0, droplet_avg_sizes, out=area_per_volume,
+                  where=droplet_avg_sizes > 0)
 
-        N_drop_i = self.droplet_subsurface_mass_xfer_rate(droplet_avg_sizes,
-                                                          k_w_i + k_diffusion,
-                                                          oil_concentrations,
-                                                          K_ow_comp,
-                                                          arom_mask,
-                                                          total_volumes
-                                                          )
-        # with printoptions(precision=2):
-        #     print 'N_drop_i = ', N_drop_i
-        #
-        # print 'T_wc_i = ', T_wc_i
+        U_10 = max(.1, self.waves.wind.get_value(model_time)[0])
 
-        #
-        # OK, here it is, the mass dissolved in the water column.
-        #
-        mass_dissolved_in_wc = (N_drop_i.T * T_wc_i).T
+        # Both mass xfer rates are C_dis / K_ow times a per LE factor in
+        # kg/(m^2 * hr), see droplet_subsurface_mass_xfer_rate() and
+        # slick_subsurface_mass_xfer_rate(), so the mass dissolved in the
+        # water column and from the slick is
+        #     C_dis / K_ow * (N_drop * T_wc + N_s * T_calm)
+        coeffs = ((k_w_i + k_diffusion) / 3600.0 *
+                  total_volumes * area_per_volume * T_wc_i)
+        coeffs += 0.01 * (U_10 / 3600.0) * areas * T_calm_i
+        coeffs *= conc_scale
+
+        # allocated for each call - the forecast and uncertain spill
+        # containers may be weathered at the same time
+        total_mass_dissolved = fmasses * tables['arom_inv_K_ow']
+        total_mass_dissolved *= coeffs[:, np.newaxis]
 
-        # with printoptions(precision=2):
-        #     print 'mass_dissolved_in_wc = ', mass_dissolved_in_wc
+        # adjust any masses that might go negative
+        np.minimum(total_mass_dissolved, fmasses, out=total_mass_dissolved)
 
-        N_s_i = self.slick_subsurface_mass_xfer_rate(model_time,
-                                                     oil_concentrations,
-                                                     K_ow_comp,
-                                                     areas,
-                                                     arom_mask)
-        # with printoptions(precision=2):
-        #     print 'N_s_i = ', N_s_i
+        return total_mass_dissolved
 
-        #
-        # OK, here it is, the mass dissolved in the slick.
-        #
-        mass_dissolved_in_slick = (N_s_i.T * T_calm_i).T
+    def _component_tables(self, substance):
+        '''
+            Per component quantities used by dissolve_oil() that only depend
+            on the substance. Computed once per substance and run.
+        '''
+        try:
+            subs, tables = self._tables[id(substance)]
+            if subs is substance:
+                return tables
+        except KeyError:
+            pass
 
-        # with printoptions(precision=2):
-        #     print 'mass_dissolved_in_slick = ', mass_dissolved_in_slick
+        arom_mask = substance._sara['type'] == 'Aromatics'
 
-        mass_dissolved_in_wc = np.vstack(mass_dissolved_in_wc)
-        mass_dissolved_in_slick = np.vstack(mass_dissolved_in_slick)
-        total_mass_dissolved = mass_dissolved_in_wc + mass_dissolved_in_slick
+        mol_wt = np.asarray(substance.molecular_weight, dtype=np.float64)
+        rho = np.asarray(substance.component_density, dtype=np.float64)
 
-        # adjust any masses that might go negative
-        total_mass_dissolved += np.clip(fmasses - total_mass_dissolved,
-                                        - np.inf, 0.0)
+        assert mol_wt.shape == rho.shape
 
-        return total_mass_dissolved
+        K_ow_comp = arom_mask * BanerjeeHuibers.partition_coeff(mol_wt, rho)
+
+        arom_inv_K_ow = np.zeros_like(K_ow_comp)
+        np.divide(1.0, K_ow_comp, out=arom_inv_K_ow,
+                  where=arom_mask & (K_ow_comp > 0))
+
+        tables = {'arom_mask': arom_mask,
+                  'rho': rho,
+                  'inv_rho': 1.0 / rho,
+                  'inv_mol_wt': 1.0 / mol_wt,
+                  'K_ow_per_mol': K_ow_comp / mol_wt,
+                  'arom_inv_K_ow': arom_inv_K_ow}
+
+        self._tables[id(substance)] = (substance, tables)
+
+        return tables
 
     def oil_avg_density(self, masses, densities):
         # oil component count needs to match
@@ -32,6 +32,7 @@ class Emulsification(Weatherer, Serializable):
     _state = copy.deepcopy(Weatherer._state)
     _state += [Field('waves', save=True, update=True, save_reference=True)]
     _schema = WeathererSchema
+    _env_array_types = ('wind_speed',)
 
     def __init__(self,
                  waves=None,
@@ -263,57 +264,78 @@ class Emulsification(Weatherer, Serializable):
         if sc.num_released == 0:
             return
 
-        for substance, data in sc.itersubstancedata(self.array_types):
+        array_types = self._data_array_types(sc)
+        for substance, data in sc.itersubstancedata(array_types):
             if len(data['age']) == 0:
             #if len(data['frac_water']) == 0:
                 # substance does not contain any surface_weathering LEs
                 continue
 
-            k_emul = self._water_uptake_coeff(model_time, substance)
-
-            # bulltime is not in database, but could be set by user
-            #emul_time = substance.get_bulltime()
-            emul_time = substance.bulltime
-
-            # get from database bullwinkle (could be overridden by user)
-            #emul_constant = substance.get('bullwinkle_fraction')
-            emul_constant = substance.bullwinkle
-
-            # max water content fraction - get from database
-            Y_max = substance.get('emulsion_water_fraction_max')
-
-            # doesn't emulsify, avoid the nans
-            if Y_max <= 0:
-                continue
-            S_max = (6. / constants.drop_min) * (Y_max / (1.0 - Y_max))
-
-            emulsify_oil(time_step,
-                         data['frac_water'],
-                         data['interfacial_area'],
-                         data['frac_lost'],
-                         data['age'],
-                         data['bulltime'],
-                         k_emul,
-                         emul_time,
-                         emul_constant,
-                         S_max,
-                         Y_max,
-                         constants.drop_max)
+            if self._weather_data(data, substance, time_step, model_time,
+                                  sc.mass_balance):
+                self._set_water_content(data, substance, sc.mass_balance)
 
-            #sc.mass_balance['water_content'] += \
-                #np.sum(data['frac_water'][:]) / sc.num_released
-            # just average the water fraction each time - it is not per time
-            # step value but at a certain time value
-            # todo: probably should be weighted avg
-            if data['mass'].sum() > 0:
-                sc.mass_balance['water_content'] = \
-                    np.sum(data['mass']/data['mass'].sum() * data['frac_water'])
+        sc.update_from_fatedataview()
 
-            self.logger.debug(self._pid + 'water_content for {0}: {1}'.
-                              format(substance.name,
-                                     sc.mass_balance['water_content']))
+    def _weather_data(self, data, substance, time_step, model_time,
+                      mass_balance):
+        '''
+        emulsify the elements in data in place. Used by weather_elements()
+        and FusedWeathering.
 
-        sc.update_from_fatedataview()
+        :returns: False if the substance does not emulsify, else True
+        '''
+        # per element if the model sampled the wind
+        k_emul = self._water_uptake_coeff(model_time, substance,
+                                          data.get('wind_speed'))
+
+        # bulltime is not in database, but could be set by user
+        #emul_time = substance.get_bulltime()
+        emul_time = substance.bulltime
+
+        # get from database bullwinkle (could be overridden by user)
+        #emul_constant = substance.get('bullwinkle_fraction')
+        emul_constant = substance.bullwinkle
+
+        # max water content fraction - get from database
+        Y_max = substance.get('emulsion_water_fraction_max')
+
+        # doesn't emulsify, avoid the nans
+        if Y_max <= 0:
+            return False
+        S_max = (6. / constants.drop_min) * (Y_max / (1.0 - Y_max))
+
+        emulsify_oil(time_step,
+                     data['frac_water'],
+                     data['interfacial_area'],
+                     data['frac_lost'],
+                     data['age'],
+                     data['bulltime'],
+                     k_emul,
+                     emul_time,
+                     emul_constant,
+                     S_max,
+                     Y_max,
+                     constants.drop_max)
+
+        return True
+
+    def _set_water_content(self, data, substance, mass_balance):
+        '''
+        set 'water_content' in mass_balance from the elements in data
+        '''
+        #sc.mass_balance['water_content'] += \
+            #np.sum(data['frac_water'][:]) / sc.num_released
+        # just average the water fraction each time - it is not per time
+        # step value but at a certain time value
+        # todo: probably should be weighted avg
+        if data['mass'].sum() > 0:
+            mass_balance['water_content'] = \
+                np.sum(data['mass']/data['mass'].sum() * data['frac_water'])
+
+        self.logger.debug(self._pid + 'water_content for {0}: {1}'.
+                          format(substance.name,
+                                 mass_balance['water_content']))
 
     def serialize(self, json_='webapi'):
         """
@@ -414,7 +436,7 @@ class Emulsification(Weatherer, Serializable):
         
         return Bw
 
-    def _water_uptake_coeff(self, model_time, substance):
+    def _water_uptake_coeff(self, model_time, substance, wind_speed=None):
         '''
         Use higher of wind or pseudo wind corresponding to wave height
 
@@ -423,10 +445,15 @@ class Emulsification(Weatherer, Serializable):
             if (U < HU) U = HU
             k_emul = 6.0 * K0Y * U * U / d_max
 
+        :param wind_speed=None: per element wind speed array. If None, use
+            the wind at model_time and return a scalar
         '''
 
         ## higher of real or psuedo wind
-        wind_speed = self.waves.get_emulsification_wind(model_time)
+        if wind_speed is None:
+            wind_speed = self.waves.get_emulsification_wind(model_time)
+        else:
+            wind_speed = self.waves.get_emulsification_winds(wind_speed)
 
         # water uptake rate constant - get this from database
         K0Y = substance.get('k0y')
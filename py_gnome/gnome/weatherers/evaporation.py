@@ -21,6 +21,7 @@ class Evaporation(Weatherer, Serializable):
     _state += [Field('water', save=True, update=True, save_reference=True),
                Field('wind', save=True, update=True, save_reference=True)]
     _schema = WeathererSchema
+    _env_array_types = ('wind_speed', 'water_temp')
 
     def __init__(self,
                  water=None,
@@ -79,10 +80,45 @@ class Evaporation(Weatherer, Serializable):
         else:
             return 0.06 * c_evap * wind_speed ** 2
 
+    def _mass_transport_coeffs(self, wind_speed):
+        '''
+        vectorized version of _mass_transport_coeff() for the per element
+        'wind_speed' array
+        '''
+        wind_speed = np.maximum(1, wind_speed)
+        c_evap = 0.0025     # if wind_speed in m/s
+
+        return np.where(wind_speed <= 10.0,
+                        c_evap * wind_speed ** 0.78,
+                        0.06 * c_evap * wind_speed ** 2)
+
+    def _vapor_pressures(self, substance, water_temp):
+        '''
+        vapor pressure of each component at the per element 'water_temp'.
+        The substance curve takes a scalar temperature so evaluate it once
+        per distinct temperature, rounded to 0.01 K
+
+        :returns: (num_elements, num_components) array
+        '''
+        temps, ix = np.unique(np.round(water_temp, 2), return_inverse=True)
+        vp = np.array([substance.vapor_pressure(t) for t in temps])
+
+        return vp[ix]
+
     def _set_evap_decay_constant(self, model_time, data, substance, time_step):
         # used to compute the evaporation decay constant
-        K = self._mass_transport_coeff(model_time)
-        water_temp = self.water.get('temperature', 'K')
+        # use per element environment if the model sampled it
+        if 'wind_speed' in data:
+            K = self._mass_transport_coeffs(data['wind_speed'])
+        else:
+            K = self._mass_transport_coeff(model_time)
+
+        if 'water_temp' in data:
+            water_temp = data['water_temp']
+            vp = self._vapor_pressures(substance, water_temp)
+        else:
+            water_temp = self.water.get('temperature', 'K')
+            vp = substance.vapor_pressure(water_temp)
 
         f_diff = 1.0
         if 'frac_water' in data:
@@ -91,13 +127,13 @@ class Evaporation(Weatherer, Serializable):
             # and properly set frac_water
             f_diff = (1.0 - data['frac_water'])
 
-        vp = substance.vapor_pressure(water_temp)
+        num_vp = vp.shape[-1]
 
         #mw = substance.molecular_weight
         # evaporation expects mw in kg/mol, database is in g/mol
         mw = substance.molecular_weight / 1000.	
 
-        sum_mi_mw = (data['mass_components'][:, :len(vp)] / mw).sum(axis=1)
+        sum_mi_mw = (data['mass_components'][:, :num_vp] / mw).sum(axis=1)
         # d_numer = -1/rho * f_diff.reshape(-1, 1) * K * vp
         # d_denom = (data['thickness'] * constants.gas_constant *
         #            water_temp * sum_frac_mw).reshape(-1, 1)
@@ -106,7 +142,7 @@ class Evaporation(Weatherer, Serializable):
         # Do computation together so we don't need to make intermediate copies
         # of data - left sum_frac_mw, which is a copy but easier to
         # read/understand
-        data['evap_decay_constant'][:, :len(vp)] = \
+        data['evap_decay_constant'][:, :num_vp] = \
             ((-data['area'] * f_diff * K /
               (constants.gas_constant * water_temp * sum_mi_mw)).reshape(-1, 1)
              * vp)
@@ -118,6 +154,37 @@ class Evaporation(Weatherer, Serializable):
             raise ValueError("Error in Evaporation routine. One of the"
                              " exponential decay constant is positive")
 
+    def stable_time_step(self, sc, time_step, model_time):
+        '''
+        Time in which the fastest evaporating element loses
+        max_substep_change of its mass at the current decay constants.
+        Fresh oil evaporates quickly so this is short early in a release and
+        grows as the light components are lost.
+        '''
+        if not self.active or sc.num_released == 0:
+            return None
+
+        rate = 0.0
+        array_types = self._data_array_types(sc)
+        for substance, data in sc.itersubstancedata(array_types):
+            mass = data['mass_components'].sum(1)
+            if not np.any(mass > 0):
+                continue
+
+            self._set_evap_decay_constant(model_time, data,
+                                          sc.substance_properties(substance),
+                                          time_step)
+
+            # decay constants are negative
+            loss = -(data['evap_decay_constant'] *
+                     data['mass_components']).sum(1)
+            rate = max(rate, (loss[mass > 0] / mass[mass > 0]).max())
+
+        if rate <= 0.0:
+            return np.inf
+
+        return self.max_substep_change / rate
+
     def weather_elements(self, sc, time_step, model_time):
         '''
         weather elements over time_step
@@ -166,33 +233,43 @@ class Evaporation(Weatherer, Serializable):
         if sc.num_released == 0:
             return
 
-        for substance, data in sc.itersubstancedata(self.array_types):
+        array_types = self._data_array_types(sc)
+        for substance, data in sc.itersubstancedata(array_types):
             if len(data['mass']) is 0:
                 continue
 
-            # set evap_decay_constant array
-            self._set_evap_decay_constant(model_time, data, substance,
-                                          time_step)
-            mass_remain = self._exp_decay(data['mass_components'],
-                                          data['evap_decay_constant'],
-                                          time_step)
-
-            sc.mass_balance['evaporated'] += \
-                np.sum(data['mass_components'][:, :] - mass_remain[:, :])
-
-            # log amount evaporated at each step
-            self.logger.debug(self._pid + 'amount evaporated for {0}: {1}'.
-                              format(substance.name,
-                                     np.sum(data['mass_components'][:, :] -
-                                            mass_remain[:, :])))
+            self._weather_data(data, sc.substance_properties(substance),
+                               time_step, model_time, sc.mass_balance)
 
-            data['mass_components'][:] = mass_remain
-            data['mass'][:] = data['mass_components'].sum(1)
-
-            # add frac_lost
-            data['frac_lost'][:] = 1 - data['mass']/data['init_mass']
         sc.update_from_fatedataview()
 
+    def _weather_data(self, data, substance, time_step, model_time,
+                      mass_balance):
+        '''
+        evaporate the elements in data in place and add the evaporated mass
+        to mass_balance. Used by weather_elements() and FusedWeathering
+        '''
+        # set evap_decay_constant array
+        self._set_evap_decay_constant(model_time, data, substance,
+                                      time_step)
+        mass_remain = self._exp_decay(data['mass_components'],
+                                      data['evap_decay_constant'],
+                                      time_step)
+
+        evaporated = np.sum(data['mass_components'][:, :] -
+                            mass_remain[:, :])
+        mass_balance['evaporated'] += evaporated
+
+        # log amount evaporated at each step
+        self.logger.debug(self._pid + 'amount evaporated for {0}: {1}'.
+                          format(substance.name, evaporated))
+
+        data['mass_components'][:] = mass_remain
+        data['mass'][:] = data['mass_components'].sum(1)
+
+        # add frac_lost
+        data['frac_lost'][:] = 1 - data['mass']/data['init_mass']
+
     def serialize(self, json_='webapi'):
         """
         Since 'wind'/'water' property is saved as references in save file
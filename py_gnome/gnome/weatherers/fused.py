@@ -0,0 +1,200 @@
+'''
+Fused evaluation of the standard weathering process chain.
+
+Model.weather_elements() normally runs each weatherer over all substeps
+before going on to the next one, so arrays like 'mass_components', 'mass',
+'frac_lost', 'density' and 'viscosity' are streamed through memory once per
+weatherer per substep. FusedWeathering instead walks the elements in blocks
+and, for each block, runs every substep of the chain
+(Evaporation -> NaturalDispersion -> Emulsification -> WeatheringData) before
+moving to the next block, so a block's data stays in cache.
+
+Differences from the per-process loop:
+
+- with weathering_substeps > 1, processes are interleaved per substep rather
+  than each process running all of its substeps in turn
+- NaturalDispersion removes dispersed mass in proportion to mass within a
+  block instead of across all elements
+
+The total mass balance agrees with the per-process loop to within a small
+tolerance; see tests/unit_tests/test_weatherers/test_fused.py
+'''
+import numpy as np
+
+from gnome import AddLogger
+from gnome.basic_types import fate as bt_fate
+
+from .evaporation import Evaporation
+from .natural_dispersion import NaturalDispersion
+from .emulsification import Emulsification
+from .weathering_data import WeatheringData
+
+
+fused_types = (Evaporation, NaturalDispersion, Emulsification, WeatheringData)
+
+
+def fuse_weatherers(weatherers, block_size=4096):
+    '''
+    Return a list to be used in place of the model's weatherers, where each
+    run of two or more consecutive active weatherers from the standard
+    process chain is replaced by one FusedWeathering object. Inactive chain
+    weatherers do nothing in weather_elements() so they are dropped.
+
+    :param weatherers: weatherers in sorted order
+    :param block_size=4096: number of elements processed at once
+    '''
+    plan = []
+    run = []
+
+    for w in list(weatherers) + [None]:
+        if w is not None and isinstance(w, fused_types):
+            if w.active:
+                run.append(w)
+            continue
+
+        if len(run) > 1:
+            plan.append(FusedWeathering(run, block_size))
+        else:
+            plan.extend(run)
+
+        run = []
+        if w is not None:
+            plan.append(w)
+
+    return plan
+
+
+class FusedWeathering(AddLogger):
+    '''
+    Runs a chain of weatherers per block of elements. Evaporation,
+    NaturalDispersion and Emulsification act on the surface_weather elements;
+    WeatheringData updates the properties of all elements.
+    '''
+    def __init__(self, weatherers, block_size=4096):
+        '''
+        :param weatherers: list of weatherers from fused_types in the order
+            they are run
+        :param block_size=4096: number of elements processed at once
+        '''
+        for w in weatherers:
+            if not isinstance(w, fused_types):
+                raise TypeError('{0} cannot be fused'
+                                .format(w.__class__.__name__))
+
+        self.weatherers = weatherers
+        self.block_size = block_size
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(weatherers={0.weatherers!r}, '
+                'block_size={0.block_size})'.format(self))
+
+    @property
+    def array_types(self):
+        array_types = {'fate_status'}
+        for w in self.weatherers:
+            array_types.update(w.array_types)
+
+        return array_types
+
+    def _data_array_types(self, sc):
+        'array_types plus the per element environment arrays the stages use'
+        array_types = set(self.array_types)
+        for w in self.weatherers:
+            array_types.update(w._data_array_types(sc))
+
+        return array_types
+
+    def weather_elements(self, sc, substeps):
+        '''
+        weather elements for all substeps of the model's time step
+
+        :param sc: SpillContainer
+        :param substeps: list of (model_time, time_step) for each substep,
+            as returned by Model._split_into_substeps()
+        '''
+        if sc.num_released == 0:
+            return
+
+        array_types = self._data_array_types(sc)
+        for substance, data in sc.itersubstancedata(array_types, fate='all'):
+            num = len(data['mass'])
+            if num == 0:
+                continue
+
+            surface = ((data['fate_status'] & bt_fate.surface_weather) ==
+                       bt_fate.surface_weather)
+            emulsified = set()
+
+            # cached property curves - see SubstanceProperties
+            substance = sc.substance_properties(substance)
+
+            for start in xrange(0, num, self.block_size):
+                stop = min(start + self.block_size, num)
+                self._weather_block(data, substance, substeps, sc.mass_balance,
+                                    start, stop, surface[start:stop],
+                                    emulsified)
+
+            for w in emulsified:
+                w._set_water_content(dict((k, data[k][surface])
+                                          for k in ('mass', 'frac_water')),
+                                     substance, sc.mass_balance)
+
+        sc.update_from_fatedataview(fate='all')
+
+        for w in self.weatherers:
+            if isinstance(w, WeatheringData):
+                w._aggregated_data(sc, 0)
+
+    def _weather_block(self, data, substance, substeps, mass_balance,
+                       start, stop, surface, emulsified):
+        '''
+        run all substeps of the chain on elements [start, stop) of data.
+        surface is the surface_weather mask for these elements.
+        '''
+        all_block = dict((k, v[start:stop]) for k, v in data.iteritems())
+
+        surf_ix = np.flatnonzero(surface)
+        if len(surf_ix) == 0:
+            surf_sel = None
+        elif surf_ix[-1] - surf_ix[0] + 1 == len(surf_ix):
+            # usual case, e.g. every element of the block is on the
+            # surface - the surface block is a view and needs no copy back
+            surf_sel = slice(surf_ix[0], surf_ix[-1] + 1)
+        else:
+            surf_sel = surf_ix
+
+        surf_block = None
+        for model_time, time_step in substeps:
+            for w in self.weatherers:
+                if isinstance(w, WeatheringData):
+                    if surf_block is not None and not isinstance(surf_sel,
+                                                                 slice):
+                        self._put(all_block, surf_sel, surf_block)
+                        surf_block = None
+
+                    w._weather_data(all_block, substance, time_step,
+                                    model_time, mass_balance)
+                    continue
+
+                if surf_sel is None:
+                    continue
+
+                if surf_block is None:
+                    surf_block = dict((k, v[surf_sel])
+                                      for k, v in all_block.iteritems())
+
+                if isinstance(w, Emulsification):
+                    if w._weather_data(surf_block, substance, time_step,
+                                       model_time, mass_balance):
+                        emulsified.add(w)
+                else:
+                    w._weather_data(surf_block, substance, time_step,
+                                    model_time, mass_balance)
+
+        if surf_block is not None and not isinstance(surf_sel, slice):
+            self._put(all_block, surf_sel, surf_block)
+
+    def _put(self, block, sel, sub_block):
+        'copy data of sub_block back to block[sel]'
+        for k, v in sub_block.iteritems():
+            block[k][sel] = v
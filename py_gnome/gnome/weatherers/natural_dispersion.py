@@ -31,6 +31,7 @@ class NaturalDispersion(Weatherer, Serializable):
     _state += [Field('water', save=True, update=True, save_reference=True),
                Field('waves', save=True, update=True, save_reference=True)]
     _schema = WeathererSchema
+    _env_array_types = ('wind_speed', 'wave_height')
 
     def __init__(self,
                  waves=None,
@@ -89,10 +90,36 @@ class NaturalDispersion(Weatherer, Serializable):
         if sc.num_released == 0:
             return
 
-        # from the waves module
-        wave_height = self.waves.get_value(model_time)[0]
-        frac_breaking_waves = self.waves.get_value(model_time)[2]
-        disp_wave_energy = self.waves.get_value(model_time)[3]
+        array_types = self._data_array_types(sc)
+        for substance, data in sc.itersubstancedata(array_types):
+            if len(data['mass']) == 0:
+                # substance does not contain any surface_weathering LEs
+                continue
+
+            self._weather_data(data, substance, time_step, model_time,
+                               sc.mass_balance)
+
+        sc.update_from_fatedataview()
+
+    def _weather_data(self, data, substance, time_step, model_time,
+                      mass_balance):
+        '''
+        disperse the elements in data in place and add the dispersed and
+        sedimented mass to mass_balance. Used by weather_elements() and
+        FusedWeathering.
+
+        The dispersed and sedimented mass is removed from all elements in
+        data in proportion to their mass.
+        '''
+        # from the waves module - per element if the model sampled the wind
+        if 'wind_speed' in data:
+            waves_values = self.waves.get_values(data['wind_speed'],
+                                                 data.get('wave_height'))
+        else:
+            waves_values = self.waves.get_value(model_time)
+        wave_height = waves_values[0]
+        frac_breaking_waves = waves_values[2]
+        disp_wave_energy = waves_values[3]
 
         visc_w = self.waves.water.kinematic_viscosity
         rho_w = self.waves.water.density
@@ -100,71 +127,61 @@ class NaturalDispersion(Weatherer, Serializable):
         # web has different units
         sediment = self.waves.water.get('sediment', unit='kg/m^3')
 
-        for substance, data in sc.itersubstancedata(self.array_types):
-            if len(data['mass']) == 0:
-                # substance does not contain any surface_weathering LEs
-                continue
+        V_entrain = constants.volume_entrained
+        ka = constants.ka  # oil sticking term
+
+        disp = np.zeros((len(data['mass'])), dtype=np.float64)
+        sed = np.zeros((len(data['mass'])), dtype=np.float64)
+        droplet_avg_size = data['droplet_avg_size']
+
+        disperse_oil(time_step,
+                     data['frac_water'],
+                     data['mass'],
+                     data['viscosity'],
+                     data['density'],
+                     data['fay_area'],
+                     disp,
+                     sed,
+                     droplet_avg_size,
+                     frac_breaking_waves,
+                     disp_wave_energy,
+                     wave_height,
+                     visc_w,
+                     rho_w,
+                     sediment,
+                     V_entrain,
+                     ka)
 
-            V_entrain = constants.volume_entrained
-            ka = constants.ka  # oil sticking term
-
-            disp = np.zeros((len(data['mass'])), dtype=np.float64)
-            sed = np.zeros((len(data['mass'])), dtype=np.float64)
-            droplet_avg_size = data['droplet_avg_size']
-
-            #print 'dispersion: mass_components = ', data['mass_components'].sum(1)
-
-            disperse_oil(time_step,
-                         data['frac_water'],
-                         data['mass'],
-                         data['viscosity'],
-                         data['density'],
-                         data['fay_area'],
-                         disp,
-                         sed,
-                         droplet_avg_size,
-                         frac_breaking_waves,
-                         disp_wave_energy,
-                         wave_height,
-                         visc_w,
-                         rho_w,
-                         sediment,
-                         V_entrain,
-                         ka)
-
-            sc.mass_balance['natural_dispersion'] += np.sum(disp[:])
-
-            if data['mass'].sum() > 0:
-                disp_mass_frac = np.sum(disp[:]) / data['mass'].sum()
-                if disp_mass_frac > 1:
-                    disp_mass_frac = 1
-            else:
-                disp_mass_frac = 0
-
-            data['mass_components'] = ((1 - disp_mass_frac) *
-                                       data['mass_components'])
-            data['mass'] = data['mass_components'].sum(1)
-
-            sc.mass_balance['sedimentation'] += np.sum(sed[:])
-
-            if data['mass'].sum() > 0:
-                sed_mass_frac = np.sum(sed[:]) / data['mass'].sum()
-                if sed_mass_frac > 1:
-                    sed_mass_frac = 1
-            else:
-                sed_mass_frac = 0
-
-            data['mass_components'] = ((1 - sed_mass_frac) *
-                                       data['mass_components'])
-            data['mass'] = data['mass_components'].sum(1)
-
-            self.logger.debug('{0} Amount Dispersed for {1}: {2}'
-                              .format(self._pid,
-                                      substance.name,
-                                      sc.mass_balance['natural_dispersion']))
-            #print 'dispersion: mass_components = ', data['mass_components'].sum(1)
+        mass_balance['natural_dispersion'] += np.sum(disp[:])
 
-        sc.update_from_fatedataview()
+        if data['mass'].sum() > 0:
+            disp_mass_frac = np.sum(disp[:]) / data['mass'].sum()
+            if disp_mass_frac > 1:
+                disp_mass_frac = 1
+        else:
+            disp_mass_frac = 0
+
+        data['mass_components'][:] = ((1 - disp_mass_frac) *
+                                      data['mass_components'])
+        data['mass'][:] = data['mass_components'].sum(1)
+
+        mass_balance['sedimentation'] += np.sum(sed[:])
+
+        if data['mass'].sum() > 0:
+            sed_mass_frac = np.sum(sed[:]) / data['mass'].sum()
+            if sed_mass_frac > 1:
+                sed_mass_frac = 1
+        else:
+            sed_mass_frac = 0
+
+        data['mass_components'][:] = ((1 - sed_mass_frac) *
+                                      data['mass_components'])
+        data['mass'][:] = data['mass_components'].sum(1)
+
+        self.logger.debug('{0} Amount Dispersed for {1}: {2}'
+                          .format(self._pid,
+                                  substance.name,
+                                  mass_balance['natural_dispersion']))
 
     def disperse_oil(self, time_step,
                      frac_water,
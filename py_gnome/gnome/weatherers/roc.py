@@ -41,6 +41,29 @@ _valid_oil_concentration_units = _valid_units('Oil Concentration')
 _valid_concentration_units = _valid_units('Concentration In Water')
 
 
+def _convert_cached(obj, attr, unit_type, from_unit, to_unit, val):
+    '''
+    uc.convert(unit_type, from_unit, to_unit, val) for obj.get(). The state
+    machines ask for the same attributes in the same units many times per
+    step so the result is kept per (attr, to_unit) on obj. It is reused only
+    if the attribute's value and units have not changed since.
+    '''
+    if not isinstance(val, (int, long, float)):
+        return uc.convert(unit_type, from_unit, to_unit, val)
+
+    cache = obj.__dict__.setdefault('_convert_cache', {})
+    key = (attr, to_unit)
+
+    hit = cache.get(key)
+    if hit is not None and hit[0] == val and hit[1] == from_unit:
+        return hit[2]
+
+    rv = uc.convert(unit_type, from_unit, to_unit, val)
+    cache[key] = (val, from_unit, rv)
+
+    return rv
+
+
 class OnSceneTupleSchema(TupleSchema):
     start = SchemaNode(DateTime(default_tzinfo=None))
     end = SchemaNode(DateTime(default_tzinfo=None))
@@ -112,8 +135,8 @@ class Response(Weatherer, Serializable):
                 unit = self._si_units[attr]
 
         if unit in self._units_type[attr][1]:
-            return uc.convert(self._units_type[attr][0], self.units[attr],
-                             unit, val)
+            return _convert_cached(self, attr, self._units_type[attr][0],
+                                   self.units[attr], unit, val)
         else:
             ex = uc.InvalidUnitError((unit, self._units_type[attr][0]))
             self.logger.error(str(ex))
@@ -328,8 +351,8 @@ class Platform(Serializable):
                 unit = self._si_units[attr]
 
         if unit in self._units_type[attr][1]:
-            return uc.convert(self._units_type[attr][0], self.units[attr],
-                              unit, val)
+            return _convert_cached(self, attr, self._units_type[attr][0],
+                                   self.units[attr], unit, val)
         else:
             ex = uc.InvalidUnitError((unit, self._units_type[attr][0]))
             self.logger.error(str(ex))
@@ -527,6 +550,74 @@ class DisperseSchema(ResponseSchema):
         self.add(units)
         super(DisperseSchema, self).__init__()
 
+class SortieState(object):
+    '''
+    Where a Disperse platform is in its operation. Disperse.simulate_plane()
+    and simulate_boat() move it through a time step. Disperse keeps one for
+    the model run and sortie_schedule() runs the same state machines on one
+    of its own that records the events.
+    '''
+    def __init__(self, cur_state, payload, dosage=None, report=None,
+                 verbose=True):
+        self.cur_state = cur_state
+        self.next_state_time = None
+        self.op_start = None
+        self.op_end = None
+        self.pass_num = 1
+        self.payloads_delivered = 0
+        self.remaining_dispersant = payload
+        self.time_remaining = datetime.timedelta(seconds=0)
+        self.oil_treated = 0
+        self.disp_sprayed = 0
+        self.area_sprayed = 0
+
+        # fixed dosage in gal/acre - None uses the Disperse's dosage
+        self.dosage = dosage
+
+        self.report = [] if report is None else report
+        # print report messages as they are made
+        self.verbose = verbose
+
+        # (start, end, state, sortie, dispersant) tuples if recording. The
+        # sortie number and dispersant total are only kept for these.
+        self.events = None
+        self.sortie = 0
+        self.disp_total = 0
+
+    def echo(self):
+        if self.verbose:
+            print self.report[-1]
+
+    def record(self, state, start, end, disp_total):
+        '''
+        record the time from start to end spent in state. disp_total is the
+        dispersant total at start. The time steps split a state over several
+        calls, these are merged into one event.
+        '''
+        if self.events is None:
+            return
+
+        if state == 'ready' and self.cur_state == 'en_route':
+            self.sortie += 1
+
+        if end <= start or state in ('retired', 'ready', 'deactivated'):
+            return
+
+        dispersant = self.disp_total - disp_total
+        if state.startswith('disperse') or (state == 'onsite' and
+                                            dispersant > 0):
+            state = 'spray'
+
+        if len(self.events) > 0:
+            last = self.events[-1]
+            if last[1] == start and last[2:4] == (state, self.sortie):
+                self.events[-1] = (last[0], end, state, self.sortie,
+                                   last[4] + dispersant)
+                return
+
+        self.events.append((start, end, state, self.sortie, dispersant))
+
+
 class Disperse(Response):
 
     _attr = {'transit': ('nm', 'length', _valid_dist_units),
@@ -603,17 +694,8 @@ class Disperse(Response):
             units = dict([(k, v[0]) for k, v in self._attr.items()])
         self._units = units
         self.wind = wind
-        self.cur_state = None
-        self.oil_treated_this_timestep = 0
-        self._next_state_time = None
-        self._op_start = None
-        self._op_end = None
-        self._cur_sortie_num = 1
-        self._cur_pass_num = 1
-        self._area_this_ts = 0
-        self._area_this_sortie = 0
-        self._disp_sprayed_this_timestep = 0
-        self._remaining_dispersant = None
+        # SortieState of the model run - see prepare_for_model_run()
+        self._run = None
         self._pass_time_tuple = self.platform.pass_duration_tuple(self.pass_length, self.pass_type)
 
         if dosage is not None:
@@ -656,12 +738,16 @@ class Disperse(Response):
         self._setup_report(sc)
         if self.on:
             sc.mass_balance['chem_dispersed'] = 0.0
+        if self._run is None:
+            self._run = self._new_run()
+        st = self._run
+        st.report = self.report
         if self.cascade_on:
-            self.cur_state = 'cascade'
+            st.cur_state = 'cascade'
         else:
-            self.cur_state = 'retired'
-        self._remaining_dispersant = self.platform.get('payload', 'm^3')
-        self.oil_treated_this_timestep = 0
+            st.cur_state = 'retired'
+        st.remaining_dispersant = self.platform.get('payload', 'm^3')
+        st.oil_treated = 0
         if 'systems' not in sc.mass_balance:
             sc.mass_balance['systems'] = {}
         sc.mass_balance['systems'][self.id] = {
@@ -673,7 +759,21 @@ class Disperse(Response):
             'area_covered': 0.0
         }
 
-        self._payloads_delivered = 0
+        st.payloads_delivered = 0
+
+    @property
+    def cur_state(self):
+        '''
+        state of the platform in the model run, None before it is prepared
+        '''
+        return self._run.cur_state if self._run is not None else None
+
+    def _new_run(self, cur_state=None, dosage=None, verbose=True):
+        return SortieState(cur_state,
+                           self.platform.get('payload', 'm^3'),
+                           dosage=dosage,
+                           report=self.report,
+                           verbose=verbose)
 
     def dosage_from_thickness(self, sc):
         thickness = self._get_thickness(sc) # inches
@@ -715,348 +815,480 @@ class Disperse(Response):
         if not isinstance(time_step, datetime.timedelta):
             time_step = datetime.timedelta(seconds=time_step)
 
-        self._time_remaining = datetime.timedelta(seconds=time_step.total_seconds())
-        zero = datetime.timedelta(seconds=0)
         if self.cur_state is None:
             # This is first step., setup inactivity if necessary
             if self.next_interval_index(model_time) != 0:
                 raise ValueError('disperse time series begins before time of first step!')
             else:
-                self.cur_state = 'retired'
+                if self._run is None:
+                    self._run = self._new_run()
+                self._run.cur_state = 'retired'
 
-        if self.cur_state == 'deactivated':
+        self._simulate(sc, self._run, time_step, model_time)
+
+    def _simulate(self, sc, st, time_step, model_time):
+        '''
+        move the platform state st through the time step. sc is None when
+        computing a sortie_schedule() - there is then always oil to treat.
+        '''
+        st.time_remaining = datetime.timedelta(seconds=time_step.total_seconds())
+        if st.cur_state == 'deactivated':
             # do deactivated stuff
             return
 
         if self.platform.is_boat:
-            self.simulate_boat(sc, time_step, model_time)
+            self.simulate_boat(sc, st, time_step, model_time)
         else:
-            self.simulate_plane(sc, time_step, model_time)
+            self.simulate_plane(sc, st, time_step, model_time)
 
-    def simulate_boat(self, sc, time_step, model_time):
+    def _get_dosage(self, sc, st):
+        if st.dosage is not None:
+            # fixed for a sortie_schedule()
+            return st.dosage
+
+        if self.dosage_type == 'auto':
+            self.dosage_from_thickness(sc)
+
+        return self.dosage
+
+    def simulate_boat(self, sc, st, time_step, model_time):
         zero = datetime.timedelta(seconds=0)
         ttni = self.time_to_next_interval(model_time)
         tte = self.timeseries[-1][-1] - model_time
         if tte < zero:
             return
-        while self._time_remaining > zero:
+        step_end = model_time + time_step
+        while st.time_remaining > zero:
+            state, start, disp_total = st.cur_state, st.time_remaining, st.disp_total
 
-            if self.cur_state == 'retired':
+            if st.cur_state == 'retired':
                 if model_time < self.timeseries[0][0]:
                     tts = self.timeseries[0][0] - model_time
-                    self._time_remaining -= min(self._time_remaining, tts)
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                    if self.time_remaining > 0:
+                    st.time_remaining -= min(st.time_remaining, tts)
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                    if st.time_remaining > zero:
                         #must just have started. Get ready
-                        self.cur_state = 'ready'
-                        self.report.append((model_time, 'Begin new operational period'))
+                        st.cur_state = 'ready'
+                        st.report.append((model_time, 'Begin new operational period'))
                 else:
-                    self.cur_state = 'ready'
-                    self.report.append((model_time, 'Begin new operational period'))
+                    st.cur_state = 'ready'
+                    st.report.append((model_time, 'Begin new operational period'))
 
-            elif self.cur_state == 'ready':
+            elif st.cur_state == 'ready':
                 if self.platform.sortie_possible(tte, self.transit, self.pass_length):
                     # sortie is possible, so start immediately
-                    self.report.append((model_time, 'Starting sortie'))
-                    self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
-                    self.cur_state = 'en_route'
-                    self._area_sprayed_this_sortie = 0
-                    self._area_sprayed_this_ts = 0
+                    st.report.append((model_time, 'Starting sortie'))
+                    st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
+                    st.cur_state = 'en_route'
+                    st.area_sprayed = 0
                 else:
                     # cannot sortie, so retire until next interval
-                    self.cur_state = 'deactivated'
-                    self.report.append((model_time, 'Deactivating due to insufficient time remaining to conduct sortie'))
-                    print self.report[-1]
-                    self._time_remaining -= min(self._time_remaining, ttni)
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-
-            elif self.cur_state == 'en_route':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Reached slick'))
-                    self._op_start = model_time
-                    self._op_end = (self.timeseries[-1][-1] - datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit)))
-                    self._cur_pass_num = 1
-                    self.cur_state = 'onsite'
+                    st.cur_state = 'deactivated'
+                    st.report.append((model_time, 'Deactivating due to insufficient time remaining to conduct sortie'))
+                    st.echo()
+                    st.time_remaining -= min(st.time_remaining, ttni)
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+
+            elif st.cur_state == 'en_route':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Reached slick'))
+                    st.op_start = model_time
+                    st.op_end = (self.timeseries[-1][-1] - datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit)))
+                    st.pass_num = 1
+                    st.cur_state = 'onsite'
                     dur = datetime.timedelta(hours=self.platform.get('max_op_time', 'hrs'))
-                    self._next_state_time = model_time + dur
+                    st.next_state_time = model_time + dur
 
-            elif self.cur_state == 'onsite':
-                remaining_op = self._op_end - model_time
+            elif st.cur_state == 'onsite':
+                remaining_op = st.op_end - model_time
                 if self.is_operating(model_time):
                     interval_remaining = self.time_to_next_interval(model_time)
-                    spray_time = min(self._time_remaining, remaining_op, interval_remaining)
-                    if self.dosage_type == 'auto':
-                        self.dosage_from_thickness(sc)
-                    dosage = self.dosage
+                    spray_time = min(st.time_remaining, remaining_op, interval_remaining)
+                    dosage = self._get_dosage(sc, st)
                     disp_possible = spray_time.total_seconds() * self.platform.eff_pump_rate(dosage)
-                    disp_actual = min(self._remaining_dispersant, disp_possible)
+                    disp_actual = min(st.remaining_dispersant, disp_possible)
                     if disp_actual != disp_possible:
                         spray_time = datetime.timedelta(seconds=disp_actual / self.platform.eff_pump_rate(dosage))
-                    treated_possible = disp_actual * self.disp_oil_ratio
-                    mass_treatable = np.mean(sc['density'][self.dispersable_oil_idxs(sc)]) * treated_possible
-                    oil_avail = self.dispersable_oil_amount(sc, 'kg')
-                    self.report.append((model_time, 'Oil available: ' + str(oil_avail) + '  Treatable mass: ' + str(mass_treatable) + '  Dispersant Sprayed: ' + str(disp_actual)))
-                    self.report.append((model_time, 'Sprayed ' + str(disp_actual) + 'm^3 dispersant in ' + str(spray_time) + ' on ' + str(oil_avail) + ' kg of oil'))
-                    print self.report[-1]
-                    self._time_remaining -= spray_time
-                    self._disp_sprayed_this_timestep += disp_actual
-                    self._remaining_dispersant -= disp_actual
-                    self.oil_treated_this_timestep += min(mass_treatable, oil_avail)
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                    if self._time_remaining > zero: #end of interval, end of operation, or out of dispersant/fuel
-                        if self._remaining_dispersant == 0:
+                    if sc is not None:
+                        treated_possible = disp_actual * self.disp_oil_ratio
+                        mass_treatable = np.mean(sc['density'][self.dispersable_oil_idxs(sc)]) * treated_possible
+                        oil_avail = self.dispersable_oil_amount(sc, 'kg')
+                        st.report.append((model_time, 'Oil available: ' + str(oil_avail) + '  Treatable mass: ' + str(mass_treatable) + '  Dispersant Sprayed: ' + str(disp_actual)))
+                        st.report.append((model_time, 'Sprayed ' + str(disp_actual) + 'm^3 dispersant in ' + str(spray_time) + ' on ' + str(oil_avail) + ' kg of oil'))
+                        st.echo()
+                        st.oil_treated += min(mass_treatable, oil_avail)
+                    st.time_remaining -= spray_time
+                    st.disp_sprayed += disp_actual
+                    st.disp_total += disp_actual
+                    st.remaining_dispersant -= disp_actual
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                    if st.time_remaining > zero: #end of interval, end of operation, or out of dispersant/fuel
+                        if st.remaining_dispersant == 0:
                             #go to reload
                             if self.onsite_reload_refuel:
-                                self.cur_state = 'refuel_reload'
+                                st.cur_state = 'refuel_reload'
                                 refuel_reload = datetime.timedelta(seconds=self.platform.refuel_reload(simul=self.loading_type))
-                                self._next_state_time = model_time + refuel_reload
-                                self.report.append((model_time, 'Reloading/refueling'))
+                                st.next_state_time = model_time + refuel_reload
+                                st.report.append((model_time, 'Reloading/refueling'))
                             else:
                                 #need to return to base
-                                self.cur_state = 'rtb'
-                                self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
-                                self.report.append((model_time, 'Out of dispersant, returning to base'))
-                        elif model_time == self._op_end:
-                            self.report.append((model_time, 'Operation complete, returning to base'))
-                            self.cur_state = 'rtb'
-                            self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
+                                st.cur_state = 'rtb'
+                                st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
+                                st.report.append((model_time, 'Out of dispersant, returning to base'))
+                        elif model_time == st.op_end:
+                            st.report.append((model_time, 'Operation complete, returning to base'))
+                            st.cur_state = 'rtb'
+                            st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
                 else:
-                    self._time_remaining -= min(self._time_remaining, remaining_op)
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                    if self._time_remaining > zero:
-                        self.cur_state = 'rtb'
-                        self.report.append((model_time, 'Operation complete, returning to base'))
-                        self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
-
-            elif self.cur_state == 'rtb':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Returned to base'))
-                    print self.report[-1]
+                    st.time_remaining -= min(st.time_remaining, remaining_op)
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                    if st.time_remaining > zero:
+                        st.cur_state = 'rtb'
+                        st.report.append((model_time, 'Operation complete, returning to base'))
+                        st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
+
+            elif st.cur_state == 'rtb':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Returned to base'))
+                    st.echo()
                     refuel_reload = datetime.timedelta(seconds=self.platform.refuel_reload(simul=self.loading_type))
-                    self._next_state_time = model_time + refuel_reload
-                    self.cur_state = 'refuel_reload'
-
-            elif self.cur_state == 'refuel_reload':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Refuel/reload complete'))
-                    print self.report[-1]
-                    self._remaining_dispersant = self.platform.get('payload', 'm^3')
+                    st.next_state_time = model_time + refuel_reload
+                    st.cur_state = 'refuel_reload'
+
+            elif st.cur_state == 'refuel_reload':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Refuel/reload complete'))
+                    st.echo()
+                    st.remaining_dispersant = self.platform.get('payload', 'm^3')
                     if self.onsite_reload_refuel:
-                        self.cur_state = 'onsite'
+                        st.cur_state = 'onsite'
                     else:
-                        self.cur_state = 'ready'
+                        st.cur_state = 'ready'
 
-    def simulate_plane(self, sc, time_step, model_time):
+            st.record(state, step_end - start, step_end - st.time_remaining, disp_total)
+
+    def simulate_plane(self, sc, st, time_step, model_time):
         ttni = self.time_to_next_interval(model_time)
         zero = datetime.timedelta(seconds=0)
-        while self._time_remaining > zero:
+        step_end = model_time + time_step
+        while st.time_remaining > zero:
             if ttni is None:
-                if self.cur_state not in ['retired', 'reload', 'ready']:
+                if st.cur_state not in ['retired', 'reload', 'ready']:
                     raise ValueError('Operation is being deactivated while platform is active!')
-                self.cur_state = 'deactivated'
-                self.report.append((model_time, 'Disperse operation has ended and is deactivated'))
-                print self.report[-1]
+                st.cur_state = 'deactivated'
+                st.report.append((model_time, 'Disperse operation has ended and is deactivated'))
+                st.echo()
                 break
 
-            if self.cur_state == 'retired':
+            state, start, disp_total = st.cur_state, st.time_remaining, st.disp_total
+
+            if st.cur_state == 'retired':
                 if self.index_of(model_time) > -1 and self.timeseries[self.index_of(model_time)][0] == model_time:
                     #landed right on interval start, so ready immediately
-                    self.cur_state = 'ready'
-                    self.report.append((model_time, 'Begin new operational period'))
-                    print self.report[-1]
+                    st.cur_state = 'ready'
+                    st.report.append((model_time, 'Begin new operational period'))
+                    st.echo()
                     continue
-                self._time_remaining -= min(self._time_remaining, ttni)
-                if self._time_remaining > zero:
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
+                st.time_remaining -= min(st.time_remaining, ttni)
+                if st.time_remaining > zero:
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
                     # hit interval boundary before ending timestep.
                     # If ending current interval or no remaining time, do nothing
                     # if start of next interval, set state to 'ready'
                         # entering new operational interval
                         # ending current interval
                     if self.index_of(model_time) > -1:
-                        self.cur_state = 'ready'
-                        self.report.append((model_time, 'Begin new operational period'))
-                        print self.report[-1]
+                        st.cur_state = 'ready'
+                        st.report.append((model_time, 'Begin new operational period'))
+                        st.echo()
                     else:
-                        interval_idx = self.index_of(model_time - time_step + self._time_remaining)
-                        self.report.append((model_time, 'Ending current operational period'))
-                        print self.report[-1]
+                        interval_idx = self.index_of(model_time - time_step + st.time_remaining)
+                        st.report.append((model_time, 'Ending current operational period'))
+                        st.echo()
 
-            elif self.cur_state == 'ready':
+            elif st.cur_state == 'ready':
                 if self.platform.sortie_possible(ttni, self.transit, self.pass_length):
                     # sortie is possible, so start immediately
-                    self.report.append((model_time, 'Starting sortie'))
-                    print self.report[-1]
-                    self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
-                    self.cur_state = 'en_route'
-                    self._area_sprayed_this_sortie = 0
-                    self._area_sprayed_this_ts = 0
+                    st.report.append((model_time, 'Starting sortie'))
+                    st.echo()
+                    st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit))
+                    st.cur_state = 'en_route'
+                    st.area_sprayed = 0
                 else:
                     # cannot sortie, so retire until next interval
-                    self.cur_state = 'retired'
-                    self.report.append((model_time, 'Retiring due to insufficient time remaining to conduct sortie'))
-                    print self.report[-1]
-                    self._time_remaining -= min(self._time_remaining, ttni)
-                    model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-
-            elif self.cur_state == 'en_route':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Reached slick'))
-                    print self.report[-1]
-                    self._op_start = model_time
-                    self._op_end = model_time + datetime.timedelta(seconds=self.platform.max_onsite_time(self.transit, self.loading_type))
-                    self._cur_pass_num = 1
-                    self.cur_state = 'approach'
+                    st.cur_state = 'retired'
+                    st.report.append((model_time, 'Retiring due to insufficient time remaining to conduct sortie'))
+                    st.echo()
+                    st.time_remaining -= min(st.time_remaining, ttni)
+                    model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+
+            elif st.cur_state == 'en_route':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Reached slick'))
+                    st.echo()
+                    st.op_start = model_time
+                    st.op_end = model_time + datetime.timedelta(seconds=self.platform.max_onsite_time(self.transit, self.loading_type))
+                    st.pass_num = 1
+                    st.cur_state = 'approach'
                     dur = datetime.timedelta(seconds=self.platform.pass_duration_tuple(self.pass_length, self.pass_type)[0])
-                    self._next_state_time = model_time + dur
-                    self.report.append((model_time, 'Starting approach for pass ' + str(self._cur_pass_num)))
-                    print self.report[-1]
-
-            elif self.cur_state == 'approach':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
+                    st.next_state_time = model_time + dur
+                    st.report.append((model_time, 'Starting approach for pass ' + str(st.pass_num)))
+                    st.echo()
+
+            elif st.cur_state == 'approach':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
                     spray_time = self.platform.pass_duration_tuple(self.pass_length, self.pass_type)[1]
-                    self._next_state_time = model_time + datetime.timedelta(seconds=spray_time)
-                    self.cur_state = 'disperse_' + str(self._cur_pass_num)
-                    self.report.append((model_time, 'Starting pass ' + str(self._cur_pass_num)))
+                    st.next_state_time = model_time + datetime.timedelta(seconds=spray_time)
+                    st.cur_state = 'disperse_' + str(st.pass_num)
+                    st.report.append((model_time, 'Starting pass ' + str(st.pass_num)))
 
-            elif self.cur_state == 'u-turn':
+            elif st.cur_state == 'u-turn':
                 if self.pass_type != 'bidirectional':
                     raise ValueError('u-turns should not happen in uni-directional passes')
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
                     spray_time = self.platform.pass_duration_tuple(self.pass_length, self.pass_type)[1]
-                    self._next_state_time = model_time + datetime.timedelta(seconds=spray_time)
-                    self.cur_state = 'disperse_' + str(self._cur_pass_num) + 'u'
-                    self.report.append((model_time, 'Begin return pass of pass ' + str(self._cur_pass_num)))
-
-            elif self.cur_state == 'departure':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Disperse pass ' + str(self._cur_pass_num) + ' completed'))
-                    passes_possible = self.platform.num_passes_possible(self._op_end - model_time, self.pass_length, self.pass_type)
-                    passes_possible_after_holding = self.platform.num_passes_possible(self._op_end - model_time + time_step, self.pass_length, self.pass_type)
+                    st.next_state_time = model_time + datetime.timedelta(seconds=spray_time)
+                    st.cur_state = 'disperse_' + str(st.pass_num) + 'u'
+                    st.report.append((model_time, 'Begin return pass of pass ' + str(st.pass_num)))
+
+            elif st.cur_state == 'departure':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Disperse pass ' + str(st.pass_num) + ' completed'))
+                    passes_possible = self.platform.num_passes_possible(st.op_end - model_time, self.pass_length, self.pass_type)
+                    passes_possible_after_holding = self.platform.num_passes_possible(st.op_end - model_time + time_step, self.pass_length, self.pass_type)
                     o_w_t_t = datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit, payload=False))
-                    self._cur_pass_num += 1
-                    if self._remaining_dispersant == 0:
+                    st.pass_num += 1
+                    if st.remaining_dispersant == 0:
                         # no dispersant, so return to base
-                        self.reset_for_return_to_base(model_time, 'No dispersant remaining, returning to base')
-                    elif np.isclose(self.dispersable_oil_amount(sc, 'kg'), 0):
+                        self.reset_for_return_to_base(st, model_time, 'No dispersant remaining, returning to base')
+                    elif sc is not None and np.isclose(self.dispersable_oil_amount(sc, 'kg'), 0):
                         if passes_possible_after_holding > 0:
                             # no oil left, but can still do a pass after holding for one timestep
-                            self.cur_state = 'holding'
-                            self._next_state_time = model_time + datetime.timedelta(seconds=time_step)
+                            st.cur_state = 'holding'
+                            st.next_state_time = model_time + datetime.timedelta(seconds=time_step)
                         else:
-                            self.reset_for_return_to_base(model_time, 'No oil, no time for holding pattern, returning to base')
+                            self.reset_for_return_to_base(st, model_time, 'No oil, no time for holding pattern, returning to base')
                     elif passes_possible == 0:
                         # no passes possible, so RTB
-                        self.reset_for_return_to_base(model_time, 'No time for further passes, returning to base')
+                        self.reset_for_return_to_base(st, model_time, 'No time for further passes, returning to base')
                     else:
                         # oil and payload still remaining. Spray again.
-                        self.report.append((model_time, 'Starting disperse pass ' + str(self._cur_pass_num)))
-                        print self.report[-1]
-                        self.cur_state = 'disperse_' + str(self._cur_pass_num)
-                        self._next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[1])
-
-            elif self.cur_state == 'holding':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                self.cur_state = 'approach'
-
-            elif 'disperse' in self.cur_state:
+                        st.report.append((model_time, 'Starting disperse pass ' + str(st.pass_num)))
+                        st.echo()
+                        st.cur_state = 'disperse_' + str(st.pass_num)
+                        st.next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[1])
+
+            elif st.cur_state == 'holding':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                st.cur_state = 'approach'
+
+            elif 'disperse' in st.cur_state:
                 pass_dur = datetime.timedelta(seconds=self.platform.pass_duration_tuple(self.pass_length, self.pass_type)[1])
                 self._time_spraying = pass_dur.seconds
-                time_left_in_pass = self._next_state_time - model_time
-                spray_time = min(self._time_remaining, time_left_in_pass)
-                if self.dosage_type == 'auto':
-                    self.dosage_from_thickness(sc)
-                dosage = self.dosage
+                time_left_in_pass = st.next_state_time - model_time
+                spray_time = min(st.time_remaining, time_left_in_pass)
+                dosage = self._get_dosage(sc, st)
                 disp_possible = spray_time.total_seconds() * self.platform.eff_pump_rate(dosage)
-                disp_actual = min(self._remaining_dispersant, disp_possible)
-                treated_possible = disp_actual * self.disp_oil_ratio
-                mass_treatable = np.mean(sc['density'][self.dispersable_oil_idxs(sc)]) * treated_possible
-                oil_avail = self.dispersable_oil_amount(sc, 'kg')
-                self.report.append((model_time, 'Oil available: ' + str(oil_avail) + '  Treatable mass: ' + str(mass_treatable) + '  Dispersant Sprayed: ' + str(disp_actual)))
-                self.report.append((model_time, 'Sprayed ' + str(disp_actual) + 'm^3 dispersant in ' + str(spray_time) + ' seconds on ' + str(oil_avail) + ' kg of oil'))
-                self._time_remaining -= spray_time
-                self._disp_sprayed_this_timestep += disp_actual
-                self._remaining_dispersant -= disp_actual
-                self.oil_treated_this_timestep += min(mass_treatable, oil_avail)
-
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
+                disp_actual = min(st.remaining_dispersant, disp_possible)
+                if sc is not None:
+                    treated_possible = disp_actual * self.disp_oil_ratio
+                    mass_treatable = np.mean(sc['density'][self.dispersable_oil_idxs(sc)]) * treated_possible
+                    oil_avail = self.dispersable_oil_amount(sc, 'kg')
+                    st.report.append((model_time, 'Oil available: ' + str(oil_avail) + '  Treatable mass: ' + str(mass_treatable) + '  Dispersant Sprayed: ' + str(disp_actual)))
+                    st.report.append((model_time, 'Sprayed ' + str(disp_actual) + 'm^3 dispersant in ' + str(spray_time) + ' seconds on ' + str(oil_avail) + ' kg of oil'))
+                    st.oil_treated += min(mass_treatable, oil_avail)
+                st.time_remaining -= spray_time
+                st.disp_sprayed += disp_actual
+                st.disp_total += disp_actual
+                st.remaining_dispersant -= disp_actual
+
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
                     # completed a spray.
-                    if self.pass_type == 'bidirectional' and self._remaining_dispersant > 0 and self.cur_state[-1] != 'u':
-                        self.cur_state = 'u-turn'
-                        self.report.append((model_time, 'Doing u-turn'))
-                        self._next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[2])
+                    if self.pass_type == 'bidirectional' and st.remaining_dispersant > 0 and st.cur_state[-1] != 'u':
+                        st.cur_state = 'u-turn'
+                        st.report.append((model_time, 'Doing u-turn'))
+                        st.next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[2])
                     else:
-                        self.cur_state = 'departure'
-                        self._next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[-1])
+                        st.cur_state = 'departure'
+                        st.next_state_time = model_time + datetime.timedelta(seconds=self._pass_time_tuple[-1])
 
 
-            elif self.cur_state == 'rtb':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Returned to base'))
+            elif st.cur_state == 'rtb':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Returned to base'))
                     refuel_reload = datetime.timedelta(seconds=self.platform.refuel_reload(simul=self.loading_type))
-                    self._next_state_time = model_time + refuel_reload
-                    self.cur_state = 'refuel_reload'
-
-            elif self.cur_state == 'refuel_reload':
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Refuel/reload complete'))
-                    print self.report[-1]
-                    self._remaining_dispersant = self.platform.get('payload', 'm^3')
-                    self.cur_state = 'ready'
-
-            elif self.cur_state == 'cascade':
-                if self._next_state_time is None:
-                    self._next_state_time = model_time + datetime.timedelta(seconds=self.platform.cascade_time(self.cascade_distance, payload=False))
-                time_left = self._next_state_time - model_time
-                self._time_remaining -= min(self._time_remaining, time_left)
-                model_time, time_step = self.update_time(self._time_remaining, model_time, time_step)
-                if self._time_remaining > zero:
-                    self.report.append((model_time, 'Cascade complete'))
-                    print self.report[-1]
-                    self.cur_state = 'ready'
+                    st.next_state_time = model_time + refuel_reload
+                    st.cur_state = 'refuel_reload'
+
+            elif st.cur_state == 'refuel_reload':
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Refuel/reload complete'))
+                    st.echo()
+                    st.remaining_dispersant = self.platform.get('payload', 'm^3')
+                    st.cur_state = 'ready'
+
+            elif st.cur_state == 'cascade':
+                if st.next_state_time is None:
+                    st.next_state_time = model_time + datetime.timedelta(seconds=self.platform.cascade_time(self.cascade_distance, payload=False))
+                time_left = st.next_state_time - model_time
+                st.time_remaining -= min(st.time_remaining, time_left)
+                model_time, time_step = self.update_time(st.time_remaining, model_time, time_step)
+                if st.time_remaining > zero:
+                    st.report.append((model_time, 'Cascade complete'))
+                    st.echo()
+                    st.cur_state = 'ready'
             else:
-                raise ValueError('current state is not recognized: ' + self.cur_state)
+                raise ValueError('current state is not recognized: ' + st.cur_state)
+
+            st.record(state, step_end - start, step_end - st.time_remaining, disp_total)
 
-    def reset_for_return_to_base(self, model_time, message):
-        self.report.append((model_time, message))
-        print self.report[-1]
+    def reset_for_return_to_base(self, st, model_time, message):
+        st.report.append((model_time, message))
+        st.echo()
         o_w_t_t = datetime.timedelta(seconds=self.platform.one_way_transit_time(self.transit, payload=False))
-        self._next_state_time = model_time + o_w_t_t
-        self._op_start = self._op_end = None
-        self._cur_pass_num = 1
-        self._disp_sprayed_this_timestep = 0
-        self.cur_state = 'rtb'
-        self._payloads_delivered += 1
+        st.next_state_time = model_time + o_w_t_t
+        st.op_start = st.op_end = None
+        st.pass_num = 1
+        st.disp_sprayed = 0
+        st.cur_state = 'rtb'
+        st.payloads_delivered += 1
+
+    # states of the events in a sortie schedule - see sortie_schedule()
+    schedule_states = ('cascade', 'en_route', 'approach', 'spray', 'u-turn',
+                       'departure', 'holding', 'onsite', 'rtb',
+                       'refuel_reload')
+
+    schedule_dtype = np.dtype([('start', 'datetime64[ms]'),
+                               ('end', 'datetime64[ms]'),
+                               ('state', np.uint8),
+                               ('sortie', np.int32),
+                               ('dispersant', np.float64)])
+
+    def sortie_schedule(self, dosage=None, time_step=900):
+        '''
+        Precompute the platform's timeline over the timeseries as an array of
+        events with dtype schedule_dtype: 'start' and 'end' time, 'state'
+        (index into schedule_states), 'sortie' number and 'dispersant'
+        sprayed in m^3 during 'spray' events.
+
+        The timeline is made by stepping simulate_plane() or simulate_boat()
+        through the timeseries on a state of their own with no spill, so
+        there is always oil to treat. It only needs to be computed once for a
+        set of response settings. Use schedule_totals() to get the spraying
+        done in a time step. Events still going on at the end of the last
+        operational period are cut off there.
+
+        :param dosage=None: dosage in gal/acre. Defaults to self.dosage. It
+            must be given if dosage_type is 'auto' and no dosage is set,
+            since the dosage then depends on the oil thickness.
+        :param time_step=900: time step in seconds to simulate with
+        '''
+        if dosage is None:
+            dosage = self.dosage
+
+        if dosage is None:
+            raise ValueError('{0}: dosage is required to compute the sortie '
+                             'schedule'.format(self.name))
+
+        if self.platform.is_boat and self.cascade_on:
+            # simulate_boat() has no cascade state
+            raise ValueError('{0}: cascade is not simulated for vessels'
+                             .format(self.name))
+
+        st = self._new_run('cascade' if self.cascade_on else 'retired',
+                           dosage=dosage,
+                           verbose=False)
+        st.report = []
+        st.events = []
+
+        start, end = self.timeseries[0][0], self.timeseries[-1][-1]
+        time_step = datetime.timedelta(seconds=time_step)
+
+        # the number of steps caps the loop - the state machines are not
+        # stepped past the end of the operation
+        num_steps = int(math.ceil((end - start).total_seconds() /
+                                  time_step.total_seconds()))
+        model_time = start
+        for step in range(num_steps):
+            if st.cur_state == 'deactivated':
+                break
+
+            self._simulate(None, st, time_step, model_time)
+            model_time += time_step
+
+        events = [e for e in st.events if e[0] < end]
+
+        schedule = np.zeros((len(events),), dtype=self.schedule_dtype)
+        if len(events) > 0:
+            schedule['start'] = [np.datetime64(e[0], 'ms') for e in events]
+            schedule['end'] = [np.datetime64(min(e[1], end), 'ms')
+                               for e in events]
+            schedule['state'] = [self.schedule_states.index(e[2])
+                                 for e in events]
+            schedule['sortie'] = [e[3] for e in events]
+            schedule['dispersant'] = [e[4] for e in events]
+
+        return schedule
+
+    @classmethod
+    def schedule_totals(cls, schedule, model_time, time_step):
+        '''
+        Spraying done between model_time and model_time + time_step
+        according to a schedule from sortie_schedule(). Spray events that
+        overlap the time step partly are prorated.
+
+        :returns: (spray_time, dispersant) in seconds and m^3
+        '''
+        if isinstance(time_step, datetime.timedelta):
+            time_step = time_step.total_seconds()
+
+        t0 = np.datetime64(model_time, 'ms')
+        t1 = t0 + np.timedelta64(int(round(time_step * 1000)), 'ms')
+
+        # events are in time order and do not overlap
+        events = schedule[np.searchsorted(schedule['end'], t0, 'right'):
+                          np.searchsorted(schedule['start'], t1, 'left')]
+        events = events[events['state'] == cls.schedule_states.index('spray')]
+
+        sec = np.timedelta64(1, 's')
+        duration = (events['end'] - events['start']) / sec
+        overlap = (np.minimum(events['end'], t1) -
+                   np.maximum(events['start'], t0)) / sec
+
+        frac = np.ones_like(overlap)
+        np.divide(overlap, duration, out=frac, where=duration > 0)
+
+        return overlap.sum(), (frac * events['dispersant']).sum()
 
     def update_time(self, time_remaining, model_time, time_step):
         if time_remaining > datetime.timedelta(seconds=0):
@@ -1080,17 +1312,18 @@ class Disperse(Response):
             return max(0, uc.convert('m^3', units, tot_vol))
         else:
             tot_mass = np.sum(sc['mass'][idxs])
-            return max(0, tot_mass - self.oil_treated_this_timestep / np.mean(sc['density'][idxs]))
+            return max(0, tot_mass - self._run.oil_treated / np.mean(sc['density'][idxs]))
 
     def weather_elements(self, sc, time_step, model_time):
+        st = self._run
 
         idxs = self.dispersable_oil_idxs(sc)
-        if self.oil_treated_this_timestep != 0:
+        if st.oil_treated != 0:
             visc_eff_table = Disperse.visc_eff_table
             wind_eff_list = Disperse.wind_eff_list
             mass_proportions = sc['mass'][idxs] / np.sum(sc['mass'][idxs])
             eff_reductions = self.get_disp_eff(sc, model_time)
-            mass_to_remove = self.oil_treated_this_timestep * mass_proportions * eff_reductions
+            mass_to_remove = st.oil_treated * mass_proportions * eff_reductions
 
             org_mass = sc['mass'][idxs]
             removed = self._remove_mass_indices(sc, mass_to_remove, idxs)
@@ -1098,18 +1331,71 @@ class Disperse(Response):
             masstab = np.column_stack((idxs, org_mass, mass_to_remove, sc['mass'][idxs]))
             sc.mass_balance['chem_dispersed'] += sum(removed)
             sc.mass_balance['systems'][self.id]['dispersed'] += sum(removed)
-            sc.mass_balance['systems'][self.id]['area_covered'] += self._area_sprayed_this_ts
-            sc.mass_balance['systems'][self.id]['dispersant_applied'] += self._disp_sprayed_this_timestep
-            sc.mass_balance['systems'][self.id]['oil_treated'] += self.oil_treated_this_timestep
+            sc.mass_balance['systems'][self.id]['area_covered'] += st.area_sprayed
+            sc.mass_balance['systems'][self.id]['dispersant_applied'] += st.disp_sprayed
+            sc.mass_balance['systems'][self.id]['oil_treated'] += st.oil_treated
             sc.mass_balance['systems'][self.id]['payloads_delivered']
-            sc.mass_balance['floating'] -= sum(removed)
             zero_or_disp = np.isclose(sc['mass'][idxs], 0)
+            before = sc.mass_ledger.state(sc, idxs)
             new_status = sc['fate_status'][idxs]
             new_status[zero_or_disp] = bt_fate.disperse
             sc['fate_status'][idxs] = new_status
-            self.oil_treated_this_timestep = 0
-            self.disp_sprayed_this_timestep = 0
-
+            sc.mass_ledger.update(sc, idxs, before)
+            sc.reset_fate_dataview()
+            st.oil_treated = 0
+
+
+
+def evaluate_disperse_options(platforms, dosages, timeseries, transit,
+                              **kwargs):
+    '''
+    Evaluate dispersant operations for every combination of platform and
+    dosage without running a model, for response planning. Each platform's
+    constants are computed once and reused for all dosages.
+
+    :param platforms: list of platform names from platforms.json or dicts of
+        Platform attributes, as accepted by Disperse
+    :param dosages: list of dosages in gal/acre
+    :param timeseries: operational periods, list of (start, end) datetimes
+    :param transit: one way transit distance to the slick in nm
+
+    Other keyword arguments, like pass_length or loading_type, are passed
+    on to Disperse.
+
+    :returns: numpy array with shape (len(platforms), len(dosages)) and
+        fields: 'sorties', 'spray_time' (seconds), 'dispersant' (m^3) and
+        'oil_treatable' (m^3 of oil the dispersant can treat at the
+        dispersant to oil ratio)
+    '''
+    results = np.zeros((len(platforms), len(dosages)),
+                       dtype=[('sorties', np.int32),
+                              ('spray_time', np.float64),
+                              ('dispersant', np.float64),
+                              ('oil_treatable', np.float64)])
+    spray = Disperse.schedule_states.index('spray')
+
+    for i, platform in enumerate(platforms):
+        disp = Disperse(platform=platform,
+                        timeseries=timeseries,
+                        transit=transit,
+                        dosage_type='custom',
+                        **kwargs)
+
+        for j, dosage in enumerate(dosages):
+            schedule = disp.sortie_schedule(dosage)
+            sprays = schedule[schedule['state'] == spray]
+
+            if len(schedule) > 0:
+                results['sorties'][i, j] = schedule['sortie'].max()
+
+            spray_time = (sprays['end'] - sprays['start']).sum()
+            results['spray_time'][i, j] = spray_time / np.timedelta64(1, 's')
+            results['dispersant'][i, j] = sprays['dispersant'].sum()
+
+        results['oil_treatable'][i] = \
+            results['dispersant'][i] * disp.disp_oil_ratio
+
+    return results
 
 
 class BurnUnitsSchema(MappingSchema):
@@ -5,7 +5,6 @@ Include the Langmuir process here as well
 import copy
 
 import numpy as np
-from repoze.lru import lru_cache
 from colander import SchemaNode, Float, drop
 
 from gnome.utilities.serializable import Serializable, Field
@@ -22,6 +21,69 @@ class FayGravityViscousSchema(WeathererSchema):
     thickness_limit = SchemaNode(Float(), missing=drop)
 
 
+class FayBlobs(object):
+    '''
+    Blobs of oil tracked by FayGravityViscous for one SpillContainer. Each
+    blob is the oil released by one spill in one time step. LEs store the
+    index of their blob in the 'blob_id' array and these arrays are indexed
+    by blob_id.
+    '''
+    def __init__(self):
+        self.init_volume = np.zeros((0,), dtype=np.float64)
+        self.area = np.zeros((0,), dtype=np.float64)
+        self.at_max = np.zeros((0,), dtype=bool)
+
+    def __len__(self):
+        return len(self.init_volume)
+
+    def add(self, init_volume, area, at_max=False):
+        '''
+        add a blob
+
+        :returns: blob_id of the new blob
+        '''
+        self.init_volume = np.append(self.init_volume, init_volume)
+        self.area = np.append(self.area, area)
+        self.at_max = np.append(self.at_max, at_max)
+
+        return len(self) - 1
+
+    def restore(self, blob_id, init_volume, le_area, thickness_limit):
+        '''
+        add the blobs of these LEs that are not in the table. The table is
+        not saved with the model so it is rebuilt from the LE arrays if the
+        model was loaded with its spill data. The area of a blob is the sum
+        of the area of its LEs.
+
+        :param blob_id: blob_id of the LEs
+        :param init_volume: bulk_init_volume of the LEs
+        :param le_area: fay_area of the LEs
+        :param thickness_limit: used to set at_max for the restored blobs
+        '''
+        if len(blob_id) == 0:
+            return
+
+        pad = blob_id.max() + 1 - len(self)
+        if pad > 0:
+            self.init_volume = np.append(self.init_volume, np.zeros((pad,)))
+            self.area = np.append(self.area, np.zeros((pad,)))
+            self.at_max = np.append(self.at_max,
+                                    np.zeros((pad,), dtype=bool))
+
+        # a blob in the table always has an area > 0
+        missing = self.area[blob_id] == 0
+        if not np.any(missing):
+            return
+
+        area = np.bincount(blob_id[missing], weights=le_area[missing],
+                           minlength=len(self))
+        new = area > 0
+        self.init_volume[blob_id[missing]] = init_volume[missing]
+        self.area[new] = area[new]
+        self.at_max[new] = (self.area[new] >=
+                            self.init_volume[new] / thickness_limit)
+
+
 class FayGravityViscous(Weatherer, Serializable):
     '''
     Model the FayGravityViscous spreading of the oil. This assumes all LEs
@@ -49,22 +111,25 @@ class FayGravityViscous(Weatherer, Serializable):
         # can be set
         self.water = water
         self.array_types.update({'fay_area', 'area', 'spill_num',
-                                 'bulk_init_volume', 'age', 'density'})
+                                 'bulk_init_volume', 'age', 'density',
+                                 'blob_id'})
         # relative_buoyancy - use density at release time. For now
         # temperature is fixed so just compute once and store. When temperature
         # varies over time, may want to do something different
         self._init_relative_buoyancy = None
         self.thickness_limit = None
 
-    @lru_cache(4)
+        # FayBlobs for each SpillContainer, keyed by sc.uncertain
+        self._blobs = {}
+
     def _gravity_spreading_t0(self,
                               water_viscosity,
                               relative_buoyancy,
                               blob_init_vol):
         '''
         time for the initial transient phase of spreading to complete. This
-        depends on blob volume, but is on the order of minutes. Cache upto 4
-        inputs - don't expect 4 or more spills in one scenario.
+        depends on blob volume, but is on the order of minutes.
+        blob_init_vol can be an array with the volume of each blob.
         '''
         # time to reach a0
         t0 = ((self.spreading_const[1] / self.spreading_const[0]) ** 4.0 *
@@ -138,6 +203,52 @@ class FayGravityViscous(Weatherer, Serializable):
 
         return area
 
+    def _update_blob_areas(self, water_viscosity, relative_buoyancy,
+                           blob_init_volume, blob_area, blob_age, at_max):
+        '''
+        update the area of all blobs at once. blob_area and at_max are
+        updated in place - only for blobs that are past the transient phase
+        and not yet at max area. Blobs at max area keep it.
+
+        :param blob_init_volume: initial volume of each blob
+        :param blob_area: area of each blob
+        :param blob_age: age of each blob. Use 0 for blobs that should not
+            be updated
+        :param at_max: bool array - True if blob reached max area
+
+        :returns: bool array, True for the blobs past the transient phase.
+            The area of these blobs is divided among their LEs - including
+            the blobs at max area, so their area is spread over the LEs
+            still in the blob if some LEs were removed.
+        '''
+        t0 = self._gravity_spreading_t0(water_viscosity,
+                                        relative_buoyancy,
+                                        blob_init_volume)
+
+        # only update initial area, A_0, if age is past the transient
+        # phase. Expect this to be the case since t0 is on the order of
+        # minutes; but do a check incase we want to experiment with
+        # smaller timesteps.
+        past_t0 = blob_age > t0
+        update = np.logical_and(past_t0, ~at_max)
+        if not np.any(update):
+            return past_t0
+
+        # now update area of old blobs - only update till max area is reached
+        max_area = blob_init_volume[update] / self.thickness_limit
+        new_area = self._update_blob_area(water_viscosity,
+                                          relative_buoyancy,
+                                          blob_init_volume[update],
+                                          blob_age[update])
+
+        blob_area[update] = np.minimum(new_area, max_area)
+        at_max[update] = new_area >= max_area
+
+        self.logger.debug('{0}\tupdated area of {1} blobs'
+                          .format(self._pid, np.count_nonzero(update)))
+
+        return past_t0
+
     def update_area(self,
                     water_viscosity,
                     relative_buoyancy,
@@ -186,39 +297,27 @@ class FayGravityViscous(Weatherer, Serializable):
             msg = "use init_area for age == 0"
             raise ValueError(msg)
 
-        # update area for each blob of LEs
-        for b_age in np.unique(age):
-            # within each age blob_init_volume should also be the same
-            m_age = b_age == age
-            t0 = self._gravity_spreading_t0(water_viscosity,
-                                            relative_buoyancy,
-                                            blob_init_volume[m_age][0])
-
-            if b_age <= t0:
-                '''
-                only update initial area, A_0, if age is past the transient
-                phase. Expect this to be the case since t0 is on the order of
-                minutes; but do a check incase we want to experiment with
-                smaller timesteps.
-                '''
-                continue
+        # group LEs into blobs by age - within each age blob_init_volume
+        # should also be the same
+        blob_age, ix = np.unique(age, return_inverse=True)
+        num_les = np.bincount(ix)
+
+        blob_init_vol = np.zeros_like(blob_age, dtype=np.float64)
+        blob_init_vol[ix] = blob_init_volume
 
-            # now update area of old LEs - only update till max area is reached
-            max_area = blob_init_volume[m_age][0] / self.thickness_limit
-            if area[m_age].sum() < max_area:
-                # update area
-                blob_area = self._update_blob_area(water_viscosity,
-                                                   relative_buoyancy,
-                                                   blob_init_volume[m_age][0],
-                                                   age[m_age][0])
+        blob_area = np.bincount(ix, weights=area, minlength=len(blob_age))
+        at_max = blob_area >= blob_init_vol / self.thickness_limit
 
-                if blob_area >= max_area:
-                    area[m_age] = max_area / m_age.sum()
-                else:
-                    area[m_age] = blob_area / m_age.sum()
+        updated = self._update_blob_areas(water_viscosity,
+                                          relative_buoyancy,
+                                          blob_init_vol,
+                                          blob_area,
+                                          blob_age,
+                                          at_max)
 
-                self.logger.debug('{0}\tarea after update: {1}'
-                                  .format(self._pid, blob_area))
+        # equally divide blob area into the LEs used to model the blob
+        le_mask = updated[ix]
+        area[le_mask] = (blob_area / num_les)[ix[le_mask]]
 
         return area
 
@@ -259,6 +358,7 @@ class FayGravityViscous(Weatherer, Serializable):
         # reset _init_relative_buoyancy for every run
         # make it None so no stale data
         self._init_relative_buoyancy = None
+        self._blobs[sc.uncertain] = FayBlobs()
 
     def _set_init_relative_buoyancy(self, substance):
         '''
@@ -279,6 +379,23 @@ class FayGravityViscous(Weatherer, Serializable):
 
         self._init_relative_buoyancy = (rho_h2o - rho_oil) / rho_h2o
 
+    def _restore_run_state(self, substance, blobs,
+                           blob_id, init_volume, le_area):
+        '''
+        thickness_limit, the initial relative buoyancy and the blob table
+        are set up in a model run - they are not saved. If the model was
+        loaded with its spill data, set them up again from the substance and
+        the LE arrays.
+        '''
+        if self.thickness_limit is None:
+            vo = substance.kvis_at_temp(self.water.get('temperature'))
+            self._set_thickness_limit(vo)
+
+        if self._init_relative_buoyancy is None:
+            self._set_init_relative_buoyancy(substance)
+
+        blobs.restore(blob_id, init_volume, le_area, self.thickness_limit)
+
     def initialize_data(self, sc, num_released):
         '''
         initialize  'bulk_init_volume', 'area', 'fay_area' and 'area'
@@ -295,16 +412,19 @@ class FayGravityViscous(Weatherer, Serializable):
         # happen once - for efficiency
         water_kvis = self.water.get('kinematic_viscosity',
                                     'square meter per second')
+        blobs = self._blobs.setdefault(sc.uncertain, FayBlobs())
 
         for substance, data in sc.itersubstancedata(self.array_types):
             if len(data['fay_area']) == 0:
                 # no particles released yet
                 continue
 
-            if self._init_relative_buoyancy is None:
-                self._set_init_relative_buoyancy(substance)
-
             mask = data['fay_area'] == 0
+            old = ~mask
+            self._restore_run_state(substance, blobs,
+                                    data['blob_id'][old],
+                                    data['bulk_init_volume'][old],
+                                    data['fay_area'][old])
 
             for s_num in np.unique(data['spill_num'][mask]):
                 s_mask = np.logical_and(mask, data['spill_num'] == s_num)
@@ -324,6 +444,13 @@ class FayGravityViscous(Weatherer, Serializable):
                 data['fay_area'][s_mask] = init_blob_area / num
                 data['area'][s_mask] = init_blob_area / num
 
+                max_area = (data['bulk_init_volume'][s_mask][0] /
+                            self.thickness_limit)
+                data['blob_id'][s_mask] = \
+                    blobs.add(data['bulk_init_volume'][s_mask][0],
+                              init_blob_area,
+                              init_blob_area >= max_area)
+
         sc.update_from_fatedataview()
 
     def weather_elements(self, sc, time_step, model_time):
@@ -337,20 +464,38 @@ class FayGravityViscous(Weatherer, Serializable):
 
         water_kvis = self.water.get('kinematic_viscosity',
                                     'square meter per second')
-        for _, data in sc.itersubstancedata(self.array_types):
+        blobs = self._blobs.setdefault(sc.uncertain, FayBlobs())
+
+        for substance, data in sc.itersubstancedata(self.array_types):
             if len(data['fay_area']) == 0:
                 continue
 
-            for s_num in np.unique(data['spill_num']):
-                s_mask = data['spill_num'] == s_num
-                data['fay_area'][s_mask] = \
-                    self.update_area(water_kvis,
-                                     self._init_relative_buoyancy,
-                                     data['bulk_init_volume'][s_mask],
-                                     data['fay_area'][s_mask],
-                                     data['age'][s_mask] + time_step)
-
-                data['area'][s_mask] = data['fay_area'][s_mask]
+            self._restore_run_state(substance, blobs,
+                                    data['blob_id'],
+                                    data['bulk_init_volume'],
+                                    data['fay_area'])
+
+            # one pass over the LEs: count the LEs of each blob and get the
+            # blob's age. Blobs with no LEs here keep age 0 so they are not
+            # updated.
+            blob_id = data['blob_id']
+            num_les = np.bincount(blob_id, minlength=len(blobs))
+
+            blob_age = np.zeros((len(blobs),), dtype=np.float64)
+            blob_age[blob_id] = data['age'] + time_step
+
+            updated = self._update_blob_areas(water_kvis,
+                                              self._init_relative_buoyancy,
+                                              blobs.init_volume,
+                                              blobs.area,
+                                              blob_age,
+                                              blobs.at_max)
+
+            # equally divide blob area into the LEs used to model the blob
+            le_mask = updated[blob_id]
+            le_blob = blob_id[le_mask]
+            data['fay_area'][le_mask] = blobs.area[le_blob] / num_les[le_blob]
+            data['area'][:] = data['fay_area']
 
         sc.update_from_fatedataview()
 
@@ -98,7 +98,10 @@ class WeatheringData(Weatherer, Serializable):
             new_LEs_mask = data['density'] == 0
 
             if np.any(new_LEs_mask):
-                self._init_new_particles(new_LEs_mask, data, substance)
+                before = sc.mass_ledger.state(data, new_LEs_mask)
+                self._init_new_particles(new_LEs_mask, data,
+                                         sc.substance_properties(substance))
+                sc.mass_ledger.update(data, new_LEs_mask, before)
 
         sc.update_from_fatedataview(fate='all')
 
@@ -116,65 +119,74 @@ class WeatheringData(Weatherer, Serializable):
         if not self.active:
             return
 
-        water_rho = self.water.get('density')
-
         for substance, data in sc.itersubstancedata(self.array_types,
                                                     fate='all'):
             'update properties only if elements are released'
             if len(data['density']) == 0:
                 continue
 
-            k_rho = self._get_k_rho_weathering_dens_update(substance)
-
-            # sub-select mass_components array by substance.num_components.
-            # Currently, physics for modeling multiple spills with different
-            # substances is not correctly done in the same model. However,
-            # let's put some basic code in place so the data arrays can infact
-            # contain two substances and the code does not raise exceptions.
-            # mass_components are zero padded for substance which has fewer
-            # psuedocomponents. Subselecting mass_components array by
-            # [mask, :substance.num_components] ensures numpy operations work
-            mass_frac = \
-                (data['mass_components'][:, :substance.num_components] /
-                 data['mass'].reshape(len(data['mass']), -1))
-
-            # check if density becomes > water, set it equal to water in this
-            # case - 'density' is for the oil-water emulsion
-            oil_rho = k_rho*(substance.component_density * mass_frac).sum(1)
-
-            # oil/water emulsion density
-            new_rho = (data['frac_water'] * water_rho +
-                       (1 - data['frac_water']) * oil_rho)
-
-            if np.any(new_rho > self.water.density):
-                new_rho[new_rho > self.water.density] = self.water.density
-                self.logger.info('{0} during update, density is larger '
-                                 'than water density - set to water density'
-                                 .format(self._pid))
-
-            data['density'] = new_rho
-            data['oil_density'] = oil_rho
-
-            # following implementation results in an extra array called
-            # fw_d_fref but is easy to read
-            v0 = substance.kvis_at_temp(self.water.get('temperature', 'K'))
-
-            if v0 is not None:
-                kv1 = self._get_kv1_weathering_visc_update(v0)
-                fw_d_fref = data['frac_water']/self.visc_f_ref
-
-                data['viscosity'] = (v0 *
-                                     np.exp(kv1 * data['frac_lost']) *
-                                     (1 + (fw_d_fref / (1.187 - fw_d_fref))) ** 2.49
-                                     )
-                data['oil_viscosity'] = (v0 *
-                                     np.exp(kv1 * data['frac_lost']) )
+            self._weather_data(data, sc.substance_properties(substance),
+                               time_step, model_time, sc.mass_balance)
 
         sc.update_from_fatedataview(fate='all')
 
         # also initialize/update aggregated data
         self._aggregated_data(sc, 0)
 
+    def _weather_data(self, data, substance, time_step, model_time,
+                      mass_balance):
+        '''
+        update density and viscosity of the elements in data in place. Used
+        by weather_elements() and FusedWeathering. Aggregated data in
+        mass_balance is set separately by _aggregated_data()
+        '''
+        water_rho = self.water.get('density')
+        k_rho = self._get_k_rho_weathering_dens_update(substance)
+
+        # sub-select mass_components array by substance.num_components.
+        # Currently, physics for modeling multiple spills with different
+        # substances is not correctly done in the same model. However,
+        # let's put some basic code in place so the data arrays can infact
+        # contain two substances and the code does not raise exceptions.
+        # mass_components are zero padded for substance which has fewer
+        # psuedocomponents. Subselecting mass_components array by
+        # [mask, :substance.num_components] ensures numpy operations work
+        mass_frac = \
+            (data['mass_components'][:, :substance.num_components] /
+             data['mass'].reshape(len(data['mass']), -1))
+
+        # check if density becomes > water, set it equal to water in this
+        # case - 'density' is for the oil-water emulsion
+        oil_rho = k_rho*(substance.component_density * mass_frac).sum(1)
+
+        # oil/water emulsion density
+        new_rho = (data['frac_water'] * water_rho +
+                   (1 - data['frac_water']) * oil_rho)
+
+        if np.any(new_rho > self.water.density):
+            new_rho[new_rho > self.water.density] = self.water.density
+            self.logger.info('{0} during update, density is larger '
+                             'than water density - set to water density'
+                             .format(self._pid))
+
+        data['density'][:] = new_rho
+        data['oil_density'][:] = oil_rho
+
+        # following implementation results in an extra array called
+        # fw_d_fref but is easy to read
+        v0 = substance.kvis_at_temp(self.water.get('temperature', 'K'))
+
+        if v0 is not None:
+            kv1 = self._get_kv1_weathering_visc_update(v0)
+            fw_d_fref = data['frac_water']/self.visc_f_ref
+
+            data['viscosity'][:] = (v0 *
+                                    np.exp(kv1 * data['frac_lost']) *
+                                    (1 + (fw_d_fref / (1.187 - fw_d_fref))) ** 2.49
+                                    )
+            data['oil_viscosity'][:] = (v0 *
+                                        np.exp(kv1 * data['frac_lost']))
+
     def _aggregated_data(self, sc, new_LEs):
         '''
         aggregated properties that are not set by any other weatherer are
@@ -222,27 +234,19 @@ class WeatheringData(Weatherer, Serializable):
         # todo: remove fate_status and add 'surface' to status_codes. LEs
         # marked to be skimmed, burned, dispersed will also be marked as
         # 'surface' so following can get cleaned up.
-        sc.mass_balance['floating'] = \
-            (sc['mass'][sc['fate_status'] == fate.surface_weather].sum() +
-             sc['mass'][sc['fate_status'] == fate.non_weather].sum() -
-             sc['mass'][sc['status_codes'] == oil_status.on_land].sum() -
-             sc['mass'][sc['status_codes'] == oil_status.to_be_removed].sum() +
-             sc['mass'][sc['fate_status'] & fate.skim == fate.skim].sum() +
-             sc['mass'][sc['fate_status'] & fate.burn == fate.burn].sum() +
-             sc['mass'][sc['fate_status'] & fate.disperse == fate.disperse].sum())
+        # The totals are kept up to date as elements are released, change
+        # state and lose mass - see MassBalanceLedger
+        ledger = sc.mass_ledger
+        sc.mass_balance['floating'] = ledger.floating(sc.mass_balance)
 
         # add 'non_weathering' key if any mass is released for nonweathering
         # particles.
-        nonweather = sc['mass'][sc['fate_status'] == fate.non_weather].sum()
-        sc.mass_balance['non_weathering'] = nonweather
+        sc.mass_balance['non_weathering'] = ledger.non_weathering
 
         if new_LEs > 0:
-            amount_released = np.sum(sc['mass'][-new_LEs:])
+            sc.mass_balance['amount_released'] = ledger.amount_released
 
-            if 'amount_released' in sc.mass_balance:
-                sc.mass_balance['amount_released'] += amount_released
-            else:
-                sc.mass_balance['amount_released'] = amount_released
+        ledger.check(sc)
 
     def _init_new_particles(self, mask, data, substance):
         '''
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+"""
+benchmark of the IceImageOutput rendering
+
+Renders the ice grid of the ACNFS sample (an Arctic curvilinear grid, the
+same one the unit tests use) the old way -- drawing every cell with
+MapCanvas.draw_polygon() and saving the pngs through a tempfile -- and with
+IceImageOutput.render_images(), which rasterizes the grid once and encodes
+the pngs in memory.
+"""
+
+import os
+import time
+from datetime import datetime
+from tempfile import NamedTemporaryFile
+
+from gnome.utilities.remote_data import get_datafile
+from gnome.utilities.time_utils import date_to_sec
+from gnome.movers import IceMover
+from gnome.outputters import IceImageOutput
+
+
+curr_dir = os.path.join(os.path.dirname(__file__),
+                        '..', 'unit_tests', 'sample_data', 'currents')
+
+curr_file = get_datafile(os.path.join(curr_dir, 'acnfs_example.nc'))
+topology_file = get_datafile(os.path.join(curr_dir, 'acnfs_topo.dat'))
+
+num_steps = 10
+image_size = (1000, 800)
+
+
+def render_polygons(outputter, mover, model_time):
+    'what render_images() used to do'
+    canvas = outputter.map_canvas
+
+    mover_grid = mover.get_grid_data()
+    canvas.viewport = mover.get_grid_bounding_box(mover_grid)
+    canvas.clear_background()
+
+    concentration, thickness = mover.get_ice_fields(model_time)
+
+    thickness_colors = outputter.lookup_gradient_color('thickness',
+                                                       thickness)
+    concentration_colors = outputter.lookup_gradient_color('concentration',
+                                                           concentration)
+
+    dtype = mover_grid.dtype.descr
+    unstructured_type = dtype[0][1]
+    new_shape = mover_grid.shape + (len(dtype),)
+    mover_grid = (mover_grid
+                  .view(dtype=unstructured_type)
+                  .reshape(*new_shape))
+
+    for poly, tc, cc in zip(mover_grid,
+                            thickness_colors, concentration_colors):
+        canvas.draw_polygon(poly, fill_color=tc)
+        canvas.draw_polygon(poly, fill_color=cc, background=True)
+
+    with NamedTemporaryFile() as fp:
+        canvas.save_foreground(fp.name)
+        fp.seek(0)
+        thickness_image = fp.read().encode('base64')
+
+    with NamedTemporaryFile() as fp:
+        canvas.save_background(fp.name)
+        fp.seek(0)
+        coverage_image = fp.read().encode('base64')
+
+    return thickness_image, coverage_image
+
+
+if __name__ == "__main__":
+    mover = IceMover(curr_file, topology_file)
+    outputter = IceImageOutput(mover, image_size=image_size)
+
+    model_time = date_to_sec(datetime(2015, 5, 14, 0))
+
+    print "ice grid: {0} cells, image size: {1}".format(
+        len(mover.get_grid_data()), image_size)
+
+    start = time.time()
+    for i in range(num_steps):
+        render_polygons(outputter, mover, model_time)
+    polygon_time = (time.time() - start) / num_steps
+
+    print "draw_polygon per cell: {0:.4f} s per step".format(polygon_time)
+
+    start = time.time()
+    outputter.render_images(model_time)
+    first_time = time.time() - start
+
+    start = time.time()
+    for i in range(num_steps):
+        outputter.render_images(model_time)
+    raster_time = (time.time() - start) / num_steps
+
+    print ("rasterized grid: {0:.4f} s for the first step, "
+           "{1:.4f} s per step after that".format(first_time, raster_time))
+    print "speedup: {0:.1f}x".format(polygon_time / raster_time)
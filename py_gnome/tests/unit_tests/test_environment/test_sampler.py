@@ -0,0 +1,158 @@
+'''
+tests for sampling the environment per element
+'''
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from gnome.basic_types import oil_status
+from gnome.model import Model
+from gnome.spill import point_line_release_spill
+from gnome.environment import (constant_wind,
+                               Water,
+                               Waves,
+                               EnvironmentSampler)
+from gnome.weatherers import (Evaporation,
+                              NaturalDispersion,
+                              Emulsification)
+
+from ..conftest import test_oil
+
+mass_balance_keys = ('evaporated', 'natural_dispersion', 'sedimentation',
+                     'floating', 'water_content')
+
+
+def make_model(sample_environment):
+    start_time = datetime(2015, 5, 14, 0, 0)
+    model = Model(start_time=start_time,
+                  time_step=900,
+                  duration=timedelta(hours=4),
+                  sample_environment=sample_environment)
+
+    model.spills += point_line_release_spill(20,
+                                             (0., 0., 0.),
+                                             start_time,
+                                             end_release_time=start_time +
+                                             timedelta(hours=1),
+                                             substance=test_oil,
+                                             amount=10000,
+                                             units='kg')
+
+    water = Water(288.)
+    wind = constant_wind(15., 270, 'knots')
+    waves = Waves(wind, water)
+    model.environment += [water, wind, waves]
+
+    model.weatherers += Evaporation(water, wind)
+    model.weatherers += NaturalDispersion(waves, water)
+    model.weatherers += Emulsification(waves)
+
+    return model
+
+
+def test_from_environment():
+    water = Water(288.)
+    wind = constant_wind(5., 0)
+    waves = Waves(wind, water)
+
+    sampler = EnvironmentSampler.from_environment([water, wind, waves])
+    assert sampler.wind is wind
+    assert sampler.water is water
+    assert sampler.waves is waves
+    assert sampler.temperature is None
+    assert sampler.array_types == {'wind_speed', 'water_temp', 'wave_height'}
+
+    sampler = EnvironmentSampler.from_environment([water])
+    assert sampler.array_types == {'water_temp'}
+
+
+def test_from_environment_ref_as_list():
+    '''
+    some objects are referenced as more than one thing, like IceAwareWind
+    with _ref_as = ['wind', 'ice_aware']. They are found like the model
+    finds them
+    '''
+    water = Water(288.)
+    wind = constant_wind(5., 0)
+    wind._ref_as = ['wind', 'ice_aware']
+
+    sampler = EnvironmentSampler.from_environment([water, wind])
+    assert sampler.wind is wind
+    assert sampler.water is water
+    assert sampler.array_types == {'wind_speed', 'water_temp'}
+
+    model = Model()
+    model.environment += [water, wind]
+    assert model.find_by_attr('_ref_as', 'wind', model.environment) is wind
+
+
+def test_from_weatherers():
+    '''
+    the sampler uses the wind the weatherers reference, not the first one
+    in the environment. Weatherers that use different winds raise
+    '''
+    water = Water(288.)
+    wind = constant_wind(5., 0)
+    wind2 = constant_wind(15., 270, 'knots')
+    environment = [water, wind, wind2]
+
+    evaporation = Evaporation(water, wind2)
+    sampler = EnvironmentSampler.from_weatherers([evaporation], environment)
+    assert sampler.wind is wind2
+    assert sampler.water is water
+
+    # the wind of the waves is used for the wave height
+    dispersion = NaturalDispersion(Waves(wind, water), water)
+    with pytest.raises(ValueError):
+        EnvironmentSampler.from_weatherers([evaporation, dispersion],
+                                           environment)
+
+    # weatherers that are off don't count
+    dispersion.on = False
+    sampler = EnvironmentSampler.from_weatherers([evaporation, dispersion],
+                                                 environment)
+    assert sampler.wind is wind2
+
+    # with no weatherers, use the environment
+    sampler = EnvironmentSampler.from_weatherers([], environment)
+    assert sampler.wind is wind
+
+
+def test_sampled_arrays():
+    model = make_model(True)
+    sc = model.spills.items()[0]
+
+    for step in model:
+        if step['step_num'] == 1:
+            break
+
+    wind_speed = model.environment[1].get_value(model.start_time)[0]
+    in_water = sc['status_codes'] == oil_status.in_water
+
+    assert np.any(in_water)
+    assert np.allclose(sc['wind_speed'][in_water], wind_speed)
+    assert np.allclose(sc['water_temp'][in_water], 288.)
+    assert np.allclose(sc['wave_height'][in_water],
+                       model.environment[2].compute_H(wind_speed))
+
+
+def test_constant_environment_matches():
+    '''
+    with a constant wind and water temperature, per element sampling gives
+    the same result as the single point values
+    '''
+    results = []
+    for sample in (False, True):
+        model = make_model(sample)
+        mass_balance = []
+        for step in model:
+            sc = model.spills.items()[0]
+            mass_balance.append([sc.mass_balance.get(k, 0.0)
+                                 for k in mass_balance_keys])
+
+        results.append(np.asarray(mass_balance))
+
+    assert results[0][-1, 0] > 0
+    assert results[0][-1, 1] > 0
+    assert np.allclose(results[1], results[0], rtol=1e-10, atol=1e-12)
@@ -319,3 +319,40 @@ def test_get_emulsification_wind_with_wave_height2():
     print w.get_emulsification_wind(start_time)
     # input wave height should not have overwhelmed wind speed
     assert w.get_emulsification_wind(start_time) == 10.0
+
+
+@pytest.mark.parametrize(("fetch", "wave_height"), [(None, None),
+                                                     (1e4, None),
+                                                     (None, 1.0)])
+def test_get_values(fetch, wave_height):
+    '''
+    vectorized get_values() gives the same results as get_value() for each
+    wind speed
+    '''
+    water = copy(default_water)
+    water.fetch = fetch
+    water.wave_height = wave_height
+
+    speeds = np.array([0.0, 1.0, 3.0, 4.0, 5.0, 10.0, 20.0])
+    values = Waves(test_wind_5, water).get_values(speeds)
+
+    for i, U in enumerate(speeds):
+        series = np.array((start_time, (U, 45)),
+                          dtype=datetime_value_2d).reshape((1, ))
+        w = Waves(Wind(timeseries=series, units='meter per second'), water)
+
+        for val, expected in zip(values, w.get_value(start_time)):
+            assert val.shape == speeds.shape
+            assert np.isclose(val[i], expected)
+
+
+def test_get_emulsification_winds():
+    water = Water()
+    water.wave_height = 2.0
+    w = Waves(constant_wind(3., 0), water)
+
+    speeds = np.array([3.0, 10.0])
+    winds = w.get_emulsification_winds(speeds)
+
+    assert winds[0] == w.get_emulsification_wind(start_time)
+    assert winds[1] == 10.0
@@ -14,6 +14,7 @@ import pytest
 
 import gnome.map
 from gnome.basic_types import oil_status, status_code_type
+from gnome.cy_gnome import cy_helpers
 from gnome.utilities.projections import NoProjection
 
 from gnome.map import GnomeMap, MapFromBNA, RasterMap  # , MapFromUGrid
@@ -745,6 +746,43 @@ class Test_full_move:
         assert np.array_equal(spill['last_water_positions'][0], (9.0, 5.0, 0.))
         assert spill['status_codes'][0] == oil_status.on_land
 
+    def test_land_cross_num_threads(self):
+        """
+        the land check result does not depend on the number of threads
+        """
+        gmap = RasterMap(refloat_halflife=6, bitmap_array=self.raster,
+                         map_bounds=((-50, -30), (-50, 30),
+                                     (50, 30), (50, -30)),
+                         projection=NoProjection())
+
+        num_les = 200
+        start = np.random.uniform(0, 20, (num_les, 3))
+        start[:, 2] = 0.
+        end = np.random.uniform(0, 20, (num_les, 3))
+        end[:, 2] = 0.
+
+        results = []
+        # the setting is process wide - put it back for the other tests
+        orig_num_threads = cy_helpers.get_num_threads()
+        try:
+            for num_threads in (1, 4):
+                cy_helpers.set_num_threads(num_threads)
+
+                spill = sample_sc_release(num_les)
+                spill['positions'][:] = start
+                spill['next_positions'][:] = end
+                spill['status_codes'][:] = oil_status.in_water
+
+                gmap.beach_elements(spill)
+                results.append((spill['next_positions'].copy(),
+                                spill['last_water_positions'].copy(),
+                                spill['status_codes'].copy()))
+        finally:
+            cy_helpers.set_num_threads(orig_num_threads)
+
+        for r1, r4 in zip(*results):
+            assert np.array_equal(r1, r4)
+
     def test_land_cross_array(self):
         """
         test a few LEs
@@ -5,6 +5,7 @@ test code for the model class
 '''
 import os
 import shutil
+import threading
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -33,8 +34,10 @@ from gnome.weatherers import (HalfLifeWeatherer,
                               ChemicalDispersion,
                               Burn,
                               Skimmer,
-                              Emulsification)
+                              Emulsification,
+                              NaturalDispersion)
 from gnome.outputters import Renderer, TrajectoryGeoJsonOutput
+from gnome.spill_container import MassBalanceLedger
 
 from conftest import sample_model_weathering, testdata, test_oil
 
@@ -241,6 +244,112 @@ def test_simple_run_rewind():
     assert np.all(model.spills.LE('positions') == pos)
 
 
+def test_parallel_containers():
+    '''
+    forecast and uncertain SpillContainers stepped on a thread pool give the
+    same forecast as the sequential run - the forecast is deterministic for a
+    SimpleMover, uncertain results are random so only check their size
+    '''
+    start_time = datetime(2012, 9, 15, 12, 0)
+    results = []
+
+    for parallel in (False, True):
+        model = Model(start_time=start_time,
+                      uncertain=True,
+                      parallel_containers=parallel)
+        model.movers += SimpleMover(velocity=(1., 2., 0.))
+        model.spills += point_line_release_spill(num_elements=10,
+                                                 start_position=(0., 0., 0.),
+                                                 release_time=start_time)
+        model.full_run()
+
+        # the worker threads are shut down at the end of the run
+        assert model._container_pool is None
+
+        results.append((model.spills.LE('positions'),
+                        model.spills.LE('positions', uncertain=True)))
+
+    assert np.all(results[0][0] == results[1][0])
+    assert results[0][1].shape == results[1][1].shape
+
+
+def test_parallel_containers_random():
+    '''
+    RandomMover draws from the global random stream. With parallel_containers
+    it is called in the same order as in the sequential run, so the seeded
+    forecast and uncertain results are the same
+    '''
+    start_time = datetime(2012, 9, 15, 12, 0)
+    results = []
+
+    for parallel in (False, True):
+        model = Model(start_time=start_time,
+                      uncertain=True,
+                      parallel_containers=parallel)
+        model.movers += RandomMover(diffusion_coef=100000)
+        model.spills += point_line_release_spill(num_elements=100,
+                                                 start_position=(0., 0., 0.),
+                                                 release_time=start_time)
+        model.full_run()
+
+        results.append((model.spills.LE('positions'),
+                        model.spills.LE('positions', uncertain=True)))
+
+    assert np.all(results[0][0] == results[1][0])
+    assert np.all(results[0][1] == results[1][1])
+
+
+class ContainerProcess(object):
+    'a process that is not thread safe for test_parallel_containers_overlap'
+    def __init__(self, draws_random=False):
+        self.draws_random = draws_random
+
+
+def test_parallel_containers_overlap():
+    '''
+    with parallel_containers, the uncertain container calls a process once
+    the forecast container is done with it, so the two containers are in
+    different processes at the same time. A process that draws random
+    numbers waits until the forecast container is done
+    '''
+    model = Model(uncertain=True, parallel_containers=True)
+    first = ContainerProcess()
+    second = ContainerProcess()
+    drawing = ContainerProcess(draws_random=True)
+
+    uncertain_in_first = threading.Event()
+    uncertain_drawing = threading.Event()
+    forecast = {}
+
+    def func(sc):
+        model._wait_turn(first)
+        if sc.uncertain:
+            uncertain_in_first.set()
+
+        model._wait_turn(second)
+        if not sc.uncertain:
+            # the uncertain container gets to first while the forecast is
+            # still in second
+            forecast['overlap'] = uncertain_in_first.wait(10)
+
+        model._wait_turn(drawing)
+        if sc.uncertain:
+            uncertain_drawing.set()
+        else:
+            forecast['drawing'] = uncertain_drawing.wait(0.1)
+
+        return sc.uncertain
+
+    try:
+        assert model._map_containers(func) == [False, True]
+    finally:
+        model.close_container_pool()
+
+    assert forecast['overlap']
+    assert not forecast['drawing']
+    assert uncertain_drawing.is_set()
+
+
 def test_simple_run_with_map():
     '''
     pretty much all this tests is that the model will run
@@ -1070,6 +1179,136 @@ def test_staggered_spills_weathering(sample_model_fcn, delay):
     assert np.isclose(exp_total_mass, sc.mass_balance['amount_released'])
 
 
+def test_mass_ledger_full_run(sample_model_fcn, monkeypatch):
+    '''
+    the mass_balance totals kept by the SpillContainer's mass_ledger agree
+    with the totals computed from the data arrays at every step. The sample
+    model has land so elements beach and some leave the map.
+    '''
+    monkeypatch.setattr(MassBalanceLedger, 'debug', True)
+
+    model = sample_model_weathering(sample_model_fcn, test_oil)
+    model.weatherers += [HalfLifeWeatherer(), Evaporation()]
+    model.set_make_default_refs(True)
+
+    for step in model:
+        for sc in model.spills.items():
+            totals = sc.mass_ledger.full_totals(sc)
+            for key in ('floating', 'non_weathering', 'beached'):
+                assert np.isclose(sc.mass_balance[key], totals[key])
+
+    assert np.isclose(sc.mass_balance['amount_released'],
+                      model.spills[0].get_mass())
+
+
+def weathering_model(**kwargs):
+    '''
+    all water model with a continuous release for weathering_only and
+    adaptive_substeps tests. kwargs are passed to Model
+    '''
+    start_time = datetime(2015, 5, 14, 0, 0)
+    model = Model(start_time=start_time,
+                  duration=timedelta(hours=6),
+                  time_step=900,
+                  **kwargs)
+
+    end_release_time = start_time + timedelta(hours=2)
+    et = floating(substance=test_oil)
+    model.spills += point_line_release_spill(200, (0, 0, 0),
+                                             start_time,
+                                             end_release_time=end_release_time,
+                                             element_type=et,
+                                             amount=1000,
+                                             units='kg')
+
+    wind = constant_wind(10., 0)
+    water = Water()
+    model.environment += [wind, water, Waves(wind, water)]
+    model.movers += RandomMover()
+    model.weatherers += [Evaporation(),
+                         NaturalDispersion(),
+                         Emulsification()]
+    model.outputters += gnome.outputters.WeatheringOutput()
+
+    return model
+
+
+def test_weathering_only():
+    '''
+    with no land, the weathering_only mode gives the same oil budget as a
+    full run using a few elements per release
+    '''
+    full = weathering_model()
+    fast = weathering_model(weathering_only=True)
+
+    for full_out, fast_out in zip(full.full_run(), fast.full_run()):
+        full_mb = full_out['WeatheringOutput']
+        fast_mb = fast_out['WeatheringOutput']
+
+        assert full_mb['time_stamp'] == fast_mb['time_stamp']
+        for key in ('amount_released', 'floating', 'evaporated',
+                    'natural_dispersion', 'avg_density'):
+            assert np.isclose(full_mb[key], fast_mb[key], rtol=1e-8)
+
+    sc = fast.spills.items()[0]
+    assert sc.elements_per_release == Model.weathering_only_elements
+    assert sc.num_released < full.spills.items()[0].num_released
+
+    # positions are not updated
+    assert np.all(sc['positions'] == sc['positions'][0])
+
+
+def test_weathering_only_outputters():
+    model = weathering_model(weathering_only=True)
+    model.outputters += TrajectoryGeoJsonOutput()
+
+    with raises(ValueError):
+        model.step()
+
+
+@pytest.mark.parametrize("num_substeps", [1, 4, 7])
+def test_split_into_substeps(num_substeps):
+    model = Model(time_step=900)
+    model.rewind()
+
+    substeps = model._split_into_substeps(num_substeps)
+
+    assert len(substeps) >= num_substeps
+    assert sum(dt for _t, dt in substeps) == 900
+    assert substeps[0][0] == model.model_time
+
+
+def test_adaptive_substeps(monkeypatch):
+    '''
+    evaporation gets many substeps while the oil is fresh and fewer as it
+    weathers. Weatherers with no estimate use weathering_substeps.
+    '''
+    # a tight tolerance so the fresh oil needs several substeps
+    monkeypatch.setattr(Evaporation, 'max_substep_change', 0.01)
+
+    model = weathering_model(weathering_only=True, adaptive_substeps=True)
+    fine = weathering_model(weathering_only=True,
+                            weathering_substeps=Model.max_adaptive_substeps)
+
+    for out, fine_out in zip(model.full_run(), fine.full_run()):
+        mb = out['WeatheringOutput']
+        fine_mb = fine_out['WeatheringOutput']
+
+        assert np.isclose(mb['evaporated'], fine_mb['evaporated'],
+                          rtol=0.05)
+
+    evap = model.substeps_used['Evaporation']
+    assert len(evap) == model.num_time_steps - 1
+    assert max(evap) > 1
+    assert evap[-1] < max(evap)
+    assert all(n <= Model.max_adaptive_substeps for n in evap)
+
+    assert set(model.substeps_used['NaturalDispersion']) == {1}
+
+    model.rewind()
+    assert len(model.substeps_used) == 0
+
+
 @pytest.mark.parametrize(("s0", "s1"),
                          [(test_oil, test_oil),
                           (test_oil, "ARABIAN MEDIUM, EXXON")
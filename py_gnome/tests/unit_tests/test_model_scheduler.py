@@ -0,0 +1,142 @@
+'''
+tests for the ModelScheduler
+'''
+from datetime import datetime, timedelta
+
+import numpy as np
+from pytest import raises, mark
+
+from gnome.model import Model
+from gnome.spill import point_line_release_spill
+from gnome.movers import SimpleMover
+
+from gnome.multi_model_scheduler import ModelScheduler
+
+
+def make_model(num_steps=8, velocity=(1.0, 0.5, 0.0)):
+    start_time = datetime(2015, 1, 1, 12, 0)
+    model = Model(start_time=start_time,
+                  time_step=900,
+                  duration=timedelta(seconds=900 * (num_steps - 1)),
+                  cache_enabled=False)
+
+    model.spills += point_line_release_spill(num_elements=10,
+                                             start_position=(0., 0., 0.),
+                                             release_time=start_time)
+    model.movers += SimpleMover(velocity=velocity)
+
+    return model
+
+
+def final_positions(model):
+    return model.spills.items()[0]['positions'].copy()
+
+
+@mark.parametrize('policy', ['round_robin', 'priority'])
+def test_run_matches_sequential(policy):
+    velocities = [(1.0, 0.5, 0.0), (-0.5, 1.0, 0.0), (0.2, -0.3, 0.0)]
+
+    expected = []
+    for vel in velocities:
+        model = make_model(velocity=vel)
+        model.full_run()
+        expected.append(final_positions(model))
+
+    models = [make_model(velocity=vel) for vel in velocities]
+    scheduler = ModelScheduler(num_workers=2, policy=policy)
+    for priority, model in enumerate(models):
+        scheduler.add(model, priority=priority)
+
+    results = scheduler.run()
+    scheduler.close()
+
+    for model, exp in zip(models, expected):
+        assert len(results[model.id]) == model.num_time_steps
+        assert ([o['step_num'] for o in results[model.id]] ==
+                range(model.num_time_steps))
+        assert np.allclose(final_positions(model), exp)
+
+        prog = scheduler.progress(model.id)
+        assert prog['status'] == 'complete'
+        assert prog['fraction'] == 1.0
+
+
+def test_callback_and_progress():
+    model = make_model(num_steps=5)
+    seen = []
+
+    scheduler = ModelScheduler(num_workers=1)
+    m_id = scheduler.add(model,
+                         callback=lambda m, out: seen.append(out['step_num']),
+                         keep_output=False)
+
+    prog = scheduler.progress(m_id)
+    assert prog['status'] == 'pending'
+    assert prog['step_num'] == -1
+    assert prog['fraction'] == 0.
+
+    results = scheduler.run()
+    scheduler.close()
+
+    assert sorted(seen) == range(model.num_time_steps)
+    assert results[m_id] == []
+
+
+def test_cancel_pending():
+    models = [make_model() for _i in range(3)]
+    scheduler = ModelScheduler(num_workers=1)
+    ids = [scheduler.add(m) for m in models]
+
+    scheduler.cancel(ids[1])
+    results = scheduler.run()
+    scheduler.close()
+
+    assert scheduler.progress(ids[1])['status'] == 'cancelled'
+    assert results[ids[1]] == []
+
+    for m_id in (ids[0], ids[2]):
+        assert scheduler.progress(m_id)['status'] == 'complete'
+
+
+def test_cancel_from_callback():
+    model = make_model(num_steps=10)
+    scheduler = ModelScheduler(num_workers=1)
+
+    def stop_at_3(m, output):
+        if output['step_num'] == 3:
+            scheduler.cancel(m.id)
+
+    m_id = scheduler.add(model, callback=stop_at_3)
+    scheduler.run()
+    scheduler.close()
+
+    prog = scheduler.progress(m_id)
+    assert prog['status'] == 'cancelled'
+    assert prog['step_num'] == 3
+    assert prog['fraction'] < 1.0
+
+
+def test_model_error():
+    model = make_model()
+    model.movers[0].get_move = None     # not callable, fails on first step
+
+    scheduler = ModelScheduler(num_workers=2)
+    m_id = scheduler.add(model)
+    ok_id = scheduler.add(make_model())
+    scheduler.run()
+    scheduler.close()
+
+    assert scheduler.progress(m_id)['status'] == 'error'
+    assert isinstance(scheduler.exception(m_id), TypeError)
+    assert scheduler.progress(ok_id)['status'] == 'complete'
+
+
+def test_invalid():
+    with raises(ValueError):
+        ModelScheduler(policy='fifo')
+
+    model = make_model()
+    scheduler = ModelScheduler()
+    scheduler.add(model)
+    with raises(ValueError):
+        scheduler.add(model)
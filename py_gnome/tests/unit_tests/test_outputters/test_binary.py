@@ -0,0 +1,156 @@
+'''
+tests for binary particle outputter
+'''
+import os
+from datetime import datetime
+from glob import glob
+
+import numpy as np
+import pytest
+
+from gnome.basic_types import oil_status
+from gnome.outputters import BinaryParticleOutput, decode_frame
+from gnome.spill import point_line_release_spill
+
+from ..conftest import sample_model, sample_sc_release
+
+
+@pytest.fixture(scope='function')
+def model(sample_model, output_dir):
+    model = sample_model['model']
+
+    model.cache_enabled = True
+    model.uncertain = True
+
+    rel_start_pos = sample_model['release_start_pos']
+    rel_end_pos = sample_model['release_end_pos']
+
+    model.spills += point_line_release_spill(10,
+                                             start_position=rel_start_pos,
+                                             release_time=model.start_time,
+                                             end_position=rel_end_pos)
+
+    model.outputters += BinaryParticleOutput(output_dir=output_dir)
+    model.rewind()
+    return model
+
+
+def check_frame(decoded, model, uncertain):
+    'decoded frame matches the elements in the model'
+    positions = model.spills.LE('positions', uncertain)
+
+    assert decoded['uncertain'] is uncertain
+    assert decoded['num_elements'] == len(positions)
+    assert np.all(decoded['id'] == model.spills.LE('id', uncertain))
+    assert np.all(decoded['lon'] == positions[:, 0].astype(np.float32))
+    assert np.all(decoded['lat'] == positions[:, 1].astype(np.float32))
+    assert np.all(decoded['mass'] ==
+                  model.spills.LE('mass', uncertain).astype(np.float32))
+    assert np.all(decoded['status_codes'] ==
+                  model.spills.LE('status_codes', uncertain))
+    assert np.all(decoded['spill_num'] ==
+                  model.spills.LE('spill_num', uncertain))
+
+
+def test_init():
+    o_bin = BinaryParticleOutput()
+    assert o_bin.output_dir is None
+    assert not o_bin.delta
+    assert o_bin.keyframe_interval == 10
+
+
+@pytest.mark.parametrize("delta", [False, True])
+def test_write_output(model, delta):
+    o_bin = model.outputters[-1]
+    o_bin.delta = delta
+    o_bin.keyframe_interval = 3
+    model.rewind()
+
+    previous = {}
+    for step in model:
+        output = step['BinaryParticleOutput']
+        for key, uncertain in (('certain', False), ('uncertain', True)):
+            decoded = decode_frame(output[key], previous.get(key))
+            assert decoded['step_num'] == step['step_num']
+            check_frame(decoded, model, uncertain)
+
+            if not delta or decoded['step_num'] % 3 == 0:
+                assert decoded['num_delta'] == 0
+            else:
+                assert decoded['num_delta'] > 0
+
+            previous[key] = decoded
+
+        with open(output['output_filename'], 'rb') as infile:
+            assert infile.read() == output['certain']
+
+    o_bin.delta = False
+
+
+def test_load_timestep_arrays(model):
+    '''
+    the arrays loaded from the cache for the outputter are the ones
+    encode_frame() needs
+    '''
+    model.step()
+    o_bin = model.outputters[-1]
+
+    for sc in o_bin._load_timestep(0).items():
+        assert len(sc['id']) > 0
+        check_frame(decode_frame(o_bin.encode_frame(sc, 0)), model,
+                    sc.uncertain)
+
+
+def test_delta_elements_removed():
+    '''
+    delta frames are matched to the previous frame by id, so elements can be
+    removed between frames. They are compressed.
+    '''
+    num_les = 1000
+    sc = sample_sc_release(num_les, (-127.0, 47.0, 0.0))
+    sc.current_time_stamp = datetime(2015, 1, 1)
+    sc['positions'][:, :2] += np.random.uniform(0, 0.1, (num_les, 2))
+
+    o_bin = BinaryParticleOutput(delta=True)
+    o_bin.rewind()
+    previous = decode_frame(o_bin.encode_frame(sc, 0))
+
+    # remove some elements and move the others a little
+    sc['status_codes'][::7] = oil_status.to_be_removed
+    sc.model_step_is_done()
+    sc['positions'][:, :2] += 1e-4
+
+    frame = o_bin.encode_frame(sc, 1)
+    decoded = decode_frame(frame, previous)
+
+    assert decoded['num_delta'] == len(sc)
+    assert np.all(decoded['id'] == sc['id'])
+    assert np.all(decoded['lon'] == sc['positions'][:, 0].astype(np.float32))
+    assert np.all(decoded['lat'] == sc['positions'][:, 1].astype(np.float32))
+    assert np.all(decoded['mass'] == sc['mass'].astype(np.float32))
+
+    keyframe = BinaryParticleOutput().encode_frame(sc, 1)
+    assert len(frame) < len(keyframe) / 2
+
+
+def test_delta_requires_previous(model):
+    model.outputters[-1].delta = True
+    model.rewind()
+    model.step()
+    output = model.step()['BinaryParticleOutput']
+
+    with pytest.raises(ValueError):
+        decode_frame(output['certain'])
+
+    model.outputters[-1].delta = False
+
+
+def test_clean_output_files(model, output_dir):
+    model.full_run()
+    files = glob(os.path.join(output_dir, 'particles_*.bin'))
+    assert len(files) == 2 * model.num_time_steps
+
+    model.outputters[-1].clean_output_files()
+
+    files = glob(os.path.join(output_dir, 'particles_*.bin'))
+    assert len(files) == 0
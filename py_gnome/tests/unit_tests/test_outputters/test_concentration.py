@@ -0,0 +1,116 @@
+'''
+tests for the concentration grid outputter
+'''
+import os
+
+import numpy as np
+import pytest
+
+import netCDF4 as nc
+
+from gnome.basic_types import oil_status
+from gnome.outputters import ConcentrationGridOutput
+from gnome.outputters.concentration import bin_mass, kernel_matrix
+from gnome.spill import point_line_release_spill
+
+from ..conftest import sample_model
+
+
+bounds = ((-128.0, 47.0), (-126.0, 49.0))
+num_cells = (20, 10)
+
+
+@pytest.fixture(scope='function')
+def model(sample_model, output_dir):
+    model = sample_model['model']
+
+    model.cache_enabled = True
+    model.uncertain = True
+
+    rel_start_pos = sample_model['release_start_pos']
+    rel_end_pos = sample_model['release_end_pos']
+
+    model.spills += point_line_release_spill(100,
+                                             start_position=rel_start_pos,
+                                             release_time=model.start_time,
+                                             end_position=rel_end_pos,
+                                             amount=1000,
+                                             units='kg')
+
+    model.outputters += \
+        ConcentrationGridOutput(os.path.join(output_dir, 'grid.nc'),
+                                bounds, num_cells)
+    model.rewind()
+    return model
+
+
+def test_init():
+    o_grid = ConcentrationGridOutput('grid.nc', bounds, num_cells)
+
+    assert o_grid.uncertain_filename == 'grid_uncertain.nc'
+    assert o_grid.aggregation == 'instantaneous'
+    assert o_grid.method == 'bincount'
+
+
+@pytest.mark.parametrize(("key", "value"), [('aggregation', 'mean'),
+                                            ('method', 'hist')])
+def test_init_exceptions(key, value):
+    with pytest.raises(ValueError):
+        ConcentrationGridOutput('grid.nc', bounds, num_cells,
+                                **{key: value})
+
+
+def test_bin_mass():
+    positions = np.array([(-127.95, 47.05, 0.0),
+                          (-127.95, 47.05, 0.0),
+                          (-126.05, 48.95, 0.0),
+                          (-125.0, 48.0, 0.0)])
+    mass = np.array([1.0, 2.0, 4.0, 8.0])
+
+    grid = bin_mass(positions, mass, bounds, num_cells)
+
+    assert grid.shape == (10, 20)
+    assert grid[0, 0] == 3.0
+    assert grid[9, 19] == 4.0
+    # last element is outside the grid
+    assert grid.sum() == 7.0
+
+
+def test_kernel_matrix():
+    kernel = kernel_matrix(15, 2.0)
+
+    assert np.allclose(kernel.sum(axis=0), 1.0)
+    assert np.allclose(kernel[:, 7], kernel[::-1, 7])
+
+
+@pytest.mark.parametrize("method", ['bincount', 'kde'])
+def test_write_output(model, method):
+    o_grid = model.outputters[-1]
+    o_grid.method = method
+
+    for step in model:
+        in_water = (model.spills.LE('status_codes') ==
+                    oil_status.in_water)
+        mass = model.spills.LE('mass')[in_water].sum()
+        assert np.isclose(o_grid.grid_mass(model.spills.items()[0]).sum(),
+                          mass)
+
+    with nc.Dataset(o_grid.netcdf_filename) as data:
+        assert len(data.variables['time']) == model.num_time_steps
+        assert data.variables['mass'].shape == (model.num_time_steps, 10, 20)
+        assert np.isclose(data.variables['mass'][-1].sum(), mass)
+
+    assert os.path.exists(o_grid.uncertain_filename)
+
+
+@pytest.mark.parametrize("aggregation", ['max', 'cumulative'])
+def test_aggregation(model, aggregation):
+    o_grid = model.outputters[-1]
+    o_grid.aggregation = aggregation
+
+    model.full_run()
+
+    with nc.Dataset(o_grid.netcdf_filename) as data:
+        grids = data.variables['mass'][:]
+
+    assert np.all(np.diff(grids, axis=0) >= 0)
@@ -2,11 +2,13 @@
 tests for geojson outputter
 '''
 import os
+import json
 from glob import glob
 from datetime import timedelta
 
 import numpy as np
 import pytest
+import geojson
 
 from gnome.outputters import TrajectoryGeoJsonOutput
 from gnome.spill import SpatialRelease, Spill, point_line_release_spill
@@ -64,10 +66,13 @@ def test_clean_output_files(model, output_dir):
     'test geojson outputter with a model since simplest to do that'
     model.rewind()
     model.full_run()
-    files = glob(os.path.join(output_dir, '*.geojson'))
+    files = glob(os.path.join(output_dir, 'geojson_[0-9]*.geojson'))
     print files
     assert len(files) == model.num_time_steps
 
+    files = glob(os.path.join(output_dir, 'geojson_uncertain_*.geojson'))
+    assert len(files) == model.num_time_steps
+
     model.outputters[-1].clean_output_files()
 
     files = glob(os.path.join(output_dir, '*.geojson'))
@@ -99,7 +104,7 @@ def test_write_output_post_run(model, output_ts_factor, output_dir):
                                     cache=model._cache,
                                     spills=model.spills)
 
-    files = glob(os.path.join(output_dir, '*.geojson'))
+    files = glob(os.path.join(output_dir, 'geojson_[0-9]*.geojson'))
 
     assert len(files) == int((model.num_time_steps-2)/output_ts_factor) + 2
 
@@ -139,3 +144,71 @@ def test_geojson_multipoint_output(model):
                         atol=10 ** -round_to)
 
     model.outputters[-1].output_dir = odir
+
+
+def uncertain_filename(filename):
+    'the uncertain geojson file written next to filename'
+    (dirname, basename) = os.path.split(filename)
+    return os.path.join(dirname,
+                        basename.replace('geojson_', 'geojson_uncertain_'))
+
+
+def test_geojson_uncertain_file(model):
+    'the forecast and uncertain collections are written to their own files'
+    model.rewind()
+
+    for step in model:
+        output = step['TrajectoryGeoJsonOutput']
+        filename = output['output_filename']
+
+        for fname, fc in ((filename, output['certain']),
+                          (uncertain_filename(filename), output['uncertain'])):
+            with open(fname) as infile:
+                assert json.load(infile) == json.loads(geojson.dumps(fc))
+
+
+def test_geojson_multipoint_fast_path(model, output_dir):
+    'multipoint features are written from the arrays and match the LEs'
+    o_geojson = model.outputters[-1]
+    o_geojson.multipoint = True
+    model.rewind()
+    round_to = o_geojson.round_to
+
+    for step in model:
+        output = step['TrajectoryGeoJsonOutput']
+        for sc_type, uncertain in (('certain', False), ('uncertain', True)):
+            features = json.loads(output[sc_type])['features']
+            num_elements = 0
+
+            for feature in features:
+                props = feature['properties']
+                assert feature['geometry']['type'] == 'MultiPoint'
+                assert type(props['spill_num']) is int
+
+                coords = feature['geometry']['coordinates']
+                assert len(coords) == len(props['mass'])
+                num_elements += len(coords)
+
+                mask = ((model.spills.LE('status_codes', uncertain) ==
+                         props['status_code']) &
+                        (model.spills.LE('spill_num', uncertain) ==
+                         props['spill_num']))
+
+                assert np.allclose(model.spills.LE('positions',
+                                                   uncertain)[mask, :2],
+                                   coords, atol=10 ** -round_to)
+                assert np.allclose(model.spills.LE('mass',
+                                                   uncertain)[mask],
+                                   props['mass'], atol=10 ** -round_to)
+
+            assert num_elements == len(model.spills.LE('status_codes',
+                                                       uncertain))
+
+        # the files hold the same text that is returned
+        filename = output['output_filename']
+        for fname, sc_type in ((filename, 'certain'),
+                               (uncertain_filename(filename), 'uncertain')):
+            with open(fname) as infile:
+                assert json.load(infile) == json.loads(output[sc_type])
+
+    o_geojson.multipoint = False
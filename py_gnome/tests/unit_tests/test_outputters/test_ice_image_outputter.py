@@ -130,6 +130,30 @@ def test_ice_image_output():
     # not sure what else to check here
 
 
+def test_ice_image_png():
+    '''
+        The images are base64 encoded pngs, and the grid is only
+        rasterized once
+    '''
+    model = make_model()
+    ice_outputter = model.outputters[0]
+
+    for step in model:
+        ice_output = step['IceImageOutput']
+
+        for key in ('thickness_image', 'concentration_image'):
+            header, data = ice_output[key].split(',', 1)
+
+            assert header == 'data:image/png;base64'
+            assert data.decode('base64').startswith('\x89PNG\r\n\x1a\n')
+
+        pixels, cells = ice_outputter._grid_pixels.values()[0]
+        assert len(pixels) == len(cells)
+        assert len(pixels) > 0
+
+    assert len(ice_outputter._grid_pixels) == 1
+
+
 def test_ice_image_mid_run():
     '''
         Test image outputter with a model
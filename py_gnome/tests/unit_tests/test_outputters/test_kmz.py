@@ -3,6 +3,7 @@ tests for kmz outputter
 '''
 
 import os
+import zipfile
 from glob import glob
 from datetime import datetime, timedelta
 
@@ -132,6 +133,31 @@ def test_timesteps(model):
     model.full_run()
 
 
+def test_kml_streamed(model, output_filename):
+    'kml is written to disk as the model runs, then zipped on the last step'
+    kmz = KMZOutput(output_filename)
+    model.outputters += kmz
+    kml_filename = output_filename[:-4] + '.kml'
+
+    model.step()
+    size = os.path.getsize(kml_filename)
+    assert size > 0
+    assert not os.path.exists(kmz.filename)
+
+    model.full_run(rewind=False)
+
+    assert not os.path.exists(kml_filename)
+    with zipfile.ZipFile(kmz.filename) as kmzfile:
+        assert sorted(kmzfile.namelist()) == sorted(['dot.png', 'x.png',
+                                                     kmz.kml_name])
+        kml = kmzfile.read(kmz.kml_name)
+
+    assert len(kml) > size
+    assert kml.endswith(kmz_templates.footer)
+    # one Folder per step for certain and uncertain
+    assert kml.count('<Folder>') == 2 * model.num_time_steps
+
+
 
 ## test the kml templates
 def test_element_template():
@@ -145,6 +171,16 @@ def test_element_template():
              </Point>
 """
 
+
+def test_format_points():
+    positions = np.random.uniform(-180, 180, (20, 3))
+
+    expected = "".join([kmz_templates.point_template.format(*point[:2])
+                        for point in positions])
+
+    assert kmz_templates.format_points(positions) == expected
+    assert kmz_templates.format_points([]) == ""
+
 def test_on_timestep_kml():
     floating_positions = [ (23.45, 45.2, 0),
                            (-13.45,12.2, 0),
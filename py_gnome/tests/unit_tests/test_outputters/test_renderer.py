@@ -12,11 +12,13 @@ NOTE: some of these only really test if the code crashes
 """
 
 import os
+import time
 from os.path import basename
 
 from datetime import datetime
 
 import pytest
+import numpy as np
 import numpy.random as random
 
 from gnome.basic_types import oil_status
@@ -24,7 +26,9 @@ from gnome.basic_types import oil_status
 from gnome.outputters.renderer import Renderer
 from gnome.utilities.projections import GeoProjection
 
-from ..conftest import sample_sc_release, testdata
+from gnome.spill import point_line_release_spill
+
+from ..conftest import sample_sc_release, sample_model, testdata
 
 # fixme -- this should be in conftest
 from gnome.spill_container import SpillContainerPairData
@@ -39,7 +43,7 @@ class FakeCache(object):
         self.sc = sc
         self.sc.current_time_stamp = datetime.now()
 
-    def load_timestep(self, step):
+    def load_timestep(self, step, arrays=None, metadata_only=False):
         return SpillContainerPairData(self.sc, )
 
 
@@ -277,6 +281,187 @@ def test_render_beached_elements(output_dir):
     r.save_foreground(os.path.join(output_dir, 'elements2.png'))
 
 
+def test_beached_pixels(output_dir):
+    """
+    pixels of beached elements are reused only if the element did not move
+    """
+    r = Renderer(bna_sample, output_dir, image_size=(400, 400))
+    (min_lon, min_lat), (max_lon, max_lat) = r.map_BB
+
+    N = 10
+    sc = sample_sc_release(num_elements=N)
+    sc['positions'][:, 0] = random.uniform(min_lon, max_lon, (N, ))
+    sc['positions'][:, 1] = random.uniform(min_lat, max_lat, (N, ))
+    sc['status_codes'][::2] = oil_status.on_land
+
+    r.draw_elements(sc)
+    on_land = sc['status_codes'] == oil_status.on_land
+    ids, lonlat, pixels = r._beached_pixels[False]
+    assert np.all(ids == sc['id'][on_land])
+    assert np.all(pixels == r.projection.to_pixel(sc['positions'][on_land],
+                                                  asint=True))
+
+    # beach one more and move one of the beached elements
+    sc['status_codes'][1] = oil_status.on_land
+    sc['positions'][2, :2] = (min_lon, min_lat)
+
+    r.draw_elements(sc)
+    on_land = sc['status_codes'] == oil_status.on_land
+    ids, lonlat, pixels = r._beached_pixels[False]
+    assert np.all(ids == sc['id'][on_land])
+    assert np.all(pixels == r.projection.to_pixel(sc['positions'][on_land],
+                                                  asint=True))
+
+    # a new background invalidates the pixels
+    r.draw_background()
+    assert r._beached_pixels == {}
+
+
+def test_beached_pixels_ids_out_of_order(output_dir, monkeypatch):
+    """
+    pixels are reused when the ids are not in order along the data arrays
+    """
+    r = Renderer(bna_sample, output_dir, image_size=(400, 400))
+    (min_lon, min_lat), (max_lon, max_lat) = r.map_BB
+
+    N = 10
+    sc = sample_sc_release(num_elements=N)
+    sc['positions'][:, 0] = random.uniform(min_lon, max_lon, (N, ))
+    sc['positions'][:, 1] = random.uniform(min_lat, max_lat, (N, ))
+    sc['id'][:] = sc['id'][::-1]
+    on_land = np.ones((N, ), dtype=bool)
+
+    pixels = r._beached_to_pixel(sc, on_land)
+    assert np.all(pixels == r.projection.to_pixel(sc['positions'],
+                                                  asint=True))
+
+    projected = []
+    to_pixel = r.projection.to_pixel
+
+    def counting_to_pixel(coords, asint=False):
+        projected.append(len(coords))
+        return to_pixel(coords, asint=asint)
+
+    monkeypatch.setattr(r.projection, 'to_pixel', counting_to_pixel)
+
+    assert np.all(r._beached_to_pixel(sc, on_land) == pixels)
+    assert projected == []
+
+    # move one - only that one is projected again
+    sc['positions'][3, :2] = (min_lon, min_lat)
+    pixels = r._beached_to_pixel(sc, on_land)
+
+    assert projected == [1]
+    assert np.all(pixels == to_pixel(sc['positions'], asint=True))
+
+
+def test_save_workers(output_dir):
+    """
+    frames written by the save workers are all on disk after the last step
+    """
+    r = Renderer(bna_star,
+                 output_dir,
+                 image_size=(400, 400),
+                 formats=['png'],
+                 save_workers=2)
+    r.draw_background()
+
+    (min_lon, min_lat), (max_lon, max_lat) = r.map_BB
+    N = 100
+    sc = sample_sc_release(num_elements=N)
+    r.cache = FakeCache(sc)
+
+    num_steps = 10
+    for step_num in range(num_steps):
+        sc['positions'][:, 0] = random.uniform(min_lon, max_lon, (N, ))
+        sc['positions'][:, 1] = random.uniform(min_lat, max_lat, (N, ))
+        r.write_output(step_num, islast_step=(step_num == num_steps - 1))
+
+    assert r._save_pool is None
+    for step_num in range(num_steps):
+        assert os.path.isfile(os.path.join(output_dir,
+                                           r.foreground_filename_format
+                                           .format(step_num)))
+
+
+def _wait_for_file(filename):
+    'keeps a save worker busy until filename exists'
+    while not os.path.exists(filename):
+        time.sleep(0.01)
+
+
+def test_save_workers_hand_off(output_dir):
+    """
+    save_frame() hands the frame to a save worker and returns before it is
+    written. The file is the same as the one saved in this process
+    """
+    size = 100
+    r = Renderer(bna_star,
+                 output_dir,
+                 image_size=(size, size),
+                 formats=['png'],
+                 save_workers=1)
+    r.draw_background()
+
+    num_colors = len(r.get_color_names())
+    r.fore_image = r.image_from_array(random.randint(0, num_colors,
+                                                     (size, size))
+                                      .astype(np.uint8))
+
+    sync_file = os.path.join(output_dir, 'sync.png')
+    r.save_foreground(sync_file)
+
+    # the first frame starts the worker, then keep it busy so the next
+    # frame can't be written till we say so
+    r.save_frame(os.path.join(output_dir, 'first.png'), ['png'])
+    release = os.path.join(output_dir, 'release')
+    busy = r._save_pool.apply_async(_wait_for_file, (release,))
+
+    worker_file = os.path.join(output_dir, 'worker.png')
+    r.save_frame(worker_file, ['png'])
+    pending = r._pending_saves[-1]
+
+    assert not pending.ready()
+    assert not os.path.exists(worker_file)
+
+    open(release, 'w').close()
+    busy.get()
+    r.wait_for_saves()
+
+    assert pending.ready()
+    assert open(worker_file, 'rb').read() == open(sync_file, 'rb').read()
+
+
+def test_render_from_cache(sample_model, output_dir):
+    """
+    frames rendered from the cache by a process pool
+    """
+    model = sample_model['model']
+    model.cache_enabled = True
+    model.uncertain = True
+    rel_start_pos = sample_model['release_start_pos']
+    rel_end_pos = sample_model['release_end_pos']
+    model.spills += point_line_release_spill(100,
+                                             start_position=rel_start_pos,
+                                             release_time=model.start_time,
+                                             end_position=rel_end_pos)
+    model.full_run()
+
+    r = Renderer(bna_sample,
+                 output_dir,
+                 image_size=(400, 400),
+                 formats=['png', 'gif'])
+
+    filenames = r.render_from_cache(model._cache, model.num_time_steps,
+                                    processes=2)
+
+    assert len(filenames) == model.num_time_steps
+    for filename in filenames:
+        assert os.path.isfile(filename)
+    assert os.path.isfile(r.anim_filename)
+    assert r.last_filename == filenames[-1]
+
+
 def test_show_hide_map_bounds(output_dir):
     r = Renderer(bna_star, output_dir, image_size=(600, 600))
 
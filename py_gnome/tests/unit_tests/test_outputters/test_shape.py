@@ -3,9 +3,12 @@ tests for kmz outputter
 '''
 
 import os
+import zipfile
 from datetime import datetime, timedelta
 
+import numpy as np
 import pytest
+import shapefile
 from pytest import raises
 
 from gnome.outputters import ShapeOutput
@@ -127,6 +130,35 @@ def test_timesteps(model):
     model.full_run()
 
 
+def test_records(model, output_filename):
+    'every element of every step is written to the shapefiles'
+    shp_out = ShapeOutput(output_filename)
+    model.outputters += shp_out
+
+    positions = {False: [], True: []}
+    for step in model:
+        for uncertain in (False, True):
+            positions[uncertain].append(model.spills.LE('positions',
+                                                        uncertain).copy())
+
+    for uncertain, suffix in ((False, ''), (True, '_uncert')):
+        fn = output_filename + suffix
+        with zipfile.ZipFile(fn + '.zip') as zipf:
+            zipf.extractall(os.path.dirname(fn))
+
+        reader = shapefile.Reader(fn)
+        expected = np.concatenate(positions[uncertain])
+
+        assert len(reader.records()) == len(expected)
+        assert np.allclose([s.points[0] for s in reader.shapes()],
+                           expected[:, :2])
+        assert np.allclose([r[5] for r in reader.records()], expected[:, 2],
+                           atol=1e-6)
+        assert np.allclose(reader.bbox,
+                           (expected[:, 0].min(), expected[:, 1].min(),
+                            expected[:, 0].max(), expected[:, 1].max()))
+
+
 
 
 
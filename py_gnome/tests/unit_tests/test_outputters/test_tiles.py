@@ -0,0 +1,187 @@
+'''
+tests for the tile outputter
+'''
+import os
+import math
+import shutil
+
+import numpy as np
+import pytest
+
+from gnome.outputters import TileOutput
+from gnome.outputters.tiles import (to_mercator, tile_bounds,
+                                    tiles_for_points, MAX_LATITUDE)
+from gnome.spill import point_line_release_spill
+
+from ..conftest import sample_model, testdata
+
+
+map_filename = testdata['MapFromBNA']['testmap']
+
+
+@pytest.fixture(scope='function')
+def model(sample_model, output_dir):
+    model = sample_model['model']
+
+    model.cache_enabled = True
+    model.uncertain = True
+
+    rel_start_pos = sample_model['release_start_pos']
+    rel_end_pos = sample_model['release_end_pos']
+
+    model.spills += point_line_release_spill(100,
+                                             start_position=rel_start_pos,
+                                             release_time=model.start_time,
+                                             end_position=rel_end_pos)
+
+    model.outputters += TileOutput(map_filename,
+                                   output_dir=output_dir,
+                                   zoom_levels=(6, 9))
+    model.rewind()
+    return model
+
+
+def slippy_tile(lon, lat, zoom):
+    'the usual formula for the tile a point is on'
+    lat = math.radians(lat)
+    n = 2 ** zoom
+
+    return (int((lon + 180.0) / 360.0 * n),
+            int((1.0 - math.log(math.tan(lat) + 1 / math.cos(lat)) /
+                 math.pi) / 2.0 * n))
+
+
+def test_to_mercator():
+    projected = to_mercator(((-127.1, 0.0, 0.0),
+                             (10.0, MAX_LATITUDE, 0.0),
+                             (10.0, -89.0, 0.0)))
+
+    assert np.allclose(projected, ((-127.1, 0.0),
+                                   (10.0, 180.0),
+                                   (10.0, -180.0)))
+
+
+def test_tile_bounds():
+    assert np.allclose(tile_bounds(0, 0, 0), ((-180, -180), (180, 180)))
+    assert np.allclose(tile_bounds(2, 1, 3), ((-90, -180), (0, -90)))
+
+
+@pytest.mark.parametrize("zoom", [0, 4, 10, 14])
+def test_tiles_for_points(zoom):
+    positions = np.array(((-127.1, 47.93, 0.0),
+                          (-126.5, 48.1, 0.0),
+                          (-70.0, 42.3, 0.0),
+                          (10.0, -40.0, 0.0)))
+    points = to_mercator(positions)
+
+    tiles = tiles_for_points(points, zoom)
+
+    assert (sorted(tiles) ==
+            sorted(set(slippy_tile(lon, lat, zoom)
+                       for lon, lat, _z in positions)))
+
+    for (x, y), idx in tiles.iteritems():
+        (min_x, min_y), (max_x, max_y) = tile_bounds(zoom, x, y)
+        assert np.all((points[idx, 0] >= min_x) & (points[idx, 0] < max_x))
+        assert np.all((points[idx, 1] > min_y) & (points[idx, 1] <= max_y))
+
+
+def test_tiles_for_points_pad():
+    'a point near the corner of a tile is also drawn on its neighbors'
+    (_min_x, _min_y), (max_x, max_y) = tile_bounds(6, 10, 20)
+    points = np.array(((max_x - 1e-4, max_y - 1e-4),))
+
+    assert sorted(tiles_for_points(points, 6)) == [(10, 20)]
+    assert (sorted(tiles_for_points(points, 6, pad=0.01)) ==
+            [(10, 19), (10, 20), (11, 19), (11, 20)])
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_write_output(model, processes):
+    o_tiles = model.outputters[-1]
+    o_tiles.processes = processes
+
+    outputs = [step['TileOutput'] for step in model]
+
+    land_tiles = set()
+    for output in outputs:
+        assert sorted(output['tiles']) == [6, 9]
+
+        for zoom, tiles in output['tiles'].iteritems():
+            assert len(tiles) > 0
+            for x, y in tiles:
+                assert os.path.exists(output['tile_url']
+                                      .format(z=zoom, x=x, y=y))
+                land_tiles.add((zoom, x, y))
+
+    assert o_tiles._land_tiles == land_tiles
+    for zoom, x, y in land_tiles:
+        assert os.path.exists(os.path.join(o_tiles.output_dir, 'land',
+                                           str(zoom), str(x),
+                                           '{0}.png'.format(y)))
+
+
+def test_land_tiles_kept(model):
+    'land tiles are only drawn once per map and tile size'
+    o_tiles = model.outputters[-1]
+    o_tiles.processes = 0
+
+    model.full_run()
+    land_tiles = set(o_tiles._land_tiles)
+    land_dir = os.path.join(o_tiles.output_dir, 'land')
+    marker = os.path.join(land_dir, 'marker')
+    open(marker, 'w').close()
+
+    model.rewind()
+    model.step()
+    assert o_tiles._land_tiles == land_tiles
+    assert os.path.exists(marker)
+
+    o_tiles.tile_size = 512
+    model.rewind()
+    model.step()
+    assert not os.path.exists(marker)
+    assert o_tiles._land_tiles <= land_tiles
+
+
+def test_land_tiles_output_dir(model, output_dir):
+    'land tiles are drawn again if output_dir changes or land is removed'
+    o_tiles = model.outputters[-1]
+    o_tiles.processes = 0
+
+    model.rewind()
+    model.step()
+    land_tiles = set(o_tiles._land_tiles)
+    assert len(land_tiles) > 0
+
+    o_tiles.output_dir = os.path.join(output_dir, 'other')
+    model.rewind()
+    model.step()
+    assert o_tiles._land_tiles == land_tiles
+    for zoom, x, y in land_tiles:
+        assert os.path.exists(os.path.join(o_tiles.output_dir, 'land',
+                                           str(zoom), str(x),
+                                           '{0}.png'.format(y)))
+
+    shutil.rmtree(os.path.join(o_tiles.output_dir, 'land'))
+    model.rewind()
+    model.step()
+    assert o_tiles._land_tiles == land_tiles
+    assert os.path.isdir(os.path.join(o_tiles.output_dir, 'land'))
+
+
+@pytest.mark.parametrize(("json_"), ['save', 'webapi'])
+def test_serialize_deserialize(json_, output_dir):
+    o_tiles = TileOutput(map_filename, output_dir=output_dir, processes=3)
+
+    toserial = o_tiles.serialize(json_)
+    dict_ = o_tiles.deserialize(toserial)
+    assert dict_['processes'] == 3
+
+    dict_['map_filename'] = map_filename
+    o_tiles2 = TileOutput.new_from_dict(dict_)
+    assert o_tiles2.processes == 3
+
+    dict_['processes'] = 0
+    o_tiles2.update_from_dict(dict_)
+    assert o_tiles2.processes == 0
@@ -190,6 +190,27 @@ def test_save_load_model(uncertain, zipsave, saveloc_):
     assert model == model2
 
 
+@pytest.mark.parametrize('options',
+                         [{'parallel_containers': True, 'num_threads': 2},
+                          {'fused_weathering': True,
+                           'sample_environment': True},
+                          {'weathering_only': True,
+                           'adaptive_substeps': True}])
+def test_save_load_model_options(options, saveloc_):
+    '''
+    the options that change how the model runs are saved with it
+    '''
+    model = Model(**options)
+    model.zipsave = False
+    model.save(saveloc_)
+
+    model2 = load(saveloc_)
+
+    for name, value in options.iteritems():
+        assert getattr(model2, name) == value
+    assert model == model2
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize(('uncertain', 'zipsave'),
                          [(False, False), (True, False),
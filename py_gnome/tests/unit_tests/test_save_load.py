@@ -139,6 +139,11 @@ g_objects = (environment.Tide(testdata['CatsMover']['tide']),
              #       SpatialRelease, GeoJson
              # spill.SpatialRelease(datetime.now(), ((0, 0, 0), (1, 2, 0))),
              outputters.TrajectoryGeoJsonOutput(),
+             outputters.BinaryParticleOutput(),
+             outputters.ConcentrationGridOutput(os.path.join(base_dir,
+                                                             u'xgrid.nc'),
+                                                ((-128, 47), (-126, 49)),
+                                                (20, 10)),
              )
 
 
@@ -15,6 +15,7 @@ import numpy
 np = numpy
 
 from gnome.basic_types import (oil_status,
+                               fate,
                                world_point_type,
                                id_type)
 from gnome import array_types
@@ -28,6 +29,7 @@ from gnome.utilities.distributions import UniformDistribution
 
 from gnome.spill_container import SpillContainer, SpillContainerPair
 from gnome.spill import point_line_release_spill, Spill, Release
+from gnome.movers import constant_wind_mover
 from gnome.exceptions import GnomeRuntimeError
 
 from conftest import test_oil
@@ -1300,5 +1302,234 @@ def test_split_element():
         assert np.allclose(d_split, split)
 
 
+def test_fate_data_views():
+    '''
+    weatherers get views of the SC arrays if the elements in a fate are
+    contiguous, else copies that are scattered back
+    '''
+    sc = SpillContainer()
+    reltime = datetime(2015, 1, 1, 12, 0, 0)
+    num_les = 10
+    sc.spills += point_line_release_spill(num_les, (1, 1, 1),
+                                          reltime,
+                                          amount=100,
+                                          units='kg',
+                                          substance=test_oil)
+    sc.prepare_for_model_run({'fate_status', 'frac_lost'})
+    sc.release_elements(900, reltime)
+
+    sc['fate_status'][:num_les / 2] = fate.surface_weather
+    sc['mass'][-1] = 0.0
+    sc.reset_fate_dataview()
+    ids = sc['id'].copy()
+
+    subs = sc.get_substances(complete=False)[0]
+    data = sc.substancefatedata(subs, {'fate_status', 'mass', 'frac_lost'},
+                                fate='surface_weather')
+
+    # elements are not reordered
+    assert np.all(sc['id'] == ids)
+    assert len(data['mass']) == num_les / 2
+    assert np.all(data['fate_status'] == fate.surface_weather)
+    assert data['frac_lost'].base is not None
+
+    # changes made to views are in SC without syncing
+    data['frac_lost'][:] = 0.5
+    surf = sc['fate_status'] == fate.surface_weather
+    assert np.all(sc['frac_lost'][surf] == 0.5)
+    assert np.all(sc['frac_lost'][~surf] == 0.0)
+
+    # arrays replaced in the dict are copied back
+    data['mass'] = data['mass'] * 0.5
+    sc.update_from_fatedataview(subs, 'surface_weather')
+    assert np.allclose(sc['mass'][surf], 5.0)
+
+    # change fate - elements are selected again on next request
+    data = sc.substancefatedata(subs, {'fate_status'},
+                                fate='surface_weather')
+    data['fate_status'][1:3] = fate.burn
+    sc.update_from_fatedataview(subs, 'surface_weather')
+
+    burn = sc.substancefatedata(subs, {'mass'}, fate='burn')
+    surf = sc.substancefatedata(subs, {'mass'}, fate='surface_weather')
+    assert len(burn['mass']) == 2
+    assert len(surf['mass']) == num_les / 2 - 2
+    assert np.all(sc['fate_status'][np.in1d(sc['id'], burn['id'])] ==
+                  fate.burn)
+
+    # surface elements are no longer contiguous - a copy is scattered back
+    assert surf['mass'].base is None
+    surf['mass'] = surf['mass'] * 0.5
+    sc.update_from_fatedataview(subs, 'surface_weather')
+    assert np.allclose(sc['mass'][sc['fate_status'] ==
+                                  fate.surface_weather], 2.5)
+    assert np.allclose(sc['mass'][sc['fate_status'] == fate.burn], 5.0)
+
+
+class CountingSubstance(object):
+    '''
+    stand-in for OilProps that counts calls to the property curves
+    '''
+    name = 'counting'
+    num_components = 2
+
+    def __init__(self):
+        self.calls = 0
+
+    def vapor_pressure(self, temp):
+        self.calls += 1
+        return np.array([1.0, 2.0]) * temp
+
+    def kvis_at_temp(self, temp=288.15):
+        self.calls += 1
+        return 1e-6 * temp
+
+    def density_at_temp(self, temp=288.15):
+        self.calls += 1
+        return 900. - temp
+
+
+def test_substance_properties_cache():
+    sc = SpillContainer()
+    subs = CountingSubstance()
+
+    props = sc.substance_properties(subs)
+    assert sc.substance_properties(subs) is props
+
+    vp = props.vapor_pressure(300.)
+    assert np.all(vp == [300., 600.])
+    assert props.vapor_pressure(np.float64(300.)) is vp
+    assert subs.calls == 1
+
+    # cached array is shared so it is read only
+    with raises(ValueError):
+        vp[0] = 0.
+
+    assert props.kvis_at_temp(300.) == 1e-6 * 300.
+    assert props.kvis_at_temp(300.) == 1e-6 * 300.
+    assert props.density_at_temp() == 900. - 288.15
+    assert props.density_at_temp() == 900. - 288.15
+    assert subs.calls == 3
+
+    # new temperature and array of temperatures
+    props.vapor_pressure(301.)
+    props.kvis_at_temp(np.array([300., 301.]))
+    assert subs.calls == 5
+
+    # other attributes pass through
+    assert props.name == subs.name
+    assert props.num_components == 2
+
+    # new run gets a new cache
+    sc.rewind()
+    assert sc.substance_properties(subs) is not props
+
+
+def test_mass_balance_ledger():
+    '''
+    the ledger totals follow release, state changes and removal of elements
+    and agree with the totals computed from the data arrays
+    '''
+    rel_time = datetime(2012, 1, 1, 12)
+    sc = SpillContainer()
+    sc.spills += point_line_release_spill(10, (0, 0, 0), rel_time,
+                                          amount=100, units='kg')
+    sc.prepare_for_model_run({'fate_status'})
+    sc.release_elements(100, rel_time)
+
+    ledger = sc.mass_ledger
+    ledger.debug = True
+
+    assert np.isclose(ledger.amount_released, 100.)
+    assert np.isclose(ledger.non_weathering, 100.)
+    assert np.isclose(ledger.floating(sc.mass_balance), 100.)
+    ledger.check(sc)
+
+    # initialize fate of half the elements, beach two of them
+    before = ledger.state(sc, slice(0, 5))
+    sc['fate_status'][:5] = fate.surface_weather
+    ledger.update(sc, slice(0, 5), before)
+
+    idx = np.array([0, 1])
+    before = ledger.state(sc, idx)
+    sc['status_codes'][idx] = oil_status.on_land
+    ledger.update(sc, idx, before)
+
+    assert np.isclose(ledger.non_weathering, 50.)
+    assert np.isclose(ledger.beached, 20.)
+    assert np.isclose(ledger.floating(sc.mass_balance), 80.)
+    ledger.check(sc)
+
+    # a weatherer removes mass from floating elements
+    sc['mass'][2:5] -= 1.
+    sc.mass_balance['evaporated'] = 3.
+    assert np.isclose(ledger.floating(sc.mass_balance), 77.)
+    ledger.check(sc)
+
+    # element moves off map and is removed
+    before = ledger.state(sc, [9])
+    sc['status_codes'][9] = oil_status.off_maps
+    ledger.update(sc, [9], before)
+    assert np.isclose(ledger.off_maps, 10.)
+
+    before = ledger.state(sc, [9])
+    sc['status_codes'][9] = oil_status.to_be_removed
+    ledger.update(sc, [9], before)
+    sc.model_step_is_done()
+
+    assert np.isclose(ledger.non_weathering, 40.)
+    assert np.isclose(ledger.floating(sc.mass_balance), 67.)
+    ledger.check(sc)
+
+    # a change the ledger does not know about is caught in debug mode
+    sc['status_codes'][3] = oil_status.on_land
+    with raises(GnomeRuntimeError):
+        ledger.check(sc)
+
+    ledger.restore(sc)
+    ledger.check(sc)
+    assert np.isclose(ledger.beached, 29.)
+
+
+def test_fate_data_keeps_mover_records():
+    '''
+    the C++ movers keep per-element uncertainty by position in the arrays.
+    Changing the fate of elements must not move them, or the uncertainty
+    records would end up on other elements
+    '''
+    reltime = datetime(2015, 1, 1, 12, 0, 0)
+    time_step = 900
+    sc = SpillContainer(uncertain=True)
+    sc.spills += point_line_release_spill(10, (1, 1, 1),
+                                          reltime,
+                                          amount=100,
+                                          units='kg',
+                                          substance=test_oil)
+    sc.prepare_for_model_run(windage_at | {'fate_status'})
+    sc.release_elements(time_step, reltime)
+    sc['fate_status'][:] = fate.surface_weather
+
+    wm = constant_wind_mover(10, 45, units='m/s')
+    wm.uncertain_time_delay = 0
+    wm.prepare_for_model_run()
+    wm.prepare_for_model_step(sc, time_step, reltime)
+
+    delta = wm.get_move(sc, time_step, reltime)
+    by_id = dict(zip(sc['id'], delta))
+
+    # some elements leave the surface, some have no mass left
+    sc['fate_status'][::3] = fate.subsurf_weather
+    sc['mass'][1] = 0.0
+    sc.reset_fate_dataview()
+
+    subs = sc.get_substances(complete=False)[0]
+    for fate_ in ('surface_weather', 'subsurf_weather', 'all'):
+        sc.substancefatedata(subs, {'mass'}, fate=fate_)
+
+    delta = wm.get_move(sc, time_step, reltime)
+    for id_, d in zip(sc['id'], delta):
+        assert np.all(d == by_id[id_])
+
+
 if __name__ == '__main__':
     test_rewind()
@@ -282,6 +282,41 @@ def test_read_back_from_memory():
                           sc['positions'])
 
 
+@pytest.mark.parametrize("step", [0, 1])
+def test_read_selected_arrays(step):
+    """
+    read back only some arrays, or only the mass_balance and time stamp.
+    Step 0 is read from disk and step 1 from memory.
+    """
+    c = cache.ElementCache()
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    sc.mass_balance = {'floating': 2.0, 'evaporated': 1.0}
+    scp = SpillContainerPairData(sc)
+
+    for i in range(2):
+        sc.current_time_stamp = dt + tdelta * i
+        c.save_timestep(i, scp)
+
+    scp1 = c.load_timestep(step, arrays=('positions', 'bogus'))
+    sc1 = scp1._spill_container
+
+    assert sorted(sc1._data_arrays.keys()) == ['positions']
+    assert np.array_equal(sc1['positions'], sc['positions'])
+    assert sc1.mass_balance == sc.mass_balance
+    assert sc1.current_time_stamp == dt + tdelta * step
+
+    sc1 = c.load_timestep(step, metadata_only=True)._spill_container
+
+    assert len(sc1._data_arrays) == 0
+    assert sc1.mass_balance == sc.mass_balance
+    assert sc1.current_time_stamp == dt + tdelta * step
+
+    # default is all arrays
+    sc1 = c.load_timestep(step)._spill_container
+    assert set(sc1._data_arrays.keys()) == set(sc._data_arrays.keys())
+
+
 def test_cache_error():
     """
     you should get an exception when you ask for somethign not there
@@ -3,9 +3,14 @@ Tests of the gd map canvas code.
 """
 
 import os
+import struct
+import zlib
 
+import numpy as np
 
-from gnome.utilities.map_canvas import MapCanvas
+from gnome.utilities.map_canvas import (MapCanvas,
+                                        rasterize_polygons,
+                                        encode_png)
 
 import pytest
 from ..conftest import testdata
@@ -163,6 +168,55 @@ def test_projection(output_dir):
 
     mc.save_foreground(os.path.join(output_dir, "image_projection_south.png"))
 
+def test_rasterize_polygons():
+    """
+    the pixels with their centers in a polygon get its index
+    """
+    polygons = np.array((((1, 1), (4, 1), (4, 3), (1, 3)),
+                         ((3, 2), (6, 2), (6, 5), (3, 5)),
+                         ((-5, -5), (-1, -5), (-1, -1), (-5, -1))),
+                        dtype=np.float64)
+
+    raster = rasterize_polygons(polygons, (8, 6))
+
+    assert raster.shape == (6, 8)
+    assert np.all(raster[1:3, 1:3] == 0)
+    assert raster[1, 3] == 0
+    # the second polygon is drawn over the first
+    assert np.all(raster[2:5, 3:6] == 1)
+    # the third is off the image
+    assert (raster >= 0).sum() == 5 + 9
+    assert np.all(rasterize_polygons(polygons, (8, 6), chunk_size=4) ==
+                  raster)
+
+
+def test_encode_png():
+    """
+    the png holds the image and the palette
+    """
+    indices = np.arange(12, dtype=np.uint8).reshape(3, 4) % 3
+    palette = ((255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 0, 0))
+
+    png = encode_png(indices, palette)
+
+    assert png.startswith('\x89PNG\r\n\x1a\n')
+
+    chunks = {}
+    pos = 8
+    while pos < len(png):
+        length, chunk_type = struct.unpack('>I4s', png[pos:pos + 8])
+        chunks[chunk_type] = png[pos + 8:pos + 8 + length]
+        pos += length + 12
+
+    assert struct.unpack('>II', chunks['IHDR'][:8]) == (4, 3)
+    assert chunks['PLTE'] == '\xff\x00\x00\x00\xff\x00\x00\x00\x00'
+    assert chunks['tRNS'] == '\xff\xff\x00'
+
+    raw = np.fromstring(zlib.decompress(chunks['IDAT']), dtype=np.uint8)
+    assert np.all(raw.reshape(3, 5)[:, 1:] == indices)
+    assert 'IEND' in chunks
+
+
 # @pytest.mark.parametrize(("val","exp","num_digits"),
 #                          [(1.1, 1.0, 1),
 #                           (0.0011, 0.001, 1),
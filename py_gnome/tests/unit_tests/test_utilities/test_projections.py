@@ -248,6 +248,27 @@ def test_meters_to_lonlat3():
     assert dlonlat[0, 0] > 1e16
 
 
+@pytest.mark.parametrize("ncols", [2, 3])
+def test_add_meters_to_lonlat(ncols):
+    """ fused kernel matches ref_positions + meters_to_lonlat """
+    ref = np.array([(10.0, 0.0, 1.0),
+                    (-120.0, 60.0, 2.0),
+                    (45.0, -30.0, 0.0)])
+    meters = np.array([(100.0, 200.0, 3.0),
+                       (-50.0, 10.0, 0.0),
+                       (0.0, -500.0, 1.5)])[:, :ncols]
+
+    exp = ref.copy()
+    exp[:, :ncols] += m2l(meters, ref)
+
+    lon_scale = projections.FlatEarthProjection.lon_scale(ref)
+    out = np.empty_like(ref)
+    projections.FlatEarthProjection.add_meters_to_lonlat(meters, lon_scale,
+                                                         ref, out)
+
+    assert np.allclose(out, exp)
+
+
 # tests for lonlat_to_meters
 l2m = projections.FlatEarthProjection.lonlat_to_meters
 METERS_PER_DEGREE_GNOME = 111119.9994764
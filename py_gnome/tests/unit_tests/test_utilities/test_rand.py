@@ -7,7 +7,9 @@ Test gnome.utilities.rand.py
 import numpy as np
 import random
 
-from gnome.utilities.rand import random_with_persistance, seed
+from gnome.utilities.rand import (random_with_persistance,
+                                  refresh_with_persistance,
+                                  seed)
 from gnome.cy_gnome.cy_helpers import rand
 
 import pytest
@@ -72,6 +74,39 @@ def test_random_with_persistance_low_equals_high(low, high):
     assert np.all(x == low)
 
 
+def test_refresh_with_persistance():
+    """
+    only elements whose persistence window expires in the time step are
+    updated; persistence < 0 is never updated
+    """
+    time_step = 900
+    low = np.asarray([0.01] * 4)
+    high = np.asarray([0.04] * 4)
+    persist = np.asarray([-1, 900, 1800, 1800])
+    age = np.asarray([0, 0, 0, 900])
+    array = np.zeros((4,), dtype=np.float64)
+
+    upd = refresh_with_persistance(low, high, array, persist, age, time_step)
+
+    assert np.all(upd == [1, 3])
+    assert np.all(array[[0, 2]] == 0)
+    assert np.all(array[upd] >= low[upd]) and np.all(array[upd] <= high[upd])
+
+
+def test_refresh_with_persistance_scaled():
+    """
+    persistence < time_step scales the range like random_with_persistance
+    """
+    low = np.asarray([1., 1.])
+    high = np.asarray([5., 5.])
+    array = np.zeros((2,), dtype=np.float64)
+
+    refresh_with_persistance(low, high, array, (100, 100), (0, 0), 400)
+
+    # range is scaled by sqrt(100/400) = 0.5 about the mean
+    assert np.all(array >= 2.) and np.all(array <= 4.)
+
+
 def test_set_seed():
     """
     test set_seed to 1 works
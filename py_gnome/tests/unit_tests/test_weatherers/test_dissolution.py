@@ -1,18 +1,21 @@
 '''
 Test dissolution module
 '''
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 import pytest
 import numpy as np
 
+from gnome.model import Model
 from gnome.environment import constant_wind, Water, Waves
 from gnome.outputters import WeatheringOutput
+from gnome.spill import point_line_release_spill
 from gnome.spill.elements import floating
 from gnome.weatherers import (Evaporation,
                               NaturalDispersion,
                               Dissolution,
                               weatherer_sort)
+from gnome.utilities.weathering import BanerjeeHuibers, Stokes
 
 from conftest import weathering_data_arrays, build_waves_obj
 from ..conftest import (sample_model_weathering,
@@ -177,6 +180,67 @@ def test_dissolution_droplet_size(oil, temp, num_elems, drop_size, on):
         assert np.allclose(sc._data_arrays['droplet_avg_size'], drop_size[i])
 
 
+@pytest.mark.parametrize('oil', ('oil_bahia', 'oil_ans_mp'))
+def test_dissolve_oil_tables(oil):
+    '''
+        dissolve_oil() uses per substance tables and a combined expression.
+        Check it against the per process rates it is derived from.
+    '''
+    et = floating(substance=oil)
+
+    disp = NaturalDispersion(waves, water)
+    diss = Dissolution(waves)
+
+    (sc, time_step) = weathering_data_arrays(diss.array_types,
+                                             water,
+                                             element_type=et,
+                                             num_elements=10)[:2]
+    model_time = (sc.spills[0]
+                  .release_time + timedelta(seconds=time_step))
+
+    disp.prepare_for_model_run(sc)
+    diss.prepare_for_model_run(sc)
+    disp.initialize_data(sc, sc.num_released)
+    diss.initialize_data(sc, sc.num_released)
+
+    disp.prepare_for_model_step(sc, time_step, model_time)
+    disp.weather_elements(sc, time_step, model_time)
+
+    substance = sc.get_substances(complete=False)[0]
+    assert id(substance) in diss._tables
+
+    for substance, data in sc.itersubstancedata(diss.array_types):
+        fmasses = data['mass_components']
+        arom_mask = substance._sara['type'] == 'Aromatics'
+        rho = substance.component_density
+        K_ow = arom_mask * BanerjeeHuibers.partition_coeff(
+            substance.molecular_weight, rho)
+
+        avg_rhos = diss.oil_avg_density(fmasses, rho)
+        k_w = Stokes.water_phase_xfer_velocity(water.get('density') -
+                                               avg_rhos,
+                                               data['droplet_avg_size'])
+        T_wc = diss.water_column_time_fraction(model_time, k_w) * time_step
+        T_calm = diss.calm_between_wave_breaks(model_time, time_step, T_wc)
+        conc = diss.oil_concentration(fmasses, rho)
+
+        N_drop = diss.droplet_subsurface_mass_xfer_rate(
+            data['droplet_avg_size'], k_w + 0.134, conc, K_ow, arom_mask,
+            diss.oil_total_volume(fmasses, rho))
+        N_s = diss.slick_subsurface_mass_xfer_rate(model_time, conc, K_ow,
+                                                   data['area'], arom_mask)
+        expected = np.minimum((N_drop.T * T_wc).T + (N_s.T * T_calm).T,
+                              fmasses)
+
+        diss_mass = diss.dissolve_oil(data, substance,
+                                      model_time=model_time,
+                                      time_step=time_step)
+
+        assert diss_mass.shape == fmasses.shape
+        assert np.all(diss_mass[:, ~arom_mask] == 0.0)
+        assert np.allclose(diss_mass, expected, rtol=1e-10, atol=0.0)
+
+
 mb_param_names = ('oil', 'temp', 'wind_speed',
                   'num_elems', 'expected_mb', 'on')
 mb_params = [
@@ -383,6 +447,46 @@ def test_full_run_no_evap(sample_model_fcn2, oil, temp, expected_balance):
     assert np.isclose(dissolved[-1], expected_balance)
 
 
+def test_full_run_parallel_containers():
+    '''
+    the forecast and uncertain spill containers are weathered at the same
+    time with parallel_containers. Weathering does not depend on position
+    so both give the dissolved mass of the sequential run at each step.
+    '''
+    start_time = datetime(2015, 5, 14, 0, 0)
+    results = []
+
+    for parallel in (False, True):
+        model = Model(start_time=start_time,
+                      duration=timedelta(hours=6),
+                      time_step=900,
+                      uncertain=True,
+                      parallel_containers=parallel)
+
+        model.spills += point_line_release_spill(100, (0, 0, 0),
+                                                 start_time,
+                                                 element_type=floating(
+                                                     substance='oil_bahia'),
+                                                 amount=1000,
+                                                 units='kg')
+
+        model.environment += [Water(288.7), wind, waves]
+        model.weatherers += [Evaporation(),
+                             NaturalDispersion(),
+                             Dissolution(waves)]
+
+        dissolved = []
+        for step in model:
+            dissolved.append([sc.mass_balance['dissolution']
+                              for sc in model.spills.items()])
+
+        results.append(np.asarray(dissolved))
+
+    assert np.all(results[0][1:] > 0.0)
+    assert np.allclose(results[1][:, 0], results[0][:, 0], rtol=1e-10)
+    assert np.allclose(results[1][:, 1], results[0][:, 0], rtol=1e-10)
+
+
 def test_full_run_dissolution_not_active(sample_model_fcn):
     'no water/wind/waves object and no evaporation'
     model = sample_model_weathering(sample_model_fcn, 'oil_6')
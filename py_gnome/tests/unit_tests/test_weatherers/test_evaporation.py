@@ -219,7 +219,8 @@ def test_full_run(oil, temp):
                 assert np.all(sc['viscosity'] >= init_vis)
 
             mask = sc['status_codes'] == oil_status.in_water
-            assert sc.mass_balance['floating'] == np.sum(sc['mass'][mask])
+            assert np.isclose(sc.mass_balance['floating'],
+                              np.sum(sc['mass'][mask]))
 
             print ("Amount released: {0}".
                    format(sc.mass_balance['amount_released']))
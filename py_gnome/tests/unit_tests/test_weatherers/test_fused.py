@@ -0,0 +1,133 @@
+'''
+Regression tests for the fused weathering engine - it should give the same
+mass balance as the per-process loop
+'''
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+import numpy as np
+
+from gnome import model as gnome_model
+from gnome.model import Model
+from gnome.spill import point_line_release_spill
+from gnome.environment import constant_wind, Water, Waves
+from gnome.weatherers import (Evaporation,
+                              NaturalDispersion,
+                              Dissolution,
+                              Emulsification,
+                              WeatheringData,
+                              FayGravityViscous,
+                              Skimmer)
+from gnome.weatherers.fused import (fuse_weatherers,
+                                    FusedWeathering)
+
+from conftest import test_oil
+
+# first four are masses
+mass_balance_keys = ('evaporated', 'natural_dispersion', 'sedimentation',
+                     'floating', 'water_content', 'avg_density',
+                     'avg_viscosity')
+
+
+def make_model(fused, weathering_substeps=1):
+    start_time = datetime(2015, 5, 14, 0, 0)
+    model = Model(start_time=start_time,
+                  time_step=900,
+                  duration=timedelta(hours=6),
+                  weathering_substeps=weathering_substeps,
+                  fused_weathering=fused)
+
+    model.spills += point_line_release_spill(50,
+                                             (0., 0., 0.),
+                                             start_time,
+                                             end_release_time=start_time +
+                                             timedelta(hours=1),
+                                             substance=test_oil,
+                                             amount=10000,
+                                             units='kg')
+
+    water = Water(288.)
+    wind = constant_wind(15., 270, 'knots')
+    waves = Waves(wind, water)
+    model.environment += [water, wind, waves]
+
+    model.weatherers += Evaporation(water, wind)
+    model.weatherers += NaturalDispersion(waves, water)
+    model.weatherers += Emulsification(waves)
+
+    return model
+
+
+def run_mass_balance(model):
+    mass_balance = []
+    for step in model:
+        sc = model.spills.items()[0]
+        mass_balance.append([sc.mass_balance.get(k, 0.0)
+                             for k in mass_balance_keys])
+
+    return np.asarray(mass_balance)
+
+
+@pytest.mark.parametrize(('substeps', 'block_size', 'rtol'),
+                         [(1, 4096, 1e-10),
+                          (1, 7, 1e-3),
+                          (3, 4096, 5e-2),
+                          (3, 7, 5e-2)])
+def test_fused_matches_per_process(monkeypatch, substeps, block_size, rtol):
+    '''
+    with one substep and one block the fused engine does the same
+    computation. With substeps, processes are interleaved differently so
+    only compare the mass balance - emulsification onset depends on the
+    order in which frac_lost is updated.
+    '''
+    expected = run_mass_balance(make_model(False, substeps))
+
+    monkeypatch.setattr(gnome_model, 'fuse_weatherers',
+                        partial(fuse_weatherers, block_size=block_size))
+    fused = run_mass_balance(make_model(True, substeps))
+
+    assert expected[-1, 0] > 0   # something evaporated
+    assert expected[-1, 1] > 0   # something dispersed
+
+    if substeps > 1:
+        expected = expected[:, :4]
+        fused = fused[:, :4]
+
+    assert np.allclose(fused, expected, rtol=rtol, atol=1e-12)
+
+
+def test_fuse_weatherers():
+    water = Water()
+    wind = constant_wind(1., 0)
+    waves = Waves(wind, water)
+    evap = Evaporation(water, wind)
+    disp = NaturalDispersion(waves, water)
+    diss = Dissolution(waves)
+    emul = Emulsification(waves)
+    wd = WeatheringData(water)
+    fay = FayGravityViscous(water)
+    skim = Skimmer(100, 'kg', active_start=datetime(2015, 1, 1),
+                   active_stop=datetime(2015, 1, 2), efficiency=0.5)
+
+    # FusedWeathering replaces runs of two or more
+    plan = fuse_weatherers([skim, evap, disp, emul, wd, fay])
+    assert plan[0] is skim
+    assert isinstance(plan[1], FusedWeathering)
+    assert plan[1].weatherers == [evap, disp, emul, wd]
+    assert plan[2] is fay
+
+    plan = fuse_weatherers([evap, disp, diss, emul, wd])
+    assert len(plan) == 3
+    assert plan[0].weatherers == [evap, disp]
+    assert plan[1] is diss
+    assert plan[2].weatherers == [emul, wd]
+
+    # a single process and inactive processes are not fused
+    disp = NaturalDispersion(waves, water, on=False)
+    emul = Emulsification(waves, on=False)
+    plan = fuse_weatherers([evap, disp, diss, emul, wd])
+    assert plan == [evap, diss, wd]
+
+    with pytest.raises(TypeError):
+        FusedWeathering([evap, fay])
@@ -10,7 +10,8 @@ import unit_conversion as us
 
 from gnome.basic_types import oil_status, fate
 
-from gnome.weatherers.roc import (Burn, Disperse, Skim, Platform)
+from gnome.weatherers.roc import (Burn, Disperse, Skim, Platform,
+                                  evaluate_disperse_options)
 from gnome.persist import load
 from gnome.weatherers import (WeatheringData,
                               FayGravityViscous,
@@ -306,6 +307,114 @@ class TestRocChemDispersion(ROCTests):
         assert ser2['platform']['swath_width'] == 100.0
         assert ser == ser2
 
+    def test_sortie_schedule(self):
+        d = Disperse(name='test_disperse',
+                     transit=100,
+                     pass_length=4,
+                     dosage=5,
+                     dosage_type='custom',
+                     timeseries=np.array([(rel_time,
+                                           rel_time + timedelta(hours=12.))]),
+                     platform='Test Platform')
+        schedule = d.sortie_schedule()
+
+        assert len(schedule) > 0
+        assert schedule['sortie'].max() > 0
+        assert np.all(schedule['start'] <= schedule['end'])
+        assert np.all(schedule['end'][:-1] <= schedule['start'][1:])
+
+        spray = schedule[schedule['state'] ==
+                         Disperse.schedule_states.index('spray')]
+        assert np.all(spray['dispersant'] > 0)
+
+        # prorated totals per time step add up to the whole schedule
+        spray_time = 0.
+        dispersant = 0.
+        for i in range(12 * 4 + 4):
+            t = rel_time + timedelta(seconds=i * 900)
+            s, v = Disperse.schedule_totals(schedule, t, 900)
+            spray_time += s
+            dispersant += v
+
+        total = (spray['end'] - spray['start']).sum() / np.timedelta64(1, 's')
+        assert np.isclose(spray_time, total)
+        assert np.isclose(dispersant, spray['dispersant'].sum())
+
+    def test_sortie_schedule_no_dosage(self):
+        with raises(ValueError):
+            self.disp.sortie_schedule()
+
+    def test_sortie_schedule_run_state(self):
+        # the schedule runs the state machine on a state of its own
+        d = Disperse(name='test_disperse',
+                     transit=100,
+                     pass_length=4,
+                     dosage=5,
+                     dosage_type='custom',
+                     timeseries=np.array([(rel_time,
+                                           rel_time + timedelta(hours=12.))]),
+                     platform='Test Platform')
+        d.report = []
+        schedule = d.sortie_schedule()
+
+        assert d.cur_state is None
+        assert len(d.report) == 0
+
+        # and stops at the end of the operation
+        end = np.datetime64(rel_time + timedelta(hours=12.), 'ms')
+        assert np.all(schedule['end'] <= end)
+
+    def test_sortie_schedule_boat_cascade(self):
+        d = Disperse(name='test_disperse',
+                     transit=100,
+                     pass_length=4,
+                     dosage=5,
+                     dosage_type='custom',
+                     cascade_on=True,
+                     cascade_distance=10,
+                     timeseries=np.array([(rel_time,
+                                           rel_time + timedelta(hours=12.))]),
+                     platform='Typical Large Vessel')
+        with raises(ValueError):
+            d.sortie_schedule()
+
+    def test_boat_before_operational_period(self):
+        'a boat stepped before its first operational period gets ready'
+        start = rel_time + timedelta(hours=1.)
+        d = Disperse(name='test_disperse',
+                     transit=100,
+                     pass_length=4,
+                     dosage=5,
+                     dosage_type='custom',
+                     timeseries=np.array([(start,
+                                           start + timedelta(hours=12.))]),
+                     platform='Typical Large Vessel')
+
+        st = d._new_run('retired', dosage=5, verbose=False)
+        d._simulate(None, st, timedelta(hours=2.), rel_time)
+
+        assert st.cur_state != 'retired'
+        assert (start, 'Begin new operational period') in st.report
+
+    def test_evaluate_disperse_options(self):
+        timeseries = np.array([(rel_time, rel_time + timedelta(hours=12.))])
+        res = evaluate_disperse_options(['Test Platform'], [1, 5],
+                                        timeseries, 100, pass_length=4)
+
+        assert res.shape == (1, 2)
+        assert np.all(res['sorties'] > 0)
+        assert np.all(res['spray_time'] > 0)
+        assert np.allclose(res['oil_treatable'], res['dispersant'] * 20)
+
+        # one dosage is the same as building the schedule directly
+        d = Disperse(transit=100,
+                     pass_length=4,
+                     dosage_type='custom',
+                     timeseries=timeseries,
+                     platform='Test Platform')
+        schedule = d.sortie_schedule(5)
+        assert res['sorties'][0, 1] == schedule['sortie'].max()
+
     def test_prepare_for_model_run(self, sample_model_fcn2):
         (self.sc, self.model) = ROCTests.mk_objs(sample_model_fcn2)
         self.reset_and_release()
@@ -343,7 +452,7 @@ class TestRocChemDispersion(ROCTests):
         self.model.step()
         print self.model.spills.items()[0]['viscosity']
         assert disp.cur_state == 'en_route'
-        print disp._next_state_time
+        print disp._run.next_state_time
         self.model.step()
         assert disp.cur_state == 'en_route'
         print disp.transit
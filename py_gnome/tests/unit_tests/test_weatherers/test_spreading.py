@@ -2,14 +2,18 @@
 Test Langmuir() - very simple object with only one method
 '''
 
+import os
 from datetime import datetime, timedelta
 
 import numpy as np
 import pytest
 
 from gnome import constants
+from gnome.basic_types import oil_status
 from gnome.environment import constant_wind, Water
+from gnome.persist import load
 from gnome.weatherers import FayGravityViscous, Langmuir
+from gnome.weatherers.spreading import FayBlobs
 from .test_cleanup import ObjForTests
 
 # scalar inputs - for testing
@@ -177,6 +181,110 @@ class TestFayGravityViscous:
         assert np.all(area[:4] == i_area)
         assert np.all(area[4:] < i_area)
 
+    def test_update_blob_areas(self):
+        '''
+        blob areas updated in one pass match update_area for the LEs. Blobs
+        with age 0 are not updated and blobs at max area stay at max area.
+        '''
+        (bulk_init_volume, age, area) = data_arrays(10)
+        bulk_init_volume[5:] = 60
+        age[:5] = 900
+        age[5:] = 1800
+        a0 = self.spread.init_area(water_viscosity, rel_buoy, bulk_init_vol)
+        area[:5] = a0 / 5
+        a0 = self.spread.init_area(water_viscosity, rel_buoy, 60)
+        area[5:] = a0 / 5
+
+        blobs = FayBlobs()
+        blob_id = np.asarray([blobs.add(bulk_init_volume[0], area[:5].sum()),
+                              blobs.add(bulk_init_volume[5], area[5:].sum()),
+                              blobs.add(10., 10. / self.spread.thickness_limit,
+                                        True)]
+                             ).repeat([5, 5, 0])
+        assert len(blobs) == 3
+
+        self.spread.update_area(water_viscosity, rel_buoy,
+                                bulk_init_volume, area, age)
+
+        blob_age = np.asarray([900., 1800., 3600.])
+        updated = self.spread._update_blob_areas(water_viscosity,
+                                                 rel_buoy,
+                                                 blobs.init_volume,
+                                                 blobs.area,
+                                                 blob_age,
+                                                 blobs.at_max)
+        assert np.all(updated == [True, True, True])
+        assert np.isclose(blobs.area[0], area[blob_id == 0].sum())
+        assert np.isclose(blobs.area[1], area[blob_id == 1].sum())
+        assert blobs.area[2] == 10. / self.spread.thickness_limit
+        assert blobs.at_max[2]
+
+
+class TestFayBlobs(ObjForTests):
+    (sc, weatherers) = ObjForTests.mk_test_objs()
+
+    def test_max_area_les_removed(self):
+        '''
+        a blob at max area keeps it when some of its LEs are removed - the
+        max area is divided among the LEs still in the blob
+        '''
+        self.reset_and_release()
+        spread = [w for w in self.weatherers
+                  if isinstance(w, FayGravityViscous)][0]
+        model_time = self.sc.spills[0].release_time
+
+        blobs = spread._blobs[self.sc.uncertain]
+        max_area = blobs.init_volume[0] / spread.thickness_limit
+        blobs.area[0] = max_area
+        blobs.at_max[0] = True
+        self.sc['fay_area'][:] = max_area / len(self.sc)
+
+        self.sc['status_codes'][:4] = oil_status.to_be_removed
+        self.sc.model_step_is_done()
+
+        spread.prepare_for_model_step(self.sc, default_ts, model_time)
+        spread.weather_elements(self.sc, default_ts, model_time)
+
+        assert len(self.sc) == 6
+        assert blobs.area[0] == max_area
+        assert np.allclose(self.sc['fay_area'], max_area / 6)
+        assert np.allclose(self.sc['area'], max_area / 6)
+
+    def test_save_load_step(self, saveloc_):
+        '''
+        the blob table is not saved - a loaded FayGravityViscous rebuilds it
+        from the LE arrays and steps like the one that was saved
+        '''
+        self.reset_and_release()
+        spread = [w for w in self.weatherers
+                  if isinstance(w, FayGravityViscous)][0]
+        model_time = self.sc.spills[0].release_time
+
+        spread.prepare_for_model_step(self.sc, default_ts, model_time)
+        spread.weather_elements(self.sc, default_ts, model_time)
+        self.sc['age'][:] = self.sc['age'][:] + default_ts
+        model_time += timedelta(seconds=default_ts)
+
+        refs = spread.save(saveloc_)
+        loaded = load(os.path.join(saveloc_, refs.reference(spread)))
+        assert len(loaded._blobs) == 0
+
+        fay_area = self.sc['fay_area'].copy()
+        loaded.prepare_for_model_step(self.sc, default_ts, model_time)
+        loaded.weather_elements(self.sc, default_ts, model_time)
+        loaded_area = self.sc['fay_area'].copy()
+        assert np.all(loaded_area > fay_area)
+
+        self.sc['fay_area'][:] = fay_area
+        self.sc['area'][:] = fay_area
+        spread.prepare_for_model_step(self.sc, default_ts, model_time)
+        spread.weather_elements(self.sc, default_ts, model_time)
+
+        blobs = loaded._blobs[self.sc.uncertain]
+        assert len(blobs) == len(spread._blobs[self.sc.uncertain])
+        assert loaded.thickness_limit == spread.thickness_limit
+        assert np.allclose(loaded_area, self.sc['fay_area'])
+
 
 class TestLangmuir(ObjForTests):
     thick = 1e-4